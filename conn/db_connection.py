@@ -2,8 +2,13 @@
 
 import mysql.connector
 from mysql.connector import Error
-from typing import Optional
+from mysql.connector.errors import PoolError
+from mysql.connector.pooling import MySQLConnectionPool, PooledMySQLConnection
+from contextlib import contextmanager
+from typing import Iterator, Optional
 import os
+import threading
+import time
 from dotenv import load_dotenv
 from utils.logger import get_database_logger, log_database_error
 from utils.exceptions import ConnectionException, QueryException
@@ -18,14 +23,19 @@ logger = get_database_logger()
 class DatabaseConnection:
     """
     - Gestiona la conexión con la base de datos MySQL.
-    - Implementa el patrón Singleton para mantener una única conexión.
+    - Implementa el patrón Singleton para mantener un único pool de conexiones.
+    - Cada hilo toma una conexión del pool y no la comparte: los hilos en
+      segundo plano (reconciliación, planificador, bus de eventos) envuelven
+      su trabajo en unidad_de_trabajo() para devolverla al terminar.
     - Lee configuración desde variables de entorno (.env)
     - Registra todas las operaciones en logs
     - Maneja excepciones de forma específica
     """
 
     _instance: Optional["DatabaseConnection"] = None
-    _connection: Optional[mysql.connector.MySQLConnection] = None
+    _local = threading.local()
+    _pool: Optional[MySQLConnectionPool] = None
+    _pool_lock = threading.Lock()
 
     def __new__(cls):
         """Implementa Singleton."""
@@ -41,10 +51,58 @@ class DatabaseConnection:
         self.user = os.getenv("DB_USER", "root")
         self.password = os.getenv("DB_PASSWORD", "")
         self.port = int(os.getenv("DB_PORT", "3306"))
+        self.pool_size = int(os.getenv("DB_POOL_SIZE", "10"))
+        self.pool_timeout = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
 
-    def connect(self) -> mysql.connector.MySQLConnection:
+    @property
+    def _connection(self) -> Optional[PooledMySQLConnection]:
+        """Conexión tomada del pool por el hilo actual (None si no tiene)."""
+        return getattr(self._local, "connection", None)
+
+    @_connection.setter
+    def _connection(self, conexion: Optional[PooledMySQLConnection]) -> None:
+        self._local.connection = conexion
+
+    def __obtener_pool(self) -> MySQLConnectionPool:
+        """Crea el pool en el primer uso (abre pool_size conexiones)."""
+        with DatabaseConnection._pool_lock:
+            if DatabaseConnection._pool is None:
+                logger.info(
+                    f"Intentando conectar a BD: {self.database}@{self.host} "
+                    f"(pool de {self.pool_size})"
+                )
+                DatabaseConnection._pool = MySQLConnectionPool(
+                    pool_name="smarthome",
+                    pool_size=self.pool_size,
+                    host=self.host,
+                    database=self.database,
+                    user=self.user,
+                    password=self.password,
+                    port=self.port,
+                )
+                logger.info(f"Conexión exitosa a {self.database}")
+            return DatabaseConnection._pool
+
+    def __tomar_del_pool(self) -> PooledMySQLConnection:
+        """
+        Toma una conexión libre del pool, esperando hasta pool_timeout.
+
+        Raises:
+            PoolError: Si el pool sigue agotado al vencer la espera
+        """
+        pool = self.__obtener_pool()
+        limite = time.monotonic() + self.pool_timeout
+        while True:
+            try:
+                return pool.get_connection()
+            except PoolError:
+                if time.monotonic() >= limite:
+                    raise
+                time.sleep(0.05)
+
+    def connect(self) -> PooledMySQLConnection:
         """
-        Establece conexión con la base de datos.
+        Obtiene la conexión del hilo actual, tomándola del pool si no tiene.
 
         Returns:
             Objeto de conexión
@@ -53,21 +111,12 @@ class DatabaseConnection:
             ConnectionException: Si no se puede conectar a la base de datos
         """
         try:
-            if self._connection is None or not self._connection.is_connected():
-                logger.info(f"Intentando conectar a BD: {self.database}@{self.host}")
-                
-                self._connection = mysql.connector.connect(
-                    host=self.host,
-                    database=self.database,
-                    user=self.user,
-                    password=self.password,
-                    port=self.port,
-                )
-                
-                if self._connection.is_connected():
-                    print("✓ Conexión exitosa a la base de datos")
-                    logger.info(f"Conexión exitosa a {self.database}")
-                    
+            if self._connection is not None and not self._connection.is_connected():
+                self.liberar()
+            if self._connection is None:
+                self._connection = self.__tomar_del_pool()
+                logger.debug(f"Conexión tomada del pool ({threading.current_thread().name})")
+
             return self._connection
             
         except Error as e:
@@ -100,11 +149,41 @@ class DatabaseConnection:
                 "Error inesperado al conectar a la base de datos"
             ) from e
 
+    def liberar(self) -> None:
+        """Devuelve al pool la conexión del hilo actual (si tiene una)."""
+        conexion, self._connection = self._connection, None
+        if conexion is None:
+            return
+        try:
+            conexion.close()
+            logger.debug(f"Conexión devuelta al pool ({threading.current_thread().name})")
+        except Exception as e:
+            logger.warning(f"Error al devolver la conexión al pool: {e}")
+
+    @contextmanager
+    def unidad_de_trabajo(self) -> Iterator[None]:
+        """
+        Delimita el trabajo de un hilo en segundo plano.
+
+        La conexión que se tome del pool dentro del bloque se devuelve al
+        salir. Si el hilo ya tenía una conexión (bloques anidados o el hilo
+        principal) se conserva.
+        """
+        tenia_conexion = self._connection is not None
+        try:
+            yield
+        finally:
+            if not tenia_conexion:
+                self.liberar()
+
     def disconnect(self) -> None:
-        """Cierra la conexión con la base de datos."""
+        """Devuelve la conexión del hilo actual y cierra las del pool."""
+        self.liberar()
+        with DatabaseConnection._pool_lock:
+            pool, DatabaseConnection._pool = DatabaseConnection._pool, None
         try:
-            if self._connection and self._connection.is_connected():
-                self._connection.close()
+            if pool is not None:
+                pool._remove_connections()
                 print("✓ Conexión cerrada")
                 logger.info("Conexión a BD cerrada correctamente")
         except Exception as e:
@@ -1,16 +1,26 @@
 """Implementación DAO para la entidad Automation."""
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from mysql.connector import Error
 from interfaces.i_dao import IDao
 from dominio.automation import Automation
+from dominio.home import Home
+from dominio.summary import AutomationSummary
 from conn.db_connection import DatabaseConnection
 from dao.home_dao import HomeDAO
+from dao.identity_map import buscar, hidratar, olvidar, registrar
 
 
 class AutomationDAO(IDao[Automation]):
     """Data Access Object para gestionar automatizaciones."""
     
+    # Campo del dominio -> (columna, obtención del valor); el hogar no cambia tras el alta
+    COLUMNAS_MODIFICABLES = {
+        'name': ('name', lambda a: a.name),
+        'description': ('description', lambda a: a.description),
+        'active': ('active', lambda a: a.active),
+    }
+    
     def __init__(self):
         """Inicializa el DAO con la conexión a BD."""
         self.db = DatabaseConnection()
@@ -31,7 +41,9 @@ class AutomationDAO(IDao[Automation]):
                 entidad.home.id
             ))
             self.db.commit()
+            entidad._assign_id(cursor.lastrowid)
             cursor.close()
+            entidad.mark_clean()
             return True
         except Error as e:
             print(f"Error al insertar automatización: {e}")
@@ -39,24 +51,32 @@ class AutomationDAO(IDao[Automation]):
             return False
     
     def modificar(self, entidad: Automation) -> bool:
-        """Modifica una automatización existente."""
+        """
+        Modifica una automatización existente.
+        
+        Solo actualiza las columnas de los campos modificados. Si la
+        automatización no tiene cambios no se accede a la base de datos.
+        """
+        campos = entidad.get_dirty_fields()
+        if not campos:
+            return True
+        
         try:
+            columnas = [self.COLUMNAS_MODIFICABLES[campo] for campo in sorted(campos)]
             cursor = self.db.get_cursor()
-            query = """
+            query = f"""
                 UPDATE automation 
-                SET name = %s, description = %s, active = %s, home_id = %s
+                SET {', '.join(f'{columna} = %s' for columna, _ in columnas)}
                 WHERE id = %s
             """
-            cursor.execute(query, (
-                entidad.name,
-                entidad.description,
-                entidad.active,
-                entidad.home.id,
-                entidad.id
-            ))
+            valores = [obtener(entidad) for _, obtener in columnas]
+            cursor.execute(query, (*valores, entidad.id))
             self.db.commit()
             affected = cursor.rowcount > 0
+            registrar(Automation, entidad.id, entidad)
             cursor.close()
+            if affected:
+                entidad.mark_clean()
             return affected
         except Error as e:
             print(f"Error al modificar automatización: {e}")
@@ -71,6 +91,7 @@ class AutomationDAO(IDao[Automation]):
             cursor.execute(query, (id,))
             self.db.commit()
             affected = cursor.rowcount > 0
+            olvidar(Automation, id)
             cursor.close()
             return affected
         except Error as e:
@@ -78,8 +99,31 @@ class AutomationDAO(IDao[Automation]):
             self.db.rollback()
             return False
     
+    def _construir_automatizacion(self, row: dict, home: Home) -> Automation:
+        """
+        Construye una automatización reutilizando la instancia de la sesión si existe.
+        
+        Args:
+            row: Fila con id, name, description y active
+            home: Hogar de la automatización
+            
+        Returns:
+            Instancia canónica de la automatización
+        """
+        return hidratar(Automation, row['id'], lambda: Automation(
+            row['id'],
+            row['name'],
+            row['description'],
+            bool(row['active']),
+            home
+        ))
+    
     def obtener_por_id(self, id: int) -> Optional[Automation]:
         """Obtiene una automatización por ID."""
+        existente = buscar(Automation, id)
+        if existente is not None:
+            return existente
+        
         try:
             cursor = self.db.get_cursor()
             query = """
@@ -93,13 +137,7 @@ class AutomationDAO(IDao[Automation]):
             if row:
                 home = self.home_dao.obtener_por_id(row['home_id'])
                 if home:
-                    return Automation(
-                        row['id'],
-                        row['name'],
-                        row['description'],
-                        bool(row['active']),
-                        home
-                    )
+                    return self._construir_automatizacion(row, home)
             return None
         except Error as e:
             print(f"Error al obtener automatización: {e}")
@@ -121,18 +159,30 @@ class AutomationDAO(IDao[Automation]):
             for row in rows:
                 home = self.home_dao.obtener_por_id(row['home_id'])
                 if home:
-                    automatizaciones.append(Automation(
-                        row['id'],
-                        row['name'],
-                        row['description'],
-                        bool(row['active']),
-                        home
-                    ))
+                    automatizaciones.append(self._construir_automatizacion(row, home))
             return automatizaciones
         except Error as e:
             print(f"Error al obtener automatizaciones: {e}")
             return []
-    
+
+    def listar_hogares(self) -> Optional[Dict[int, int]]:
+        """
+        Obtiene el hogar de cada automatización (sin JOIN con home).
+
+        Returns:
+            Diccionario {automation_id: home_id}, o None si hubo un error de BD
+        """
+        try:
+            cursor = self.db.get_cursor()
+            cursor.execute("SELECT id, home_id FROM automation")
+            rows = cursor.fetchall()
+            cursor.close()
+
+            return {row['id']: row['home_id'] for row in rows}
+        except Error as e:
+            print(f"Error al obtener hogares de automatizaciones: {e}")
+            return None
+
     def obtener_por_hogar(self, home_id: int) -> List[Automation]:
         """
         Obtiene todas las automatizaciones de un hogar.
@@ -158,13 +208,7 @@ class AutomationDAO(IDao[Automation]):
             home = self.home_dao.obtener_por_id(home_id)
             if home:
                 for row in rows:
-                    automatizaciones.append(Automation(
-                        row['id'],
-                        row['name'],
-                        row['description'],
-                        bool(row['active']),
-                        home
-                    ))
+                    automatizaciones.append(self._construir_automatizacion(row, home))
             return automatizaciones
         except Error as e:
             print(f"Error al obtener automatizaciones del hogar: {e}")
@@ -195,17 +239,141 @@ class AutomationDAO(IDao[Automation]):
             home = self.home_dao.obtener_por_id(home_id)
             if home:
                 for row in rows:
-                    automatizaciones.append(Automation(
+                    automatizaciones.append(self._construir_automatizacion(row, home))
+            return automatizaciones
+        except Error as e:
+            print(f"Error al obtener automatizaciones activas: {e}")
+            return []
+    
+    def obtener_por_usuario(
+        self,
+        email: str,
+        solo_activas: bool = False
+    ) -> Dict[str, List[Automation]]:
+        """
+        Obtiene las automatizaciones de todos los hogares de un usuario en una sola consulta.
+        
+        Args:
+            email: Email del usuario
+            solo_activas: True para incluir solo automatizaciones activas
+            
+        Returns:
+            Diccionario con el nombre del hogar como clave y sus automatizaciones como valor
+        """
+        try:
+            cursor = self.db.get_cursor()
+            filtro_activas = "AND a.active = TRUE" if solo_activas else ""
+            query = f"""
+                SELECT h.id AS home_id, h.name AS home_name,
+                       a.id, a.name, a.description, a.active
+                FROM user_home uh
+                INNER JOIN home h ON h.id = uh.home_id
+                LEFT JOIN automation a ON a.home_id = h.id {filtro_activas}
+                WHERE uh.user_email = %s
+                ORDER BY h.id, a.id
+            """
+            cursor.execute(query, (email,))
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            resultado: Dict[str, List[Automation]] = {}
+            hogares: Dict[int, Home] = {}
+            for row in rows:
+                home = hogares.get(row['home_id'])
+                if home is None:
+                    home = hidratar(Home, row['home_id'], lambda: Home(row['home_id'], row['home_name']))
+                    hogares[row['home_id']] = home
+                    resultado[home.name] = []
+                
+                # Hogar sin automatizaciones (LEFT JOIN sin coincidencias)
+                if row['id'] is None:
+                    continue
+                
+                resultado[home.name].append(self._construir_automatizacion(row, home))
+            return resultado
+        except Error as e:
+            print(f"Error al obtener automatizaciones del usuario: {e}")
+            return {}
+    
+    def listar_resumen(self) -> List[AutomationSummary]:
+        """
+        Obtiene el resumen de todas las automatizaciones para listados.
+        
+        Returns:
+            Lista de AutomationSummary ordenada por ID
+        """
+        try:
+            cursor = self.db.get_cursor()
+            query = """
+                SELECT a.id, a.name, a.description, a.active, h.name AS home_name
+                FROM automation a
+                INNER JOIN home h ON h.id = a.home_id
+                ORDER BY a.id
+            """
+            cursor.execute(query)
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            return [
+                AutomationSummary(
+                    row['id'],
+                    row['name'],
+                    row['description'] or "",
+                    bool(row['active']),
+                    row['home_name']
+                )
+                for row in rows
+            ]
+        except Error as e:
+            print(f"Error al obtener resumen de automatizaciones: {e}")
+            return []
+    
+    def listar_resumen_por_usuario(
+        self,
+        email: str,
+        solo_activas: bool = False
+    ) -> Dict[str, List[AutomationSummary]]:
+        """
+        Obtiene el resumen de las automatizaciones de los hogares de un usuario.
+        
+        Args:
+            email: Email del usuario
+            solo_activas: True para incluir solo automatizaciones activas
+            
+        Returns:
+            Diccionario {nombre_hogar: [AutomationSummary]}, incluye hogares vacíos
+        """
+        try:
+            cursor = self.db.get_cursor()
+            filtro_activas = "AND a.active = TRUE" if solo_activas else ""
+            query = f"""
+                SELECT h.name AS home_name, a.id, a.name, a.description, a.active
+                FROM user_home uh
+                INNER JOIN home h ON h.id = uh.home_id
+                LEFT JOIN automation a ON a.home_id = h.id {filtro_activas}
+                WHERE uh.user_email = %s
+                ORDER BY h.id, a.id
+            """
+            cursor.execute(query, (email,))
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            resultado: Dict[str, List[AutomationSummary]] = {}
+            for row in rows:
+                automatizaciones = resultado.setdefault(row['home_name'], [])
+                # Hogar sin automatizaciones (LEFT JOIN sin coincidencias)
+                if row['id'] is not None:
+                    automatizaciones.append(AutomationSummary(
                         row['id'],
                         row['name'],
-                        row['description'],
+                        row['description'] or "",
                         bool(row['active']),
-                        home
+                        row['home_name']
                     ))
-            return automatizaciones
+            return resultado
         except Error as e:
-            print(f"Error al obtener automatizaciones activas: {e}")
-            return []
+            print(f"Error al obtener resumen de automatizaciones del usuario: {e}")
+            return {}
     
     def cambiar_estado(self, automation_id: int, activar: bool) -> bool:
         """
@@ -224,6 +392,7 @@ class AutomationDAO(IDao[Automation]):
             cursor.execute(query, (activar, automation_id))
             self.db.commit()
             affected = cursor.rowcount > 0
+            olvidar(Automation, automation_id)
             cursor.close()
             return affected
         except Error as e:
@@ -0,0 +1,171 @@
+"""Implementación DAO para los disparadores y acciones de las automatizaciones."""
+
+from datetime import time, timedelta
+from typing import Dict, List, Optional, Union
+from mysql.connector import Error
+from conn.db_connection import DatabaseConnection
+from dominio.automation_rule import AutomationAction, AutomationRule, Trigger
+
+
+def _a_hora(valor: Union[time, timedelta, None]) -> Optional[time]:
+    """
+    Convierte una columna TIME a datetime.time.
+
+    mysql-connector devuelve las columnas TIME como timedelta.
+    """
+    if valor is None or isinstance(valor, time):
+        return valor
+    segundos = int(valor.total_seconds()) % 86400
+    return time(segundos // 3600, segundos % 3600 // 60, segundos % 60)
+
+
+class AutomationRuleDAO:
+    """
+    Data Access Object para las reglas de las automatizaciones.
+
+    Lee en bloque las tablas automation_trigger y device_automation para
+    construir las reglas que indexa el motor (services/rule_engine.py).
+    """
+
+    def __init__(self):
+        """Inicializa el DAO con la conexión a BD."""
+        self.db = DatabaseConnection()
+
+    def obtener_reglas(
+        self, automation_id: Optional[int] = None, solo_activas: bool = True
+    ) -> Optional[List[AutomationRule]]:
+        """
+        Obtiene las reglas con sus disparadores y acciones (dos consultas en total).
+
+        Args:
+            automation_id: Limitar a una automatización (None para todas)
+            solo_activas: Excluir las automatizaciones desactivadas
+
+        Returns:
+            Lista de AutomationRule (solo las que tienen disparadores),
+            o None si hubo un error de BD
+        """
+        condiciones, params = [], []
+        if automation_id is not None:
+            condiciones.append("a.id = %s")
+            params.append(automation_id)
+        if solo_activas:
+            condiciones.append("a.active = TRUE")
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+
+        try:
+            cursor = self.db.get_cursor()
+            cursor.execute(
+                f"""
+                SELECT t.id, t.automation_id, t.trigger_type, t.device_id, t.state_id,
+                       t.source, t.time_of_day, a.name, a.home_id
+                FROM automation_trigger t
+                INNER JOIN automation a ON a.id = t.automation_id
+                {where}
+                ORDER BY t.automation_id, t.id
+                """,
+                tuple(params),
+            )
+            filas_triggers = cursor.fetchall()
+            cursor.execute(
+                f"""
+                SELECT da.automation_id, da.device_id, da.action, da.state_id
+                FROM device_automation da
+                INNER JOIN automation a ON a.id = da.automation_id
+                {where}
+                ORDER BY da.automation_id, da.device_id
+                """,
+                tuple(params),
+            )
+            filas_acciones = cursor.fetchall()
+            cursor.close()
+        except Error as e:
+            print(f"Error al obtener reglas de automatizaciones: {e}")
+            return None
+
+        acciones: Dict[int, List[AutomationAction]] = {}
+        for row in filas_acciones:
+            acciones.setdefault(row['automation_id'], []).append(
+                AutomationAction(row['device_id'], row['action'], row['state_id'])
+            )
+
+        reglas: Dict[int, AutomationRule] = {}
+        for row in filas_triggers:
+            trigger = Trigger(
+                row['id'],
+                row['automation_id'],
+                row['trigger_type'],
+                row['device_id'],
+                row['state_id'],
+                row['source'],
+                _a_hora(row['time_of_day']),
+            )
+            regla = reglas.get(trigger.automation_id)
+            if regla is None:
+                regla = AutomationRule(
+                    trigger.automation_id,
+                    row['name'],
+                    row['home_id'],
+                    (),
+                    tuple(acciones.get(trigger.automation_id, ())),
+                )
+            reglas[trigger.automation_id] = regla._replace(triggers=regla.triggers + (trigger,))
+        return list(reglas.values())
+
+    def insertar_trigger(self, trigger: Trigger) -> bool:
+        """
+        Inserta un disparador.
+
+        Args:
+            trigger: Disparador a insertar (el id se ignora)
+
+        Returns:
+            True si se insertó correctamente
+        """
+        try:
+            cursor = self.db.get_cursor()
+            query = """
+                INSERT INTO automation_trigger
+                    (automation_id, trigger_type, device_id, state_id, source, time_of_day)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """
+            cursor.execute(
+                query,
+                (
+                    trigger.automation_id,
+                    trigger.trigger_type,
+                    trigger.device_id,
+                    trigger.state_id,
+                    trigger.source,
+                    trigger.time_of_day,
+                ),
+            )
+            self.db.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"Error al insertar disparador: {e}")
+            self.db.rollback()
+            return False
+
+    def eliminar_trigger(self, trigger_id: int) -> bool:
+        """
+        Elimina un disparador.
+
+        Args:
+            trigger_id: ID del disparador
+
+        Returns:
+            True si se eliminó correctamente
+        """
+        try:
+            cursor = self.db.get_cursor()
+            cursor.execute("DELETE FROM automation_trigger WHERE id = %s", (trigger_id,))
+            self.db.commit()
+            affected = cursor.rowcount > 0
+            cursor.close()
+            return affected
+        except Error as e:
+            print(f"Error al eliminar disparador: {e}")
+            self.db.rollback()
+            return False
@@ -1,10 +1,18 @@
 """Implementación DAO para la entidad Device."""
 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from mysql.connector import Error
 from interfaces.i_device_dao import IDeviceDao
 from dominio.device import Device
+from dominio.state import State
+from dominio.device_type import DeviceType
+from dominio.location import Location
+from dominio.home import Home
+from dominio.summary import DeviceStatus, DeviceSummary
 from conn.db_connection import DatabaseConnection
+from dao.identity_map import buscar, hidratar, olvidar, registrar
+from dao.lazy import CargadorLote
+from dao.flyweight import internar
 from dao.state_dao import StateDAO
 from dao.device_type_dao import DeviceTypeDAO
 from dao.location_dao import LocationDAO
@@ -14,6 +22,13 @@ from dao.home_dao import HomeDAO
 class DeviceDAO(IDeviceDao):
     """Data Access Object para gestionar dispositivos."""
     
+    # Campo del dominio -> (columna, obtención del valor); el tipo y el hogar no cambian tras el alta
+    COLUMNAS_MODIFICABLES = {
+        'name': ('name', lambda d: d.name),
+        'state': ('state_id', lambda d: d.state.id),
+        'location': ('location_id', lambda d: d.location.id),
+    }
+    
     def __init__(self):
         self.db = DatabaseConnection()
         self.state_dao = StateDAO()
@@ -37,7 +52,9 @@ class DeviceDAO(IDeviceDao):
                 entidad.home.id
             ))
             self.db.commit()
+            entidad._assign_id(cursor.lastrowid)
             cursor.close()
+            entidad.mark_clean()
             return True
         except Error as e:
             print(f"Error al insertar dispositivo: {e}")
@@ -45,26 +62,32 @@ class DeviceDAO(IDeviceDao):
             return False
     
     def modificar(self, entidad: Device) -> bool:
-        """Modifica un dispositivo existente."""
+        """
+        Modifica un dispositivo existente.
+        
+        Solo actualiza las columnas de los campos modificados. Si el
+        dispositivo no tiene cambios no se accede a la base de datos.
+        """
+        campos = entidad.get_dirty_fields()
+        if not campos:
+            return True
+        
         try:
+            columnas = [self.COLUMNAS_MODIFICABLES[campo] for campo in sorted(campos)]
             cursor = self.db.get_cursor()
-            query = """
+            query = f"""
                 UPDATE device 
-                SET name = %s, state_id = %s, device_type_id = %s, 
-                    location_id = %s, home_id = %s
+                SET {', '.join(f'{columna} = %s' for columna, _ in columnas)}
                 WHERE id = %s
             """
-            cursor.execute(query, (
-                entidad.name,
-                entidad.state.id,
-                entidad.device_type.id,
-                entidad.location.id,
-                entidad.home.id,
-                entidad.id
-            ))
+            valores = [obtener(entidad) for _, obtener in columnas]
+            cursor.execute(query, (*valores, entidad.id))
             self.db.commit()
             affected = cursor.rowcount > 0
+            registrar(Device, entidad.id, entidad)
             cursor.close()
+            if affected:
+                entidad.mark_clean()
             return affected
         except Error as e:
             print(f"Error al modificar dispositivo: {e}")
@@ -72,13 +95,19 @@ class DeviceDAO(IDeviceDao):
             return False
     
     def eliminar(self, id: int) -> bool:
-        """Elimina un dispositivo por ID."""
+        """Elimina un dispositivo por ID (sus eventos quedan sin dispositivo)."""
         try:
             cursor = self.db.get_cursor()
+            # event no tiene FK (tabla particionada): equivale a ON DELETE SET NULL.
+            # Los deltas de estado (state_id) conservan el dispositivo: son su historial
+            cursor.execute(
+                "UPDATE event SET device_id = NULL WHERE device_id = %s AND state_id IS NULL", (id,)
+            )
             query = "DELETE FROM device WHERE id = %s"
             cursor.execute(query, (id,))
             self.db.commit()
             affected = cursor.rowcount > 0
+            olvidar(Device, id)
             cursor.close()
             return affected
         except Error as e:
@@ -86,67 +115,149 @@ class DeviceDAO(IDeviceDao):
             self.db.rollback()
             return False
     
+    def _nuevos_cargadores(self) -> Dict[str, CargadorLote]:
+        """
+        Crea los cargadores por lote de las relaciones de un listado.
+        
+        Returns:
+            Diccionario relación -> cargador
+        """
+        return {
+            'device_type': CargadorLote(self.device_type_dao.obtener_por_ids),
+            'location': CargadorLote(self.location_dao.obtener_por_ids),
+            'home': CargadorLote(self.home_dao.obtener_por_ids),
+        }
+    
+    def _construir_dispositivo(
+        self,
+        row: dict,
+        cargadores: Dict[str, CargadorLote]
+    ) -> Device:
+        """
+        Construye un dispositivo a partir de una fila de device unida con state.
+        
+        El estado se hidrata con la misma fila. El tipo, la ubicación y el
+        hogar son referencias perezosas que se cargan, en una sola consulta
+        por relación para todo el listado, al acceder a ellas.
+        
+        Args:
+            row: Fila con id, name, state_id, state_name, device_type_id, location_id y home_id
+            cargadores: Cargadores por lote del listado
+            
+        Returns:
+            Instancia canónica del dispositivo en la sesión
+        """
+        existente = buscar(Device, row['id'])
+        if existente is not None:
+            return existente
+        
+        state = hidratar(
+            State,
+            row['state_id'],
+            lambda: internar(State(row['state_id'], row['state_name']))
+        )
+        return hidratar(Device, row['id'], lambda: Device(
+            row['id'],
+            row['name'],
+            state,
+            buscar(DeviceType, row['device_type_id'])
+            or cargadores['device_type'].referencia(row['device_type_id']),
+            buscar(Location, row['location_id'])
+            or cargadores['location'].referencia(row['location_id']),
+            buscar(Home, row['home_id'])
+            or cargadores['home'].referencia(row['home_id'])
+        ))
+    
+    def _construir_listado(self, rows: List[dict]) -> List[Device]:
+        """
+        Construye los dispositivos de un listado compartiendo los cargadores.
+        
+        Args:
+            rows: Filas de device unidas con state
+            
+        Returns:
+            Lista de dispositivos
+        """
+        cargadores = self._nuevos_cargadores()
+        return [self._construir_dispositivo(row, cargadores) for row in rows]
+    
     def obtener_por_id(self, id: int) -> Optional[Device]:
         """Obtiene un dispositivo por ID."""
+        existente = buscar(Device, id)
+        if existente is not None:
+            return existente
+        
         try:
             cursor = self.db.get_cursor()
             query = """
-                SELECT id, name, state_id, device_type_id, location_id, home_id
-                FROM device WHERE id = %s
+                SELECT d.id, d.name, d.state_id, s.name AS state_name,
+                       d.device_type_id, d.location_id, d.home_id
+                FROM device d
+                INNER JOIN state s ON s.id = d.state_id
+                WHERE d.id = %s
             """
             cursor.execute(query, (id,))
             row = cursor.fetchone()
             cursor.close()
             
             if row:
-                state = self.state_dao.obtener_por_id(row['state_id'])
-                device_type = self.device_type_dao.obtener_por_id(row['device_type_id'])
-                location = self.location_dao.obtener_por_id(row['location_id'])
-                home = self.home_dao.obtener_por_id(row['home_id'])
-                
-                if all([state, device_type, location, home]):
-                    return Device(
-                        row['id'],
-                        row['name'],
-                        state,
-                        device_type,
-                        location,
-                        home
-                    )
+                return self._construir_dispositivo(row, self._nuevos_cargadores())
             return None
         except Error as e:
             print(f"Error al obtener dispositivo: {e}")
             return None
     
+    def obtener_por_ids(self, ids: Iterable[int]) -> Dict[int, Device]:
+        """
+        Obtiene varios dispositivos en una sola consulta.
+        
+        Args:
+            ids: IDs de los dispositivos
+            
+        Returns:
+            Diccionario {id: dispositivo} con los dispositivos encontrados
+        """
+        dispositivos = {id: buscar(Device, id) for id in set(ids)}
+        faltantes = [id for id, device in dispositivos.items() if device is None]
+        dispositivos = {id: device for id, device in dispositivos.items() if device is not None}
+        if not faltantes:
+            return dispositivos
+        
+        try:
+            cursor = self.db.get_cursor()
+            query = f"""
+                SELECT d.id, d.name, d.state_id, s.name AS state_name,
+                       d.device_type_id, d.location_id, d.home_id
+                FROM device d
+                INNER JOIN state s ON s.id = d.state_id
+                WHERE d.id IN ({', '.join(['%s'] * len(faltantes))})
+            """
+            cursor.execute(query, tuple(faltantes))
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            for device in self._construir_listado(rows):
+                dispositivos[device.id] = device
+            return dispositivos
+        except Error as e:
+            print(f"Error al obtener dispositivos: {e}")
+            return dispositivos
+    
     def obtener_todos(self) -> List[Device]:
         """Obtiene todos los dispositivos."""
         try:
             cursor = self.db.get_cursor()
             query = """
-                SELECT id, name, state_id, device_type_id, location_id, home_id
-                FROM device
+                SELECT d.id, d.name, d.state_id, s.name AS state_name,
+                       d.device_type_id, d.location_id, d.home_id
+                FROM device d
+                INNER JOIN state s ON s.id = d.state_id
             """
             cursor.execute(query)
             rows = cursor.fetchall()
             cursor.close()
             
-            dispositivos = []
-            for row in rows:
-                state = self.state_dao.obtener_por_id(row['state_id'])
-                device_type = self.device_type_dao.obtener_por_id(row['device_type_id'])
-                location = self.location_dao.obtener_por_id(row['location_id'])
-                home = self.home_dao.obtener_por_id(row['home_id'])
-                
-                if all([state, device_type, location, home]):
-                    dispositivos.append(Device(
-                        row['id'],
-                        row['name'],
-                        state,
-                        device_type,
-                        location,
-                        home
-                    ))
-            return dispositivos
+            return self._construir_listado(rows)
         except Error as e:
             print(f"Error al obtener dispositivos: {e}")
             return []
@@ -156,30 +267,17 @@ class DeviceDAO(IDeviceDao):
         try:
             cursor = self.db.get_cursor()
             query = """
-                SELECT id, name, state_id, device_type_id, location_id, home_id
-                FROM device WHERE home_id = %s
+                SELECT d.id, d.name, d.state_id, s.name AS state_name,
+                       d.device_type_id, d.location_id, d.home_id
+                FROM device d
+                INNER JOIN state s ON s.id = d.state_id
+                WHERE d.home_id = %s
             """
             cursor.execute(query, (home_id,))
             rows = cursor.fetchall()
             cursor.close()
             
-            dispositivos = []
-            for row in rows:
-                state = self.state_dao.obtener_por_id(row['state_id'])
-                device_type = self.device_type_dao.obtener_por_id(row['device_type_id'])
-                location = self.location_dao.obtener_por_id(row['location_id'])
-                home = self.home_dao.obtener_por_id(row['home_id'])
-                
-                if all([state, device_type, location, home]):
-                    dispositivos.append(Device(
-                        row['id'],
-                        row['name'],
-                        state,
-                        device_type,
-                        location,
-                        home
-                    ))
-            return dispositivos
+            return self._construir_listado(rows)
         except Error as e:
             print(f"Error al obtener dispositivos del hogar: {e}")
             return []
@@ -189,35 +287,195 @@ class DeviceDAO(IDeviceDao):
         try:
             cursor = self.db.get_cursor()
             query = """
-                SELECT id, name, state_id, device_type_id, location_id, home_id
-                FROM device 
-                WHERE home_id = %s AND name LIKE %s
+                SELECT d.id, d.name, d.state_id, s.name AS state_name,
+                       d.device_type_id, d.location_id, d.home_id
+                FROM device d
+                INNER JOIN state s ON s.id = d.state_id
+                WHERE d.home_id = %s AND d.name LIKE %s
             """
             cursor.execute(query, (home_id, f"%{nombre}%"))
             rows = cursor.fetchall()
             cursor.close()
             
-            dispositivos = []
+            return self._construir_listado(rows)
+        except Error as e:
+            print(f"Error al buscar dispositivos: {e}")
+            return []
+    
+    def obtener_por_usuario(self, email: str) -> Dict[str, List[Device]]:
+        """
+        Obtiene los dispositivos de todos los hogares de un usuario en una sola consulta.
+        
+        Args:
+            email: Email del usuario
+            
+        Returns:
+            Diccionario con el nombre del hogar como clave y sus dispositivos como valor
+        """
+        try:
+            cursor = self.db.get_cursor()
+            query = """
+                SELECT h.id AS home_id, h.name AS home_name,
+                       d.id, d.name,
+                       s.id AS state_id, s.name AS state_name,
+                       dt.id AS device_type_id, dt.name AS device_type_name,
+                       dt.characteristic AS device_type_characteristic,
+                       l.id AS location_id, l.name AS location_name
+                FROM user_home uh
+                INNER JOIN home h ON h.id = uh.home_id
+                LEFT JOIN device d ON d.home_id = h.id
+                LEFT JOIN state s ON s.id = d.state_id
+                LEFT JOIN device_type dt ON dt.id = d.device_type_id
+                LEFT JOIN location l ON l.id = d.location_id
+                WHERE uh.user_email = %s
+                ORDER BY h.id, d.id
+            """
+            cursor.execute(query, (email,))
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            resultado: Dict[str, List[Device]] = {}
+            hogares: Dict[int, Home] = {}
             for row in rows:
-                state = self.state_dao.obtener_por_id(row['state_id'])
-                device_type = self.device_type_dao.obtener_por_id(row['device_type_id'])
-                location = self.location_dao.obtener_por_id(row['location_id'])
-                home = self.home_dao.obtener_por_id(row['home_id'])
+                home = hogares.get(row['home_id'])
+                if home is None:
+                    home = hidratar(Home, row['home_id'], lambda: Home(row['home_id'], row['home_name']))
+                    hogares[row['home_id']] = home
+                    resultado[home.name] = []
                 
-                if all([state, device_type, location, home]):
-                    dispositivos.append(Device(
-                        row['id'],
-                        row['name'],
-                        state,
-                        device_type,
-                        location,
-                        home
-                    ))
-            return dispositivos
+                # Hogar sin dispositivos (LEFT JOIN sin coincidencias)
+                if row['id'] is None or row['state_id'] is None \
+                        or row['device_type_id'] is None or row['location_id'] is None:
+                    continue
+                
+                state = hidratar(
+                    State,
+                    row['state_id'],
+                    lambda: internar(State(row['state_id'], row['state_name']))
+                )
+                device_type = hidratar(DeviceType, row['device_type_id'], lambda: internar(DeviceType(
+                    row['device_type_id'],
+                    row['device_type_name'],
+                    row['device_type_characteristic'] or ""
+                )))
+                location = hidratar(
+                    Location,
+                    row['location_id'],
+                    lambda: Location(row['location_id'], row['location_name'], home)
+                )
+                resultado[home.name].append(hidratar(Device, row['id'], lambda: Device(
+                    row['id'],
+                    row['name'],
+                    state,
+                    device_type,
+                    location,
+                    home
+                )))
+            return resultado
         except Error as e:
-            print(f"Error al buscar dispositivos: {e}")
+            print(f"Error al obtener dispositivos del usuario: {e}")
+            return {}
+    
+    def listar_resumen(self, home_id: Optional[int] = None) -> List[DeviceSummary]:
+        """
+        Obtiene el resumen de los dispositivos para listados, en una sola consulta.
+        
+        Args:
+            home_id: ID del hogar (opcional, None para todos los hogares)
+            
+        Returns:
+            Lista de DeviceSummary ordenada por ID
+        """
+        try:
+            cursor = self.db.get_cursor()
+            filtro_hogar = "WHERE d.home_id = %s" if home_id is not None else ""
+            query = f"""
+                SELECT d.id, d.name, dt.name AS type_name, s.name AS state_name,
+                       l.name AS location_name, h.name AS home_name
+                FROM device d
+                INNER JOIN device_type dt ON dt.id = d.device_type_id
+                INNER JOIN state s ON s.id = d.state_id
+                INNER JOIN location l ON l.id = d.location_id
+                INNER JOIN home h ON h.id = d.home_id
+                {filtro_hogar}
+                ORDER BY d.id
+            """
+            cursor.execute(query, (home_id,) if home_id is not None else ())
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            return [DeviceSummary(**row) for row in rows]
+        except Error as e:
+            print(f"Error al obtener resumen de dispositivos: {e}")
             return []
     
+    def listar_resumen_por_usuario(self, email: str) -> Dict[str, List[DeviceSummary]]:
+        """
+        Obtiene el resumen de los dispositivos de los hogares de un usuario.
+        
+        Args:
+            email: Email del usuario
+            
+        Returns:
+            Diccionario {nombre_hogar: [DeviceSummary]}, incluye hogares sin dispositivos
+        """
+        try:
+            cursor = self.db.get_cursor()
+            query = """
+                SELECT h.name AS home_name, d.id, d.name, dt.name AS type_name,
+                       s.name AS state_name, l.name AS location_name
+                FROM user_home uh
+                INNER JOIN home h ON h.id = uh.home_id
+                LEFT JOIN device d ON d.home_id = h.id
+                LEFT JOIN device_type dt ON dt.id = d.device_type_id
+                LEFT JOIN state s ON s.id = d.state_id
+                LEFT JOIN location l ON l.id = d.location_id
+                WHERE uh.user_email = %s
+                ORDER BY h.id, d.id
+            """
+            cursor.execute(query, (email,))
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            resultado: Dict[str, List[DeviceSummary]] = {}
+            for row in rows:
+                dispositivos = resultado.setdefault(row['home_name'], [])
+                # Hogar sin dispositivos (LEFT JOIN sin coincidencias)
+                if row['id'] is not None:
+                    dispositivos.append(DeviceSummary(**row))
+            return resultado
+        except Error as e:
+            print(f"Error al obtener resumen de dispositivos del usuario: {e}")
+            return {}
+    
+    def listar_estados(self, device_id: Optional[int] = None) -> Optional[List[DeviceStatus]]:
+        """
+        Obtiene el estado actual de los dispositivos en una sola consulta.
+        
+        Args:
+            device_id: ID de un dispositivo (opcional, None para todos)
+            
+        Returns:
+            Lista de DeviceStatus, o None si hubo un error de BD
+        """
+        try:
+            cursor = self.db.get_cursor()
+            filtro = "WHERE d.id = %s" if device_id is not None else ""
+            query = f"""
+                SELECT d.id AS device_id, d.state_id, s.name AS state_name, d.home_id
+                FROM device d
+                INNER JOIN state s ON s.id = d.state_id
+                {filtro}
+            """
+            cursor.execute(query, (device_id,) if device_id is not None else ())
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            return [DeviceStatus(**row) for row in rows]
+        except Error as e:
+            print(f"Error al obtener estados de dispositivos: {e}")
+            return None
+    
     def cambiar_estado(self, device_id: int, nuevo_estado_id: int) -> bool:
         """Cambia el estado de un dispositivo."""
         try:
@@ -226,6 +484,7 @@ class DeviceDAO(IDeviceDao):
             cursor.execute(query, (nuevo_estado_id, device_id))
             self.db.commit()
             affected = cursor.rowcount > 0
+            olvidar(Device, device_id)
             cursor.close()
             return affected
         except Error as e:
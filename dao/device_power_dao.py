@@ -0,0 +1,98 @@
+"""Implementación DAO para la potencia estimada por tipo de dispositivo."""
+
+from typing import Dict, List, Optional, Tuple
+from mysql.connector import Error
+from conn.db_connection import DatabaseConnection
+
+
+class DevicePowerDAO:
+    """
+    Data Access Object para la tabla device_type_power.
+
+    También resuelve el tipo de cada dispositivo, que es lo único del
+    dispositivo que necesita el cálculo de consumo.
+    """
+
+    def __init__(self):
+        """Inicializa el DAO con la conexión a BD."""
+        self.db = DatabaseConnection()
+
+    def obtener_potencias(self) -> Optional[List[Tuple[int, int, float]]]:
+        """
+        Obtiene la potencia de cada tipo de dispositivo en cada estado.
+
+        Returns:
+            Lista de tuplas (device_type_id, state_id, watts) o None si hubo un error
+        """
+        try:
+            cursor = self.db.get_cursor()
+            cursor.execute("SELECT device_type_id, state_id, watts FROM device_type_power")
+            rows = cursor.fetchall()
+            cursor.close()
+            return [
+                (row['device_type_id'], row['state_id'], float(row['watts']))
+                for row in rows
+            ]
+        except Error as e:
+            print(f"Error al obtener potencias: {e}")
+            return None
+
+    def guardar_potencia(self, device_type_id: int, state_id: int, watts: float) -> bool:
+        """
+        Crea o actualiza la potencia de un tipo de dispositivo en un estado.
+
+        Args:
+            device_type_id: ID del tipo de dispositivo
+            state_id: ID del estado
+            watts: Potencia estimada en W
+
+        Returns:
+            True si se guardó correctamente
+        """
+        try:
+            cursor = self.db.get_cursor()
+            query = """
+                INSERT INTO device_type_power (device_type_id, state_id, watts)
+                VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE watts = VALUES(watts)
+            """
+            cursor.execute(query, (device_type_id, state_id, watts))
+            self.db.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"Error al guardar potencia: {e}")
+            self.db.rollback()
+            return False
+
+    def obtener_tipos(
+        self, device_id: Optional[int] = None, home_id: Optional[int] = None
+    ) -> Optional[Dict[int, int]]:
+        """
+        Obtiene el tipo de cada dispositivo.
+
+        Args:
+            device_id: Limitar a un dispositivo (opcional)
+            home_id: Limitar a los dispositivos de un hogar (opcional)
+
+        Returns:
+            Diccionario {device_id: device_type_id} o None si hubo un error
+        """
+        filtros = []
+        params: Tuple = ()
+        if device_id is not None:
+            filtros.append("id = %s")
+            params += (device_id,)
+        if home_id is not None:
+            filtros.append("home_id = %s")
+            params += (home_id,)
+        where = f"WHERE {' AND '.join(filtros)}" if filtros else ""
+        try:
+            cursor = self.db.get_cursor()
+            cursor.execute(f"SELECT id, device_type_id FROM device {where}", params)
+            rows = cursor.fetchall()
+            cursor.close()
+            return {row['id']: row['device_type_id'] for row in rows}
+        except Error as e:
+            print(f"Error al obtener tipos de dispositivos: {e}")
+            return None
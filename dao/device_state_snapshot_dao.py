@@ -0,0 +1,141 @@
+"""Implementación DAO para las instantáneas (snapshots) del estado de los dispositivos."""
+
+import struct
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Tuple
+from mysql.connector import Error
+from conn.db_connection import DatabaseConnection
+
+# Cada dispositivo ocupa 12 bytes: (device_id, home_id, state_id) como uint32 little-endian
+_FORMATO_FILA = struct.Struct("<III")
+
+
+class Snapshot(NamedTuple):
+    """
+    Instantánea del estado de todos los dispositivos.
+
+    Atributos:
+        taken_at: Momento de la instantánea
+        estados: Tuplas (device_id, home_id, state_id)
+    """
+
+    taken_at: datetime
+    estados: List[Tuple[int, int, int]]
+
+
+def empaquetar(estados: List[Tuple[int, int, int]]) -> bytes:
+    """
+    Serializa los estados en formato binario compacto.
+
+    Args:
+        estados: Tuplas (device_id, home_id, state_id)
+
+    Returns:
+        Bytes con 12 bytes por dispositivo
+    """
+    return b"".join(_FORMATO_FILA.pack(*fila) for fila in estados)
+
+
+def desempaquetar(datos: bytes) -> List[Tuple[int, int, int]]:
+    """
+    Deserializa los estados empaquetados con empaquetar().
+
+    Args:
+        datos: Bytes de la columna states
+
+    Returns:
+        Tuplas (device_id, home_id, state_id)
+    """
+    return list(_FORMATO_FILA.iter_unpack(bytes(datos)))
+
+
+class DeviceStateSnapshotDAO:
+    """
+    Data Access Object para la tabla device_state_snapshot.
+
+    Cada instantánea es una sola fila con el estado de todos los
+    dispositivos empaquetado en binario, de modo que leerla es una
+    búsqueda por índice sobre taken_at y una única lectura.
+    """
+
+    def __init__(self):
+        """Inicializa el DAO con la conexión a BD."""
+        self.db = DatabaseConnection()
+
+    def tomar(self, instante: datetime) -> int:
+        """
+        Guarda una instantánea del estado actual de todos los dispositivos.
+
+        Args:
+            instante: Momento que se registra como taken_at
+
+        Returns:
+            Cantidad de dispositivos incluidos (-1 si hubo un error)
+        """
+        try:
+            cursor = self.db.get_cursor()
+            cursor.execute("SELECT id, home_id, state_id FROM device ORDER BY id")
+            estados = [(row['id'], row['home_id'], row['state_id']) for row in cursor.fetchall()]
+            query = """
+                INSERT INTO device_state_snapshot (taken_at, device_count, states)
+                VALUES (%s, %s, %s)
+            """
+            cursor.execute(query, (instante, len(estados), empaquetar(estados)))
+            self.db.commit()
+            cursor.close()
+            return len(estados)
+        except Error as e:
+            print(f"Error al guardar snapshot de estados: {e}")
+            self.db.rollback()
+            return -1
+
+    def obtener_anterior(self, instante: datetime) -> Optional[Snapshot]:
+        """
+        Obtiene la instantánea más reciente tomada hasta un momento.
+
+        Args:
+            instante: Momento de referencia (inclusive)
+
+        Returns:
+            Snapshot o None si no hay ninguna anterior (o hubo un error)
+        """
+        try:
+            cursor = self.db.get_cursor()
+            query = """
+                SELECT taken_at, states FROM device_state_snapshot
+                WHERE taken_at <= %s
+                ORDER BY taken_at DESC
+                LIMIT 1
+            """
+            cursor.execute(query, (instante,))
+            row = cursor.fetchone()
+            cursor.close()
+
+            if row is None:
+                return None
+            return Snapshot(row['taken_at'], desempaquetar(row['states']))
+        except Error as e:
+            print(f"Error al obtener snapshot de estados: {e}")
+            return None
+
+    def eliminar_anteriores(self, fecha: datetime) -> int:
+        """
+        Elimina las instantáneas anteriores a una fecha.
+
+        Args:
+            fecha: Fecha límite (exclusive)
+
+        Returns:
+            Cantidad de instantáneas eliminadas (-1 si hubo un error)
+        """
+        try:
+            cursor = self.db.get_cursor()
+            cursor.execute("DELETE FROM device_state_snapshot WHERE taken_at < %s", (fecha,))
+            self.db.commit()
+            eliminadas = cursor.rowcount
+            cursor.close()
+            return eliminadas
+        except Error as e:
+            print(f"Error al eliminar snapshots de estados: {e}")
+            self.db.rollback()
+            return -1
@@ -1,10 +1,12 @@
 """Implementación DAO para la entidad DeviceType."""
 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from mysql.connector import Error
 from interfaces.i_dao import IDao
 from dominio.device_type import DeviceType
 from conn.db_connection import DatabaseConnection
+from dao.identity_map import buscar, hidratar, olvidar, registrar
+from dao.flyweight import descartar, internar
 
 
 class DeviceTypeDAO(IDao[DeviceType]):
@@ -33,6 +35,8 @@ class DeviceTypeDAO(IDao[DeviceType]):
             cursor.execute(query, (entidad.name, entidad.characteristics, entidad.id))
             self.db.commit()
             affected = cursor.rowcount > 0
+            registrar(DeviceType, entidad.id, entidad)
+            descartar(DeviceType, entidad.id)
             cursor.close()
             return affected
         except Error as e:
@@ -47,6 +51,8 @@ class DeviceTypeDAO(IDao[DeviceType]):
             cursor.execute(query, (id,))
             self.db.commit()
             affected = cursor.rowcount > 0
+            olvidar(DeviceType, id)
+            descartar(DeviceType, id)
             cursor.close()
             return affected
         except Error as e:
@@ -55,6 +61,10 @@ class DeviceTypeDAO(IDao[DeviceType]):
             return False
     
     def obtener_por_id(self, id: int) -> Optional[DeviceType]:
+        existente = buscar(DeviceType, id)
+        if existente is not None:
+            return existente
+        
         try:
             cursor = self.db.get_cursor()
             query = "SELECT id, name, characteristic FROM device_type WHERE id = %s"
@@ -63,7 +73,11 @@ class DeviceTypeDAO(IDao[DeviceType]):
             cursor.close()
             
             if row:
-                return DeviceType(row['id'], row['name'], row['characteristic'] or "")
+                return hidratar(
+                    DeviceType,
+                    row['id'],
+                    lambda: internar(DeviceType(row['id'], row['name'], row['characteristic'] or ""))
+                )
             return None
         except Error as e:
             print(f"Error al obtener tipo de dispositivo: {e}")
@@ -77,7 +91,51 @@ class DeviceTypeDAO(IDao[DeviceType]):
             rows = cursor.fetchall()
             cursor.close()
             
-            return [DeviceType(row['id'], row['name'], row['characteristic'] or "") for row in rows]
+            return [
+                hidratar(
+                    DeviceType,
+                    row['id'],
+                    lambda: internar(DeviceType(row['id'], row['name'], row['characteristic'] or ""))
+                )
+                for row in rows
+            ]
         except Error as e:
             print(f"Error al obtener tipos de dispositivos: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    def obtener_por_ids(self, ids: Iterable[int]) -> Dict[int, DeviceType]:
+        """
+        Obtiene varios tipos de dispositivo en una sola consulta.
+        
+        Args:
+            ids: IDs de los tipos
+            
+        Returns:
+            Diccionario {id: tipo} con los tipos encontrados
+        """
+        tipos = {id: buscar(DeviceType, id) for id in set(ids)}
+        faltantes = [id for id, tipo in tipos.items() if tipo is None]
+        tipos = {id: tipo for id, tipo in tipos.items() if tipo is not None}
+        if not faltantes:
+            return tipos
+        
+        try:
+            cursor = self.db.get_cursor()
+            query = f"""
+                SELECT id, name, characteristic FROM device_type
+                WHERE id IN ({', '.join(['%s'] * len(faltantes))})
+            """
+            cursor.execute(query, tuple(faltantes))
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            for row in rows:
+                tipos[row['id']] = hidratar(
+                    DeviceType,
+                    row['id'],
+                    lambda: internar(DeviceType(row['id'], row['name'], row['characteristic'] or ""))
+                )
+            return tipos
+        except Error as e:
+            print(f"Error al obtener tipos de dispositivos: {e}")
+            return tipos
\ No newline at end of file
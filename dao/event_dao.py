@@ -1,13 +1,17 @@
 """Implementación DAO para la entidad Event."""
 
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 from mysql.connector import Error
 from interfaces.i_dao import IDao
 from dominio.event import Event
+from dominio.device import Device
+from dominio.user import User
 from conn.db_connection import DatabaseConnection
 from dao.device_dao import DeviceDAO
 from dao.user_dao import UserDAO
+from dao.identity_map import buscar, hidratar, olvidar, registrar
+from dao.lazy import CargadorLote
 
 
 class EventDAO(IDao[Event]):
@@ -68,6 +72,7 @@ class EventDAO(IDao[Event]):
             ))
             self.db.commit()
             affected = cursor.rowcount > 0
+            registrar(Event, entidad.id, entidad)
             cursor.close()
             return affected
         except Error as e:
@@ -83,6 +88,7 @@ class EventDAO(IDao[Event]):
             cursor.execute(query, (id,))
             self.db.commit()
             affected = cursor.rowcount > 0
+            olvidar(Event, id)
             cursor.close()
             return affected
         except Error as e:
@@ -90,8 +96,65 @@ class EventDAO(IDao[Event]):
             self.db.rollback()
             return False
     
+    def _nuevos_cargadores(self) -> Dict[str, CargadorLote]:
+        """
+        Crea los cargadores por lote de las relaciones de un listado.
+        
+        Returns:
+            Diccionario relación -> cargador
+        """
+        return {
+            'device': CargadorLote(self.device_dao.obtener_por_ids),
+            'user': CargadorLote(self.user_dao.obtener_por_emails),
+        }
+    
+    def _construir_evento(self, row: dict, cargadores: Dict[str, CargadorLote]) -> Event:
+        """
+        Construye un evento con referencias perezosas a su dispositivo y usuario.
+        
+        Args:
+            row: Fila de la tabla event
+            cargadores: Cargadores por lote del listado
+            
+        Returns:
+            Instancia canónica del evento en la sesión
+        """
+        device = None
+        if row['device_id']:
+            device = buscar(Device, row['device_id']) or cargadores['device'].referencia(row['device_id'])
+        user = None
+        if row['user_email']:
+            user = buscar(User, row['user_email']) \
+                or cargadores['user'].referencia(row['user_email'], 'email')
+        
+        return hidratar(Event, row['id'], lambda: Event(
+            row['id'],
+            row['description'],
+            row['source'],
+            device,
+            user,
+            row['date_time_value']
+        ))
+    
+    def _construir_listado(self, rows: List[dict]) -> List[Event]:
+        """
+        Construye los eventos de un listado compartiendo los cargadores.
+        
+        Args:
+            rows: Filas de la tabla event
+            
+        Returns:
+            Lista de eventos
+        """
+        cargadores = self._nuevos_cargadores()
+        return [self._construir_evento(row, cargadores) for row in rows]
+    
     def obtener_por_id(self, id: int) -> Optional[Event]:
         """Obtiene un evento por ID."""
+        existente = buscar(Event, id)
+        if existente is not None:
+            return existente
+        
         try:
             cursor = self.db.get_cursor()
             query = """
@@ -103,17 +166,7 @@ class EventDAO(IDao[Event]):
             cursor.close()
             
             if row:
-                device = self.device_dao.obtener_por_id(row['device_id']) if row['device_id'] else None
-                user = self.user_dao.obtener_por_email(row['user_email']) if row['user_email'] else None
-                
-                return Event(
-                    row['id'],
-                    row['description'],
-                    row['source'],
-                    device,
-                    user,
-                    row['date_time_value']
-                )
+                return self._construir_evento(row, self._nuevos_cargadores())
             return None
         except Error as e:
             print(f"Error al obtener evento: {e}")
@@ -132,20 +185,7 @@ class EventDAO(IDao[Event]):
             rows = cursor.fetchall()
             cursor.close()
             
-            eventos = []
-            for row in rows:
-                device = self.device_dao.obtener_por_id(row['device_id']) if row['device_id'] else None
-                user = self.user_dao.obtener_por_email(row['user_email']) if row['user_email'] else None
-                
-                eventos.append(Event(
-                    row['id'],
-                    row['description'],
-                    row['source'],
-                    device,
-                    user,
-                    row['date_time_value']
-                ))
-            return eventos
+            return self._construir_listado(rows)
         except Error as e:
             print(f"Error al obtener eventos: {e}")
             return []
@@ -174,21 +214,7 @@ class EventDAO(IDao[Event]):
             rows = cursor.fetchall()
             cursor.close()
             
-            eventos = []
-            device = self.device_dao.obtener_por_id(device_id)
-            
-            for row in rows:
-                user = self.user_dao.obtener_por_email(row['user_email']) if row['user_email'] else None
-                
-                eventos.append(Event(
-                    row['id'],
-                    row['description'],
-                    row['source'],
-                    device,
-                    user,
-                    row['date_time_value']
-                ))
-            return eventos
+            return self._construir_listado(rows)
         except Error as e:
             print(f"Error al obtener eventos del dispositivo: {e}")
             return []
@@ -217,21 +243,7 @@ class EventDAO(IDao[Event]):
             rows = cursor.fetchall()
             cursor.close()
             
-            eventos = []
-            user = self.user_dao.obtener_por_email(user_email)
-            
-            for row in rows:
-                device = self.device_dao.obtener_por_id(row['device_id']) if row['device_id'] else None
-                
-                eventos.append(Event(
-                    row['id'],
-                    row['description'],
-                    row['source'],
-                    device,
-                    user,
-                    row['date_time_value']
-                ))
-            return eventos
+            return self._construir_listado(rows)
         except Error as e:
             print(f"Error al obtener eventos del usuario: {e}")
             return []
@@ -258,20 +270,7 @@ class EventDAO(IDao[Event]):
             rows = cursor.fetchall()
             cursor.close()
             
-            eventos = []
-            for row in rows:
-                device = self.device_dao.obtener_por_id(row['device_id']) if row['device_id'] else None
-                user = self.user_dao.obtener_por_email(row['user_email']) if row['user_email'] else None
-                
-                eventos.append(Event(
-                    row['id'],
-                    row['description'],
-                    row['source'],
-                    device,
-                    user,
-                    row['date_time_value']
-                ))
-            return eventos
+            return self._construir_listado(rows)
         except Error as e:
             print(f"Error al obtener eventos recientes: {e}")
             return []
@@ -299,20 +298,222 @@ class EventDAO(IDao[Event]):
             rows = cursor.fetchall()
             cursor.close()
             
-            eventos = []
-            for row in rows:
-                device = self.device_dao.obtener_por_id(row['device_id']) if row['device_id'] else None
-                user = self.user_dao.obtener_por_email(row['user_email']) if row['user_email'] else None
-                
-                eventos.append(Event(
-                    row['id'],
-                    row['description'],
-                    row['source'],
-                    device,
-                    user,
-                    row['date_time_value']
-                ))
-            return eventos
+            return self._construir_listado(rows)
         except Error as e:
             print(f"Error al obtener eventos por fecha: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    def iterar_por_fecha(
+        self,
+        fecha_inicio: datetime,
+        fecha_fin: datetime,
+        home_id: Optional[int] = None,
+        tamano_lote: int = 10000
+    ) -> Iterator[Dict]:
+        """
+        Recorre en orden cronológico los eventos de un rango, en lotes.
+        
+        Devuelve filas crudas (sin hidratar Event) para procesar grandes
+        volúmenes de historial sin cargarlos completos en memoria.
+        
+        Args:
+            fecha_inicio: Fecha inicial del rango
+            fecha_fin: Fecha final del rango
+            home_id: Limitar a los dispositivos de un hogar (opcional)
+            tamano_lote: Cantidad de filas por lote
+            
+        Yields:
+            Diccionarios con date_time_value, device_id, source, description,
+            state_id (None si no es un cambio de estado) y home_id (None si
+            el dispositivo ya no existe)
+        """
+        filtro_hogar = "AND d.home_id = %s" if home_id else ""
+        cursor = self.db.get_cursor()
+        try:
+            query = f"""
+                SELECT e.date_time_value, e.device_id, e.source, e.description,
+                       e.state_id, d.home_id
+                FROM event e
+                LEFT JOIN device d ON d.id = e.device_id
+                WHERE e.date_time_value BETWEEN %s AND %s {filtro_hogar}
+                ORDER BY e.date_time_value, e.id
+            """
+            params = (fecha_inicio, fecha_fin) + ((home_id,) if home_id else ())
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(tamano_lote)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def registrar_cambio_estado(
+        self,
+        device_id: int,
+        state_id: int,
+        descripcion: str,
+        source: str,
+        instante: datetime
+    ) -> bool:
+        """
+        Registra un cambio de estado como evento con su state_id.
+        
+        Estos eventos son los deltas que se aplican sobre las instantáneas
+        de device_state_snapshot para reconstruir estados pasados.
+        
+        Args:
+            device_id: ID del dispositivo
+            state_id: ID del nuevo estado
+            descripcion: Descripción del evento
+            source: Origen del cambio
+            instante: Momento del cambio
+            
+        Returns:
+            True si se registró correctamente
+        """
+        try:
+            cursor = self.db.get_cursor()
+            query = """
+                INSERT INTO event (description, device_id, source, state_id, date_time_value)
+                VALUES (%s, %s, %s, %s, %s)
+            """
+            cursor.execute(query, (descripcion, device_id, source, state_id, instante))
+            self.db.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"Error al registrar cambio de estado: {e}")
+            self.db.rollback()
+            return False
+    
+    def iterar_cambios_estado(
+        self,
+        desde: datetime,
+        hasta: datetime,
+        tamano_lote: int = 10000,
+        incluir_desde: bool = False
+    ) -> Iterator[Dict]:
+        """
+        Recorre en orden cronológico los cambios de estado de un intervalo.
+        
+        Args:
+            desde: Inicio del intervalo (excluido salvo con incluir_desde)
+            hasta: Fin del intervalo (incluido)
+            tamano_lote: Cantidad de filas por lote
+            incluir_desde: Incluir los cambios registrados en 'desde' (al
+                partir de una instantánea: un cambio con el mismo instante
+                puede no estar en ella)
+            
+        Yields:
+            Diccionarios con date_time_value, device_id, state_id y home_id
+            (home_id es None si el dispositivo ya no existe)
+        """
+        cursor = self.db.get_cursor()
+        try:
+            desde_op = ">=" if incluir_desde else ">"
+            query = f"""
+                SELECT e.date_time_value, e.device_id, e.state_id, d.home_id
+                FROM event e
+                LEFT JOIN device d ON d.id = e.device_id
+                WHERE e.date_time_value {desde_op} %s AND e.date_time_value <= %s
+                  AND e.state_id IS NOT NULL
+                ORDER BY e.date_time_value, e.id
+            """
+            cursor.execute(query, (desde, hasta))
+            while True:
+                rows = cursor.fetchmany(tamano_lote)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+    
+    def iterar_transiciones(
+        self,
+        desde: datetime,
+        hasta: datetime,
+        device_id: Optional[int] = None,
+        home_id: Optional[int] = None,
+        tamano_lote: int = 50000
+    ) -> Iterator[Tuple[int, float, int]]:
+        """
+        Recorre los cambios de estado de un intervalo como tuplas numéricas.
+        
+        Pensado para cargar historiales largos en arreglos: el instante se
+        devuelve en segundos desde 'desde' (sin objetos datetime ni diccionarios
+        por fila en el consumidor).
+        
+        Args:
+            desde: Inicio del intervalo (excluido)
+            hasta: Fin del intervalo (incluido)
+            device_id: Limitar a un dispositivo (opcional)
+            home_id: Limitar a los dispositivos de un hogar (opcional)
+            tamano_lote: Cantidad de filas por lote
+            
+        Yields:
+            Tuplas (device_id, segundos desde 'desde', state_id) ordenadas por
+            dispositivo y fecha
+        """
+        filtros = ""
+        params: Tuple = (desde, desde, hasta)
+        if device_id is not None:
+            filtros += " AND device_id = %s"
+            params += (device_id,)
+        if home_id is not None:
+            filtros += " AND device_id IN (SELECT id FROM device WHERE home_id = %s)"
+            params += (home_id,)
+        cursor = self.db.get_cursor()
+        try:
+            query = f"""
+                SELECT device_id,
+                       TIMESTAMPDIFF(MICROSECOND, %s, date_time_value) AS offset_us,
+                       state_id
+                FROM event
+                WHERE date_time_value > %s AND date_time_value <= %s
+                  AND state_id IS NOT NULL AND device_id IS NOT NULL {filtros}
+                ORDER BY device_id, date_time_value, id
+            """
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(tamano_lote)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row['device_id'], row['offset_us'] / 1e6, row['state_id']
+        finally:
+            cursor.close()
+    
+    def registrar_evento(
+        self,
+        device_id: Optional[int],
+        source: str,
+        descripcion: str,
+        instante: datetime
+    ) -> bool:
+        """
+        Inserta un evento sin hidratar entidades (ej: detecciones y alertas).
+        
+        Args:
+            device_id: ID del dispositivo (None si no aplica)
+            source: Origen del evento (ej: 'sensor', 'alerta')
+            descripcion: Descripción del evento
+            instante: Momento del evento
+            
+        Returns:
+            True si se registró correctamente
+        """
+        try:
+            cursor = self.db.get_cursor()
+            query = """
+                INSERT INTO event (description, device_id, source, date_time_value)
+                VALUES (%s, %s, %s, %s)
+            """
+            cursor.execute(query, (descripcion, device_id, source, instante))
+            self.db.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"Error al registrar evento: {e}")
+            self.db.rollback()
+            return False
@@ -0,0 +1,192 @@
+"""Implementación DAO para la gestión de particiones de la tabla event."""
+
+import re
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional
+from mysql.connector import Error
+from conn.db_connection import DatabaseConnection
+
+
+class EventPartitionDAO:
+    """
+    Data Access Object para las particiones mensuales de la tabla event.
+
+    La tabla está particionada por RANGE (TO_DAYS(date_time_value)):
+    - Una partición por mes con nombre pAAAAMM
+    - Una partición comodín 'p_futuro' (MAXVALUE) que recibe todo lo demás
+    """
+
+    PARTICION_FUTURO = "p_futuro"
+    PATRON_MENSUAL = re.compile(r"^p(\d{4})(\d{2})$")
+
+    def __init__(self):
+        """Inicializa el DAO con la conexión a BD."""
+        self.db = DatabaseConnection()
+
+    @staticmethod
+    def nombre_particion(anio: int, mes: int) -> str:
+        """
+        Construye el nombre de la partición de un mes.
+
+        Args:
+            anio: Año de la partición
+            mes: Mes de la partición (1-12)
+
+        Returns:
+            Nombre con formato pAAAAMM
+        """
+        return f"p{anio:04d}{mes:02d}"
+
+    @classmethod
+    def mes_de_particion(cls, nombre: str) -> date:
+        """
+        Obtiene el primer día del mes cubierto por una partición mensual.
+
+        Args:
+            nombre: Nombre de la partición (pAAAAMM)
+
+        Returns:
+            Fecha del primer día del mes
+
+        Raises:
+            ValueError: Si el nombre no corresponde a una partición mensual
+        """
+        coincidencia = cls.PATRON_MENSUAL.match(nombre)
+        if not coincidencia:
+            raise ValueError(f"Partición no mensual: {nombre}")
+        return date(int(coincidencia.group(1)), int(coincidencia.group(2)), 1)
+
+    def obtener_particiones(self) -> List[str]:
+        """
+        Obtiene las particiones mensuales existentes, ordenadas cronológicamente.
+
+        Returns:
+            Lista de nombres de particiones (sin incluir 'p_futuro')
+        """
+        try:
+            cursor = self.db.get_cursor()
+            query = """
+                SELECT PARTITION_NAME AS name
+                FROM information_schema.PARTITIONS
+                WHERE TABLE_SCHEMA = DATABASE()
+                  AND TABLE_NAME = 'event'
+                  AND PARTITION_NAME IS NOT NULL
+                ORDER BY PARTITION_ORDINAL_POSITION
+            """
+            cursor.execute(query)
+            rows = cursor.fetchall()
+            cursor.close()
+
+            return [
+                row['name'] for row in rows
+                if self.PATRON_MENSUAL.match(row['name'])
+            ]
+        except Error as e:
+            print(f"Error al obtener particiones de eventos: {e}")
+            return []
+
+    def obtener_fecha_minima(self) -> Optional[datetime]:
+        """
+        Obtiene la fecha del evento más antiguo.
+
+        Returns:
+            Fecha y hora del evento más antiguo, o None si no hay eventos o hubo un error
+        """
+        try:
+            cursor = self.db.get_cursor()
+            cursor.execute("SELECT MIN(date_time_value) AS minima FROM event")
+            row = cursor.fetchone()
+            cursor.close()
+            return row['minima'] if row else None
+        except Error as e:
+            print(f"Error al obtener el evento más antiguo: {e}")
+            return None
+
+    def agregar_particion(self, nombre: str, limite: date) -> bool:
+        """
+        Crea una partición mensual separándola de 'p_futuro'.
+
+        Args:
+            nombre: Nombre de la nueva partición
+            limite: Primer día del mes siguiente (límite exclusivo)
+
+        Returns:
+            True si se creó correctamente
+
+        Raises:
+            ValueError: Si el nombre no es de una partición mensual
+        """
+        self.mes_de_particion(nombre)
+        try:
+            cursor = self.db.get_cursor()
+            query = f"""
+                ALTER TABLE event REORGANIZE PARTITION {self.PARTICION_FUTURO} INTO (
+                    PARTITION {nombre} VALUES LESS THAN (TO_DAYS('{limite.isoformat()}')),
+                    PARTITION {self.PARTICION_FUTURO} VALUES LESS THAN MAXVALUE
+                )
+            """
+            cursor.execute(query)
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"Error al crear partición {nombre}: {e}")
+            return False
+
+    def iterar_filas_particion(
+        self,
+        nombre: str,
+        tamano_lote: int = 5000
+    ) -> Iterator[Dict]:
+        """
+        Recorre las filas de una partición en lotes, sin cargarla completa en memoria.
+
+        Args:
+            nombre: Nombre de la partición
+            tamano_lote: Cantidad de filas por lote
+
+        Yields:
+            Filas de la partición como diccionarios
+
+        Raises:
+            ValueError: Si el nombre no es de una partición mensual
+        """
+        self.mes_de_particion(nombre)
+        cursor = self.db.get_cursor()
+        try:
+            query = f"""
+                SELECT id, date_time_value, description, device_id, user_email, source, state_id
+                FROM event PARTITION ({nombre})
+                ORDER BY date_time_value, id
+            """
+            cursor.execute(query)
+            while True:
+                rows = cursor.fetchmany(tamano_lote)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def eliminar_particion(self, nombre: str) -> bool:
+        """
+        Elimina una partición completa (operación de metadatos, sin DELETE masivo).
+
+        Args:
+            nombre: Nombre de la partición
+
+        Returns:
+            True si se eliminó correctamente
+
+        Raises:
+            ValueError: Si el nombre no es de una partición mensual
+        """
+        self.mes_de_particion(nombre)
+        try:
+            cursor = self.db.get_cursor()
+            query = f"ALTER TABLE event DROP PARTITION {nombre}"
+            cursor.execute(query)
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"Error al eliminar partición {nombre}: {e}")
+            return False
@@ -0,0 +1,197 @@
+"""Implementación DAO para las tablas de agregados (rollups) de eventos."""
+
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+from mysql.connector import Error
+from conn.db_connection import DatabaseConnection
+
+
+class EventRollupDAO:
+    """
+    Data Access Object para los conteos agregados de eventos.
+
+    Mantiene las tablas event_rollup_hour y event_rollup_day de forma
+    incremental: cada actualización recalcula los buckets de los eventos
+    con id mayor al registrado en rollup_watermark y de los registrados en
+    los últimos EVENT_ROLLUP_LAG_SECONDS. Los ids se asignan al insertar
+    pero una transacción lenta puede confirmarse después de otra con un id
+    mayor; esa ventana vuelve a leer los eventos que quedaron por debajo del
+    watermark. Los conteos se reemplazan (no se suman), de modo que releer
+    un evento no lo cuenta dos veces.
+    """
+
+    WATERMARK = "event_rollup"
+
+    # Granularidad -> (tabla, expresión SQL del bucket)
+    GRANULARIDADES = {
+        'hora': ('event_rollup_hour', "DATE_FORMAT(date_time_value, '%%Y-%%m-%%d %%H:00:00')"),
+        'dia': ('event_rollup_day', "DATE(date_time_value)"),
+    }
+
+    def __init__(self):
+        """Inicializa el DAO con la conexión a BD."""
+        self.db = DatabaseConnection()
+        self.margen_segundos = int(os.getenv("EVENT_ROLLUP_LAG_SECONDS", "600"))
+
+    def obtener_watermark(self) -> int:
+        """
+        Obtiene el último event.id incorporado a los rollups.
+
+        Returns:
+            ID del último evento procesado (0 si nunca se procesó)
+        """
+        try:
+            cursor = self.db.get_cursor()
+            query = "SELECT last_event_id FROM rollup_watermark WHERE name = %s"
+            cursor.execute(query, (self.WATERMARK,))
+            row = cursor.fetchone()
+            cursor.close()
+
+            return row['last_event_id'] if row else 0
+        except Error as e:
+            print(f"Error al obtener watermark de rollups: {e}")
+            return 0
+
+    def actualizar_rollups(self) -> int:
+        """
+        Incorpora a los rollups los eventos posteriores al watermark.
+
+        Se recuentan completos los buckets desde el más antiguo que contiene
+        un evento nuevo (id mayor al watermark) o reciente (dentro del
+        margen de seguridad). Los conteos por hora, por día y el nuevo
+        watermark se escriben en una única transacción; repetir la
+        actualización deja los mismos conteos.
+
+        Returns:
+            Cantidad de eventos nuevos procesados (-1 si hubo un error)
+        """
+        try:
+            desde = self.obtener_watermark()
+
+            cursor = self.db.get_cursor()
+            cursor.execute(
+                """
+                SELECT MAX(id) AS max_id, MIN(date_time_value) AS fecha_minima,
+                       COALESCE(SUM(id > %s), 0) AS nuevos
+                FROM event
+                WHERE id > %s OR date_time_value >= NOW() - INTERVAL %s SECOND
+                """,
+                (desde, desde, self.margen_segundos)
+            )
+            row = cursor.fetchone()
+
+            if not row or row['max_id'] is None:
+                cursor.close()
+                return 0
+
+            inicio_hora = row['fecha_minima'].replace(minute=0, second=0, microsecond=0)
+            inicios = {'hora': inicio_hora, 'dia': inicio_hora.replace(hour=0)}
+            for granularidad, (tabla, bucket) in self.GRANULARIDADES.items():
+                query = f"""
+                    INSERT INTO {tabla} (bucket, device_id, source, event_count)
+                    SELECT {bucket}, COALESCE(device_id, 0), source, COUNT(*)
+                    FROM event
+                    WHERE date_time_value >= %s
+                    GROUP BY 1, 2, 3
+                    ON DUPLICATE KEY UPDATE event_count = VALUES(event_count)
+                """
+                cursor.execute(query, (inicios[granularidad],))
+
+            query = """
+                INSERT INTO rollup_watermark (name, last_event_id) VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE last_event_id = GREATEST(last_event_id, VALUES(last_event_id))
+            """
+            cursor.execute(query, (self.WATERMARK, row['max_id']))
+            self.db.commit()
+            cursor.close()
+            return int(row['nuevos'])
+        except Error as e:
+            print(f"Error al actualizar rollups de eventos: {e}")
+            self.db.rollback()
+            return -1
+
+    def obtener_conteos_dispositivo(
+        self,
+        device_id: int,
+        desde: datetime,
+        hasta: datetime,
+        granularidad: str = 'dia',
+        source: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Obtiene la cantidad de eventos de un dispositivo por bucket.
+
+        Args:
+            device_id: ID del dispositivo
+            desde: Inicio del rango (inclusive)
+            hasta: Fin del rango (inclusive)
+            granularidad: 'hora' o 'dia'
+            source: Filtra por origen del evento (opcional)
+
+        Returns:
+            Lista de diccionarios {bucket, source, total} ordenada por bucket
+        """
+        tabla = self.GRANULARIDADES[granularidad][0]
+        try:
+            cursor = self.db.get_cursor()
+            filtro_source = "AND source = %s" if source else ""
+            query = f"""
+                SELECT bucket, source, event_count AS total
+                FROM {tabla}
+                WHERE device_id = %s AND bucket BETWEEN %s AND %s {filtro_source}
+                ORDER BY bucket, source
+            """
+            params = (device_id, desde, hasta) + ((source,) if source else ())
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            cursor.close()
+            return rows
+        except Error as e:
+            print(f"Error al obtener conteos del dispositivo: {e}")
+            return []
+
+    def obtener_conteos_hogar(
+        self,
+        home_id: int,
+        desde: datetime,
+        hasta: datetime,
+        granularidad: str = 'hora',
+        source: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Obtiene la cantidad de eventos de los dispositivos de un hogar por bucket.
+
+        Args:
+            home_id: ID del hogar
+            desde: Inicio del rango (inclusive)
+            hasta: Fin del rango (inclusive)
+            granularidad: 'hora' o 'dia'
+            source: Filtra por origen del evento (opcional)
+
+        Returns:
+            Lista de diccionarios {bucket, source, total} ordenada por bucket
+        """
+        tabla = self.GRANULARIDADES[granularidad][0]
+        try:
+            cursor = self.db.get_cursor()
+            filtro_source = "AND r.source = %s" if source else ""
+            query = f"""
+                SELECT r.bucket, r.source, SUM(r.event_count) AS total
+                FROM {tabla} r
+                INNER JOIN device d ON d.id = r.device_id
+                WHERE d.home_id = %s AND r.bucket BETWEEN %s AND %s {filtro_source}
+                GROUP BY r.bucket, r.source
+                ORDER BY r.bucket, r.source
+            """
+            params = (home_id, desde, hasta) + ((source,) if source else ())
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            cursor.close()
+            return [
+                {'bucket': row['bucket'], 'source': row['source'], 'total': int(row['total'])}
+                for row in rows
+            ]
+        except Error as e:
+            print(f"Error al obtener conteos del hogar: {e}")
+            return []
@@ -0,0 +1,92 @@
+"""Registro de instancias canónicas (flyweight) para entidades de catálogo."""
+
+from typing import Any, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# (tipo, id) -> instancia canónica, compartida por todo el proceso
+_instancias: Dict[Tuple[type, Hashable], Any] = {}
+
+# tipo -> subclase de solo lectura usada por sus instancias canónicas
+_solo_lectura: Dict[type, type] = {}
+
+
+def _subclase_solo_lectura(tipo: type) -> type:
+    """
+    Obtiene (creándola una vez) la variante de solo lectura de una clase.
+
+    La subclase no agrega atributos (__slots__ vacío), así que una
+    instancia ya construida puede pasar a ella cambiando su __class__.
+    """
+    subclase = _solo_lectura.get(tipo)
+    if subclase is None:
+        def __setattr__(self, nombre: str, valor: Any) -> None:
+            raise AttributeError(
+                f"{tipo.__name__} id={self.id!r} es una instancia compartida (solo lectura): "
+                f"para modificarla cree una nueva y guárdela con su DAO"
+            )
+
+        subclase = type(tipo.__name__, (tipo,), {
+            '__slots__': (),
+            '__setattr__': __setattr__,
+            '__module__': tipo.__module__,
+        })
+        _solo_lectura[tipo] = subclase
+    return subclase
+
+
+def internar(entidad: T) -> T:
+    """
+    Obtiene la instancia canónica equivalente a la entidad.
+
+    Pensado para filas de catálogo pequeñas y casi inmutables (State,
+    Role, DeviceType): todos los dispositivos y usuarios hidratados
+    comparten la misma instancia por id. Si los valores leídos de la
+    base de datos cambiaron, la entidad recibida pasa a ser la canónica.
+
+    La instancia canónica queda de solo lectura (sus setters lanzan
+    AttributeError): un cambio en ella alteraría a todas las entidades
+    que la comparten.
+
+    Args:
+        entidad: Entidad recién construida (con __eq__ por valor)
+
+    Returns:
+        La instancia canónica
+    """
+    tipo = type(entidad)
+    if tipo in _solo_lectura.values():
+        tipo = tipo.__base__
+    clave = (tipo, entidad.id)
+    canonica = _instancias.get(clave)
+    if canonica is not None and canonica == entidad:
+        return canonica
+    object.__setattr__(entidad, '__class__', _subclase_solo_lectura(tipo))
+    _instancias[clave] = entidad
+    return entidad
+
+
+def descartar(tipo: type, id: Hashable) -> None:
+    """
+    Quita la instancia canónica de una entidad (p. ej. tras modificarla o eliminarla).
+
+    Args:
+        tipo: Clase de la entidad
+        id: Identificador de la entidad
+    """
+    _instancias.pop((tipo, id), None)
+
+
+def limpiar() -> None:
+    """Vacía el registro."""
+    _instancias.clear()
+
+
+def cantidad() -> int:
+    """
+    Cantidad de instancias canónicas registradas.
+
+    Returns:
+        Número de entidades internadas
+    """
+    return len(_instancias)
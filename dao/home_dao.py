@@ -1,10 +1,11 @@
 """Implementación DAO para la entidad Home."""
 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from mysql.connector import Error
 from interfaces.i_dao import IDao
 from dominio.home import Home
 from conn.db_connection import DatabaseConnection
+from dao.identity_map import buscar, hidratar, olvidar, registrar
 
 
 class HomeDAO(IDao[Home]):
@@ -33,6 +34,7 @@ class HomeDAO(IDao[Home]):
             cursor.execute(query, (entidad.name, entidad.id))
             self.db.commit()
             affected = cursor.rowcount > 0
+            registrar(Home, entidad.id, entidad)
             cursor.close()
             return affected
         except Error as e:
@@ -47,6 +49,7 @@ class HomeDAO(IDao[Home]):
             cursor.execute(query, (id,))
             self.db.commit()
             affected = cursor.rowcount > 0
+            olvidar(Home, id)
             cursor.close()
             return affected
         except Error as e:
@@ -55,6 +58,10 @@ class HomeDAO(IDao[Home]):
             return False
     
     def obtener_por_id(self, id: int) -> Optional[Home]:
+        existente = buscar(Home, id)
+        if existente is not None:
+            return existente
+        
         try:
             cursor = self.db.get_cursor()
             query = "SELECT id, name FROM home WHERE id = %s"
@@ -63,7 +70,7 @@ class HomeDAO(IDao[Home]):
             cursor.close()
             
             if row:
-                return Home(row['id'], row['name'])
+                return hidratar(Home, row['id'], lambda: Home(row['id'], row['name']))
             return None
         except Error as e:
             print(f"Error al obtener hogar: {e}")
@@ -77,11 +84,44 @@ class HomeDAO(IDao[Home]):
             rows = cursor.fetchall()
             cursor.close()
             
-            return [Home(row['id'], row['name']) for row in rows]
+            return [
+                hidratar(Home, row['id'], lambda: Home(row['id'], row['name']))
+                for row in rows
+            ]
         except Error as e:
             print(f"Error al obtener hogares: {e}")
             return []
     
+    def obtener_por_ids(self, ids: Iterable[int]) -> Dict[int, Home]:
+        """
+        Obtiene varios hogares en una sola consulta.
+        
+        Args:
+            ids: IDs de los hogares
+            
+        Returns:
+            Diccionario {id: hogar} con los hogares encontrados
+        """
+        hogares = {id: buscar(Home, id) for id in set(ids)}
+        faltantes = [id for id, home in hogares.items() if home is None]
+        hogares = {id: home for id, home in hogares.items() if home is not None}
+        if not faltantes:
+            return hogares
+        
+        try:
+            cursor = self.db.get_cursor()
+            query = f"SELECT id, name FROM home WHERE id IN ({', '.join(['%s'] * len(faltantes))})"
+            cursor.execute(query, tuple(faltantes))
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            for row in rows:
+                hogares[row['id']] = hidratar(Home, row['id'], lambda: Home(row['id'], row['name']))
+            return hogares
+        except Error as e:
+            print(f"Error al obtener hogares: {e}")
+            return hogares
+    
     def obtener_hogares_usuario(self, email: str) -> List[Home]:
         """Obtiene los hogares asociados a un usuario."""
         try:
@@ -96,7 +136,79 @@ class HomeDAO(IDao[Home]):
             rows = cursor.fetchall()
             cursor.close()
             
-            return [Home(row['id'], row['name']) for row in rows]
+            return [
+                hidratar(Home, row['id'], lambda: Home(row['id'], row['name']))
+                for row in rows
+            ]
         except Error as e:
             print(f"Error al obtener hogares del usuario: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    def obtener_ids_hogares_usuario(self, email: str) -> Optional[List[int]]:
+        """
+        Obtiene los IDs de los hogares de un usuario (sin JOIN con home).
+        
+        Args:
+            email: Email del usuario
+            
+        Returns:
+            Lista de IDs, o None si hubo un error de BD
+        """
+        try:
+            cursor = self.db.get_cursor()
+            query = "SELECT home_id FROM user_home WHERE user_email = %s"
+            cursor.execute(query, (email,))
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            return [row['home_id'] for row in rows]
+        except Error as e:
+            print(f"Error al obtener hogares del usuario: {e}")
+            return None
+    
+    def asociar_usuario(self, email: str, home_id: int) -> bool:
+        """
+        Asocia un usuario a un hogar (sin efecto si ya estaba asociado).
+        
+        Args:
+            email: Email del usuario
+            home_id: ID del hogar
+            
+        Returns:
+            True si la operación se completó
+        """
+        try:
+            cursor = self.db.get_cursor()
+            query = "INSERT IGNORE INTO user_home (user_email, home_id) VALUES (%s, %s)"
+            cursor.execute(query, (email, home_id))
+            self.db.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"Error al asociar usuario a hogar: {e}")
+            self.db.rollback()
+            return False
+    
+    def desasociar_usuario(self, email: str, home_id: int) -> bool:
+        """
+        Quita la asociación de un usuario con un hogar.
+        
+        Args:
+            email: Email del usuario
+            home_id: ID del hogar
+            
+        Returns:
+            True si la asociación existía y se eliminó
+        """
+        try:
+            cursor = self.db.get_cursor()
+            query = "DELETE FROM user_home WHERE user_email = %s AND home_id = %s"
+            cursor.execute(query, (email, home_id))
+            self.db.commit()
+            affected = cursor.rowcount > 0
+            cursor.close()
+            return affected
+        except Error as e:
+            print(f"Error al desasociar usuario de hogar: {e}")
+            self.db.rollback()
+            return False
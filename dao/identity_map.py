@@ -0,0 +1,187 @@
+"""Mapa de identidad compartido por los DAOs dentro de una sesión."""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class IdentityMap:
+    """
+    Registro de entidades hidratadas durante una sesión/petición.
+
+    Cada par (tipo de entidad, id) se materializa una sola vez y se
+    reutiliza en todas las consultas de la sesión, de modo que, por
+    ejemplo, mil dispositivos del mismo hogar comparten un único Home.
+    """
+
+    def __init__(self):
+        """Inicializa un mapa vacío."""
+        self.__entidades: Dict[Tuple[type, Hashable], Any] = {}
+
+    def obtener(self, tipo: type, id: Hashable) -> Optional[Any]:
+        """
+        Obtiene una entidad ya hidratada.
+
+        Args:
+            tipo: Clase de la entidad
+            id: Identificador de la entidad
+
+        Returns:
+            La entidad registrada o None
+        """
+        return self.__entidades.get((tipo, id))
+
+    def obtener_o_registrar(self, tipo: type, id: Hashable, fabrica: Callable[[], T]) -> T:
+        """
+        Obtiene la entidad registrada o la crea y registra con la fábrica.
+
+        Args:
+            tipo: Clase de la entidad
+            id: Identificador de la entidad
+            fabrica: Función que construye la entidad si no existe
+
+        Returns:
+            Instancia canónica de la entidad en la sesión
+        """
+        clave = (tipo, id)
+        entidad = self.__entidades.get(clave)
+        if entidad is None:
+            entidad = fabrica()
+            self.__entidades[clave] = entidad
+        return entidad
+
+    def registrar(self, tipo: type, id: Hashable, entidad: Any) -> None:
+        """
+        Registra una entidad como la instancia canónica de su fila.
+
+        Args:
+            tipo: Clase de la entidad
+            id: Identificador de la entidad
+            entidad: Instancia a registrar
+        """
+        self.__entidades[(tipo, id)] = entidad
+
+    def olvidar(self, tipo: type, id: Hashable) -> None:
+        """
+        Elimina una entidad del mapa (p. ej. tras un DELETE o un UPDATE
+        directo por id, sin la instancia en memoria).
+
+        Args:
+            tipo: Clase de la entidad
+            id: Identificador de la entidad
+        """
+        self.__entidades.pop((tipo, id), None)
+
+    def limpiar(self) -> None:
+        """Vacía el mapa."""
+        self.__entidades.clear()
+
+    def __len__(self) -> int:
+        """Cantidad de entidades registradas."""
+        return len(self.__entidades)
+
+
+# Mapa de la sesión actual (aislado por hilo y por tarea asíncrona)
+_mapa_actual: ContextVar[Optional[IdentityMap]] = ContextVar("mapa_identidad", default=None)
+
+
+@contextmanager
+def sesion_identidad() -> Iterator[IdentityMap]:
+    """
+    Abre un alcance con mapa de identidad; se vacía al salir.
+
+    Si ya hay una sesión activa se reutiliza, por lo que los alcances
+    anidados comparten el mismo mapa.
+
+    Yields:
+        El mapa de identidad de la sesión
+    """
+    mapa = _mapa_actual.get()
+    if mapa is not None:
+        yield mapa
+        return
+
+    mapa = IdentityMap()
+    token = _mapa_actual.set(mapa)
+    try:
+        yield mapa
+    finally:
+        mapa.limpiar()
+        _mapa_actual.reset(token)
+
+
+def mapa_actual() -> Optional[IdentityMap]:
+    """
+    Obtiene el mapa de identidad de la sesión activa.
+
+    Returns:
+        El mapa activo o None si no hay sesión
+    """
+    return _mapa_actual.get()
+
+
+def buscar(tipo: type, id: Hashable) -> Optional[Any]:
+    """
+    Busca una entidad en el mapa de la sesión activa.
+
+    Args:
+        tipo: Clase de la entidad
+        id: Identificador de la entidad
+
+    Returns:
+        La entidad registrada o None (también si no hay sesión)
+    """
+    mapa = _mapa_actual.get()
+    return mapa.obtener(tipo, id) if mapa is not None else None
+
+
+def hidratar(tipo: type, id: Hashable, fabrica: Callable[[], T]) -> T:
+    """
+    Construye una entidad reutilizando la instancia de la sesión si existe.
+
+    Sin sesión activa se comporta como una llamada directa a la fábrica.
+
+    Args:
+        tipo: Clase de la entidad
+        id: Identificador de la entidad
+        fabrica: Función que construye la entidad
+
+    Returns:
+        Instancia canónica de la entidad
+    """
+    mapa = _mapa_actual.get()
+    if mapa is None:
+        return fabrica()
+    return mapa.obtener_o_registrar(tipo, id, fabrica)
+
+
+def registrar(tipo: type, id: Hashable, entidad: Any) -> None:
+    """
+    Registra en la sesión activa la instancia que se acaba de guardar.
+
+    Tras un UPDATE hecho desde la entidad en memoria, esa instancia ya
+    refleja la fila: se conserva (o pasa a ser) la canónica de la sesión.
+
+    Args:
+        tipo: Clase de la entidad
+        id: Identificador de la entidad
+        entidad: Instancia guardada
+    """
+    mapa = _mapa_actual.get()
+    if mapa is not None:
+        mapa.registrar(tipo, id, entidad)
+
+
+def olvidar(tipo: type, id: Hashable) -> None:
+    """
+    Quita una entidad del mapa de la sesión activa, si la hay.
+
+    Args:
+        tipo: Clase de la entidad
+        id: Identificador de la entidad
+    """
+    mapa = _mapa_actual.get()
+    if mapa is not None:
+        mapa.olvidar(tipo, id)
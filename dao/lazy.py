@@ -0,0 +1,163 @@
+"""Referencias perezosas a entidades relacionadas, cargadas por lotes."""
+
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class CargadorLote:
+    """
+    Agrupa los ids pendientes de una relación y los carga juntos.
+
+    Todas las referencias creadas por un mismo cargador (p. ej. los
+    tipos de dispositivo de un listado) se resuelven con una sola
+    consulta la primera vez que se accede a cualquiera de ellas.
+    """
+
+    def __init__(self, cargar: Callable[[List[Hashable]], Dict[Hashable, Any]]):
+        """
+        Inicializa el cargador.
+
+        Args:
+            cargar: Función que recibe una lista de ids y devuelve {id: entidad}
+        """
+        self.__cargar = cargar
+        self.__pendientes: Dict[Hashable, None] = {}
+        self.__cargados: Dict[Hashable, Any] = {}
+
+    def referencia(self, id: Hashable, atributo_id: str = 'id') -> 'LazyRef':
+        """
+        Crea una referencia perezosa y registra su id como pendiente.
+
+        Args:
+            id: Identificador de la entidad
+            atributo_id: Nombre del atributo identificador (ej: 'email')
+
+        Returns:
+            Referencia sin cargar
+        """
+        if id not in self.__cargados:
+            self.__pendientes[id] = None
+        return LazyRef(id, self, atributo_id)
+
+    def resolver(self, id: Hashable) -> Optional[Any]:
+        """
+        Obtiene la entidad, cargando en lote todos los ids pendientes.
+
+        Args:
+            id: Identificador de la entidad
+
+        Returns:
+            La entidad cargada o None si no existe en la base de datos
+        """
+        if id not in self.__cargados:
+            self.__pendientes[id] = None
+            ids = list(self.__pendientes)
+            self.__pendientes.clear()
+            encontrados = self.__cargar(ids)
+            for pendiente in ids:
+                self.__cargados[pendiente] = encontrados.get(pendiente)
+        return self.__cargados[id]
+
+
+class LazyRef:
+    """
+    Proxy de una entidad relacionada que se carga al primer acceso.
+
+    El identificador está disponible sin cargar la entidad; cualquier
+    otro atributo dispara la carga en lote a través del cargador.
+
+    Si la entidad no existe (p. ej. el dispositivo de un evento ya fue
+    borrado) la referencia se resuelve a None: es falsa, igual a None y
+    sus atributos fallan con AttributeError, como si la relación fuera None.
+    """
+
+    __slots__ = ('_id', '_cargador', '_atributo_id', '_objetivo')
+
+    def __init__(self, id: Hashable, cargador: CargadorLote, atributo_id: str = 'id'):
+        """
+        Inicializa la referencia.
+
+        Args:
+            id: Identificador de la entidad
+            cargador: Cargador que resuelve la entidad
+            atributo_id: Nombre del atributo identificador
+        """
+        object.__setattr__(self, '_id', id)
+        object.__setattr__(self, '_cargador', cargador)
+        object.__setattr__(self, '_atributo_id', atributo_id)
+        object.__setattr__(self, '_objetivo', None)
+
+    def _resolver(self) -> Any:
+        """
+        Carga (una sola vez) y devuelve la entidad real.
+
+        Returns:
+            La entidad, o None si la entidad referenciada no existe
+        """
+        if self._objetivo is None:
+            object.__setattr__(self, '_objetivo', self._cargador.resolver(self._id))
+        return self._objetivo
+
+    def __objetivo_o_error(self, nombre: str) -> Any:
+        """Entidad real, o AttributeError (como con None) si no existe."""
+        objetivo = self._resolver()
+        if objetivo is None:
+            raise AttributeError(
+                f"La entidad referenciada no existe ({self._atributo_id}={self._id!r}): "
+                f"sin atributo '{nombre}'"
+            )
+        return objetivo
+
+    def __bool__(self) -> bool:
+        # Una referencia colgante (p. ej. evento de un dispositivo borrado) es falsa
+        return self._resolver() is not None
+
+    def __getattr__(self, nombre: str) -> Any:
+        if nombre == self._atributo_id:
+            return self._id
+        return getattr(self.__objetivo_o_error(nombre), nombre)
+
+    def __setattr__(self, nombre: str, valor: Any) -> None:
+        setattr(self.__objetivo_o_error(nombre), nombre, valor)
+
+    def __eq__(self, otro: object) -> bool:
+        return self._resolver() == resolver(otro)
+
+    def __hash__(self) -> int:
+        return hash(self._resolver())
+
+    def __str__(self) -> str:
+        return str(self._resolver())
+
+    def __repr__(self) -> str:
+        if self._objetivo is None:
+            return f"<LazyRef {self._atributo_id}={self._id!r}>"
+        return repr(self._objetivo)
+
+
+def esta_cargado(entidad: Any) -> bool:
+    """
+    Indica si una entidad ya está disponible sin acceder a la base de datos.
+
+    Args:
+        entidad: Entidad o referencia perezosa
+
+    Returns:
+        False solo para referencias perezosas aún no cargadas
+    """
+    return not isinstance(entidad, LazyRef) or entidad._objetivo is not None
+
+
+def resolver(entidad: Any) -> Any:
+    """
+    Obtiene la entidad real detrás de una referencia perezosa.
+
+    Args:
+        entidad: Entidad o referencia perezosa
+
+    Returns:
+        La entidad cargada, None si la referencia es colgante (o el mismo
+        objeto si no es una referencia)
+    """
+    if isinstance(entidad, LazyRef):
+        return entidad._resolver()
+    return entidad
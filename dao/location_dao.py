@@ -1,10 +1,11 @@
 """Implementación DAO para la entidad Location."""
 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from mysql.connector import Error
 from interfaces.i_dao import IDao
 from dominio.location import Location
 from conn.db_connection import DatabaseConnection
+from dao.identity_map import buscar, hidratar, olvidar, registrar
 from dao.home_dao import HomeDAO
 
 
@@ -35,6 +36,7 @@ class LocationDAO(IDao[Location]):
             cursor.execute(query, (entidad.name, entidad.id))
             self.db.commit()
             affected = cursor.rowcount > 0
+            registrar(Location, entidad.id, entidad)
             cursor.close()
             return affected
         except Error as e:
@@ -49,6 +51,7 @@ class LocationDAO(IDao[Location]):
             cursor.execute(query, (id,))
             self.db.commit()
             affected = cursor.rowcount > 0
+            olvidar(Location, id)
             cursor.close()
             return affected
         except Error as e:
@@ -57,6 +60,10 @@ class LocationDAO(IDao[Location]):
             return False
     
     def obtener_por_id(self, id: int) -> Optional[Location]:
+        existente = buscar(Location, id)
+        if existente is not None:
+            return existente
+        
         try:
             cursor = self.db.get_cursor()
             query = "SELECT id, name FROM location WHERE id = %s"
@@ -69,7 +76,11 @@ class LocationDAO(IDao[Location]):
                 # En producción, se debería obtener el home real
                 from dominio.home import Home
                 home = Home(0, "Default")
-                return Location(row['id'], row['name'], home)
+                return hidratar(
+                    Location,
+                    row['id'],
+                    lambda: Location(row['id'], row['name'], home)
+                )
             return None
         except Error as e:
             print(f"Error al obtener ubicación: {e}")
@@ -85,7 +96,50 @@ class LocationDAO(IDao[Location]):
             
             from dominio.home import Home
             home = Home(0, "Default")
-            return [Location(row['id'], row['name'], home) for row in rows]
+            return [
+                hidratar(
+                    Location,
+                    row['id'],
+                    lambda: Location(row['id'], row['name'], home)
+                )
+                for row in rows
+            ]
         except Error as e:
             print(f"Error al obtener ubicaciones: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    def obtener_por_ids(self, ids: Iterable[int]) -> Dict[int, Location]:
+        """
+        Obtiene varias ubicaciones en una sola consulta.
+        
+        Args:
+            ids: IDs de las ubicaciones
+            
+        Returns:
+            Diccionario {id: ubicación} con las ubicaciones encontradas
+        """
+        ubicaciones = {id: buscar(Location, id) for id in set(ids)}
+        faltantes = [id for id, ubicacion in ubicaciones.items() if ubicacion is None]
+        ubicaciones = {id: ubicacion for id, ubicacion in ubicaciones.items() if ubicacion is not None}
+        if not faltantes:
+            return ubicaciones
+        
+        try:
+            cursor = self.db.get_cursor()
+            query = f"SELECT id, name FROM location WHERE id IN ({', '.join(['%s'] * len(faltantes))})"
+            cursor.execute(query, tuple(faltantes))
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            from dominio.home import Home
+            home = Home(0, "Default")
+            for row in rows:
+                ubicaciones[row['id']] = hidratar(
+                    Location,
+                    row['id'],
+                    lambda: Location(row['id'], row['name'], home)
+                )
+            return ubicaciones
+        except Error as e:
+            print(f"Error al obtener ubicaciones: {e}")
+            return ubicaciones
\ No newline at end of file
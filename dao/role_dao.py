@@ -5,6 +5,8 @@ from mysql.connector import Error
 from interfaces.i_dao import IDao
 from dominio.role import Role
 from conn.db_connection import DatabaseConnection
+from dao.identity_map import buscar, hidratar, olvidar, registrar
+from dao.flyweight import descartar, internar
 
 
 class RoleDAO(IDao[Role]):
@@ -35,6 +37,8 @@ class RoleDAO(IDao[Role]):
             query = "UPDATE role SET name = %s WHERE id = %s"
             cursor.execute(query, (entidad.name, entidad.id))
             self.db.commit()
+            registrar(Role, entidad.id, entidad)
+            descartar(Role, entidad.id)
             cursor.close()
             return cursor.rowcount > 0
         except Error as e:
@@ -49,6 +53,8 @@ class RoleDAO(IDao[Role]):
             query = "DELETE FROM role WHERE id = %s"
             cursor.execute(query, (id,))
             self.db.commit()
+            olvidar(Role, id)
+            descartar(Role, id)
             cursor.close()
             return cursor.rowcount > 0
         except Error as e:
@@ -58,6 +64,10 @@ class RoleDAO(IDao[Role]):
     
     def obtener_por_id(self, id: int) -> Optional[Role]:
         """Obtiene un rol por ID."""
+        existente = buscar(Role, id)
+        if existente is not None:
+            return existente
+        
         try:
             cursor = self.db.get_cursor()
             query = "SELECT id, name FROM role WHERE id = %s"
@@ -66,7 +76,7 @@ class RoleDAO(IDao[Role]):
             cursor.close()
             
             if row:
-                return Role(row['id'], row['name'])
+                return hidratar(Role, row['id'], lambda: internar(Role(row['id'], row['name'])))
             return None
         except Error as e:
             print(f"Error al obtener rol: {e}")
@@ -81,7 +91,10 @@ class RoleDAO(IDao[Role]):
             rows = cursor.fetchall()
             cursor.close()
             
-            return [Role(row['id'], row['name']) for row in rows]
+            return [
+                hidratar(Role, row['id'], lambda: internar(Role(row['id'], row['name'])))
+                for row in rows
+            ]
         except Error as e:
             print(f"Error al obtener roles: {e}")
             return []
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""Implementación DAO para las próximas ejecuciones del planificador."""
+
+from datetime import datetime
+from typing import Dict, Optional
+from mysql.connector import Error
+from conn.db_connection import DatabaseConnection
+
+
+class ScheduledJobDAO:
+    """
+    Data Access Object para la tabla scheduled_job.
+
+    Guarda la próxima ejecución de cada tarea con nombre, para que el
+    planificador recupere las ejecuciones perdidas tras un reinicio.
+    """
+
+    def __init__(self):
+        """Inicializa el DAO con la conexión a BD."""
+        self.db = DatabaseConnection()
+
+    def obtener_proximas(self) -> Optional[Dict[str, datetime]]:
+        """
+        Obtiene la próxima ejecución registrada de todas las tareas.
+
+        Returns:
+            Diccionario {nombre: próxima ejecución}, o None si hubo un error
+        """
+        try:
+            cursor = self.db.get_cursor()
+            cursor.execute("SELECT name, next_fire_at FROM scheduled_job")
+            rows = cursor.fetchall()
+            cursor.close()
+            return {row['name']: row['next_fire_at'] for row in rows}
+        except Error as e:
+            print(f"Error al obtener tareas programadas: {e}")
+            return None
+
+    def guardar(self, nombre: str, proxima: datetime) -> bool:
+        """
+        Registra (o actualiza) la próxima ejecución de una tarea.
+
+        Args:
+            nombre: Nombre de la tarea
+            proxima: Próxima ejecución
+
+        Returns:
+            True si se guardó correctamente
+        """
+        try:
+            cursor = self.db.get_cursor()
+            query = """
+                INSERT INTO scheduled_job (name, next_fire_at) VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE next_fire_at = VALUES(next_fire_at)
+            """
+            cursor.execute(query, (nombre, proxima))
+            self.db.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"Error al guardar tarea programada: {e}")
+            self.db.rollback()
+            return False
+
+    def eliminar(self, nombre: str) -> bool:
+        """
+        Elimina el registro de una tarea (ej: una tarea única ya ejecutada).
+
+        Args:
+            nombre: Nombre de la tarea
+
+        Returns:
+            True si se eliminó correctamente
+        """
+        try:
+            cursor = self.db.get_cursor()
+            cursor.execute("DELETE FROM scheduled_job WHERE name = %s", (nombre,))
+            self.db.commit()
+            affected = cursor.rowcount > 0
+            cursor.close()
+            return affected
+        except Error as e:
+            print(f"Error al eliminar tarea programada: {e}")
+            self.db.rollback()
+            return False
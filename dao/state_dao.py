@@ -5,6 +5,8 @@ from mysql.connector import Error
 from interfaces.i_dao import IDao
 from dominio.state import State
 from conn.db_connection import DatabaseConnection
+from dao.identity_map import buscar, hidratar, olvidar, registrar
+from dao.flyweight import descartar, internar
 
 
 class StateDAO(IDao[State]):
@@ -36,6 +38,8 @@ class StateDAO(IDao[State]):
             cursor.execute(query, (entidad.name, entidad.id))
             self.db.commit()
             affected = cursor.rowcount > 0
+            registrar(State, entidad.id, entidad)
+            descartar(State, entidad.id)
             cursor.close()
             return affected
         except Error as e:
@@ -51,6 +55,8 @@ class StateDAO(IDao[State]):
             cursor.execute(query, (id,))
             self.db.commit()
             affected = cursor.rowcount > 0
+            olvidar(State, id)
+            descartar(State, id)
             cursor.close()
             return affected
         except Error as e:
@@ -60,6 +66,10 @@ class StateDAO(IDao[State]):
     
     def obtener_por_id(self, id: int) -> Optional[State]:
         """Obtiene un estado por ID."""
+        existente = buscar(State, id)
+        if existente is not None:
+            return existente
+        
         try:
             cursor = self.db.get_cursor()
             query = "SELECT id, name FROM state WHERE id = %s"
@@ -68,7 +78,7 @@ class StateDAO(IDao[State]):
             cursor.close()
             
             if row:
-                return State(row['id'], row['name'])
+                return hidratar(State, row['id'], lambda: internar(State(row['id'], row['name'])))
             return None
         except Error as e:
             print(f"Error al obtener estado: {e}")
@@ -83,7 +93,10 @@ class StateDAO(IDao[State]):
             rows = cursor.fetchall()
             cursor.close()
             
-            return [State(row['id'], row['name']) for row in rows]
+            return [
+                hidratar(State, row['id'], lambda: internar(State(row['id'], row['name'])))
+                for row in rows
+            ]
         except Error as e:
             print(f"Error al obtener estados: {e}")
             return []
\ No newline at end of file
@@ -0,0 +1,218 @@
+"""Implementación DAO para las lecturas de telemetría y sus niveles reducidos."""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from mysql.connector import Error
+from conn.db_connection import DatabaseConnection
+
+# (device_id, metric, ts, value)
+Muestra = Tuple[int, str, datetime, float]
+
+
+def normalizar_ts(instante: datetime) -> datetime:
+    """
+    Trunca un instante a milisegundos, la precisión de telemetry.ts (DATETIME(3)).
+
+    Así una lectura en memoria y la misma lectura leída de la BD tienen
+    la misma clave.
+
+    Args:
+        instante: Momento de la lectura
+
+    Returns:
+        Instante sin los microsegundos sobrantes
+    """
+    return instante.replace(microsecond=instante.microsecond // 1000 * 1000)
+
+
+def inicio_bucket(instante: datetime, segundos: int) -> datetime:
+    """
+    Inicio del bucket de una granularidad que contiene un instante.
+
+    Args:
+        instante: Momento de la lectura
+        segundos: Duración del bucket (60 o 3600)
+
+    Returns:
+        Instante truncado al bucket
+    """
+    if segundos == 3600:
+        return instante.replace(minute=0, second=0, microsecond=0)
+    return instante.replace(second=0, microsecond=0)
+
+
+class TelemetryDAO:
+    """
+    Data Access Object para las tablas telemetry y telemetry_rollup_*.
+
+    Las lecturas se insertan por lotes; una lectura repetida (mismo
+    dispositivo, métrica e instante) reemplaza el valor anterior. Los
+    agregados de los buckets que recibieron lecturas se recalculan en la
+    misma transacción desde el nivel anterior (minuto desde telemetry,
+    hora desde los minutos), de modo que siempre coinciden con las
+    lecturas guardadas aunque un bucket se escriba varias veces.
+    """
+
+    # Granularidad -> (tabla, segundos por bucket)
+    GRANULARIDADES = {
+        'minuto': ('telemetry_rollup_minute', 60),
+        'hora': ('telemetry_rollup_hour', 3600),
+    }
+
+    # Granularidad -> (tabla de origen, columna de fecha, agregados) para recalcular
+    # los buckets; el origen se lee con el alias "o"
+    ORIGENES = {
+        'minuto': ('telemetry', 'ts', 'COUNT(*), MIN(o.value), MAX(o.value), SUM(o.value)'),
+        'hora': (
+            'telemetry_rollup_minute', 'bucket',
+            'SUM(o.sample_count), MIN(o.min_value), MAX(o.max_value), SUM(o.sum_value)',
+        ),
+    }
+
+    def __init__(self):
+        """Inicializa el DAO con la conexión a BD."""
+        self.db = DatabaseConnection()
+
+    def guardar(self, muestras: Sequence[Muestra]) -> bool:
+        """
+        Guarda un lote de lecturas y recalcula sus agregados en una sola transacción.
+
+        Args:
+            muestras: Lecturas (device_id, metric, ts, value)
+
+        Returns:
+            True si se guardó correctamente
+        """
+        try:
+            cursor = self.db.get_cursor()
+            if muestras:
+                query = """
+                    INSERT INTO telemetry (device_id, metric, ts, value)
+                    VALUES (%s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE value = VALUES(value)
+                """
+                cursor.executemany(query, list(muestras))
+
+            for granularidad, (_, segundos) in self.GRANULARIDADES.items():
+                buckets = sorted({
+                    (device_id, metric, inicio_bucket(ts, segundos))
+                    for device_id, metric, ts, _ in muestras
+                })
+                if buckets:
+                    self.__recalcular(cursor, granularidad, buckets)
+
+            self.db.commit()
+            cursor.close()
+            return True
+        except Error as e:
+            print(f"Error al guardar telemetría: {e}")
+            self.db.rollback()
+            return False
+
+    def __recalcular(
+        self, cursor, granularidad: str, buckets: List[Tuple[int, str, datetime]]
+    ) -> None:
+        """
+        Recalcula los buckets afectados de una granularidad con una sola sentencia.
+
+        Los buckets se pasan como tabla derivada y se cruzan con el nivel
+        de origen, de modo que el costo no crece en idas y vueltas a la BD
+        con la cantidad de buckets del lote.
+
+        Args:
+            cursor: Cursor de la transacción en curso
+            granularidad: 'minuto' o 'hora'
+            buckets: (device_id, metric, inicio del bucket) a recalcular
+        """
+        tabla, segundos = self.GRANULARIDADES[granularidad]
+        origen, columna, agregados = self.ORIGENES[granularidad]
+        fila = "SELECT %s AS device_id, %s AS metric, %s AS bucket, %s AS fin"
+        afectados = " UNION ALL ".join([fila] * len(buckets))
+        query = f"""
+            INSERT INTO {tabla}
+                (device_id, metric, bucket, sample_count, min_value, max_value, sum_value)
+            SELECT b.device_id, b.metric, b.bucket, {agregados}
+            FROM ({afectados}) AS b
+            INNER JOIN {origen} o
+                ON o.device_id = b.device_id AND o.metric = b.metric
+                AND o.{columna} >= b.bucket AND o.{columna} < b.fin
+            GROUP BY b.device_id, b.metric, b.bucket
+            ON DUPLICATE KEY UPDATE
+                sample_count = VALUES(sample_count),
+                min_value = VALUES(min_value),
+                max_value = VALUES(max_value),
+                sum_value = VALUES(sum_value)
+        """
+        params = []
+        for device_id, metric, bucket in buckets:
+            params.extend((device_id, metric, bucket, bucket + timedelta(seconds=segundos)))
+        cursor.execute(query, tuple(params))
+
+    def obtener_muestras(
+        self, device_id: int, metric: str, desde: datetime, hasta: datetime
+    ) -> Optional[List[Dict]]:
+        """
+        Obtiene las lecturas crudas de una métrica en un rango.
+
+        Args:
+            device_id: ID del dispositivo
+            metric: Nombre de la métrica
+            desde: Inicio del rango (inclusive)
+            hasta: Fin del rango (inclusive)
+
+        Returns:
+            Lista de diccionarios {ts, value} ordenada por ts, o None si hubo un error
+        """
+        try:
+            cursor = self.db.get_cursor()
+            query = """
+                SELECT ts, value FROM telemetry
+                WHERE device_id = %s AND metric = %s AND ts BETWEEN %s AND %s
+                ORDER BY ts
+            """
+            cursor.execute(query, (device_id, metric, desde, hasta))
+            rows = cursor.fetchall()
+            cursor.close()
+            return rows
+        except Error as e:
+            print(f"Error al obtener telemetría: {e}")
+            return None
+
+    def obtener_agregados(
+        self,
+        device_id: int,
+        metric: str,
+        desde: datetime,
+        hasta: datetime,
+        granularidad: str = 'hora'
+    ) -> Optional[List[Dict]]:
+        """
+        Obtiene los agregados de una métrica en un rango.
+
+        Args:
+            device_id: ID del dispositivo
+            metric: Nombre de la métrica
+            desde: Inicio del rango (inclusive)
+            hasta: Fin del rango (inclusive)
+            granularidad: 'minuto' o 'hora'
+
+        Returns:
+            Lista de diccionarios {bucket, sample_count, min_value, max_value,
+            sum_value} ordenada por bucket, o None si hubo un error
+        """
+        tabla = self.GRANULARIDADES[granularidad][0]
+        try:
+            cursor = self.db.get_cursor()
+            query = f"""
+                SELECT bucket, sample_count, min_value, max_value, sum_value
+                FROM {tabla}
+                WHERE device_id = %s AND metric = %s AND bucket BETWEEN %s AND %s
+                ORDER BY bucket
+            """
+            cursor.execute(query, (device_id, metric, desde, hasta))
+            rows = cursor.fetchall()
+            cursor.close()
+            return rows
+        except Error as e:
+            print(f"Error al obtener agregados de telemetría: {e}")
+            return None
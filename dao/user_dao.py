@@ -1,11 +1,18 @@
 """Implementación DAO para la entidad User."""
 
-from typing import List, Optional
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Optional
 from mysql.connector import Error
 from interfaces.i_user_dao import IUserDao
 from dominio.user import User
 from conn.db_connection import DatabaseConnection
 from dao.role_dao import RoleDAO
+from dao.identity_map import buscar, hidratar, olvidar, registrar
+from utils.logger import get_auth_logger
+from utils.passwords import PasswordHasher, es_hash, hash_ficticio, hashear
+
+# Logger de autenticación
+logger = get_auth_logger()
 
 
 class UserDAO(IUserDao):
@@ -15,10 +22,21 @@ class UserDAO(IUserDao):
         """Inicializa el DAO con la conexión a BD."""
         self.db = DatabaseConnection()
         self.role_dao = RoleDAO()
+        self.hasher = PasswordHasher()
+    
+    def _hashear(self, password: str) -> str:
+        """
+        Hashea (en el pool) una contraseña ingresada.
+
+        Todo lo que llega de un usuario se hashea, aunque parezca un hash:
+        los hashes ya calculados sólo se guardan con guardar_hash().
+        """
+        return self.hasher.hashear(password).result()
     
     def insertar(self, entidad: User) -> bool:
-        """Inserta un nuevo usuario."""
+        """Inserta un nuevo usuario (la contraseña se guarda hasheada)."""
         try:
+            password = self._hashear(entidad.password)
             cursor = self.db.get_cursor()
             query = """
                 INSERT INTO user (email, password, name, role_id) 
@@ -26,7 +44,7 @@ class UserDAO(IUserDao):
             """
             cursor.execute(query, (
                 entidad.email,
-                entidad.password,
+                password,
                 entidad.name,
                 entidad.role.id
             ))
@@ -39,22 +57,25 @@ class UserDAO(IUserDao):
             return False
     
     def modificar(self, entidad: User) -> bool:
-        """Modifica un usuario existente."""
+        """
+        Modifica un usuario existente.
+
+        La contraseña sólo se escribe (hasheada) si se cambió con
+        change_password(); la cargada de la BD ya es el valor guardado.
+        """
         try:
+            if 'password' in entidad.get_dirty_fields():
+                query = "UPDATE user SET password = %s, name = %s, role_id = %s WHERE email = %s"
+                valores = (self._hashear(entidad.password), entidad.name, entidad.role.id, entidad.email)
+            else:
+                query = "UPDATE user SET name = %s, role_id = %s WHERE email = %s"
+                valores = (entidad.name, entidad.role.id, entidad.email)
             cursor = self.db.get_cursor()
-            query = """
-                UPDATE user 
-                SET password = %s, name = %s, role_id = %s 
-                WHERE email = %s
-            """
-            cursor.execute(query, (
-                entidad.password,
-                entidad.name,
-                entidad.role.id,
-                entidad.email
-            ))
+            cursor.execute(query, valores)
             self.db.commit()
             affected = cursor.rowcount > 0
+            entidad.mark_clean()
+            registrar(User, entidad.email, entidad)
             cursor.close()
             return affected
         except Error as e:
@@ -63,13 +84,16 @@ class UserDAO(IUserDao):
             return False
     
     def eliminar(self, email: str) -> bool:
-        """Elimina un usuario por email."""
+        """Elimina un usuario por email (sus eventos quedan sin usuario)."""
         try:
             cursor = self.db.get_cursor()
+            # event no tiene FK (tabla particionada): equivale a ON DELETE SET NULL
+            cursor.execute("UPDATE event SET user_email = NULL WHERE user_email = %s", (email,))
             query = "DELETE FROM user WHERE email = %s"
             cursor.execute(query, (email,))
             self.db.commit()
             affected = cursor.rowcount > 0
+            olvidar(User, email)
             cursor.close()
             return affected
         except Error as e:
@@ -83,6 +107,10 @@ class UserDAO(IUserDao):
     
     def obtener_por_email(self, email: str) -> Optional[User]:
         """Obtiene un usuario por su email."""
+        existente = buscar(User, email)
+        if existente is not None:
+            return existente
+        
         try:
             cursor = self.db.get_cursor()
             query = """
@@ -97,12 +125,12 @@ class UserDAO(IUserDao):
             if row:
                 role = self.role_dao.obtener_por_id(row['role_id'])
                 if role:
-                    return User(
+                    return hidratar(User, row['email'], lambda: User(
                         row['email'],
                         row['password'],
                         row['name'],
                         role
-                    )
+                    ))
             return None
         except Error as e:
             print(f"Error al obtener usuario: {e}")
@@ -121,17 +149,57 @@ class UserDAO(IUserDao):
             for row in rows:
                 role = self.role_dao.obtener_por_id(row['role_id'])
                 if role:
-                    usuarios.append(User(
+                    usuarios.append(hidratar(User, row['email'], lambda: User(
                         row['email'],
                         row['password'],
                         row['name'],
                         role
-                    ))
+                    )))
             return usuarios
         except Error as e:
             print(f"Error al obtener usuarios: {e}")
             return []
     
+    def obtener_por_emails(self, emails: Iterable[str]) -> Dict[str, User]:
+        """
+        Obtiene varios usuarios en una sola consulta.
+        
+        Args:
+            emails: Emails de los usuarios
+            
+        Returns:
+            Diccionario {email: usuario} con los usuarios encontrados
+        """
+        usuarios = {email: buscar(User, email) for email in set(emails)}
+        faltantes = [email for email, user in usuarios.items() if user is None]
+        usuarios = {email: user for email, user in usuarios.items() if user is not None}
+        if not faltantes:
+            return usuarios
+        
+        try:
+            cursor = self.db.get_cursor()
+            query = f"""
+                SELECT email, password, name, role_id FROM user
+                WHERE email IN ({', '.join(['%s'] * len(faltantes))})
+            """
+            cursor.execute(query, tuple(faltantes))
+            rows = cursor.fetchall()
+            cursor.close()
+            
+            for row in rows:
+                role = self.role_dao.obtener_por_id(row['role_id'])
+                if role:
+                    usuarios[row['email']] = hidratar(User, row['email'], lambda: User(
+                        row['email'],
+                        row['password'],
+                        row['name'],
+                        role
+                    ))
+            return usuarios
+        except Error as e:
+            print(f"Error al obtener usuarios: {e}")
+            return usuarios
+    
     def cambiar_rol(self, email: str, nuevo_rol_id: int) -> bool:
         """Cambia el rol de un usuario."""
         try:
@@ -140,6 +208,7 @@ class UserDAO(IUserDao):
             cursor.execute(query, (nuevo_rol_id, email))
             self.db.commit()
             affected = cursor.rowcount > 0
+            olvidar(User, email)
             cursor.close()
             return affected
         except Error as e:
@@ -147,9 +216,111 @@ class UserDAO(IUserDao):
             self.db.rollback()
             return False
     
+    def actualizar_password(self, email: str, password: str) -> bool:
+        """Guarda la contraseña ingresada por un usuario (siempre se hashea)."""
+        try:
+            password = self._hashear(password)
+        except Exception as e:
+            print(f"Error al hashear contraseña: {e}")
+            return False
+        return self.__escribir_password(email, password)
+    
+    def guardar_hash(self, email: str, hash_password: str) -> bool:
+        """
+        Guarda un hash ya calculado (migración y rehash de contraseñas heredadas).
+        
+        Args:
+            email: Email del usuario
+            hash_password: Hash en formato scrypt$...
+            
+        Returns:
+            True si se actualizó el usuario
+            
+        Raises:
+            ValueError: Si el valor no es un hash
+        """
+        if not es_hash(hash_password):
+            raise ValueError("guardar_hash sólo acepta contraseñas ya hasheadas")
+        return self.__escribir_password(email, hash_password)
+    
+    def __escribir_password(self, email: str, password: str) -> bool:
+        """Escribe el valor final de la columna password."""
+        try:
+            cursor = self.db.get_cursor()
+            query = "UPDATE user SET password = %s WHERE email = %s"
+            cursor.execute(query, (password, email))
+            self.db.commit()
+            affected = cursor.rowcount > 0
+            olvidar(User, email)
+            cursor.close()
+            return affected
+        except Error as e:
+            print(f"Error al actualizar contraseña: {e}")
+            self.db.rollback()
+            return False
+    
     def validar_credenciales(self, email: str, password: str) -> Optional[User]:
-        """Valida las credenciales de un usuario."""
+        """Valida las credenciales de un usuario (bloquea hasta verificar el hash)."""
+        return self.validar_credenciales_futuro(email, password).result()
+    
+    def validar_credenciales_futuro(self, email: str, password: str) -> "Future[Optional[User]]":
+        """
+        Valida las credenciales sin bloquear durante la verificación del hash.
+        
+        El usuario se lee en el hilo llamador; la verificación corre en el
+        pool de PasswordHasher. Si el email no existe se verifica igual
+        contra un hash ficticio, para que el tiempo de respuesta no revele
+        qué emails están registrados. Si la contraseña guardada todavía
+        está en texto plano (heredada) y es correcta, se reemplaza por su
+        hash (también en el usuario devuelto).
+        
+        Args:
+            email: Email ingresado
+            password: Contraseña ingresada
+            
+        Returns:
+            Future con el usuario, o None si las credenciales no son válidas
+        """
+        resultado: "Future[Optional[User]]" = Future()
         user = self.obtener_por_email(email)
-        if user and user.validate_credentials(email, password):
-            return user
+        if not user or user.email != email:
+            user = None
+            almacenado = hash_ficticio()
+        else:
+            almacenado = user.password
+        
+        def verificado(futuro: "Future[bool]") -> None:
+            try:
+                valido = futuro.result() and user is not None
+            except Exception as e:
+                resultado.set_exception(e)
+                return
+            if valido and not es_hash(almacenado):
+                hash_password = self.__rehashear(email, password)
+                if hash_password is not None:
+                    user._assign_password_hash(hash_password)
+            resultado.set_result(user if valido else None)
+        
+        self.hasher.verificar(password, almacenado).add_done_callback(verificado)
+        return resultado
+    
+    def __rehashear(self, email: str, password: str) -> Optional[str]:
+        """
+        Reemplaza una contraseña heredada en texto plano por su hash.
+        
+        Corre en un hilo del pool de contraseñas, con su propia conexión;
+        si falla, el inicio de sesión sigue siendo válido y se reintenta
+        en el próximo.
+        
+        Returns:
+            Hash guardado, o None si no se pudo guardar
+        """
+        try:
+            hash_password = hashear(password)
+            with DatabaseConnection().unidad_de_trabajo():
+                if self.guardar_hash(email, hash_password):
+                    logger.info(f"Contraseña heredada de {email} migrada a hash")
+                    return hash_password
+        except Exception as e:
+            logger.error(f"No se pudo migrar la contraseña de {email}: {e}")
         return None
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Job de mantenimiento de la tabla event particionada por mes.
+
+Funcionalidades:
+- Pre-crear particiones para los próximos meses
+- Exportar particiones vencidas a archivos CSV comprimidos (gzip)
+- Eliminar particiones vencidas con DROP PARTITION
+- Actualizar incrementalmente los rollups de eventos por hora y por día
+
+Uso (programar diariamente, p. ej. con cron):
+    python database/event_maintenance.py --all
+    python database/event_maintenance.py --crear --adelantados 6
+    python database/event_maintenance.py --purgar --retencion 24 --archivo /var/smarthome/archive
+    python database/event_maintenance.py --rollup
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio padre al path para importar servicios y ui
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.event_retention_service import EventRetentionService
+from services.event_analytics_service import EventAnalyticsService
+from ui.rich_utils import print_success, print_error, print_warning, console
+
+
+def main():
+    """Función principal del script."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Mantenimiento de particiones de eventos SmartHome",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  python database/event_maintenance.py --all
+  python database/event_maintenance.py --crear --adelantados 6
+  python database/event_maintenance.py --purgar --retencion 24
+  python database/event_maintenance.py --rollup
+        """,
+    )
+
+    parser.add_argument("--crear", action="store_true", help="Pre-crear particiones futuras")
+    parser.add_argument("--purgar", action="store_true", help="Archivar y eliminar particiones vencidas")
+    parser.add_argument("--rollup", action="store_true", help="Actualizar rollups de eventos")
+    parser.add_argument("--all", action="store_true", help="Ejecutar todo (crear + rollup + purgar)")
+    parser.add_argument("--adelantados", type=int, default=3, help="Meses futuros a pre-crear (default: 3)")
+    parser.add_argument("--retencion", type=int, default=12, help="Meses a conservar en la BD (default: 12)")
+    parser.add_argument("--archivo", type=Path, default=None, help="Directorio de archivos históricos")
+
+    args = parser.parse_args()
+
+    # Si no se pasa ninguna acción, mostrar ayuda
+    if not (args.crear or args.purgar or args.rollup or args.all):
+        parser.print_help()
+        return
+
+    if args.all:
+        args.crear = args.purgar = args.rollup = True
+
+    service = EventRetentionService(
+        meses_adelantados=args.adelantados,
+        meses_retencion=args.retencion,
+        directorio_archivo=args.archivo,
+    )
+
+    if args.crear:
+        creadas = service.crear_particiones_futuras()
+        if creadas:
+            print_success(f"Particiones creadas: {', '.join(creadas)}")
+        else:
+            print_warning("No hay particiones nuevas para crear")
+
+    # Los rollups se actualizan antes de purgar para no perder eventos sin agregar
+    if args.rollup:
+        exito, mensaje = EventAnalyticsService().actualizar_rollups()
+        if exito:
+            print_success(f"Rollups actualizados: {mensaje}")
+        else:
+            print_error(mensaje)
+
+    if args.purgar:
+        eliminadas = service.purgar_particiones_vencidas()
+        if eliminadas:
+            print_success(
+                f"Particiones archivadas y eliminadas: {', '.join(eliminadas)} "
+                f"(archivo: {service.directorio_archivo})"
+            )
+        else:
+            print_warning("No hay particiones vencidas")
+
+    console.print()
+
+
+if __name__ == "__main__":
+    main()
@@ -94,26 +94,176 @@ CREATE TABLE automation (
 
 -- Tabla: device_automation
 -- Relación entre dispositivos y automatizaciones
+-- state_id: estado que la acción aplica al dispositivo (NULL si la acción no cambia el estado)
 CREATE TABLE device_automation (
     device_id INT NOT NULL,
     automation_id INT NOT NULL,
     action VARCHAR(50) NOT NULL,
+    state_id INT NULL,
     
     PRIMARY KEY (device_id, automation_id),
     FOREIGN KEY (device_id) REFERENCES device(id) ON DELETE CASCADE ON UPDATE CASCADE,
-    FOREIGN KEY (automation_id) REFERENCES automation(id) ON DELETE CASCADE ON UPDATE CASCADE
+    FOREIGN KEY (automation_id) REFERENCES automation(id) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (state_id) REFERENCES state(id) ON DELETE SET NULL ON UPDATE CASCADE
+);
+
+-- Tabla: automation_trigger
+-- Disparadores de las automatizaciones (motor de reglas, ver services/rule_engine.py)
+-- trigger_type:
+--   'device_state': device_id pasa a state_id (state_id NULL = cualquier estado)
+--   'event_source': evento con origen source (device_id NULL = cualquier dispositivo)
+--   'time': a la hora time_of_day (precisión de minutos)
+CREATE TABLE automation_trigger (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    automation_id INT NOT NULL,
+    trigger_type VARCHAR(20) NOT NULL,
+    device_id INT NULL,
+    state_id INT NULL,
+    source VARCHAR(50) NULL,
+    time_of_day TIME NULL,
+    
+    INDEX idx_trigger_automation (automation_id),
+    FOREIGN KEY (automation_id) REFERENCES automation(id) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (device_id) REFERENCES device(id) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (state_id) REFERENCES state(id) ON DELETE CASCADE ON UPDATE CASCADE
 );
 
 -- Tabla: event
 -- Log de eventos del sistema
+-- Particionada por mes sobre date_time_value: la retención se aplica con
+-- DROP PARTITION (ver database/event_maintenance.py) en lugar de DELETE masivo.
+-- MySQL no admite claves foráneas en tablas particionadas y exige que la
+-- columna de partición forme parte de la clave primaria.
+-- state_id: nuevo estado del dispositivo en los eventos de cambio de estado
+-- (NULL en el resto); son los deltas que se aplican sobre device_state_snapshot.
+-- El alta de un dispositivo registra su estado inicial y la baja state_id = 0.
+-- date_time_value guarda microsegundos (como taken_at de las instantáneas):
+-- un cambio del mismo segundo que una instantánea se ordena respecto de ella.
 CREATE TABLE event (
-    id INT AUTO_INCREMENT PRIMARY KEY,
-    date_time_value TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    id INT AUTO_INCREMENT,
+    date_time_value DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
     description TEXT NOT NULL,
     device_id INT,
     user_email VARCHAR(255),
     source VARCHAR(50) NOT NULL, 
-      
-    FOREIGN KEY (device_id) REFERENCES device(id) ON DELETE SET NULL ON UPDATE CASCADE,
-    FOREIGN KEY (user_email) REFERENCES user(email) ON DELETE SET NULL ON UPDATE CASCADE
+    state_id INT NULL,
+    
+    PRIMARY KEY (id, date_time_value),
+    INDEX idx_event_device (device_id, date_time_value),
+    INDEX idx_event_user (user_email, date_time_value),
+    INDEX idx_event_date (date_time_value)
+)
+PARTITION BY RANGE (TO_DAYS(date_time_value)) (
+    PARTITION p_futuro VALUES LESS THAN MAXVALUE
+);
+
+-- Tablas: event_rollup_hour / event_rollup_day
+-- Conteos agregados de eventos por (bucket, device_id, source) para analítica.
+-- device_id = 0 agrupa los eventos sin dispositivo asociado.
+CREATE TABLE event_rollup_hour (
+    bucket DATETIME NOT NULL,
+    device_id INT NOT NULL,
+    source VARCHAR(50) NOT NULL,
+    event_count INT NOT NULL DEFAULT 0,
+    
+    PRIMARY KEY (bucket, device_id, source),
+    INDEX idx_rollup_hour_device (device_id, bucket)
+);
+
+CREATE TABLE event_rollup_day (
+    bucket DATE NOT NULL,
+    device_id INT NOT NULL,
+    source VARCHAR(50) NOT NULL,
+    event_count INT NOT NULL DEFAULT 0,
+    
+    PRIMARY KEY (bucket, device_id, source),
+    INDEX idx_rollup_day_device (device_id, bucket)
+);
+
+-- Tabla: rollup_watermark
+-- Último event.id procesado por cada job incremental
+CREATE TABLE rollup_watermark (
+    name VARCHAR(50) PRIMARY KEY,
+    last_event_id INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- Tabla: scheduled_job
+-- Próxima ejecución de cada tarea del planificador (services/scheduler.py).
+-- Permite recuperar las ejecuciones perdidas mientras la aplicación estuvo detenida.
+CREATE TABLE scheduled_job (
+    name VARCHAR(100) PRIMARY KEY,
+    next_fire_at DATETIME NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- Tabla: device_state_snapshot
+-- Instantáneas periódicas del estado de todos los dispositivos.
+-- states: (device_id, home_id, state_id) empaquetados como uint32 little-endian
+-- (12 bytes por dispositivo). El estado en un instante T es la instantánea
+-- más reciente anterior a T más los eventos con state_id desde su taken_at
+-- (inclusive: los deltas son estados absolutos y reaplicarlos no cambia nada).
+CREATE TABLE device_state_snapshot (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    taken_at DATETIME(6) NOT NULL,
+    device_count INT NOT NULL,
+    states MEDIUMBLOB NOT NULL,
+    
+    INDEX idx_snapshot_taken_at (taken_at)
+);
+
+-- Tabla: telemetry
+-- Lecturas numéricas de sensores (temperatura, humedad, energía...).
+-- Solo se agregan filas (una lectura repetida reemplaza el valor); la clave
+-- primaria agrupa físicamente las lecturas de cada (device_id, metric) por
+-- fecha, así un rango es un recorrido secuencial.
+-- Sin clave foránea: las lecturas sobreviven al borrado del dispositivo.
+CREATE TABLE telemetry (
+    device_id INT NOT NULL,
+    metric VARCHAR(32) NOT NULL,
+    ts DATETIME(3) NOT NULL,
+    value DOUBLE NOT NULL,
+    
+    PRIMARY KEY (device_id, metric, ts)
+);
+
+-- Tablas: telemetry_rollup_minute / telemetry_rollup_hour
+-- Niveles de resolución reducida (min/max/promedio) de telemetry.
+-- avg = sum_value / sample_count; al re-escribir un bucket se recalcula desde el
+-- nivel anterior (minuto desde telemetry, hora desde telemetry_rollup_minute).
+CREATE TABLE telemetry_rollup_minute (
+    device_id INT NOT NULL,
+    metric VARCHAR(32) NOT NULL,
+    bucket DATETIME NOT NULL,
+    sample_count INT NOT NULL,
+    min_value DOUBLE NOT NULL,
+    max_value DOUBLE NOT NULL,
+    sum_value DOUBLE NOT NULL,
+    
+    PRIMARY KEY (device_id, metric, bucket)
+);
+
+CREATE TABLE telemetry_rollup_hour (
+    device_id INT NOT NULL,
+    metric VARCHAR(32) NOT NULL,
+    bucket DATETIME NOT NULL,
+    sample_count INT NOT NULL,
+    min_value DOUBLE NOT NULL,
+    max_value DOUBLE NOT NULL,
+    sum_value DOUBLE NOT NULL,
+    
+    PRIMARY KEY (device_id, metric, bucket)
+);
+
+-- Tabla: device_type_power
+-- Potencia estimada (W) de cada tipo de dispositivo en cada estado.
+-- Los pares (tipo, estado) sin fila se consideran sin consumo.
+CREATE TABLE device_type_power (
+    device_type_id INT NOT NULL,
+    state_id INT NOT NULL,
+    watts DECIMAL(8,2) NOT NULL,
+    
+    PRIMARY KEY (device_type_id, state_id),
+    FOREIGN KEY (device_type_id) REFERENCES device_type(id) ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (state_id) REFERENCES state(id) ON DELETE CASCADE ON UPDATE CASCADE
 );
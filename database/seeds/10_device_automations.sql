@@ -1,20 +1,20 @@
 -- =============================================================================================================
 -- SEED 10: DISPOSITIVOS-AUTOMATIZACIONES
 -- =============================================================================================================
--- Asociar dispositivos con automatizaciones
+-- Asociar dispositivos con automatizaciones (state_id: estado que aplica la acción)
 
-INSERT INTO device_automation (device_id, automation_id, action) VALUES 
-(1, 1, 'Apagar'),         -- Luz Sala Principal
-(2, 1, 'Modo nocturno'),  -- Termostato Central
-(5, 1, 'Activar'),        -- Sensor Movimiento Pasillo
-(1, 2, 'Encender'),       -- Luz Sala Principal
-(2, 2, 'Ajustar a 22°C'), -- Termostato Central
-(15, 3, 'Apagar'),        -- Enchufe Living (Depto Centro)
-(17, 4, 'Encender'),      -- Cámara Piscina (Casa Playa)
-(18, 4, 'Activar'),       -- Sensor Movimiento Jardín
-(16, 4, 'Activar'),       -- Luz Exterior Jardín
-(19, 5, 'Activar riego'), -- Válvula Riego Automático
-(21, 6, 'Encender'),      -- Luz Oficina 1
-(23, 6, 'Ajustar a 24°C'),-- Aire Acondicionado Central
-(8, 7, 'Alarma'),         -- Detector Humo Cocina
-(2, 8, 'Control automático'); -- Termostato Central
+INSERT INTO device_automation (device_id, automation_id, action, state_id) VALUES 
+(1, 1, 'Apagar', 2),                 -- Luz Sala Principal
+(2, 1, 'Modo nocturno', 8),          -- Termostato Central
+(5, 1, 'Activar', 1),                -- Sensor Movimiento Pasillo
+(1, 2, 'Encender', 1),               -- Luz Sala Principal
+(2, 2, 'Ajustar a 22°C', NULL),      -- Termostato Central
+(15, 3, 'Apagar', 2),                -- Enchufe Living (Depto Centro)
+(17, 4, 'Encender', 1),              -- Cámara Piscina (Casa Playa)
+(18, 4, 'Activar', 1),               -- Sensor Movimiento Jardín
+(16, 4, 'Activar', 1),               -- Luz Exterior Jardín
+(19, 5, 'Activar riego', 1),         -- Válvula Riego Automático
+(21, 6, 'Encender', 1),              -- Luz Oficina 1
+(23, 6, 'Ajustar a 24°C', NULL),     -- Aire Acondicionado Central
+(8, 7, 'Alarma', NULL),              -- Detector Humo Cocina
+(2, 8, 'Control automático', 9);     -- Termostato Central
@@ -0,0 +1,16 @@
+-- =============================================================================================================
+-- SEED 12: DISPARADORES DE AUTOMATIZACIONES
+-- =============================================================================================================
+-- Insertar disparadores de las automatizaciones
+
+INSERT INTO automation_trigger (automation_id, trigger_type, device_id, state_id, source, time_of_day) VALUES 
+(1, 'time', NULL, NULL, NULL, '23:00:00'),          -- Modo Noche
+(2, 'event_source', 5, NULL, 'sensor', NULL),       -- Bienvenida a Casa: movimiento en pasillo
+(2, 'device_state', 3, 1, NULL, NULL),              -- Bienvenida a Casa: cerradura de entrada abierta
+(3, 'device_state', 15, 3, NULL, NULL),             -- Ahorro Energético: enchufe en espera
+(4, 'time', NULL, NULL, NULL, '22:00:00'),          -- Seguridad Nocturna
+(5, 'time', NULL, NULL, NULL, '07:00:00'),          -- Riego Automático
+(6, 'time', NULL, NULL, NULL, '09:00:00'),          -- Modo Trabajo
+(7, 'event_source', 8, NULL, 'sensor', NULL),       -- Alarma Humo
+(8, 'device_state', 2, 7, NULL, NULL),              -- Control Temperatura: termostato en error
+(9, 'time', NULL, NULL, NULL, '07:30:00');          -- Apertura Matutina
@@ -0,0 +1,18 @@
+-- =============================================================================================================
+-- SEED 13: POTENCIA POR TIPO DE DISPOSITIVO Y ESTADO
+-- =============================================================================================================
+-- Insertar potencias estimadas (W) para el cálculo de consumo
+
+INSERT INTO device_type_power (device_type_id, state_id, watts) VALUES 
+(1, 1, 9.00), (1, 3, 0.50), (1, 5, 5.00), (1, 8, 3.00), (1, 9, 9.00),             -- Luz inteligente
+(2, 1, 3.00), (2, 3, 1.00), (2, 5, 2.00), (2, 9, 3.00),                           -- Termostato
+(3, 1, 0.50), (3, 2, 0.30), (3, 4, 0.30),                                         -- Cerradura
+(4, 1, 6.00), (4, 3, 2.00), (4, 8, 7.00), (4, 9, 6.00),                           -- Cámara
+(5, 1, 0.50), (5, 9, 0.50),                                                       -- Sensor de movimiento
+(6, 1, 150.00), (6, 3, 1.00), (6, 5, 60.00),                                      -- Enchufe inteligente
+(7, 1, 2.00), (7, 3, 0.50),                                                       -- Persiana motorizada
+(8, 1, 0.20),                                                                     -- Detector de humo
+(9, 1, 3.00), (9, 3, 1.00),                                                       -- Timbre
+(10, 1, 5.00), (10, 3, 2.00),                                                     -- Altavoz inteligente
+(11, 1, 1200.00), (11, 3, 5.00), (11, 5, 800.00), (11, 8, 600.00), (11, 9, 1000.00), -- Aire acondicionado
+(12, 1, 4.00), (12, 3, 0.50);                                                     -- Válvula de agua
@@ -9,6 +9,20 @@ from .location import Location
 from .home import Home
 from .automation import Automation
 from .event import Event
+from .tracked_entity import TrackedEntity
+from .summary import DeviceSummary, AutomationSummary, DeviceStatus
+from .messages import (
+    DeviceStateChanged,
+    DeviceCreated,
+    DeviceDeleted,
+    EventOccurred,
+    ClockTick,
+    AutomationChanged,
+    MembershipChanged,
+    SensorReading,
+    AnomalyDetected,
+)
+from .automation_rule import Trigger, AutomationAction, AutomationRule
 
 __all__ = [
     'User',
@@ -19,5 +33,21 @@ __all__ = [
     'Location',
     'Home',
     'Automation',
-    'Event'
+    'Event',
+    'TrackedEntity',
+    'DeviceSummary',
+    'AutomationSummary',
+    'DeviceStatus',
+    'DeviceStateChanged',
+    'DeviceCreated',
+    'DeviceDeleted',
+    'EventOccurred',
+    'ClockTick',
+    'AutomationChanged',
+    'MembershipChanged',
+    'SensorReading',
+    'AnomalyDetected',
+    'Trigger',
+    'AutomationAction',
+    'AutomationRule'
 ]
\ No newline at end of file
@@ -1,12 +1,13 @@
 """Módulo de dominio para la entidad Automation."""
 
 from typing import TYPE_CHECKING
+from .tracked_entity import TrackedEntity
 
 if TYPE_CHECKING:
     from .home import Home
 
 
-class Automation:
+class Automation(TrackedEntity):
     """
     Representa una automatización en el sistema SmartHome.
     
@@ -18,6 +19,8 @@ class Automation:
         home: Hogar al que pertenece
     """
     
+    __slots__ = ('__id', '__name', '__description', '__active', '__home')
+    
     def __init__(
         self,
         id: int,
@@ -36,6 +39,7 @@ class Automation:
             active: Si está activa o no
             home: Objeto Home al que pertenece
         """
+        super().__init__()
         self.__id = id
         self.__name = name
         self.__description = description
@@ -47,6 +51,15 @@ class Automation:
         """Obtiene el ID de la automatización."""
         return self.__id
 
+    def _assign_id(self, id: int) -> None:
+        """
+        Registra el ID generado por la base de datos (uso interno de AutomationDAO).
+
+        Args:
+            id: ID asignado al insertar
+        """
+        self.__id = id
+
     @property
     def name(self) -> str:
         """Obtiene el nombre de la automatización."""
@@ -70,20 +83,28 @@ class Automation:
     @name.setter
     def name(self, value: str) -> None:
         """Establece el nombre de la automatización."""
-        self.__name = value
+        if value != self.__name:
+            self.__name = value
+            self._mark_dirty('name')
 
     @description.setter
     def description(self, value: str) -> None:
         """Establece la descripción de la automatización."""
-        self.__description = value
+        if value != self.__description:
+            self.__description = value
+            self._mark_dirty('description')
 
     def activate(self) -> None:
         """Activa la automatización."""
-        self.__active = True
+        if not self.__active:
+            self.__active = True
+            self._mark_dirty('active')
 
     def deactivate(self) -> None:
         """Desactiva la automatización."""
-        self.__active = False
+        if self.__active:
+            self.__active = False
+            self._mark_dirty('active')
 
     def execute(self) -> None:
         """Ejecuta la automatización sobre los dispositivos asociados."""
@@ -0,0 +1,84 @@
+"""Módulo de dominio con las reglas (disparadores y acciones) de las automatizaciones."""
+
+from datetime import time
+from typing import Hashable, NamedTuple, Optional, Tuple
+
+# Tipos de disparador
+TRIGGER_DEVICE_STATE = "device_state"
+TRIGGER_EVENT_SOURCE = "event_source"
+TRIGGER_TIME = "time"
+
+
+class Trigger(NamedTuple):
+    """
+    Condición que dispara una automatización.
+
+    Atributos:
+        id: Identificador del disparador
+        automation_id: Automatización que dispara
+        trigger_type: TRIGGER_DEVICE_STATE, TRIGGER_EVENT_SOURCE o TRIGGER_TIME
+        device_id: Dispositivo observado (None = cualquiera, solo para eventos)
+        state_id: Estado esperado (None = cualquier cambio de estado)
+        source: Origen del evento (ej: 'sensor')
+        time_of_day: Hora del día (precisión de minutos)
+    """
+
+    id: int
+    automation_id: int
+    trigger_type: str
+    device_id: Optional[int] = None
+    state_id: Optional[int] = None
+    source: Optional[str] = None
+    time_of_day: Optional[time] = None
+
+    def clave(self) -> Tuple[Hashable, ...]:
+        """
+        Clave de índice del disparador en el motor de reglas.
+
+        Los campos opcionales en None actúan como comodín: un evento se
+        busca con su clave exacta y con la clave comodín.
+
+        Returns:
+            Tupla (tipo, ...) comparable con las claves de los eventos
+        """
+        if self.trigger_type == TRIGGER_DEVICE_STATE:
+            return (TRIGGER_DEVICE_STATE, self.device_id, self.state_id)
+        if self.trigger_type == TRIGGER_EVENT_SOURCE:
+            return (TRIGGER_EVENT_SOURCE, self.source, self.device_id)
+        if self.trigger_type == TRIGGER_TIME:
+            return (TRIGGER_TIME, self.time_of_day.hour, self.time_of_day.minute)
+        raise ValueError(f"Tipo de disparador desconocido: {self.trigger_type}")
+
+
+class AutomationAction(NamedTuple):
+    """
+    Acción de una automatización sobre un dispositivo.
+
+    Atributos:
+        device_id: Dispositivo sobre el que actúa
+        action: Descripción de la acción (ej: 'Apagar')
+        state_id: Estado que aplica al dispositivo (None si no cambia el estado)
+    """
+
+    device_id: int
+    action: str
+    state_id: Optional[int] = None
+
+
+class AutomationRule(NamedTuple):
+    """
+    Automatización lista para el motor de reglas.
+
+    Atributos:
+        automation_id: Identificador de la automatización
+        name: Nombre de la automatización
+        home_id: Hogar de la automatización
+        triggers: Disparadores
+        actions: Acciones a ejecutar
+    """
+
+    automation_id: int
+    name: str
+    home_id: int
+    triggers: Tuple[Trigger, ...]
+    actions: Tuple[AutomationAction, ...]
@@ -1,6 +1,7 @@
 """Módulo de dominio para la entidad Device."""
 
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
+from .tracked_entity import TrackedEntity
 
 if TYPE_CHECKING:
     from .state import State
@@ -9,7 +10,7 @@ if TYPE_CHECKING:
     from .home import Home
 
 
-class Device:
+class Device(TrackedEntity):
     """
     Representa un dispositivo inteligente en el sistema.
     
@@ -22,6 +23,10 @@ class Device:
         home: Hogar al que pertenece
     """
     
+    __slots__ = (
+        '__id', '__name', '__state', '__device_type', '__location', '__home', '__home_index'
+    )
+    
     def __init__(
         self,
         id: int,
@@ -42,12 +47,15 @@ class Device:
             location: Objeto Location con la ubicación
             home: Objeto Home al que pertenece
         """
+        super().__init__()
         self.__id = id
         self.__name = name
         self.__state = state
         self.__device_type = device_type
         self.__location = location
         self.__home = home
+        # Hogar cuyos índices contienen a este dispositivo (ver Home.add_device)
+        self.__home_index: Optional['Home'] = None
 
     @property
     def id(self) -> int:
@@ -82,17 +90,50 @@ class Device:
     @name.setter
     def name(self, value: str) -> None:
         """Establece el nombre del dispositivo."""
-        self.__name = value
+        if value != self.__name:
+            self.__name = value
+            self._mark_dirty('name')
 
     @state.setter
     def state(self, value: 'State') -> None:
         """Cambia el estado del dispositivo."""
+        changed = getattr(value, 'id', None) != getattr(self.__state, 'id', None)
         self.__state = value
+        if changed:
+            self._mark_dirty('state')
+            self.__reindex()
 
     @location.setter
     def location(self, value: 'Location') -> None:
         """Cambia la ubicación del dispositivo."""
+        changed = getattr(value, 'id', None) != getattr(self.__location, 'id', None)
         self.__location = value
+        if changed:
+            self._mark_dirty('location')
+            self.__reindex()
+
+    def _assign_id(self, id: int) -> None:
+        """
+        Registra el ID generado por la base de datos (uso interno de DeviceDAO).
+
+        Args:
+            id: ID asignado al insertar
+        """
+        self.__id = id
+
+    def _attach_home_index(self, home: Optional['Home']) -> None:
+        """
+        Registra el hogar que indexa a este dispositivo (uso interno de Home).
+
+        Args:
+            home: Hogar que lo contiene, o None al quitarlo
+        """
+        self.__home_index = home
+
+    def __reindex(self) -> None:
+        """Mantiene al día los índices secundarios del hogar que lo contiene."""
+        if self.__home_index is not None:
+            self.__home_index.reindex_device(self)
 
     def search_device_by_name(self, search_name: str) -> bool:
         """
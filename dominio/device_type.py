@@ -11,6 +11,8 @@ class DeviceType:
         characteristics: Características del tipo de dispositivo
     """
     
+    __slots__ = ('__id', '__name', '__characteristics')
+    
     def __init__(self, id: int, name: str, characteristics: str = ""):
         """
         Inicializa un nuevo tipo de dispositivo.
@@ -47,4 +49,16 @@ class DeviceType:
     @characteristics.setter
     def characteristics(self, value: str) -> None:
         """Establece las características del tipo."""
-        self.__characteristics = value
\ No newline at end of file
+        self.__characteristics = value
+
+    def __eq__(self, other: object) -> bool:
+        """Dos tipos son iguales si tienen el mismo id, nombre y características."""
+        if not isinstance(other, DeviceType):
+            return NotImplemented
+        return (self.__id, self.__name, self.__characteristics) == (
+            other.id, other.name, other.characteristics
+        )
+
+    def __hash__(self) -> int:
+        """Hash por id (estable aunque cambie el nombre)."""
+        return hash((DeviceType, self.__id))
\ No newline at end of file
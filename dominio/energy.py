@@ -0,0 +1,41 @@
+"""Módulo de dominio con los resultados del análisis de consumo energético."""
+
+from datetime import datetime
+from typing import Any, Dict, NamedTuple
+
+
+class EnergyReport(NamedTuple):
+    """
+    Consumo estimado de un conjunto de dispositivos en un intervalo.
+
+    Los arreglos (numpy.ndarray) están alineados: la posición i de cada
+    uno corresponde al dispositivo device_ids[i].
+
+    Atributos:
+        desde: Inicio del intervalo
+        hasta: Fin del intervalo
+        device_ids: Dispositivos analizados (orden ascendente)
+        device_type_ids: Tipo de cada dispositivo (0 si ya no existe)
+        observed_seconds: Segundos con estado conocido dentro del intervalo
+        on_seconds: Segundos en un estado de encendido
+        duty_cycles: on_seconds / observed_seconds (0 si no hay observación)
+        kwh: Consumo estimado en kWh
+        kwh_by_type: {device_type_id: kWh} sumado por tipo
+        transitions: Cambios de estado procesados
+    """
+
+    desde: datetime
+    hasta: datetime
+    device_ids: Any
+    device_type_ids: Any
+    observed_seconds: Any
+    on_seconds: Any
+    duty_cycles: Any
+    kwh: Any
+    kwh_by_type: Dict[int, float]
+    transitions: int
+
+    @property
+    def total_kwh(self) -> float:
+        """Consumo total estimado en kWh."""
+        return float(self.kwh.sum()) if len(self.kwh) else 0.0
@@ -21,6 +21,8 @@ class Event:
         source: Origen del evento (manual/automático)
     """
     
+    __slots__ = ('__id', '__date_time_value', '__description', '__device', '__user', '__source')
+    
     def __init__(
         self,
         id: int,
@@ -1,6 +1,6 @@
 """Módulo de dominio para la entidad Home."""
 
-from typing import List, TYPE_CHECKING
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .device import Device
@@ -13,8 +13,17 @@ class Home:
     Atributos:
         id: Identificador único del hogar
         name: Nombre del hogar
+    
+    Los dispositivos se guardan en un índice ordenado por id, con índices
+    secundarios por tipo, ubicación y estado; agregar, quitar y buscar
+    son operaciones O(1).
     """
     
+    __slots__ = (
+        '__id', '__name', '__devices', '__device_keys',
+        '__by_type', '__by_location', '__by_state'
+    )
+    
     def __init__(self, id: int, name: str):
         """
         Inicializa un nuevo hogar.
@@ -25,7 +34,12 @@ class Home:
         """
         self.__id = id
         self.__name = name
-        self.__devices: List['Device'] = []
+        self.__devices: Dict[int, 'Device'] = {}
+        # id del dispositivo -> (tipo, ubicación, estado) con que fue indexado
+        self.__device_keys: Dict[int, Tuple] = {}
+        self.__by_type: Dict[int, Dict[int, 'Device']] = {}
+        self.__by_location: Dict[int, Dict[int, 'Device']] = {}
+        self.__by_state: Dict[int, Dict[int, 'Device']] = {}
 
     @property
     def id(self) -> int:
@@ -42,15 +56,51 @@ class Home:
         """Establece el nombre del hogar."""
         self.__name = value
 
+    @staticmethod
+    def __index_key(device: 'Device') -> Tuple:
+        """Claves secundarias actuales del dispositivo."""
+        return (
+            getattr(device.device_type, 'id', None),
+            getattr(device.location, 'id', None),
+            getattr(device.state, 'id', None),
+        )
+
+    def __indexes(self) -> Tuple[Dict, Dict, Dict]:
+        """Índices secundarios, en el mismo orden que las claves."""
+        return (self.__by_type, self.__by_location, self.__by_state)
+
+    def __unindex(self, device_id: int) -> None:
+        """Quita un dispositivo de los índices secundarios."""
+        for index, key in zip(self.__indexes(), self.__device_keys.pop(device_id)):
+            bucket = index[key]
+            del bucket[device_id]
+            if not bucket:
+                del index[key]
+
+    def __index(self, device: 'Device') -> None:
+        """Agrega un dispositivo a los índices secundarios."""
+        keys = self.__index_key(device)
+        self.__device_keys[device.id] = keys
+        for index, key in zip(self.__indexes(), keys):
+            index.setdefault(key, {})[device.id] = device
+
     def add_device(self, device: 'Device') -> None:
         """
         Agrega un dispositivo al hogar.
         
+        Si ya había otro dispositivo con el mismo id, se reemplaza.
+        
         Args:
             device: Dispositivo a agregar
         """
-        if device not in self.__devices:
-            self.__devices.append(device)
+        actual = self.__devices.get(device.id)
+        if actual is device:
+            return
+        if actual is not None:
+            self.remove_device(actual)
+        self.__devices[device.id] = device
+        self.__index(device)
+        device._attach_home_index(self)
 
     def remove_device(self, device: 'Device') -> None:
         """
@@ -59,8 +109,83 @@ class Home:
         Args:
             device: Dispositivo a eliminar
         """
-        if device in self.__devices:
-            self.__devices.remove(device)
+        if self.__devices.get(device.id) is device:
+            del self.__devices[device.id]
+            self.__unindex(device.id)
+            device._attach_home_index(None)
+
+    def reindex_device(self, device: 'Device') -> None:
+        """
+        Actualiza los índices secundarios tras un cambio de estado o ubicación.
+        
+        Los dispositivos lo invocan automáticamente desde sus setters.
+        
+        Args:
+            device: Dispositivo modificado
+        """
+        if self.__devices.get(device.id) is device:
+            self.__unindex(device.id)
+            self.__index(device)
+
+    def has_device(self, device_id: int) -> bool:
+        """
+        Verifica si el hogar contiene un dispositivo.
+        
+        Args:
+            device_id: ID del dispositivo
+            
+        Returns:
+            True si el dispositivo pertenece al hogar
+        """
+        return device_id in self.__devices
+
+    def get_device(self, device_id: int) -> Optional['Device']:
+        """
+        Obtiene un dispositivo del hogar por su id.
+        
+        Args:
+            device_id: ID del dispositivo
+            
+        Returns:
+            Dispositivo o None si no pertenece al hogar
+        """
+        return self.__devices.get(device_id)
+
+    def get_devices_by_type(self, device_type_id: int) -> List['Device']:
+        """
+        Obtiene los dispositivos de un tipo.
+        
+        Args:
+            device_type_id: ID del tipo de dispositivo
+            
+        Returns:
+            Lista de dispositivos en orden de agregado
+        """
+        return list(self.__by_type.get(device_type_id, {}).values())
+
+    def get_devices_by_location(self, location_id: int) -> List['Device']:
+        """
+        Obtiene los dispositivos de una ubicación.
+        
+        Args:
+            location_id: ID de la ubicación
+            
+        Returns:
+            Lista de dispositivos en orden de agregado
+        """
+        return list(self.__by_location.get(location_id, {}).values())
+
+    def get_devices_by_state(self, state_id: int) -> List['Device']:
+        """
+        Obtiene los dispositivos en un estado.
+        
+        Args:
+            state_id: ID del estado
+            
+        Returns:
+            Lista de dispositivos en orden de agregado
+        """
+        return list(self.__by_state.get(state_id, {}).values())
 
     def get_devices(self) -> List['Device']:
         """
@@ -69,4 +194,4 @@ class Home:
         Returns:
             Lista de dispositivos
         """
-        return self.__devices.copy()
\ No newline at end of file
+        return list(self.__devices.values())
\ No newline at end of file
@@ -16,6 +16,8 @@ class Location:
         home: Hogar al que pertenece la ubicación
     """
     
+    __slots__ = ('__id', '__name', '__home')
+    
     def __init__(self, id: int, name: str, home: 'Home'):
         """
         Inicializa una nueva ubicación.
@@ -0,0 +1,158 @@
+"""Módulo de dominio con los mensajes publicados en el bus de eventos."""
+
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+
+class DeviceStateChanged(NamedTuple):
+    """
+    Un dispositivo cambió de estado (ya persistido en la base de datos).
+
+    Lleva todo lo que un suscriptor suele necesitar para no tener que
+    volver a consultar la BD.
+
+    Atributos:
+        device_id: Identificador del dispositivo
+        home_id: Identificador del hogar del dispositivo
+        state_id: Identificador del nuevo estado
+        state_name: Nombre del nuevo estado
+        previous_state_id: Identificador del estado anterior (si se conoce)
+        timestamp: Momento del cambio
+        source: Origen del cambio ('manual' o 'automatización')
+    """
+
+    device_id: int
+    home_id: int
+    state_id: int
+    state_name: str
+    previous_state_id: Optional[int]
+    timestamp: datetime
+    source: str = "manual"
+
+
+class DeviceCreated(NamedTuple):
+    """
+    Se creó un dispositivo (ya persistido en la base de datos).
+
+    Atributos:
+        device_id: Identificador del dispositivo
+        home_id: Identificador del hogar del dispositivo
+        state_id: Identificador del estado inicial
+        timestamp: Momento del alta
+    """
+
+    device_id: int
+    home_id: int
+    state_id: int
+    timestamp: datetime
+
+
+class DeviceDeleted(NamedTuple):
+    """
+    Se eliminó un dispositivo (ya borrado de la base de datos).
+
+    Atributos:
+        device_id: Identificador del dispositivo
+        home_id: Identificador del hogar que tenía
+        timestamp: Momento de la baja
+    """
+
+    device_id: int
+    home_id: Optional[int]
+    timestamp: datetime
+
+
+class EventOccurred(NamedTuple):
+    """
+    Se registró un evento de un dispositivo (ej: lectura de un sensor).
+
+    Atributos:
+        device_id: Identificador del dispositivo (None si no aplica)
+        source: Origen del evento (ej: 'sensor', 'manual')
+        description: Descripción del evento
+        timestamp: Momento del evento
+    """
+
+    device_id: Optional[int]
+    source: str
+    description: str
+    timestamp: datetime
+
+
+class ClockTick(NamedTuple):
+    """
+    Pulso de reloj publicado una vez por minuto (disparadores horarios).
+
+    Atributos:
+        timestamp: Minuto que comienza
+    """
+
+    timestamp: datetime
+
+
+class AutomationChanged(NamedTuple):
+    """
+    Una automatización se creó, modificó, activó, desactivó o eliminó.
+
+    Atributos:
+        automation_id: Identificador de la automatización
+        home_id: Identificador de su hogar (None si se eliminó)
+    """
+
+    automation_id: int
+    home_id: Optional[int] = None
+
+
+class MembershipChanged(NamedTuple):
+    """
+    Un usuario fue asociado a un hogar o desasociado de él (tabla user_home).
+
+    Atributos:
+        user_email: Email del usuario
+        home_id: Identificador del hogar
+        member: True si se asoció, False si se desasoció
+    """
+
+    user_email: str
+    home_id: int
+    member: bool
+
+
+class SensorReading(NamedTuple):
+    """
+    Un sensor reportó una lectura numérica (ej: temperatura).
+
+    Atributos:
+        device_id: Identificador del dispositivo
+        metric: Nombre de la métrica
+        value: Valor leído
+        timestamp: Momento de la lectura
+    """
+
+    device_id: int
+    metric: str
+    value: float
+    timestamp: datetime
+
+
+class AnomalyDetected(NamedTuple):
+    """
+    El detector de anomalías encontró un valor o una tasa de eventos atípica.
+
+    Atributos:
+        device_id: Identificador del dispositivo
+        kind: 'valor' (lectura fuera de rango) o 'tasa' (ráfaga de eventos)
+        metric: Métrica de la lectura (None para anomalías de tasa)
+        value: Valor observado (lectura o eventos en la ventana)
+        expected: Valor esperado según la media móvil
+        score: Desvíos estándar respecto de lo esperado
+        timestamp: Momento del evento que la disparó
+    """
+
+    device_id: int
+    kind: str
+    metric: Optional[str]
+    value: float
+    expected: float
+    score: float
+    timestamp: datetime
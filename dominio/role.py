@@ -10,6 +10,8 @@ class Role:
         name: Nombre del rol (ej: 'admin', 'standard')
     """
     
+    __slots__ = ('__id', '__name')
+    
     def __init__(self, id: int, name: str):
         """
         Inicializa un nuevo rol.
@@ -34,4 +36,14 @@ class Role:
     @name.setter
     def name(self, value: str) -> None:
         """Establece el nombre del rol."""
-        self.__name = value
\ No newline at end of file
+        self.__name = value
+
+    def __eq__(self, other: object) -> bool:
+        """Dos roles son iguales si tienen el mismo id y nombre."""
+        if not isinstance(other, Role):
+            return NotImplemented
+        return (self.__id, self.__name) == (other.id, other.name)
+
+    def __hash__(self) -> int:
+        """Hash por id (estable aunque cambie el nombre)."""
+        return hash((Role, self.__id))
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""Módulo de dominio con proyecciones de solo lectura para listados."""
+
+from typing import NamedTuple, Optional
+
+
+class DeviceSummary(NamedTuple):
+    """
+    Fila resumida de un dispositivo para tablas y listados.
+
+    Se obtiene directamente de una consulta con JOIN, sin hidratar el
+    grafo de objetos de Device.
+
+    Atributos:
+        id: Identificador del dispositivo
+        name: Nombre del dispositivo
+        type_name: Nombre del tipo de dispositivo
+        state_name: Nombre del estado actual
+        location_name: Nombre de la ubicación
+        home_name: Nombre del hogar
+    """
+
+    id: int
+    name: str
+    type_name: str
+    state_name: str
+    location_name: str
+    home_name: str
+
+
+class AutomationSummary(NamedTuple):
+    """
+    Fila resumida de una automatización para tablas y listados.
+
+    Atributos:
+        id: Identificador de la automatización
+        name: Nombre de la automatización
+        description: Descripción
+        active: True si está activa
+        home_name: Nombre del hogar
+    """
+
+    id: int
+    name: str
+    description: str
+    active: bool
+    home_name: str
+
+
+class DeviceStatus(NamedTuple):
+    """
+    Estado actual de un dispositivo, tal como lo guarda el store en memoria.
+
+    Atributos:
+        device_id: Identificador del dispositivo
+        state_id: Identificador del estado actual
+        state_name: Nombre del estado actual
+        home_id: Identificador del hogar (None si no se conoce)
+    """
+
+    device_id: int
+    state_id: int
+    state_name: str
+    home_id: Optional[int] = None
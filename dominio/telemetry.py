@@ -0,0 +1,53 @@
+"""Módulo de dominio con las series de telemetría numérica."""
+
+from typing import Any, NamedTuple
+
+# Métricas conocidas (las lecturas aceptan cualquier nombre de hasta 32 caracteres)
+METRICA_TEMPERATURA = "temperatura"
+METRICA_HUMEDAD = "humedad"
+METRICA_ENERGIA = "energia"
+
+
+class TelemetrySeries(NamedTuple):
+    """
+    Serie de lecturas crudas de una métrica de un dispositivo.
+
+    Los arreglos son numpy.ndarray de float64 si NumPy está instalado
+    (si no, array.array('d')); todos tienen la misma longitud.
+
+    Atributos:
+        device_id: Identificador del dispositivo
+        metric: Nombre de la métrica
+        timestamps: Instantes de las lecturas (segundos epoch)
+        values: Valores leídos
+    """
+
+    device_id: int
+    metric: str
+    timestamps: Any
+    values: Any
+
+
+class TelemetryAggregate(NamedTuple):
+    """
+    Serie reducida (min/max/promedio por bucket) de una métrica.
+
+    Atributos:
+        device_id: Identificador del dispositivo
+        metric: Nombre de la métrica
+        granularity: 'minuto' o 'hora'
+        timestamps: Inicio de cada bucket (segundos epoch)
+        minimums: Mínimo de cada bucket
+        maximums: Máximo de cada bucket
+        averages: Promedio de cada bucket
+        counts: Cantidad de lecturas de cada bucket
+    """
+
+    device_id: int
+    metric: str
+    granularity: str
+    timestamps: Any
+    minimums: Any
+    maximums: Any
+    averages: Any
+    counts: Any
@@ -0,0 +1,53 @@
+"""Módulo de dominio con el seguimiento de campos modificados."""
+
+from typing import Optional, Set
+
+
+class TrackedEntity:
+    """
+    Base para entidades que registran qué campos cambiaron desde su carga.
+
+    Los DAOs usan esta información para generar UPDATEs parciales y
+    evitar ir a la base de datos cuando la entidad no cambió.
+    """
+
+    __slots__ = ('__dirty_fields',)
+
+    def __init__(self):
+        """Inicializa la entidad sin cambios pendientes."""
+        # El conjunto se crea con el primer cambio: la mayoría de las
+        # entidades cargadas nunca se modifican
+        self.__dirty_fields: Optional[Set[str]] = None
+
+    def _mark_dirty(self, field: str) -> None:
+        """
+        Registra un campo como modificado.
+
+        Args:
+            field: Nombre del campo (propiedad) modificado
+        """
+        if self.__dirty_fields is None:
+            self.__dirty_fields = set()
+        self.__dirty_fields.add(field)
+
+    def get_dirty_fields(self) -> Set[str]:
+        """
+        Obtiene los campos modificados desde la carga o el último guardado.
+
+        Returns:
+            Conjunto con los nombres de los campos modificados
+        """
+        return set(self.__dirty_fields or ())
+
+    def is_dirty(self) -> bool:
+        """
+        Verifica si la entidad tiene cambios sin guardar.
+
+        Returns:
+            True si algún campo fue modificado
+        """
+        return bool(self.__dirty_fields)
+
+    def mark_clean(self) -> None:
+        """Descarta el registro de cambios (la entidad quedó persistida)."""
+        self.__dirty_fields = None
@@ -1,21 +1,26 @@
 """Módulo de dominio para la entidad User."""
 
 from typing import TYPE_CHECKING
+from utils.passwords import verificar
+from .tracked_entity import TrackedEntity
 
 if TYPE_CHECKING:
     from .role import Role
 
-class User:
+class User(TrackedEntity):
     """
     Representa un usuario del sistema SmartHome.
     
     Atributos:
         email: Correo electrónico único del usuario
-        password: Contraseña encriptada
+        password: Contraseña tal como se guarda (hash scrypt; texto plano
+            solo en usuarios nuevos aún no guardados o no migrados)
         name: Nombre completo del usuario
         role: Objeto Role asociado al usuario
     """
     
+    __slots__ = ('__email', '__password', '__name', '__role')
+    
     def __init__(self, email: str, password: str, name: str, role: 'Role'):
         """
         Inicializa un nuevo usuario.
@@ -26,6 +31,7 @@ class User:
             name: Nombre completo
             role: Objeto Role que define los permisos
         """
+        super().__init__()
         self.__email = email
         self.__password = password
         self.__name = name
@@ -72,16 +78,27 @@ class User:
         Returns:
             True si las credenciales coinciden, False en caso contrario
         """
-        return self.__email == email and self.__password == password
+        return self.__email == email and verificar(password, self.__password)
 
     def change_password(self, new_password: str) -> None:
         """
-        Cambia la contraseña del usuario.
+        Cambia la contraseña del usuario (UserDAO.modificar la guarda hasheada).
         
         Args:
             new_password: Nueva contraseña
         """
         self.__password = new_password
+        self._mark_dirty('password')
+
+    def _assign_password_hash(self, hash_password: str) -> None:
+        """
+        Registra el hash que UserDAO guardó en lugar de una contraseña
+        heredada en texto plano (no marca el campo como modificado).
+
+        Args:
+            hash_password: Hash ya guardado en la BD
+        """
+        self.__password = hash_password
 
     def is_admin(self) -> bool:
         """
@@ -1,9 +1,10 @@
 """Interface específica para operaciones de Device DAO."""
 
 from abc import abstractmethod
-from typing import List
+from typing import Dict, List, Optional
 from .i_dao import IDao
 from dominio.device import Device
+from dominio.summary import DeviceSummary
 
 
 class IDeviceDao(IDao[Device]):
@@ -36,6 +37,45 @@ class IDeviceDao(IDao[Device]):
         """
         pass
     
+    @abstractmethod
+    def obtener_por_usuario(self, email: str) -> Dict[str, List[Device]]:
+        """
+        Obtiene los dispositivos de todos los hogares de un usuario.
+        
+        Args:
+            email: Email del usuario
+            
+        Returns:
+            Diccionario {nombre_hogar: [dispositivos]}
+        """
+        pass
+    
+    @abstractmethod
+    def listar_resumen(self, home_id: Optional[int] = None) -> List[DeviceSummary]:
+        """
+        Obtiene el resumen de los dispositivos para listados.
+        
+        Args:
+            home_id: ID del hogar (opcional, None para todos)
+            
+        Returns:
+            Lista de DeviceSummary
+        """
+        pass
+    
+    @abstractmethod
+    def listar_resumen_por_usuario(self, email: str) -> Dict[str, List[DeviceSummary]]:
+        """
+        Obtiene el resumen de los dispositivos de los hogares de un usuario.
+        
+        Args:
+            email: Email del usuario
+            
+        Returns:
+            Diccionario {nombre_hogar: [DeviceSummary]}
+        """
+        pass
+    
     @abstractmethod
     def cambiar_estado(self, device_id: int, nuevo_estado_id: int) -> bool:
         """
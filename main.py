@@ -13,10 +13,22 @@ Arquitectura:
 - Connection Layer (conn/): Gestión de conexión a BD
 """
 
+import os
 import sys
 from ui.rich_console_ui import RichConsoleUI
 from ui.rich_utils import console, print_header, ICONS
 from conn.db_connection import DatabaseConnection
+from services.anomaly_detector import AnomalyDetector
+from services.automation_home_index import AutomationHomeIndex
+from services.command_coalescer import CommandCoalescer
+from services.device_history_service import DeviceHistoryService
+from services.device_state_store import DeviceStateStore
+from services.event_bus import EventBus
+from services.membership_cache import MembershipCache
+from services.rule_engine import RuleEngine
+from services.scheduler import Scheduler
+from services.telemetry_store import TelemetryStore
+from dominio.messages import ClockTick
 
 
 def main():
@@ -31,6 +43,57 @@ def main():
     # Inicializar interfaz de usuario Rich
     ui = RichConsoleUI()
 
+    # Cargar el estado de los dispositivos en memoria y mantenerlo sincronizado
+    store = DeviceStateStore()
+    store.cargar()
+    store.iniciar_reconciliacion_periodica()
+
+    # Historial de estados: cada cambio se registra como delta en event
+    historial = DeviceHistoryService()
+    historial.conectar()
+
+    # Hogares de cada usuario en memoria (verificación de permisos sin la BD)
+    MembershipCache().conectar()
+
+    # Hogar de cada automatización en memoria (límite por hogar sin la BD)
+    indice_automatizaciones = AutomationHomeIndex()
+    indice_automatizaciones.cargar()
+    indice_automatizaciones.conectar()
+
+    # Detección de anomalías en las lecturas y eventos de los sensores
+    AnomalyDetector().conectar()
+
+    # Motor de reglas: evalúa las automatizaciones ante cada evento del bus
+    motor = RuleEngine()
+    motor.cargar()
+    motor.conectar()
+
+    # Pulso de reloj por minuto para los disparadores horarios. Los minutos
+    # perdidos mientras la app estuvo detenida no se recuperan: reenviarlos
+    # ejecutaría de golpe acciones horarias ya vencidas
+    planificador = Scheduler()
+    planificador.programar_cron(
+        "reloj_automatizaciones",
+        "* * * * *",
+        lambda instante: EventBus().publicar(ClockTick(instante)),
+        recuperar=False,
+    )
+    # Instantáneas periódicas del estado: acotan la reconstrucción histórica
+    planificador.programar_cron(
+        "snapshot_estados",
+        os.getenv("DEVICE_STATE_SNAPSHOT_CRON", "0 * * * *"),
+        lambda instante: historial.tomar_snapshot(instante),
+        recuperar=False,
+    )
+    # Lecturas de telemetría acumuladas en memoria: se escriben por lotes
+    planificador.programar_cron(
+        "volcado_telemetria",
+        "* * * * *",
+        lambda instante: TelemetryStore().volcar(),
+        recuperar=False,
+    )
+    planificador.iniciar()
+
     # Bucle principal de la aplicación
     while True:
         ui.mostrar_menu_principal()
@@ -93,6 +156,10 @@ def ejecutar_menu_administrador(ui: RichConsoleUI):
             ui.flujo_cambiar_rol_usuario()
 
         elif opcion_admin == "4":
+            # Registrar un evento o una lectura de sensor
+            ui.flujo_registrar_dato_sensor()
+
+        elif opcion_admin == "5":
             # Cerrar sesión
             ui.auth_service.cerrar_sesion()
             console.print(
@@ -234,6 +301,11 @@ if __name__ == "__main__":
         traceback.print_exc()
         sys.exit(1)
     finally:
+        DeviceStateStore().detener_reconciliacion_periodica()
+        CommandCoalescer().vaciar()
+        CommandCoalescer().detener()
+        EventBus().cerrar()
+        TelemetryStore().volcar()
         # Asegurar que la conexión a BD se cierre correctamente
         db = DatabaseConnection()
         db.disconnect()
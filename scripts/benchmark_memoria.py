@@ -0,0 +1,140 @@
+"""
+Benchmark de memoria por instancia de las entidades de dominio.
+
+Compara cada clase de dominio (con __slots__) contra un equivalente con
+los mismos atributos y valores guardados en un __dict__ por instancia,
+que es como estaban definidas antes.
+
+Uso:
+    python scripts/benchmark_memoria.py
+    python scripts/benchmark_memoria.py --cantidad 500000
+"""
+
+import sys
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# Agregar el directorio padre al path para importar dominio y ui
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dominio import Automation, Device, DeviceType, Event, Home, Location, Role, State, User
+from ui.rich_utils import console, create_data_table
+
+
+def atributos_slots(cls: type) -> List[str]:
+    """
+    Obtiene los nombres (name-mangled) de todos los slots de la clase y sus bases.
+
+    Args:
+        cls: Clase de dominio
+
+    Returns:
+        Lista de nombres de atributo
+    """
+    return [
+        f"_{base.__name__}{nombre}" if nombre.startswith('__') else nombre
+        for base in cls.__mro__
+        for nombre in getattr(base, '__slots__', ())
+    ]
+
+
+def equivalente_con_dict(cls: type) -> Callable[[Callable[[], object]], Callable[[], object]]:
+    """
+    Crea el equivalente de la clase con los mismos atributos en un __dict__.
+
+    Es la representación que tenían las entidades antes de usar __slots__.
+
+    Args:
+        cls: Clase de dominio
+
+    Returns:
+        Función que adapta una fábrica de la clase original
+    """
+    nombres = atributos_slots(cls)
+
+    def __init__(self, original):
+        for nombre in nombres:
+            setattr(self, nombre, getattr(original, nombre))
+
+    con_dict = type(f"{cls.__name__}ConDict", (), {'__init__': __init__})
+    return lambda fabrica: lambda: con_dict(fabrica())
+
+
+def bytes_por_instancia(fabrica: Callable[[], object], cantidad: int) -> float:
+    """
+    Mide la memoria asignada por instancia con tracemalloc.
+
+    Args:
+        fabrica: Función que crea una instancia
+        cantidad: Cantidad de instancias a crear
+
+    Returns:
+        Bytes promedio por instancia
+    """
+    instancias = [None] * cantidad
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    for i in range(cantidad):
+        instancias[i] = fabrica()
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (despues - antes) / cantidad
+
+
+def casos() -> Dict[str, Tuple[type, Callable[[], object]]]:
+    """
+    Define cómo construir cada entidad; las relaciones son compartidas
+    para medir solo el costo propio de la instancia.
+
+    Returns:
+        Diccionario nombre -> (clase, fábrica)
+    """
+    home = Home(1, "Casa")
+    state = State(1, "Encendido")
+    device_type = DeviceType(1, "Luz", "Regulable")
+    location = Location(1, "Sala", home)
+    role = Role(1, "Administrador")
+    user = User("admin@smarthome.com", "hash", "Admin", role)
+    device = Device(1, "Luz Sala", state, device_type, location, home)
+    fecha = datetime(2024, 11, 28, 10, 30)
+    return {
+        'State': (State, lambda: State(1, "Encendido")),
+        'Home': (Home, lambda: Home(1, "Casa")),
+        'User': (User, lambda: User("admin@smarthome.com", "hash", "Admin", role)),
+        'Device': (Device, lambda: Device(1, "Luz Sala", state, device_type, location, home)),
+        'Automation': (Automation, lambda: Automation(1, "Modo Noche", "Apaga luces", True, home)),
+        'Event': (Event, lambda: Event(1, "Encendido", "manual", device, user, fecha)),
+    }
+
+
+def main():
+    """Función principal del script."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark de memoria del dominio SmartHome")
+    parser.add_argument(
+        "--cantidad", type=int, default=100_000, help="Instancias por clase (default: 100000)"
+    )
+    args = parser.parse_args()
+
+    filas = []
+    for nombre, (cls, fabrica) in casos().items():
+        con_slots = bytes_por_instancia(fabrica, args.cantidad)
+        con_dict = bytes_por_instancia(equivalente_con_dict(cls)(fabrica), args.cantidad)
+        ahorro = 100 * (con_dict - con_slots) / con_dict
+        filas.append([nombre, f"{con_dict:.0f}", f"{con_slots:.0f}", f"{ahorro:.0f}%"])
+
+    columnas = [
+        ("Entidad", "cyan", "left"),
+        ("Bytes (__dict__)", "yellow", "right"),
+        ("Bytes (__slots__)", "green", "right"),
+        ("Ahorro", "magenta", "right"),
+    ]
+    titulo = f"Memoria por instancia ({args.cantidad:,} instancias)"
+    console.print(create_data_table(titulo, columnas, filas))
+
+
+if __name__ == "__main__":
+    main()
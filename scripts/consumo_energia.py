@@ -0,0 +1,83 @@
+"""
+Consumo energético estimado por dispositivo y por tipo.
+
+Calcula, a partir del historial de cambios de estado y de la potencia de
+cada tipo de dispositivo en cada estado (tabla device_type_power), el
+tiempo encendido, el ciclo de trabajo y los kWh estimados de un rango.
+
+Uso:
+    python scripts/consumo_energia.py --desde 2024-11-01 --hasta 2024-12-01
+    python scripts/consumo_energia.py --desde 2024-11-01 --hasta 2024-12-01 --hogar 2
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Agregar el directorio padre al path para importar services y ui
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.energy_analytics_service import EnergyAnalyticsService
+from ui.rich_utils import console, create_data_table
+
+
+def main():
+    """Función principal del script."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Consumo energético SmartHome")
+    parser.add_argument("--desde", type=datetime.fromisoformat, required=True,
+                        help="Inicio del rango (YYYY-MM-DD[ HH:MM])")
+    parser.add_argument("--hasta", type=datetime.fromisoformat, required=True,
+                        help="Fin del rango (YYYY-MM-DD[ HH:MM])")
+    parser.add_argument("--hogar", type=int, help="Limitar a un hogar")
+    parser.add_argument("--dispositivo", type=int, help="Limitar a un dispositivo")
+    parser.add_argument("--mostrar", type=int, default=50,
+                        help="Cantidad de dispositivos a listar (default: 50)")
+    args = parser.parse_args()
+
+    reporte = EnergyAnalyticsService().consumo(
+        args.desde, args.hasta, device_id=args.dispositivo, home_id=args.hogar
+    )
+    if reporte is None:
+        console.print("[red]✗ No se pudo calcular el consumo (ver logs)[/red]")
+        sys.exit(1)
+
+    console.print(
+        f"\n[cyan]Dispositivos:[/cyan] {len(reporte.device_ids):,} | "
+        f"[cyan]Cambios de estado:[/cyan] {reporte.transitions:,} | "
+        f"[cyan]Total:[/cyan] {reporte.total_kwh:,.2f} kWh\n"
+    )
+
+    columnas = [
+        ("Dispositivo", "yellow", "right"),
+        ("Tipo", "magenta", "right"),
+        ("Horas encendido", "white", "right"),
+        ("Ciclo de trabajo", "cyan", "right"),
+        ("kWh", "green", "right"),
+    ]
+    # Los dispositivos de mayor consumo primero
+    orden = reporte.kwh.argsort()[::-1][:args.mostrar]
+    filas = [
+        [
+            str(reporte.device_ids[i]),
+            str(reporte.device_type_ids[i]),
+            f"{reporte.on_seconds[i] / 3600:,.1f}",
+            f"{reporte.duty_cycles[i]:.1%}",
+            f"{reporte.kwh[i]:,.3f}",
+        ]
+        for i in orden
+    ]
+    console.print(create_data_table("Consumo por dispositivo", columnas, filas))
+
+    filas_tipo = [
+        [str(tipo), f"{kwh:,.3f}"]
+        for tipo, kwh in sorted(reporte.kwh_by_type.items(), key=lambda item: -item[1])
+    ]
+    console.print(create_data_table(
+        "Consumo por tipo", [("Tipo", "magenta", "right"), ("kWh", "green", "right")], filas_tipo
+    ))
+
+
+if __name__ == "__main__":
+    main()
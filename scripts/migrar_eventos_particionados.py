@@ -0,0 +1,161 @@
+"""
+Convierte la tabla event de una base existente a la tabla particionada por mes.
+
+Las bases creadas con --reset ya tienen el esquema nuevo; este script es
+para las que se crearon antes. Pasos:
+- Quita las claves foráneas de event (MySQL no las admite en tablas
+  particionadas); DeviceDAO/UserDAO.eliminar dejan device_id/user_email
+  en NULL como hacía ON DELETE SET NULL
+- Pasa date_time_value a DATETIME NOT NULL y la clave primaria a
+  (id, date_time_value), con los índices del esquema nuevo
+- Particiona la tabla y crea una partición por mes desde el evento más
+  antiguo hasta los meses adelantados
+- Agrega la columna state_id (deltas del historial de estados) si falta
+- Pasa event.date_time_value y device_state_snapshot.taken_at a
+  DATETIME(6) si todavía guardan segundos enteros
+
+Si la tabla ya está particionada no se modifica, por lo que puede
+ejecutarse más de una vez. Conviene hacer un respaldo antes: los ALTER
+TABLE copian la tabla completa.
+
+Uso:
+    python scripts/migrar_eventos_particionados.py
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio padre al path para importar conn, services y ui
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mysql.connector import Error
+from conn.db_connection import DatabaseConnection
+from services.event_retention_service import EventRetentionService
+from ui.rich_utils import console
+
+
+def esta_particionada(cursor) -> bool:
+    """Verifica si la tabla event ya tiene particiones."""
+    cursor.execute("""
+        SELECT COUNT(*) AS particiones
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE()
+          AND TABLE_NAME = 'event'
+          AND PARTITION_NAME IS NOT NULL
+    """)
+    return cursor.fetchone()['particiones'] > 0
+
+
+def quitar_claves_foraneas(cursor) -> None:
+    """Quita las claves foráneas de event y los índices que crearon para ellas."""
+    cursor.execute("""
+        SELECT CONSTRAINT_NAME AS nombre
+        FROM information_schema.REFERENTIAL_CONSTRAINTS
+        WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = 'event'
+    """)
+    for row in cursor.fetchall():
+        cursor.execute(f"ALTER TABLE event DROP FOREIGN KEY `{row['nombre']}`")
+
+    cursor.execute("""
+        SELECT DISTINCT INDEX_NAME AS nombre
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'event'
+          AND INDEX_NAME <> 'PRIMARY' AND INDEX_NAME NOT LIKE 'idx\\_event\\_%'
+    """)
+    for row in cursor.fetchall():
+        cursor.execute(f"ALTER TABLE event DROP INDEX `{row['nombre']}`")
+
+
+def particionar(cursor) -> None:
+    """Ajusta la clave primaria y los índices y particiona la tabla."""
+    cursor.execute("""
+        ALTER TABLE event
+            MODIFY date_time_value DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+            DROP PRIMARY KEY,
+            ADD PRIMARY KEY (id, date_time_value),
+            ADD INDEX idx_event_device (device_id, date_time_value),
+            ADD INDEX idx_event_user (user_email, date_time_value),
+            ADD INDEX idx_event_date (date_time_value)
+    """)
+    cursor.execute("""
+        ALTER TABLE event
+        PARTITION BY RANGE (TO_DAYS(date_time_value)) (
+            PARTITION p_futuro VALUES LESS THAN MAXVALUE
+        )
+    """)
+
+
+def agregar_state_id(cursor) -> bool:
+    """
+    Agrega la columna state_id si la tabla todavía no la tiene.
+
+    Returns:
+        True si se agregó la columna
+    """
+    cursor.execute("""
+        SELECT COUNT(*) AS columnas
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'event' AND COLUMN_NAME = 'state_id'
+    """)
+    if cursor.fetchone()['columnas'] > 0:
+        return False
+    cursor.execute("ALTER TABLE event ADD COLUMN state_id INT NULL")
+    return True
+
+
+def ajustar_precision(cursor) -> bool:
+    """
+    Pasa a microsegundos las columnas de fecha del historial de estados.
+
+    Con segundos enteros, un cambio del mismo segundo que una instantánea
+    no puede ordenarse respecto de ella.
+
+    Returns:
+        True si se modificó alguna columna
+    """
+    cursor.execute("""
+        SELECT TABLE_NAME AS tabla
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND DATETIME_PRECISION = 0
+          AND ((TABLE_NAME = 'event' AND COLUMN_NAME = 'date_time_value')
+            OR (TABLE_NAME = 'device_state_snapshot' AND COLUMN_NAME = 'taken_at'))
+    """)
+    tablas = {row['tabla'] for row in cursor.fetchall()}
+    if 'event' in tablas:
+        cursor.execute("""
+            ALTER TABLE event
+            MODIFY date_time_value DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+        """)
+    if 'device_state_snapshot' in tablas:
+        cursor.execute("ALTER TABLE device_state_snapshot MODIFY taken_at DATETIME(6) NOT NULL")
+    return bool(tablas)
+
+
+def main():
+    """Función principal del script."""
+    cursor = DatabaseConnection().get_cursor()
+    try:
+        if esta_particionada(cursor):
+            console.print("[green]✓ La tabla event ya está particionada[/green]")
+        else:
+            quitar_claves_foraneas(cursor)
+            particionar(cursor)
+            console.print("[green]✓ Tabla event particionada[/green]")
+        if agregar_state_id(cursor):
+            console.print("[green]✓ Columna event.state_id agregada[/green]")
+        if ajustar_precision(cursor):
+            console.print("[green]✓ Fechas del historial de estados con microsegundos[/green]")
+    except Error as e:
+        console.print(f"[red]✗ Error al migrar la tabla event: {e}[/red]")
+        sys.exit(1)
+    finally:
+        cursor.close()
+
+    creadas = EventRetentionService().crear_particiones_futuras()
+    console.print(f"[cyan]Particiones mensuales creadas:[/cyan] {len(creadas)}")
+    if creadas:
+        console.print(f"  {creadas[0]} … {creadas[-1]}")
+
+
+if __name__ == "__main__":
+    main()
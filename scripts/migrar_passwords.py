@@ -0,0 +1,50 @@
+"""
+Migra las contraseñas guardadas en texto plano a hashes scrypt.
+
+Los hashes se calculan en paralelo en el pool de PasswordHasher y se
+guardan con UserDAO.guardar_hash (el único camino que acepta valores ya
+hasheados). Las contraseñas ya hasheadas no se tocan, por lo que puede
+ejecutarse más de una vez (por ejemplo, después de cargar los seeds).
+Las que queden en texto plano también se migran en el siguiente inicio
+de sesión correcto de cada usuario.
+
+Uso:
+    python scripts/migrar_passwords.py
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio padre al path para importar dao y utils
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dao.user_dao import UserDAO
+from ui.rich_utils import console
+from utils.passwords import es_hash
+
+
+def main():
+    """Función principal del script."""
+    user_dao = UserDAO()
+    pendientes = [u for u in user_dao.obtener_todos() if not es_hash(u.password)]
+    if not pendientes:
+        console.print("[green]✓ No hay contraseñas en texto plano[/green]")
+        return
+
+    # Todos los hashes se encolan juntos; las escrituras van a medida que terminan
+    hashes = {u.email: user_dao.hasher.hashear(u.password) for u in pendientes}
+    fallidos = [
+        email for email, futuro in hashes.items()
+        if not user_dao.guardar_hash(email, futuro.result())
+    ]
+
+    console.print(
+        f"[cyan]Contraseñas migradas:[/cyan] {len(pendientes) - len(fallidos)}/{len(pendientes)}"
+    )
+    if fallidos:
+        console.print(f"[red]✗ No se pudieron actualizar: {', '.join(fallidos)}[/red]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
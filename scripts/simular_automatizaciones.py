@@ -0,0 +1,77 @@
+"""
+Simulación (dry-run) de automatizaciones sobre el historial de eventos.
+
+Reproduce los eventos de un rango contra las reglas y muestra las
+acciones que se habrían ejecutado. No escribe en la base de datos.
+
+Uso:
+    python scripts/simular_automatizaciones.py --desde 2024-11-01 --hasta 2024-11-30
+    python scripts/simular_automatizaciones.py --desde 2024-11-01 --hasta 2024-11-30 \\
+        --automatizacion 9 --automatizacion 10 --hogar 2
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Agregar el directorio padre al path para importar services y ui
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.automation_simulator import AutomationSimulator
+from ui.rich_utils import console, create_data_table
+
+
+def main():
+    """Función principal del script."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulación de automatizaciones SmartHome")
+    parser.add_argument("--desde", type=datetime.fromisoformat, required=True,
+                        help="Inicio del historial (YYYY-MM-DD[ HH:MM])")
+    parser.add_argument("--hasta", type=datetime.fromisoformat, required=True,
+                        help="Fin del historial (YYYY-MM-DD[ HH:MM])")
+    parser.add_argument("--automatizacion", type=int, action="append",
+                        help="ID de automatización a simular (repetible; default: todas las activas)")
+    parser.add_argument("--hogar", type=int, help="Limitar los eventos a un hogar")
+    parser.add_argument("--mostrar", type=int, default=50,
+                        help="Cantidad de acciones a listar (default: 50)")
+    args = parser.parse_args()
+
+    reporte = AutomationSimulator().simular(
+        args.desde, args.hasta, automation_ids=args.automatizacion, home_id=args.hogar
+    )
+    if reporte is None:
+        console.print("[red]✗ No se pudo ejecutar la simulación (ver logs)[/red]")
+        sys.exit(1)
+
+    console.print(
+        f"\n[cyan]Eventos:[/cyan] {reporte.eventos:,} | [cyan]Pulsos horarios:[/cyan] "
+        f"{reporte.pulsos:,} | [cyan]Acciones:[/cyan] {len(reporte.acciones):,} | "
+        f"[cyan]Cascadas cortadas:[/cyan] {reporte.cascadas_cortadas} | "
+        f"[cyan]Duración:[/cyan] {reporte.segundos:.2f}s\n"
+    )
+
+    columnas = [
+        ("Fecha", "dim", "left"),
+        ("Automatización", "cyan", "left"),
+        ("Disparador", "magenta", "left"),
+        ("Dispositivo", "yellow", "right"),
+        ("Acción", "green", "left"),
+        ("Estado", "white", "right"),
+    ]
+    filas = [
+        [
+            f"{a.timestamp:%Y-%m-%d %H:%M}",
+            a.automation_name,
+            a.trigger,
+            str(a.device_id),
+            a.action,
+            f"{a.previous_state_id} → {a.state_id}",
+        ]
+        for a in reporte.acciones[:args.mostrar]
+    ]
+    console.print(create_data_table("Acciones simuladas", columnas, filas))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,65 @@ Módulos:
 - auth_service: Autenticación y gestión de usuarios
 - device_service: Gestión de dispositivos inteligentes
 - automation_service: Gestión de automatizaciones domóticas
+- event_retention_service: Particiones y retención de eventos
+- event_analytics_service: Agregados (rollups) y analítica de eventos
+- device_state_store: Estado actual de los dispositivos en memoria
+- event_bus: Bus de publicación/suscripción de eventos del dominio
+- rule_engine: Motor de reglas de automatizaciones indexado por disparador
+- command_coalescer: Agrupación (debounce) de cambios de estado por dispositivo
+- scheduler: Planificador de tareas (cron y únicas) sobre una rueda de temporizadores
+- automation_simulator: Simulación de automatizaciones sobre el historial de eventos
+- device_history_service: Reconstrucción del estado de los dispositivos en el tiempo
+- telemetry_store: Telemetría numérica de sensores con niveles reducidos
+- energy_analytics_service: Consumo energético estimado (vectorizado con NumPy)
+- sensor_service: Ingreso de eventos y lecturas de sensores
+- anomaly_detector: Detección de anomalías en línea sobre los sensores
+- rate_limiter: Limitación de solicitudes (token bucket) por usuario y hogar
+- session_store: Sesiones autenticadas en memoria (tokens con vencimiento)
+- membership_cache: Hogares de cada usuario en memoria (verificación de permisos)
+- automation_home_index: Hogar de cada automatización en memoria
 """
 
 from .auth_service import AuthService
 from .device_service import DeviceService
 from .automation_service import AutomationService
+from .event_retention_service import EventRetentionService
+from .event_analytics_service import EventAnalyticsService
+from .device_state_store import DeviceStateStore
+from .event_bus import EventBus
+from .command_coalescer import CommandCoalescer
+from .rule_engine import RuleEngine
+from .scheduler import Scheduler
+from .automation_simulator import AutomationSimulator
+from .device_history_service import DeviceHistoryService
+from .telemetry_store import TelemetryStore
+from .energy_analytics_service import EnergyAnalyticsService
+from .sensor_service import SensorService
+from .anomaly_detector import AnomalyDetector
+from .rate_limiter import RateLimiter
+from .session_store import SessionStore
+from .membership_cache import MembershipCache
+from .automation_home_index import AutomationHomeIndex
 
-__all__ = ['AuthService', 'DeviceService', 'AutomationService']
+__all__ = [
+    'AuthService',
+    'DeviceService',
+    'AutomationService',
+    'EventRetentionService',
+    'EventAnalyticsService',
+    'DeviceStateStore',
+    'EventBus',
+    'CommandCoalescer',
+    'RuleEngine',
+    'Scheduler',
+    'AutomationSimulator',
+    'DeviceHistoryService',
+    'TelemetryStore',
+    'EnergyAnalyticsService',
+    'SensorService',
+    'AnomalyDetector',
+    'RateLimiter',
+    'SessionStore',
+    'MembershipCache',
+    'AutomationHomeIndex',
+]
@@ -0,0 +1,276 @@
+"""Detección de anomalías en línea sobre eventos y lecturas de sensores."""
+
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from dao.event_dao import EventDAO
+from dominio.messages import AnomalyDetected, EventOccurred, SensorReading
+from services.event_bus import ASINCRONO, EventBus, Suscripcion
+from utils.logger import get_device_logger
+
+# Logger de dispositivos
+logger = get_device_logger()
+
+# Tipos de anomalía
+ANOMALIA_VALOR = "valor"
+ANOMALIA_TASA = "tasa"
+
+# Origen de los eventos de alerta registrados en la tabla event
+SOURCE_ALERTA = "alerta"
+
+# Ventanas vacías que se incorporan a la media de la tasa tras un silencio
+# largo (más ventanas no cambian el resultado de forma apreciable)
+MAX_VENTANAS_VACIAS = 64
+
+
+class EstadisticaEwma:
+    """
+    Media y varianza con decaimiento exponencial (memoria O(1)).
+
+    Cada nueva observación pesa 'alfa' y las anteriores decaen
+    geométricamente, de modo que la estadística sigue cambios lentos
+    del sensor sin guardar ninguna ventana de valores.
+    """
+
+    __slots__ = ('media', 'varianza', 'n')
+
+    def __init__(self):
+        """Inicializa la estadística sin observaciones."""
+        self.media = 0.0
+        self.varianza = 0.0
+        self.n = 0
+
+    def actualizar(self, x: float, alfa: float) -> None:
+        """
+        Incorpora una observación.
+
+        Args:
+            x: Valor observado
+            alfa: Peso de la observación (0 < alfa <= 1)
+        """
+        if self.n == 0:
+            self.media = x
+        else:
+            diferencia = x - self.media
+            incremento = alfa * diferencia
+            self.media += incremento
+            self.varianza = (1.0 - alfa) * (self.varianza + diferencia * incremento)
+        self.n += 1
+
+    def desvio(self) -> float:
+        """Desvío estándar actual."""
+        return math.sqrt(self.varianza)
+
+
+class _Tasa:
+    """Conteo de eventos de un dispositivo por ventana fija y su EWMA."""
+
+    __slots__ = ('inicio', 'conteo', 'estadistica', 'alertada')
+
+    def __init__(self, inicio: float):
+        self.inicio = inicio
+        self.conteo = 0
+        self.estadistica = EstadisticaEwma()
+        self.alertada = False
+
+
+class AnomalyDetector:
+    """
+    Detector de anomalías en línea para los sensores.
+
+    - Lecturas numéricas: z-score respecto de la media y el desvío EWMA
+      de cada (dispositivo, métrica)
+    - Eventos de sensor: conteo por ventana fija comparado con la EWMA de
+      las ventanas anteriores (ráfagas de eventos)
+    - Estado O(1) por dispositivo y sin consultas a la BD por evento
+    - Cada anomalía se publica en el bus (AnomalyDetected) y se registra
+      como evento con source='alerta'; un período de enfriamiento evita
+      repetir la misma alerta en cada evento de una ráfaga
+    """
+
+    def __init__(
+        self,
+        alfa: float = 0.05,
+        umbral_z: float = 4.0,
+        muestras_minimas: int = 30,
+        ventana_segundos: float = 60.0,
+        umbral_tasa: float = 4.0,
+        eventos_minimos: int = 5,
+        enfriamiento: timedelta = timedelta(minutes=5),
+    ):
+        """
+        Inicializa el detector.
+
+        Args:
+            alfa: Peso de cada observación en las medias móviles
+            umbral_z: Desvíos a partir de los que una lectura es anómala
+            muestras_minimas: Observaciones antes de empezar a alertar
+            ventana_segundos: Duración de la ventana de conteo de eventos
+            umbral_tasa: Desvíos a partir de los que un conteo es anómalo
+            eventos_minimos: Conteo mínimo en la ventana para alertar
+            enfriamiento: Tiempo mínimo entre alertas del mismo tipo y origen
+        """
+        self.event_dao = EventDAO()
+        self.alfa = alfa
+        self.umbral_z = umbral_z
+        self.muestras_minimas = muestras_minimas
+        self.ventana_segundos = ventana_segundos
+        self.umbral_tasa = umbral_tasa
+        self.eventos_minimos = eventos_minimos
+        self.enfriamiento = enfriamiento
+        self.__valores: Dict[Tuple[int, str], EstadisticaEwma] = {}
+        self.__tasas: Dict[int, _Tasa] = {}
+        self.__ultimas_alertas: Dict[Tuple[int, str, Optional[str]], datetime] = {}
+        self.__lock = threading.Lock()
+        self.__suscripciones: List[Suscripcion] = []
+        self.__bus: Optional[EventBus] = None
+
+    def procesar_lectura(self, lectura: SensorReading) -> Optional[AnomalyDetected]:
+        """
+        Evalúa una lectura numérica y actualiza su estadística.
+
+        Args:
+            lectura: Lectura publicada por SensorService
+
+        Returns:
+            La anomalía detectada, o None
+        """
+        clave = (lectura.device_id, lectura.metric)
+        with self.__lock:
+            estadistica = self.__valores.get(clave)
+            if estadistica is None:
+                estadistica = self.__valores[clave] = EstadisticaEwma()
+
+            anomalia = None
+            if estadistica.n >= self.muestras_minimas:
+                esperado = estadistica.media
+                # Piso del desvío: un sensor constante no divide por cero
+                desvio = max(estadistica.desvio(), abs(esperado) * 1e-3, 1e-6)
+                z = (lectura.value - esperado) / desvio
+                if abs(z) >= self.umbral_z:
+                    anomalia = AnomalyDetected(
+                        lectura.device_id, ANOMALIA_VALOR, lectura.metric,
+                        lectura.value, esperado, z, lectura.timestamp,
+                    )
+            estadistica.actualizar(lectura.value, self.alfa)
+
+        return self.__alertar(anomalia) if anomalia else None
+
+    def procesar_evento(self, evento: EventOccurred) -> Optional[AnomalyDetected]:
+        """
+        Cuenta un evento de sensor y evalúa la tasa de su dispositivo.
+
+        Args:
+            evento: Evento publicado por SensorService
+
+        Returns:
+            La anomalía detectada, o None
+        """
+        if evento.source != "sensor" or evento.device_id is None:
+            return None
+
+        ventana = self.ventana_segundos
+        t = evento.timestamp.timestamp()
+        with self.__lock:
+            tasa = self.__tasas.get(evento.device_id)
+            if tasa is None:
+                tasa = self.__tasas[evento.device_id] = _Tasa(t - t % ventana)
+
+            if t >= tasa.inicio + ventana:
+                # Cierra la ventana actual y las vacías intermedias
+                cerradas = int((t - tasa.inicio) // ventana)
+                tasa.estadistica.actualizar(tasa.conteo, self.alfa)
+                for _ in range(min(cerradas - 1, MAX_VENTANAS_VACIAS)):
+                    tasa.estadistica.actualizar(0.0, self.alfa)
+                tasa.inicio += cerradas * ventana
+                tasa.conteo = 0
+                tasa.alertada = False
+            tasa.conteo += 1
+
+            anomalia = None
+            estadistica = tasa.estadistica
+            if (
+                not tasa.alertada
+                and estadistica.n >= self.muestras_minimas
+                and tasa.conteo >= self.eventos_minimos
+            ):
+                esperado = estadistica.media
+                # Piso de Poisson: con pocas ventanas con eventos el desvío EWMA subestima
+                desvio = max(estadistica.desvio(), math.sqrt(max(esperado, 1.0)))
+                z = (tasa.conteo - esperado) / desvio
+                if z >= self.umbral_tasa:
+                    tasa.alertada = True
+                    anomalia = AnomalyDetected(
+                        evento.device_id, ANOMALIA_TASA, None,
+                        float(tasa.conteo), esperado, z, evento.timestamp,
+                    )
+
+        return self.__alertar(anomalia) if anomalia else None
+
+    def __alertar(self, anomalia: AnomalyDetected) -> Optional[AnomalyDetected]:
+        """
+        Publica y registra una anomalía, respetando el enfriamiento.
+
+        Args:
+            anomalia: Anomalía detectada
+
+        Returns:
+            La anomalía, o None si se descartó por enfriamiento
+        """
+        clave = (anomalia.device_id, anomalia.kind, anomalia.metric)
+        with self.__lock:
+            ultima = self.__ultimas_alertas.get(clave)
+            if ultima is not None and anomalia.timestamp - ultima < self.enfriamiento:
+                return None
+            self.__ultimas_alertas[clave] = anomalia.timestamp
+
+        if anomalia.kind == ANOMALIA_VALOR:
+            descripcion = (
+                f"Lectura anómala de {anomalia.metric}: {anomalia.value:g} "
+                f"(esperado {anomalia.expected:.2f}, z={anomalia.score:.1f})"
+            )
+        else:
+            descripcion = (
+                f"Ráfaga de eventos: {anomalia.value:.0f} en {self.ventana_segundos:g}s "
+                f"(esperado {anomalia.expected:.2f}, z={anomalia.score:.1f})"
+            )
+        logger.warning(f"Anomalía en dispositivo {anomalia.device_id}: {descripcion}")
+        if not self.event_dao.registrar_evento(
+            anomalia.device_id, SOURCE_ALERTA, descripcion, anomalia.timestamp
+        ):
+            logger.error(f"No se pudo registrar la alerta del dispositivo {anomalia.device_id}")
+        (self.__bus or EventBus()).publicar(anomalia)
+        return anomalia
+
+    def conectar(self, bus: Optional[EventBus] = None, capacidad: int = 10000) -> None:
+        """
+        Suscribe el detector a los eventos y lecturas del bus.
+
+        La entrega es asíncrona para no demorar a quien registra la lectura;
+        la cola acotada descarta lo más antiguo si el detector se atrasa.
+
+        Args:
+            bus: Bus de eventos (por defecto el del proceso)
+            capacidad: Mensajes en cola por suscripción
+        """
+        bus = bus or EventBus()
+        self.desconectar(bus)
+        self.__bus = bus
+        self.__suscripciones = [
+            bus.suscribir(SensorReading, self.procesar_lectura, modo=ASINCRONO, capacidad=capacidad),
+            bus.suscribir(EventOccurred, self.procesar_evento, modo=ASINCRONO, capacidad=capacidad),
+        ]
+
+    def desconectar(self, bus: Optional[EventBus] = None) -> None:
+        """
+        Cancela las suscripciones del detector.
+
+        Args:
+            bus: Bus de eventos (por defecto el del proceso)
+        """
+        bus = bus or EventBus()
+        for suscripcion in self.__suscripciones:
+            bus.desuscribir(suscripcion)
+        self.__suscripciones = []
+        self.__bus = None
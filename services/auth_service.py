@@ -1,9 +1,13 @@
 """Servicio de autenticación y gestión de sesión."""
 
-from typing import Optional
+import asyncio
+from typing import FrozenSet, Optional
 from dao.user_dao import UserDAO
 from dao.role_dao import RoleDAO
 from dominio.user import User
+from services.membership_cache import MembershipCache
+from services.rate_limiter import actor_actual, establecer_actor
+from services.session_store import SessionStore
 from utils.logger import get_auth_logger, log_user_action, log_validation_error
 from utils.validators import (
     validar_credenciales_registro,
@@ -30,14 +34,21 @@ class AuthService:
     - Login/Logout
     - Validación de credenciales
     - Cambio de roles
-    - Gestión de sesión
+    - Gestión de sesión (usuario actual de la consola y tokens para
+      procesos que atienden a varios usuarios a la vez)
+    - Permisos sobre hogares y dispositivos (MembershipCache, sin la BD)
     """
     
     def __init__(self):
         """Inicializa el servicio de autenticación."""
         self.user_dao = UserDAO()
         self.role_dao = RoleDAO()
+        self.session_store = SessionStore()
+        self.membresias = MembershipCache()
+        # Los hogares de un usuario sin sesiones abiertas no se conservan en memoria
+        self.session_store.al_cerrar_ultima = self.membresias.invalidar
         self.usuario_actual: Optional[User] = None
+        self.token_actual: Optional[str] = None
     
     def registrar_usuario(self, email: str, password: str, name: str) -> tuple[bool, str]:
         """
@@ -109,14 +120,41 @@ class AuthService:
                 return False, mensaje
             
             usuario = self.user_dao.validar_credenciales(email, password)
+            return self.__abrir_sesion(email, usuario)
+                
+        except InvalidCredentialsException as e:
+            return handle_exception(e, logger)
+        except Exception as e:
+            logger.error(f"Error inesperado en login: {type(e).__name__} - {e}")
+            return False, "Ha ocurrido un error inesperado durante el inicio de sesión"
+    
+    async def iniciar_sesion_async(self, email: str, password: str) -> tuple[bool, str]:
+        """
+        Versión para asyncio de iniciar_sesion().
+        
+        La verificación del hash corre en el pool de contraseñas y se espera
+        sin bloquear el loop, de modo que varios inicios de sesión pueden
+        verificarse en paralelo.
+        
+        Args:
+            email: Email del usuario
+            password: Contraseña
             
-            if usuario:
-                self.usuario_actual = usuario
-                log_user_action(email, "LOGIN", f"role={usuario.role.name}")
-                return True, f"Bienvenido {usuario.name}!"
-            else:
-                logger.warning(f"Intento de login fallido: {email}")
-                raise InvalidCredentialsException()
+        Returns:
+            Tupla (éxito: bool, mensaje: str)
+        """
+        try:
+            email = limpiar_texto(email)
+            
+            es_valido, mensaje = validar_credenciales_login(email, password)
+            if not es_valido:
+                log_validation_error("login", email, mensaje)
+                return False, mensaje
+            
+            usuario = await asyncio.wrap_future(
+                self.user_dao.validar_credenciales_futuro(email, password)
+            )
+            return self.__abrir_sesion(email, usuario)
                 
         except InvalidCredentialsException as e:
             return handle_exception(e, logger)
@@ -124,11 +162,82 @@ class AuthService:
             logger.error(f"Error inesperado en login: {type(e).__name__} - {e}")
             return False, "Ha ocurrido un error inesperado durante el inicio de sesión"
     
-    def cerrar_sesion(self) -> None:
-        """Cierra la sesión actual."""
+    def __abrir_sesion(self, email: str, usuario: Optional[User]) -> tuple[bool, str]:
+        """
+        Abre la sesión de un usuario con credenciales ya verificadas.
+        
+        Args:
+            email: Email ingresado
+            usuario: Usuario validado (None si las credenciales no son válidas)
+            
+        Returns:
+            Tupla (éxito: bool, mensaje: str)
+            
+        Raises:
+            InvalidCredentialsException: Si no hay usuario
+        """
+        if not usuario:
+            logger.warning(f"Intento de login fallido: {email}")
+            raise InvalidCredentialsException()
+        
+        self.usuario_actual = usuario
+        self.token_actual = self.session_store.crear(usuario)
+        # Precarga de hogares: las verificaciones de permisos no van a la BD
+        self.membresias.cargar_usuario(usuario.email)
+        establecer_actor(usuario.email, usuario.role.name)
+        log_user_action(email, "LOGIN", f"role={usuario.role.name}")
+        return True, f"Bienvenido {usuario.name}!"
+    
+    def cerrar_sesion(self, token: Optional[str] = None) -> None:
+        """
+        Cierra una sesión.
+        
+        Args:
+            token: Token de la sesión a cerrar (por defecto: la sesión actual)
+        """
+        if token is not None and token != self.token_actual:
+            usuario = self.session_store.revocar(token)
+            if usuario:
+                log_user_action(usuario.email, "LOGOUT", "")
+            return
+
         if self.usuario_actual:
             log_user_action(self.usuario_actual.email, "LOGOUT", "")
+        self.session_store.revocar(self.token_actual)
         self.usuario_actual = None
+        self.token_actual = None
+        establecer_actor(None)
+    
+    def validar_sesion(self, token: Optional[str]) -> Optional[User]:
+        """
+        Obtiene el usuario de un token de sesión sin consultar la BD.
+        
+        Renueva el vencimiento de la sesión y define al usuario como
+        origen de las solicitudes del contexto actual (límite de solicitudes).
+        Con un token inválido o vencido el contexto queda sin usuario, para
+        no seguir cargando solicitudes a la sesión anterior.
+        
+        Args:
+            token: Token emitido al iniciar sesión
+            
+        Returns:
+            Usuario de la sesión o None si el token no es válido o venció
+        """
+        usuario = self.session_store.validar(token)
+        if usuario:
+            establecer_actor(usuario.email, usuario.role.name)
+        else:
+            establecer_actor(None)
+        return usuario
+    
+    def obtener_token(self) -> Optional[str]:
+        """
+        Retorna el token de la sesión actual.
+        
+        Returns:
+            Token o None si no hay sesión activa
+        """
+        return self.token_actual
     
     def obtener_usuario_actual(self) -> Optional[User]:
         """
@@ -148,6 +257,45 @@ class AuthService:
         """
         return self.usuario_actual and self.usuario_actual.is_admin()
     
+    def hogares_permitidos(self) -> FrozenSet[int]:
+        """
+        Obtiene los IDs de los hogares del usuario actual (desde memoria).
+        
+        Returns:
+            Conjunto de IDs (vacío si no hay sesión activa)
+        """
+        if not self.usuario_actual:
+            return frozenset()
+        return self.membresias.hogares_de(self.usuario_actual.email)
+    
+    def puede_acceder_hogar(self, home_id: int) -> bool:
+        """
+        Verifica si el usuario actual pertenece a un hogar.
+        
+        Args:
+            home_id: ID del hogar
+            
+        Returns:
+            True si hay sesión activa y el usuario está asociado al hogar
+        """
+        if not self.usuario_actual:
+            return False
+        return self.membresias.puede_acceder_hogar(self.usuario_actual.email, home_id)
+    
+    def puede_acceder_dispositivo(self, device_id: int) -> bool:
+        """
+        Verifica si el usuario actual pertenece al hogar de un dispositivo.
+        
+        Args:
+            device_id: ID del dispositivo
+            
+        Returns:
+            True si hay sesión activa y el dispositivo es de uno de sus hogares
+        """
+        if not self.usuario_actual:
+            return False
+        return self.membresias.puede_acceder_dispositivo(self.usuario_actual.email, device_id)
+    
     def obtener_datos_usuario(self) -> dict:
         """
         Obtiene los datos del usuario actual.
@@ -189,6 +337,15 @@ class AuthService:
         # Cambiar rol
         if self.user_dao.cambiar_rol(email, nuevo_rol_id):
             log_user_action(email, "ROLE_CHANGE", f"new_role={nuevo_rol.name}")
+            # Las sesiones abiertas guardan el rol anterior
+            self.session_store.revocar_usuario(email)
+            if self.usuario_actual and self.usuario_actual.email == email:
+                # Quien cambió su propio rol sigue en sesión, ya con el rol nuevo
+                self.usuario_actual.role = nuevo_rol
+                self.token_actual = self.session_store.crear(self.usuario_actual)
+            actor = actor_actual()
+            if actor and actor[0] == email:
+                establecer_actor(email, nuevo_rol.name)
             return True, f"Rol cambiado exitosamente a {nuevo_rol.name}"
         else:
             logger.error(f"Fallo al cambiar rol de {email} a {nuevo_rol_id}")
@@ -0,0 +1,107 @@
+"""Índice en memoria del hogar de cada automatización."""
+
+import threading
+from typing import Dict, Optional
+from dao.automation_dao import AutomationDAO
+from dominio.messages import AutomationChanged
+from services.event_bus import EventBus, Suscripcion
+from utils.logger import get_automation_logger
+
+# Logger de automatizaciones
+logger = get_automation_logger()
+
+
+class AutomationHomeIndex:
+    """
+    Hogar de cada automatización, para resolverlo sin consultar la BD.
+
+    - Implementa el patrón Singleton: un único índice por proceso
+    - Se carga una vez con una sola consulta (en la primera búsqueda si
+      no se cargó antes)
+    - Se mantiene al día con los AutomationChanged que publica
+      AutomationService (llevan el hogar; None si se eliminó)
+    """
+
+    _instance: Optional["AutomationHomeIndex"] = None
+
+    def __new__(cls):
+        """Implementa Singleton."""
+        if cls._instance is None:
+            cls._instance = super(AutomationHomeIndex, cls).__new__(cls)
+            cls._instance.__inicializar()
+        return cls._instance
+
+    def __inicializar(self) -> None:
+        """Inicializa el estado interno (una sola vez por proceso)."""
+        self.automation_dao = AutomationDAO()
+        self.__hogares: Dict[int, int] = {}
+        self.__cargado = False
+        self.__lock = threading.Lock()
+        self.__suscripcion: Optional[Suscripcion] = None
+
+    def cargar(self) -> bool:
+        """
+        Carga el hogar de todas las automatizaciones desde la BD.
+
+        Returns:
+            True si se cargó correctamente
+        """
+        hogares = self.automation_dao.listar_hogares()
+        if hogares is None:
+            logger.error("No se pudo cargar el índice de hogares de automatizaciones")
+            return False
+
+        with self.__lock:
+            self.__hogares = hogares
+            self.__cargado = True
+        return True
+
+    def hogar_de(self, automation_id: int) -> Optional[int]:
+        """
+        Obtiene el hogar de una automatización desde memoria.
+
+        Args:
+            automation_id: ID de la automatización
+
+        Returns:
+            ID del hogar o None si no se conoce
+        """
+        if not self.__cargado:
+            self.cargar()
+        return self.__hogares.get(automation_id)
+
+    def aplicar(self, cambio: AutomationChanged) -> None:
+        """
+        Registra el hogar de una automatización creada o modificada, o
+        la quita si se eliminó.
+
+        Args:
+            cambio: Cambio publicado en el bus
+        """
+        with self.__lock:
+            if cambio.home_id is None:
+                self.__hogares.pop(cambio.automation_id, None)
+            else:
+                self.__hogares[cambio.automation_id] = cambio.home_id
+
+    def conectar(self, bus: Optional[EventBus] = None) -> None:
+        """
+        Suscribe el índice a los cambios de automatizaciones.
+
+        Args:
+            bus: Bus de eventos (por defecto el del proceso)
+        """
+        bus = bus or EventBus()
+        self.desconectar(bus)
+        self.__suscripcion = bus.suscribir(AutomationChanged, self.aplicar)
+
+    def desconectar(self, bus: Optional[EventBus] = None) -> None:
+        """
+        Cancela la suscripción del índice.
+
+        Args:
+            bus: Bus de eventos (por defecto el del proceso)
+        """
+        if self.__suscripcion is not None:
+            (bus or EventBus()).desuscribir(self.__suscripcion)
+            self.__suscripcion = None
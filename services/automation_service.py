@@ -3,7 +3,13 @@
 from typing import List, Optional, Dict
 from dao.automation_dao import AutomationDAO
 from dao.home_dao import HomeDAO
+from dao.identity_map import sesion_identidad
 from dominio.automation import Automation
+from dominio.messages import AutomationChanged
+from dominio.summary import AutomationSummary
+from services.automation_home_index import AutomationHomeIndex
+from services.event_bus import EventBus
+from services.rate_limiter import RateLimiter
 from utils.logger import get_automation_logger, log_validation_error
 from utils.validators import validar_nombre, validar_descripcion, validar_id_positivo, limpiar_texto
 from utils.exceptions import (
@@ -11,6 +17,7 @@ from utils.exceptions import (
     AutomationNotFoundException,
     EntityStateException,
     DatabaseException,
+    RateLimitExceededException,
     handle_exception
 )
 
@@ -27,12 +34,17 @@ class AutomationService:
     - Activación/Desactivación de automatizaciones
     - Consulta de automatizaciones por hogar
     - Gestión de automatizaciones activas
+    - Aviso de cambios al motor de reglas (vía bus de eventos)
+    - Limitación de solicitudes por usuario y hogar en las operaciones de escritura
     """
     
     def __init__(self):
         """Inicializa el servicio de automatizaciones."""
         self.automation_dao = AutomationDAO()
         self.home_dao = HomeDAO()
+        self.event_bus = EventBus()
+        self.rate_limiter = RateLimiter()
+        self.hogares = AutomationHomeIndex()
     
     def crear_automatizacion(
         self,
@@ -72,6 +84,8 @@ class AutomationService:
             es_valido, mensaje = validar_id_positivo(home_id, "home_id")
             if not es_valido:
                 return False, mensaje
+
+            self.rate_limiter.verificar(home_id)
             
             # Validar que el hogar existe
             home = self.home_dao.obtener_por_id(home_id)
@@ -94,6 +108,8 @@ class AutomationService:
                     {"table": "automation", "name": nombre}
                 )
             
+            # Una automatización creada activa empieza a evaluarse sin reiniciar el motor
+            self.event_bus.publicar(AutomationChanged(automatizacion.id, home.id))
             estado = "activa" if activar else "inactiva"
             logger.info(
                 f"Automatización creada: {nombre} | home={home.name} | "
@@ -101,6 +117,8 @@ class AutomationService:
             )
             return True, f"Automatización creada exitosamente ({estado})"
             
+        except RateLimitExceededException as e:
+            return handle_exception(e)
         except EntityNotFoundException as e:
             return handle_exception(e, logger)
         except DatabaseException as e:
@@ -117,7 +135,8 @@ class AutomationService:
             Lista de automatizaciones
         """
         try:
-            return self.automation_dao.obtener_todos()
+            with sesion_identidad():
+                return self.automation_dao.obtener_todos()
         except Exception as e:
             logger.error(f"Error al listar automatizaciones: {e}")
             return []
@@ -155,7 +174,8 @@ class AutomationService:
             Lista de automatizaciones del hogar
         """
         try:
-            return self.automation_dao.obtener_por_hogar(home_id)
+            with sesion_identidad():
+                return self.automation_dao.obtener_por_hogar(home_id)
         except Exception as e:
             logger.error(f"Error al obtener automatizaciones del hogar {home_id}: {e}")
             return []
@@ -171,37 +191,69 @@ class AutomationService:
             Lista de automatizaciones activas
         """
         try:
-            return self.automation_dao.obtener_activas(home_id)
+            with sesion_identidad():
+                return self.automation_dao.obtener_activas(home_id)
         except Exception as e:
             logger.error(f"Error al obtener automatizaciones activas del hogar {home_id}: {e}")
             return []
     
     def obtener_automatizaciones_usuario(
         self, 
-        email_usuario: str
+        email_usuario: str,
+        solo_activas: bool = False
     ) -> Dict[str, List[Automation]]:
         """
         Obtiene todas las automatizaciones organizadas por hogar para un usuario.
         
         Args:
             email_usuario: Email del usuario
+            solo_activas: True para incluir solo automatizaciones activas
             
         Returns:
             Diccionario con hogares como claves y listas de automatizaciones como valores
         """
         try:
-            hogares = self.home_dao.obtener_hogares_usuario(email_usuario)
-            resultado = {}
-            
-            for hogar in hogares:
-                automatizaciones = self.automation_dao.obtener_por_hogar(hogar.id)
-                resultado[hogar.name] = automatizaciones
-            
-            return resultado
+            # Una sola consulta (JOIN) para todos los hogares del usuario
+            with sesion_identidad():
+                return self.automation_dao.obtener_por_usuario(email_usuario, solo_activas)
         except Exception as e:
             logger.error(f"Error al obtener automatizaciones del usuario {email_usuario}: {e}")
             return {}
     
+    def listar_resumen_automatizaciones(self) -> List[AutomationSummary]:
+        """
+        Obtiene el resumen de todas las automatizaciones para mostrar en tablas.
+        
+        Returns:
+            Lista de AutomationSummary
+        """
+        try:
+            return self.automation_dao.listar_resumen()
+        except Exception as e:
+            logger.error(f"Error al obtener resumen de automatizaciones: {e}")
+            return []
+    
+    def resumen_automatizaciones_usuario(
+        self,
+        email_usuario: str,
+        solo_activas: bool = False
+    ) -> Dict[str, List[AutomationSummary]]:
+        """
+        Obtiene el resumen de las automatizaciones de un usuario organizadas por hogar.
+        
+        Args:
+            email_usuario: Email del usuario
+            solo_activas: True para incluir solo automatizaciones activas
+            
+        Returns:
+            Diccionario con hogares como claves y listas de AutomationSummary como valores
+        """
+        try:
+            return self.automation_dao.listar_resumen_por_usuario(email_usuario, solo_activas)
+        except Exception as e:
+            logger.error(f"Error al obtener resumen de automatizaciones del usuario {email_usuario}: {e}")
+            return {}
+    
     def actualizar_automatizacion(
         self,
         automation_id: int,
@@ -220,6 +272,8 @@ class AutomationService:
             Tupla (éxito: bool, mensaje: str)
         """
         try:
+            self.rate_limiter.verificar(self.hogares.hogar_de(automation_id))
+
             # Obtener automatización
             automatizacion = self.automation_dao.obtener_por_id(automation_id)
             if not automatizacion:
@@ -255,6 +309,7 @@ class AutomationService:
                     {"table": "automation", "id": automation_id}
                 )
             
+            self.event_bus.publicar(AutomationChanged(automation_id, automatizacion.home.id))
             logger.info(
                 f"Automatización actualizada: ID={automation_id} | "
                 f"new_name={nuevo_nombre or 'sin cambios'} | "
@@ -262,6 +317,8 @@ class AutomationService:
             )
             return True, "Automatización actualizada exitosamente"
             
+        except RateLimitExceededException as e:
+            return handle_exception(e)
         except AutomationNotFoundException as e:
             return handle_exception(e, logger)
         except DatabaseException as e:
@@ -281,6 +338,8 @@ class AutomationService:
             Tupla (éxito: bool, mensaje: str)
         """
         try:
+            self.rate_limiter.verificar(self.hogares.hogar_de(automation_id))
+
             # Verificar que la automatización existe
             automatizacion = self.automation_dao.obtener_por_id(automation_id)
             if not automatizacion:
@@ -294,12 +353,15 @@ class AutomationService:
                     {"table": "automation", "id": automation_id}
                 )
             
+            self.event_bus.publicar(AutomationChanged(automation_id))
             logger.info(
                 f"Automatización eliminada: ID={automation_id} | "
                 f"name={automatizacion.name} | home={automatizacion.home.name}"
             )
             return True, f"Automatización '{automatizacion.name}' eliminada exitosamente"
             
+        except RateLimitExceededException as e:
+            return handle_exception(e)
         except AutomationNotFoundException as e:
             return handle_exception(e, logger)
         except DatabaseException as e:
@@ -319,6 +381,8 @@ class AutomationService:
             Tupla (éxito: bool, mensaje: str)
         """
         try:
+            self.rate_limiter.verificar(self.hogares.hogar_de(automation_id))
+
             # Verificar que la automatización existe
             automatizacion = self.automation_dao.obtener_por_id(automation_id)
             if not automatizacion:
@@ -339,12 +403,15 @@ class AutomationService:
                     {"table": "automation", "id": automation_id, "action": "activate"}
                 )
             
+            self.event_bus.publicar(AutomationChanged(automation_id, automatizacion.home.id))
             logger.info(
                 f"Automatización activada: ID={automation_id} | "
                 f"name={automatizacion.name}"
             )
             return True, f"Automatización '{automatizacion.name}' activada exitosamente"
             
+        except RateLimitExceededException as e:
+            return handle_exception(e)
         except AutomationNotFoundException as e:
             return handle_exception(e, logger)
         except EntityStateException as e:
@@ -366,6 +433,8 @@ class AutomationService:
             Tupla (éxito: bool, mensaje: str)
         """
         try:
+            self.rate_limiter.verificar(self.hogares.hogar_de(automation_id))
+
             # Verificar que la automatización existe
             automatizacion = self.automation_dao.obtener_por_id(automation_id)
             if not automatizacion:
@@ -386,12 +455,15 @@ class AutomationService:
                     {"table": "automation", "id": automation_id, "action": "deactivate"}
                 )
             
+            self.event_bus.publicar(AutomationChanged(automation_id, automatizacion.home.id))
             logger.info(
                 f"Automatización desactivada: ID={automation_id} | "
                 f"name={automatizacion.name}"
             )
             return True, f"Automatización '{automatizacion.name}' desactivada exitosamente"
             
+        except RateLimitExceededException as e:
+            return handle_exception(e)
         except AutomationNotFoundException as e:
             return handle_exception(e, logger)
         except EntityStateException as e:
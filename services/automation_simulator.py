@@ -0,0 +1,299 @@
+"""Simulación (dry-run) de automatizaciones sobre el historial de eventos."""
+
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from dao.automation_rule_dao import AutomationRuleDAO
+from dao.event_dao import EventDAO
+from dominio.automation_rule import AutomationRule
+from dominio.messages import ClockTick, DeviceStateChanged, EventOccurred
+from services.device_history_service import ESTADO_ELIMINADO, DeviceHistoryService
+from services.rule_engine import RuleEngine
+from utils.logger import get_automation_logger
+
+# Logger de automatizaciones
+logger = get_automation_logger()
+
+
+class SimulatedAction(NamedTuple):
+    """
+    Acción que una automatización habría ejecutado.
+
+    Atributos:
+        timestamp: Momento del evento que la disparó
+        automation_id: Automatización disparada
+        automation_name: Nombre de la automatización
+        trigger: Tipo de mensaje que la disparó
+        device_id: Dispositivo afectado
+        action: Descripción de la acción
+        previous_state_id: Estado simulado antes de la acción
+        state_id: Estado aplicado
+    """
+
+    timestamp: datetime
+    automation_id: int
+    automation_name: str
+    trigger: str
+    device_id: int
+    action: str
+    previous_state_id: Optional[int]
+    state_id: int
+
+
+class SimulationReport(NamedTuple):
+    """
+    Resultado de una simulación.
+
+    Atributos:
+        eventos: Eventos del historial procesados
+        pulsos: Pulsos de reloj generados para los disparadores horarios
+        acciones: Acciones que se habrían ejecutado, en orden
+        por_automatizacion: Cantidad de acciones por automation_id
+        estados_finales: Estado simulado de cada dispositivo al terminar
+        cascadas_cortadas: Cadenas de reglas interrumpidas por max_cascada
+        segundos: Duración de la simulación
+    """
+
+    eventos: int
+    pulsos: int
+    acciones: List[SimulatedAction]
+    por_automatizacion: Dict[int, int]
+    estados_finales: Dict[int, int]
+    cascadas_cortadas: int
+    segundos: float
+
+
+def pulsos_entre(
+    desde: datetime, hasta: datetime, horarios: List[Tuple[int, int]]
+) -> Iterator[datetime]:
+    """
+    Minutos con reglas horarias en el intervalo (desde, hasta].
+
+    Solo se generan los minutos que tienen alguna regla, no los 1440 de
+    cada día.
+
+    Args:
+        desde: Inicio del intervalo (excluido)
+        hasta: Fin del intervalo (incluido)
+        horarios: Lista ordenada de (hora, minuto)
+
+    Yields:
+        Instantes en orden cronológico
+    """
+    if not horarios or hasta <= desde:
+        return
+    dia = desde.replace(hour=0, minute=0, second=0, microsecond=0)
+    while dia <= hasta:
+        for hora, minuto in horarios:
+            instante = dia.replace(hour=hora, minute=minuto)
+            if instante > hasta:
+                return
+            if instante > desde:
+                yield instante
+        dia += timedelta(days=1)
+
+
+class AutomationSimulator:
+    """
+    Reproduce el historial de eventos contra las reglas de automatización
+    sin escribir en la base de datos.
+
+    - Lee la tabla event en orden cronológico y por lotes (streaming)
+    - Usa el mismo índice por disparador que el motor en producción
+    - Mantiene una copia en memoria del estado de los dispositivos, que
+      parte del estado reconstruido al inicio del rango: los cambios de
+      estado del historial y las acciones simuladas cambian esa copia y
+      pueden disparar otras reglas; las bajas quitan el dispositivo
+    """
+
+    def __init__(self, max_cascada: int = 16):
+        """
+        Inicializa el simulador.
+
+        Args:
+            max_cascada: Máximo de cambios encadenados por cada evento
+                (corta ciclos entre reglas que se disparan mutuamente)
+        """
+        self.rule_dao = AutomationRuleDAO()
+        self.event_dao = EventDAO()
+        self.history_service = DeviceHistoryService()
+        self.max_cascada = max_cascada
+
+    def cargar_reglas(
+        self, automation_ids: Optional[Iterable[int]] = None
+    ) -> Optional[List[AutomationRule]]:
+        """
+        Obtiene las reglas a simular.
+
+        Args:
+            automation_ids: Automatizaciones a simular, aunque estén
+                desactivadas (None para todas las activas)
+
+        Returns:
+            Lista de reglas o None si hubo un error de BD
+        """
+        if automation_ids is None:
+            return self.rule_dao.obtener_reglas()
+        reglas = []
+        for automation_id in automation_ids:
+            encontradas = self.rule_dao.obtener_reglas(automation_id, solo_activas=False)
+            if encontradas is None:
+                return None
+            reglas.extend(encontradas)
+        return reglas
+
+    def simular(
+        self,
+        desde: datetime,
+        hasta: datetime,
+        automation_ids: Optional[Iterable[int]] = None,
+        home_id: Optional[int] = None,
+        estados_iniciales: Optional[Dict[int, int]] = None,
+    ) -> Optional[SimulationReport]:
+        """
+        Simula las automatizaciones sobre los eventos de un rango.
+
+        Args:
+            desde: Inicio del historial
+            hasta: Fin del historial
+            automation_ids: Automatizaciones a simular (None para las activas)
+            home_id: Limitar los eventos a un hogar (opcional)
+            estados_iniciales: {device_id: state_id} al inicio del rango
+                (por defecto el reconstruido con DeviceHistoryService)
+
+        Returns:
+            SimulationReport o None si no se pudieron leer las reglas o estados
+        """
+        reglas = self.cargar_reglas(automation_ids)
+        if estados_iniciales is None:
+            estados = self.history_service.estado_en(desde, home_id)
+            estados_iniciales = None if estados is None else {
+                device_id: estado.state_id for device_id, estado in estados.items()
+            }
+        if reglas is None or estados_iniciales is None:
+            logger.error("Simulación cancelada: no se pudieron leer reglas o estados")
+            return None
+
+        return self.simular_eventos(
+            self.event_dao.iterar_por_fecha(desde, hasta, home_id), reglas, estados_iniciales, desde, hasta
+        )
+
+    def simular_eventos(
+        self,
+        filas: Iterable[Dict],
+        reglas: List[AutomationRule],
+        estados_iniciales: Dict[int, int],
+        desde: datetime,
+        hasta: datetime,
+    ) -> SimulationReport:
+        """
+        Simula un flujo de filas de eventos (ordenadas por fecha).
+
+        Las filas con state_id son cambios de estado del historial: se
+        aplican a los estados en memoria y se evalúan como
+        DeviceStateChanged; las de ESTADO_ELIMINADO quitan el dispositivo.
+        El resto se evalúa como EventOccurred.
+
+        Args:
+            filas: Diccionarios con date_time_value, device_id, source,
+                description y opcionalmente state_id y home_id
+            reglas: Reglas a evaluar
+            estados_iniciales: {device_id: state_id} al inicio
+            desde: Inicio del rango (para los pulsos de reloj)
+            hasta: Fin del rango
+
+        Returns:
+            SimulationReport
+        """
+        inicio = time.perf_counter()
+        motor = RuleEngine(ejecutor=lambda regla, mensaje: None)
+        for regla in reglas:
+            motor.registrar(regla)
+        horarios = motor.horarios()
+
+        estados = dict(estados_iniciales)
+        eliminados = set()
+        acciones: List[SimulatedAction] = []
+        contadores = {'eventos': 0, 'pulsos': 0, 'cortadas': 0}
+        # Los pulsos se generan perezosamente: cada evento solo compara su
+        # fecha con el próximo pulso pendiente
+        pulsos = pulsos_entre(desde - timedelta(microseconds=1), hasta, horarios)
+        proximo_pulso = next(pulsos, None)
+
+        def procesar(mensaje: object, instante: datetime) -> None:
+            reglas_evento = motor.reglas_para(mensaje)
+            if not reglas_evento:
+                return
+            pendientes = deque([(mensaje, reglas_evento)])
+            cambios = 0
+            while pendientes:
+                actual, coincidentes = pendientes.popleft()
+                for regla in coincidentes:
+                    for accion in regla.actions:
+                        anterior = estados.get(accion.device_id)
+                        if (accion.state_id is None or anterior == accion.state_id
+                                or accion.device_id in eliminados):
+                            continue
+                        if cambios >= self.max_cascada:
+                            contadores['cortadas'] += 1
+                            return
+                        cambios += 1
+                        estados[accion.device_id] = accion.state_id
+                        acciones.append(SimulatedAction(
+                            instante, regla.automation_id, regla.name, type(actual).__name__,
+                            accion.device_id, accion.action, anterior, accion.state_id,
+                        ))
+                        # El nombre del estado no interviene en las claves del índice
+                        cambio = DeviceStateChanged(
+                            accion.device_id, regla.home_id, accion.state_id,
+                            "", anterior, instante,
+                        )
+                        pendientes.append((cambio, motor.reglas_para(cambio)))
+
+        for fila in filas:
+            instante = fila['date_time_value']
+            while proximo_pulso is not None and proximo_pulso <= instante:
+                contadores['pulsos'] += 1
+                procesar(ClockTick(proximo_pulso), proximo_pulso)
+                proximo_pulso = next(pulsos, None)
+            contadores['eventos'] += 1
+            state_id = fila.get('state_id')
+            if state_id is None:
+                procesar(
+                    EventOccurred(fila['device_id'], fila['source'], fila['description'], instante),
+                    instante,
+                )
+            elif state_id == ESTADO_ELIMINADO:
+                estados.pop(fila['device_id'], None)
+                eliminados.add(fila['device_id'])
+            else:
+                anterior = estados.get(fila['device_id'])
+                estados[fila['device_id']] = state_id
+                eliminados.discard(fila['device_id'])
+                procesar(
+                    DeviceStateChanged(
+                        fila['device_id'], fila.get('home_id'), state_id, "", anterior,
+                        instante, fila['source'],
+                    ),
+                    instante,
+                )
+        while proximo_pulso is not None:
+            contadores['pulsos'] += 1
+            procesar(ClockTick(proximo_pulso), proximo_pulso)
+            proximo_pulso = next(pulsos, None)
+
+        segundos = time.perf_counter() - inicio
+        logger.info(
+            f"Simulación: {contadores['eventos']} eventos, {len(acciones)} acciones "
+            f"en {segundos:.2f}s"
+        )
+        return SimulationReport(
+            eventos=contadores['eventos'],
+            pulsos=contadores['pulsos'],
+            acciones=acciones,
+            por_automatizacion=dict(Counter(a.automation_id for a in acciones)),
+            estados_finales=estados,
+            cascadas_cortadas=contadores['cortadas'],
+            segundos=segundos,
+        )
@@ -0,0 +1,255 @@
+"""Coalescencia (debounce) de cambios de estado rápidos por dispositivo."""
+
+import heapq
+import os
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from conn.db_connection import DatabaseConnection
+from services.device_service import DeviceService
+from services.device_state_store import DeviceStateStore
+from utils.logger import get_device_logger
+
+# Logger de dispositivos
+logger = get_device_logger()
+
+
+class CoalescerMetrics(NamedTuple):
+    """
+    Contadores acumulados del coalescedor.
+
+    Atributos:
+        solicitudes: Cambios de estado pedidos
+        escrituras: Cambios aplicados (una escritura y un evento cada uno)
+        combinadas: Solicitudes absorbidas por un cambio ya pendiente
+        sin_cambio: Solicitudes o ráfagas que terminaron en el estado actual
+        errores: Cambios que DeviceService no pudo aplicar
+    """
+
+    solicitudes: int
+    escrituras: int
+    combinadas: int
+    sin_cambio: int
+    errores: int
+
+    @property
+    def tasa_coalescencia(self) -> float:
+        """Fracción de solicitudes que no generaron una escritura."""
+        if self.solicitudes == 0:
+            return 0.0
+        return 1.0 - self.escrituras / self.solicitudes
+
+
+class _Pendiente:
+    """Estado destino pendiente de un dispositivo durante su ventana."""
+
+    __slots__ = ('state_id', 'origen', 'vence')
+
+    def __init__(self, state_id: int, origen: str, vence: float = 0.0):
+        self.state_id = state_id
+        self.origen = origen
+        self.vence = vence
+
+
+class CommandCoalescer:
+    """
+    Agrupa los cambios de estado de un mismo dispositivo dentro de una ventana.
+
+    - Implementa el patrón Singleton: una única cola de pendientes por proceso
+    - El primer cambio abre una ventana; los siguientes solo reemplazan el
+      estado destino
+    - Al cerrar la ventana se aplica el último estado pedido con una sola
+      llamada a DeviceService (una escritura en la BD y un evento)
+    - Si la ráfaga termina en el estado actual (ej: encender y apagar) no se
+      escribe nada
+    - Un único hilo cierra las ventanas vencidas de todos los dispositivos,
+      con una sola conexión a la BD
+    """
+
+    _instance: Optional["CommandCoalescer"] = None
+
+    def __new__(cls):
+        """Implementa Singleton."""
+        if cls._instance is None:
+            cls._instance = super(CommandCoalescer, cls).__new__(cls)
+            cls._instance.__inicializar()
+        return cls._instance
+
+    def __inicializar(self) -> None:
+        """Inicializa el estado interno (una sola vez por proceso)."""
+        self.device_service = DeviceService()
+        self.state_store = DeviceStateStore()
+        self.ventana_segundos = float(os.getenv("DEVICE_COMMAND_DEBOUNCE_MS", "250")) / 1000
+        self.__pendientes: Dict[int, _Pendiente] = {}
+        self.__vencimientos: List[Tuple[float, int]] = []
+        self.__contadores = dict.fromkeys(CoalescerMetrics._fields, 0)
+        self.__lock = threading.Lock()
+        self.__condicion = threading.Condition(self.__lock)
+        self.__hilo: Optional[threading.Thread] = None
+        self.__detenido = False
+
+    def solicitar(self, device_id: int, state_id: int, origen: str = "manual") -> bool:
+        """
+        Pide llevar un dispositivo a un estado.
+
+        El cambio se aplica al cerrar la ventana del dispositivo (o de
+        inmediato si la ventana es 0).
+
+        Args:
+            device_id: ID del dispositivo
+            state_id: ID del estado destino
+            origen: Origen del cambio ('manual' o 'automatización')
+
+        Returns:
+            True si el cambio quedó pendiente, False si el dispositivo ya
+            está en ese estado y no hay otro cambio pendiente
+        """
+        with self.__lock:
+            self.__contadores['solicitudes'] += 1
+            pendiente = self.__pendientes.get(device_id)
+            if pendiente is not None:
+                pendiente.state_id = state_id
+                pendiente.origen = origen
+                self.__contadores['combinadas'] += 1
+                return True
+
+        actual = self.state_store.obtener(device_id)
+        if actual is not None and actual.state_id == state_id:
+            with self.__lock:
+                self.__contadores['sin_cambio'] += 1
+            return False
+
+        if self.ventana_segundos <= 0:
+            self.__aplicar(device_id, _Pendiente(state_id, origen))
+            return True
+
+        with self.__lock:
+            pendiente = self.__pendientes.get(device_id)
+            if pendiente is not None:
+                # Otro hilo abrió la ventana mientras se leía el estado actual
+                pendiente.state_id = state_id
+                pendiente.origen = origen
+                self.__contadores['combinadas'] += 1
+                return True
+            vence = time.monotonic() + self.ventana_segundos
+            self.__pendientes[device_id] = _Pendiente(state_id, origen, vence)
+            heapq.heappush(self.__vencimientos, (vence, device_id))
+            self.__iniciar_hilo()
+            self.__condicion.notify()
+        return True
+
+    def __iniciar_hilo(self) -> None:
+        """Inicia el hilo que cierra las ventanas si no está corriendo (con el lock tomado)."""
+        if self.__hilo is not None and self.__hilo.is_alive():
+            return
+        self.__detenido = False
+        self.__hilo = threading.Thread(
+            target=self.__bucle, name="command-coalescer", daemon=True
+        )
+        self.__hilo.start()
+
+    def __bucle(self) -> None:
+        """Aplica las ventanas a medida que vencen, reutilizando la conexión del hilo."""
+        with DatabaseConnection().unidad_de_trabajo():
+            while True:
+                with self.__condicion:
+                    vencidos = self.__esperar_vencidos()
+                if vencidos is None:
+                    return
+                for device_id, pendiente in vencidos:
+                    self.__aplicar(device_id, pendiente)
+
+    def __esperar_vencidos(self) -> Optional[List[Tuple[int, _Pendiente]]]:
+        """
+        Espera (con el lock tomado) a que venza al menos una ventana.
+
+        Returns:
+            Pendientes vencidos, ya quitados de la cola, o None al detener
+        """
+        while not self.__detenido:
+            ahora = time.monotonic()
+            vencidos = []
+            while self.__vencimientos and self.__vencimientos[0][0] <= ahora:
+                vence, device_id = heapq.heappop(self.__vencimientos)
+                pendiente = self.__pendientes.get(device_id)
+                # Entradas de ventanas ya aplicadas por vaciar() se descartan
+                if pendiente is not None and pendiente.vence == vence:
+                    del self.__pendientes[device_id]
+                    vencidos.append((device_id, pendiente))
+            if vencidos:
+                return vencidos
+            espera = self.__vencimientos[0][0] - ahora if self.__vencimientos else None
+            self.__condicion.wait(espera)
+        return None
+
+    def __aplicar(self, device_id: int, pendiente: _Pendiente) -> None:
+        """
+        Aplica un cambio de estado a través de DeviceService.
+
+        Args:
+            device_id: ID del dispositivo
+            pendiente: Estado destino y origen
+        """
+        try:
+            actual = self.state_store.obtener(device_id)
+            if actual is not None and actual.state_id == pendiente.state_id:
+                with self.__lock:
+                    self.__contadores['sin_cambio'] += 1
+                return
+
+            exito, mensaje = self.device_service.cambiar_estado_dispositivo(
+                device_id, pendiente.state_id, pendiente.origen
+            )
+        except Exception as e:
+            exito, mensaje = False, str(e)
+
+        with self.__lock:
+            self.__contadores['escrituras' if exito else 'errores'] += 1
+        if not exito:
+            logger.warning(
+                f"Cambio de estado del dispositivo {device_id} a {pendiente.state_id} "
+                f"no aplicado: {mensaje}"
+            )
+
+    def vaciar(self) -> int:
+        """
+        Aplica de inmediato todos los cambios pendientes (ej: al cerrar la app).
+
+        Returns:
+            Cantidad de dispositivos con un cambio pendiente
+        """
+        with self.__lock:
+            pendientes, self.__pendientes = self.__pendientes, {}
+            self.__vencimientos = []
+        for device_id, pendiente in pendientes.items():
+            self.__aplicar(device_id, pendiente)
+        return len(pendientes)
+
+    def detener(self) -> None:
+        """Detiene el hilo de las ventanas (los cambios pendientes se aplican antes con vaciar)."""
+        with self.__condicion:
+            self.__detenido = True
+            self.__condicion.notify()
+            hilo, self.__hilo = self.__hilo, None
+        if hilo is not None:
+            hilo.join(timeout=5)
+
+    def pendientes(self) -> int:
+        """
+        Cantidad de dispositivos con una ventana abierta.
+
+        Returns:
+            Dispositivos con un cambio pendiente
+        """
+        with self.__lock:
+            return len(self.__pendientes)
+
+    def metricas(self) -> CoalescerMetrics:
+        """
+        Obtiene los contadores acumulados.
+
+        Returns:
+            CoalescerMetrics
+        """
+        with self.__lock:
+            return CoalescerMetrics(**self.__contadores)
@@ -0,0 +1,198 @@
+"""Servicio de historial de estados de dispositivos (reconstrucción en el tiempo)."""
+
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from dao.device_state_snapshot_dao import DeviceStateSnapshotDAO
+from dao.event_dao import EventDAO
+from dao.state_dao import StateDAO
+from dominio.messages import DeviceCreated, DeviceDeleted, DeviceStateChanged
+from dominio.summary import DeviceStatus
+from services.event_bus import EventBus, SINCRONO, Suscripcion
+from utils.logger import get_device_logger
+
+# Logger de dispositivos
+logger = get_device_logger()
+
+# state_id del delta que registra la baja de un dispositivo (los ids reales empiezan en 1)
+ESTADO_ELIMINADO = 0
+
+# Límite inferior de las consultas sin instantánea previa (rango de DATETIME en MySQL)
+INICIO_HISTORIAL = datetime(1000, 1, 1)
+
+
+class DeviceHistoryService:
+    """
+    Reconstruye el estado de los dispositivos en cualquier momento pasado.
+
+    - Toma instantáneas periódicas y compactas del estado de todos los
+      dispositivos (device_state_snapshot)
+    - Registra cada cambio de estado como evento con su state_id (deltas),
+      también el alta (estado inicial) y la baja (ESTADO_ELIMINADO) de
+      cada dispositivo
+    - El estado en un instante T es la instantánea más reciente anterior
+      a T más los deltas entre ambas: el costo de una consulta queda
+      acotado por el intervalo entre instantáneas, no por la antigüedad de T
+    """
+
+    def __init__(self, dias_retencion: Optional[int] = None):
+        """
+        Inicializa el servicio.
+
+        Args:
+            dias_retencion: Días que se conservan las instantáneas
+                (por defecto DEVICE_STATE_SNAPSHOT_RETENTION_DAYS o 400)
+        """
+        self.snapshot_dao = DeviceStateSnapshotDAO()
+        self.event_dao = EventDAO()
+        self.state_dao = StateDAO()
+        self.dias_retencion = dias_retencion or int(
+            os.getenv("DEVICE_STATE_SNAPSHOT_RETENTION_DAYS", "400")
+        )
+        self.__suscripciones: List[Suscripcion] = []
+
+    def tomar_snapshot(self, instante: Optional[datetime] = None) -> tuple[bool, str]:
+        """
+        Guarda una instantánea del estado actual y depura las vencidas.
+
+        Args:
+            instante: Momento de la instantánea (por defecto: ahora)
+
+        Returns:
+            Tupla (éxito: bool, mensaje: str)
+        """
+        instante = instante or datetime.now()
+        cantidad = self.snapshot_dao.tomar(instante)
+        if cantidad < 0:
+            logger.error("No se pudo guardar la instantánea de estados")
+            return False, "Error al guardar la instantánea de estados"
+
+        eliminadas = self.snapshot_dao.eliminar_anteriores(
+            instante - timedelta(days=self.dias_retencion)
+        )
+        logger.info(
+            f"Instantánea de estados: {cantidad} dispositivos | "
+            f"vencidas eliminadas={max(eliminadas, 0)}"
+        )
+        return True, f"Instantánea guardada ({cantidad} dispositivos)"
+
+    def estado_en(
+        self, instante: datetime, home_id: Optional[int] = None
+    ) -> Optional[Dict[int, DeviceStatus]]:
+        """
+        Reconstruye el estado de los dispositivos en un momento.
+
+        Args:
+            instante: Momento a consultar
+            home_id: Limitar a los dispositivos de un hogar (opcional)
+
+        Returns:
+            Diccionario {device_id: DeviceStatus} o None si hubo un error
+        """
+        try:
+            snapshot = self.snapshot_dao.obtener_anterior(instante)
+            if snapshot is None:
+                # Sin instantánea previa solo se conocen los dispositivos
+                # que cambiaron de estado desde el inicio del historial
+                logger.warning(f"No hay instantánea anterior a {instante}; se usan solo los eventos")
+                desde = INICIO_HISTORIAL
+                estados: Dict[int, Tuple[Optional[int], int]] = {}
+            else:
+                desde = snapshot.taken_at
+                estados = {
+                    device_id: (hogar, state_id)
+                    for device_id, hogar, state_id in snapshot.estados
+                }
+
+            # Los deltas son estados absolutos: los del mismo instante que la
+            # instantánea se reaplican por si se registraron después de leerla
+            cambios = self.event_dao.iterar_cambios_estado(
+                desde, instante, incluir_desde=snapshot is not None
+            )
+            for fila in cambios:
+                if fila['state_id'] == ESTADO_ELIMINADO:
+                    estados.pop(fila['device_id'], None)
+                    continue
+                anterior = estados.get(fila['device_id'])
+                hogar = fila['home_id'] if fila['home_id'] is not None else (anterior and anterior[0])
+                estados[fila['device_id']] = (hogar, fila['state_id'])
+
+            nombres = {estado.id: estado.name for estado in self.state_dao.obtener_todos()}
+            return {
+                device_id: DeviceStatus(device_id, state_id, nombres.get(state_id, ""))
+                for device_id, (hogar, state_id) in sorted(estados.items())
+                if home_id is None or hogar == home_id
+            }
+        except Exception as e:
+            logger.error(f"Error al reconstruir estados en {instante}: {e}")
+            return None
+
+    def registrar_cambio(self, mensaje: DeviceStateChanged) -> None:
+        """
+        Registra un cambio de estado publicado en el bus como delta.
+
+        Args:
+            mensaje: Cambio de estado publicado por DeviceService
+        """
+        descripcion = f"Estado cambiado a '{mensaje.state_name}'"
+        if not self.event_dao.registrar_cambio_estado(
+            mensaje.device_id, mensaje.state_id, descripcion, mensaje.source, mensaje.timestamp
+        ):
+            logger.error(
+                f"No se pudo registrar el cambio de estado del dispositivo {mensaje.device_id}"
+            )
+
+    def registrar_alta(self, mensaje: DeviceCreated) -> None:
+        """
+        Registra el estado inicial de un dispositivo nuevo como delta.
+
+        Args:
+            mensaje: Alta publicada por DeviceService
+        """
+        if not self.event_dao.registrar_cambio_estado(
+            mensaje.device_id, mensaje.state_id, "Dispositivo creado", "sistema", mensaje.timestamp
+        ):
+            logger.error(f"No se pudo registrar el alta del dispositivo {mensaje.device_id}")
+
+    def registrar_baja(self, mensaje: DeviceDeleted) -> None:
+        """
+        Registra la baja de un dispositivo como delta (ESTADO_ELIMINADO).
+
+        Args:
+            mensaje: Baja publicada por DeviceService
+        """
+        if not self.event_dao.registrar_cambio_estado(
+            mensaje.device_id, ESTADO_ELIMINADO, "Dispositivo eliminado", "sistema", mensaje.timestamp
+        ):
+            logger.error(f"No se pudo registrar la baja del dispositivo {mensaje.device_id}")
+
+    def conectar(self, bus: Optional[EventBus] = None) -> None:
+        """
+        Suscribe el registro de cambios a los eventos del bus.
+
+        La suscripción es síncrona: el delta se escribe en el mismo hilo
+        que confirmó el cambio, así ningún cambio queda fuera del historial
+        por un mensaje descartado en una cola.
+
+        Args:
+            bus: Bus de eventos (por defecto el del proceso)
+        """
+        bus = bus or EventBus()
+        self.desconectar(bus)
+        self.__suscripciones = [
+            bus.suscribir(DeviceStateChanged, self.registrar_cambio, modo=SINCRONO),
+            bus.suscribir(DeviceCreated, self.registrar_alta, modo=SINCRONO),
+            bus.suscribir(DeviceDeleted, self.registrar_baja, modo=SINCRONO),
+        ]
+
+    def desconectar(self, bus: Optional[EventBus] = None) -> None:
+        """
+        Cancela la suscripción al bus.
+
+        Args:
+            bus: Bus de eventos (por defecto el del proceso)
+        """
+        bus = bus or EventBus()
+        for suscripcion in self.__suscripciones:
+            bus.desuscribir(suscripcion)
+        self.__suscripciones = []
@@ -1,18 +1,27 @@
 """Servicio de gestión de dispositivos."""
 
+from datetime import datetime
 from typing import List, Optional, Dict
 from dao.device_dao import DeviceDAO
 from dao.home_dao import HomeDAO
 from dao.state_dao import StateDAO
 from dao.device_type_dao import DeviceTypeDAO
 from dao.location_dao import LocationDAO
+from dao.identity_map import sesion_identidad
 from dominio.device import Device
+from dominio.messages import DeviceCreated, DeviceDeleted, DeviceStateChanged
+from dominio.state import State
+from dominio.summary import DeviceStatus, DeviceSummary
+from services.device_state_store import DeviceStateStore
+from services.event_bus import EventBus
+from services.rate_limiter import RateLimiter
 from utils.logger import get_device_logger, log_validation_error
 from utils.validators import validar_nombre, validar_id_positivo, limpiar_texto
 from utils.exceptions import (
     EntityNotFoundException,
     DeviceNotFoundException,
     DatabaseException,
+    RateLimitExceededException,
     handle_exception
 )
 
@@ -27,7 +36,9 @@ class DeviceService:
     Responsabilidades:
     - CRUD de dispositivos
     - Búsqueda y filtrado
-    - Cambio de estados
+    - Cambio de estados (registro en el store en memoria y publicación en el bus);
+      los pedidos de los usuarios pasan por el CommandCoalescer
+    - Limitación de solicitudes por usuario y hogar en las operaciones de escritura
     - Obtención de opciones de configuración
     """
 
@@ -38,6 +49,9 @@ class DeviceService:
         self.state_dao = StateDAO()
         self.device_type_dao = DeviceTypeDAO()
         self.location_dao = LocationDAO()
+        self.state_store = DeviceStateStore()
+        self.event_bus = EventBus()
+        self.rate_limiter = RateLimiter()
 
     def crear_dispositivo(
         self, nombre: str, home_id: int, type_id: int, location_id: int, state_id: int
@@ -80,6 +94,9 @@ class DeviceService:
             if not es_valido:
                 return False, mensaje
 
+            # Se limita recién con IDs válidos: un ID arbitrario no crea baldes
+            self.rate_limiter.verificar(home_id)
+
             # Obtener entidades relacionadas
             home = self.home_dao.obtener_por_id(home_id)
             if not home:
@@ -106,6 +123,11 @@ class DeviceService:
                     Exception("Fallo al insertar dispositivo"),
                     {"table": "device", "name": nombre}
                 )
+            # El hogar queda en memoria para los permisos y límites por hogar
+            self.state_store.aplicar(dispositivo.id, state.id, state.name, home_id)
+            self.event_bus.publicar(
+                DeviceCreated(dispositivo.id, home_id, state_id, datetime.now())
+            )
             
             logger.info(
                 f"Dispositivo creado: {nombre} | home={home.name} | "
@@ -113,6 +135,8 @@ class DeviceService:
             )
             return True, "Dispositivo creado exitosamente"
             
+        except RateLimitExceededException as e:
+            return handle_exception(e)
         except EntityNotFoundException as e:
             return handle_exception(e, logger)
         except DatabaseException as e:
@@ -129,7 +153,8 @@ class DeviceService:
             Lista de dispositivos
         """
         try:
-            return self.device_dao.obtener_todos()
+            with sesion_identidad():
+                return self.device_dao.obtener_todos()
         except Exception as e:
             logger.error(f"Error al listar dispositivos: {e}")
             return []
@@ -174,6 +199,8 @@ class DeviceService:
             Tupla (éxito: bool, mensaje: str)
         """
         try:
+            self.rate_limiter.verificar(self.state_store.hogar_de(device_id))
+
             # Obtener dispositivo
             dispositivo = self.device_dao.obtener_por_id(device_id)
             if not dispositivo:
@@ -193,6 +220,7 @@ class DeviceService:
                 dispositivo.name = nuevo_nombre
 
             # Actualizar estado si se proporciona
+            estado_anterior_id = dispositivo.state.id
             if nuevo_estado_id:
                 nuevo_estado = self.state_dao.obtener_por_id(nuevo_estado_id)
                 if not nuevo_estado:
@@ -206,6 +234,9 @@ class DeviceService:
                     Exception("Fallo al actualizar dispositivo"),
                     {"table": "device", "id": device_id}
                 )
+            if nuevo_estado_id:
+                self.state_store.aplicar(device_id, nuevo_estado.id, nuevo_estado.name)
+                self._publicar_cambio_estado(dispositivo, nuevo_estado, estado_anterior_id)
             
             logger.info(
                 f"Dispositivo actualizado: ID={device_id} | "
@@ -214,6 +245,8 @@ class DeviceService:
             )
             return True, "Dispositivo actualizado exitosamente"
             
+        except RateLimitExceededException as e:
+            return handle_exception(e)
         except DeviceNotFoundException as e:
             return handle_exception(e, logger)
         except EntityNotFoundException as e:
@@ -235,6 +268,8 @@ class DeviceService:
             Tupla (éxito: bool, mensaje: str)
         """
         try:
+            self.rate_limiter.verificar(self.state_store.hogar_de(device_id))
+
             # Verificar que el dispositivo existe
             dispositivo = self.device_dao.obtener_por_id(device_id)
             if not dispositivo:
@@ -247,6 +282,10 @@ class DeviceService:
                     Exception("Fallo al eliminar dispositivo"),
                     {"table": "device", "id": device_id}
                 )
+            self.state_store.eliminar(device_id)
+            self.event_bus.publicar(
+                DeviceDeleted(device_id, dispositivo.home.id, datetime.now())
+            )
             
             logger.info(
                 f"Dispositivo eliminado: ID={device_id} | "
@@ -254,6 +293,8 @@ class DeviceService:
             )
             return True, f"Dispositivo '{dispositivo.name}' eliminado exitosamente"
             
+        except RateLimitExceededException as e:
+            return handle_exception(e)
         except DeviceNotFoundException as e:
             return handle_exception(e, logger)
         except DatabaseException as e:
@@ -273,7 +314,8 @@ class DeviceService:
             Lista de dispositivos del hogar
         """
         try:
-            return self.device_dao.obtener_por_hogar(home_id)
+            with sesion_identidad():
+                return self.device_dao.obtener_por_hogar(home_id)
         except Exception as e:
             logger.error(f"Error al obtener dispositivos del hogar {home_id}: {e}")
             return []
@@ -290,13 +332,14 @@ class DeviceService:
             Lista de dispositivos que coinciden
         """
         try:
-            return self.device_dao.buscar_por_nombre(nombre, home_id)
+            with sesion_identidad():
+                return self.device_dao.buscar_por_nombre(nombre, home_id)
         except Exception as e:
             logger.error(f"Error al buscar dispositivos: {e}")
             return []
 
     def cambiar_estado_dispositivo(
-        self, device_id: int, nuevo_estado_id: int
+        self, device_id: int, nuevo_estado_id: int, origen: str = "manual"
     ) -> tuple[bool, str]:
         """
         Cambia el estado de un dispositivo.
@@ -304,11 +347,14 @@ class DeviceService:
         Args:
             device_id: ID del dispositivo
             nuevo_estado_id: ID del nuevo estado
+            origen: Origen del cambio ('manual' o 'automatización')
 
         Returns:
             Tupla (éxito: bool, mensaje: str)
         """
         try:
+            self.rate_limiter.verificar(self.state_store.hogar_de(device_id))
+
             # Verificar que el dispositivo existe
             dispositivo = self.device_dao.obtener_por_id(device_id)
             if not dispositivo:
@@ -326,6 +372,8 @@ class DeviceService:
                     Exception("Fallo al cambiar estado"),
                     {"table": "device", "id": device_id, "state_id": nuevo_estado_id}
                 )
+            self.state_store.aplicar(device_id, estado.id, estado.name)
+            self._publicar_cambio_estado(dispositivo, estado, dispositivo.state.id, origen)
             
             logger.info(
                 f"Estado cambiado: device_id={device_id} | "
@@ -333,6 +381,8 @@ class DeviceService:
             )
             return True, f"Estado cambiado a '{estado.name}'"
             
+        except RateLimitExceededException as e:
+            return handle_exception(e)
         except DeviceNotFoundException as e:
             return handle_exception(e, logger)
         except EntityNotFoundException as e:
@@ -343,6 +393,95 @@ class DeviceService:
             logger.error(f"Error inesperado al cambiar estado: {e}")
             return False, "Error inesperado al cambiar estado"
 
+    def solicitar_cambio_estado(self, device_id: int, nuevo_estado_id: int) -> tuple[bool, str]:
+        """
+        Pide un cambio de estado iniciado por un usuario (UI).
+
+        El cambio pasa por el CommandCoalescer, igual que las acciones de
+        las automatizaciones: varios pedidos sobre el mismo dispositivo
+        dentro de la ventana generan una sola escritura y un solo evento,
+        aplicados luego con cambiar_estado_dispositivo.
+
+        Args:
+            device_id: ID del dispositivo
+            nuevo_estado_id: ID del nuevo estado
+
+        Returns:
+            Tupla (éxito: bool, mensaje: str)
+        """
+        # Import diferido: el coalescedor aplica los cambios con DeviceService
+        from services.command_coalescer import CommandCoalescer
+
+        try:
+            self.rate_limiter.verificar(self.state_store.hogar_de(device_id))
+
+            # Verificar en memoria que el dispositivo existe
+            if self.state_store.obtener(device_id) is None:
+                raise DeviceNotFoundException(device_id)
+
+            # Verificar que el estado existe
+            estado = self.state_dao.obtener_por_id(nuevo_estado_id)
+            if not estado:
+                raise EntityNotFoundException("Estado", nuevo_estado_id)
+
+            if not CommandCoalescer().solicitar(device_id, estado.id, origen="manual"):
+                return True, f"El dispositivo ya está en '{estado.name}'"
+
+            logger.info(
+                f"Cambio de estado solicitado: device_id={device_id} | new_state={estado.name}"
+            )
+            return True, f"Cambio a '{estado.name}' solicitado"
+
+        except RateLimitExceededException as e:
+            return handle_exception(e)
+        except DeviceNotFoundException as e:
+            return handle_exception(e, logger)
+        except EntityNotFoundException as e:
+            return handle_exception(e, logger)
+        except Exception as e:
+            logger.error(f"Error inesperado al solicitar cambio de estado: {e}")
+            return False, "Error inesperado al cambiar estado"
+
+    def _publicar_cambio_estado(
+        self, dispositivo: Device, estado: State, estado_anterior_id: int, origen: str = "manual"
+    ) -> None:
+        """
+        Publica en el bus que un dispositivo cambió de estado.
+
+        Args:
+            dispositivo: Dispositivo modificado
+            estado: Nuevo estado (ya persistido)
+            estado_anterior_id: ID del estado previo al cambio
+            origen: Origen del cambio
+        """
+        self.event_bus.publicar(
+            DeviceStateChanged(
+                device_id=dispositivo.id,
+                home_id=dispositivo.home.id,
+                state_id=estado.id,
+                state_name=estado.name,
+                previous_state_id=estado_anterior_id,
+                timestamp=datetime.now(),
+                source=origen,
+            )
+        )
+
+    def obtener_estado_dispositivo(self, device_id: int) -> Optional[DeviceStatus]:
+        """
+        Obtiene el estado actual de un dispositivo desde el store en memoria.
+
+        Args:
+            device_id: ID del dispositivo
+
+        Returns:
+            DeviceStatus o None si el dispositivo no existe
+        """
+        try:
+            return self.state_store.obtener(device_id)
+        except Exception as e:
+            logger.error(f"Error al obtener estado del dispositivo {device_id}: {e}")
+            return None
+
     def obtener_opciones_configuracion(self) -> Dict[str, List]:
         """
         Obtiene todas las opciones para configurar dispositivos.
@@ -351,12 +490,13 @@ class DeviceService:
             Diccionario con hogares, tipos, ubicaciones y estados
         """
         try:
-            return {
-                "hogares": self.home_dao.obtener_todos(),
-                "tipos": self.device_type_dao.obtener_todos(),
-                "ubicaciones": self.location_dao.obtener_todos(),
-                "estados": self.state_dao.obtener_todos(),
-            }
+            with sesion_identidad():
+                return {
+                    "hogares": self.home_dao.obtener_todos(),
+                    "tipos": self.device_type_dao.obtener_todos(),
+                    "ubicaciones": self.location_dao.obtener_todos(),
+                    "estados": self.state_dao.obtener_todos(),
+                }
         except Exception as e:
             logger.error(f"Error al obtener opciones de configuración: {e}")
             return {
@@ -379,14 +519,45 @@ class DeviceService:
             Diccionario con hogares como claves y listas de dispositivos como valores
         """
         try:
-            hogares = self.home_dao.obtener_hogares_usuario(email_usuario)
-            resultado = {}
+            # Una sola consulta (JOIN) para todos los hogares del usuario
+            with sesion_identidad():
+                return self.device_dao.obtener_por_usuario(email_usuario)
+        except Exception as e:
+            logger.error(f"Error al obtener dispositivos del usuario {email_usuario}: {e}")
+            return {}
 
-            for hogar in hogares:
-                dispositivos = self.device_dao.obtener_por_hogar(hogar.id)
-                resultado[hogar.name] = dispositivos
+    def listar_resumen_dispositivos(
+        self, home_id: Optional[int] = None
+    ) -> List[DeviceSummary]:
+        """
+        Obtiene el resumen de los dispositivos para mostrar en tablas.
+
+        Args:
+            home_id: ID del hogar (opcional, None para todos)
 
-            return resultado
+        Returns:
+            Lista de DeviceSummary
+        """
+        try:
+            return self.device_dao.listar_resumen(home_id)
         except Exception as e:
-            logger.error(f"Error al obtener dispositivos del usuario {email_usuario}: {e}")
+            logger.error(f"Error al obtener resumen de dispositivos: {e}")
+            return []
+
+    def resumen_dispositivos_usuario(
+        self, email_usuario: str
+    ) -> Dict[str, List[DeviceSummary]]:
+        """
+        Obtiene el resumen de los dispositivos de un usuario organizados por hogar.
+
+        Args:
+            email_usuario: Email del usuario
+
+        Returns:
+            Diccionario con hogares como claves y listas de DeviceSummary como valores
+        """
+        try:
+            return self.device_dao.listar_resumen_por_usuario(email_usuario)
+        except Exception as e:
+            logger.error(f"Error al obtener resumen de dispositivos del usuario {email_usuario}: {e}")
             return {}
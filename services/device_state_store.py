@@ -0,0 +1,236 @@
+"""Store en memoria con el estado actual de todos los dispositivos."""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from conn.db_connection import DatabaseConnection
+from dao.device_dao import DeviceDAO
+from dominio.summary import DeviceStatus
+from utils.logger import get_device_logger
+
+# Logger de dispositivos
+logger = get_device_logger()
+
+
+class DeviceStateStore:
+    """
+    Vista materializada, en memoria, del estado de cada dispositivo.
+
+    - Implementa el patrón Singleton: un único store por proceso
+    - Se carga una vez con una sola consulta y responde lecturas sin ir a la BD
+    - Recibe las escrituras de DeviceService (write-through)
+    - Una reconciliación periódica contra la BD corrige desvíos
+      (cambios hechos por otros procesos o directamente en MySQL)
+    """
+
+    _instance: Optional["DeviceStateStore"] = None
+
+    def __new__(cls):
+        """Implementa Singleton."""
+        if cls._instance is None:
+            cls._instance = super(DeviceStateStore, cls).__new__(cls)
+            cls._instance.__inicializar()
+        return cls._instance
+
+    def __inicializar(self) -> None:
+        """Inicializa el estado interno (una sola vez por proceso)."""
+        self.device_dao = DeviceDAO()
+        self.__estados: Dict[int, DeviceStatus] = {}
+        # device_id -> instante (monotónico) de la última escritura aplicada
+        self.__escrituras: Dict[int, float] = {}
+        self.__cargado = False
+        self.__lock = threading.RLock()
+        self.__temporizador: Optional[threading.Timer] = None
+
+    def cargar(self) -> bool:
+        """
+        Carga el estado de todos los dispositivos desde la BD.
+
+        Returns:
+            True si se cargó correctamente
+        """
+        estados = self.device_dao.listar_estados()
+        if estados is None:
+            logger.error("No se pudo cargar el store de estados de dispositivos")
+            return False
+
+        with self.__lock:
+            self.__estados = {estado.device_id: estado for estado in estados}
+            self.__escrituras.clear()
+            self.__cargado = True
+        logger.info(f"Store de estados cargado: {len(estados)} dispositivos")
+        return True
+
+    def esta_cargado(self) -> bool:
+        """
+        Verifica si el store ya fue cargado.
+
+        Returns:
+            True si el store tiene datos de la BD
+        """
+        return self.__cargado
+
+    def obtener(self, device_id: int) -> Optional[DeviceStatus]:
+        """
+        Obtiene el estado actual de un dispositivo desde memoria.
+
+        Si el dispositivo no está en el store (p. ej. se creó después de la
+        carga) se consulta solo esa fila y se incorpora.
+
+        Args:
+            device_id: ID del dispositivo
+
+        Returns:
+            DeviceStatus o None si el dispositivo no existe
+        """
+        if not self.__cargado:
+            self.cargar()
+
+        estado = self.__estados.get(device_id)
+        if estado is not None:
+            return estado
+
+        estados = self.device_dao.listar_estados(device_id)
+        if not estados:
+            return None
+        with self.__lock:
+            return self.__estados.setdefault(device_id, estados[0])
+
+    def obtener_todos(self) -> Dict[int, DeviceStatus]:
+        """
+        Obtiene una copia del estado de todos los dispositivos.
+
+        Returns:
+            Diccionario {device_id: DeviceStatus}
+        """
+        if not self.__cargado:
+            self.cargar()
+        with self.__lock:
+            return dict(self.__estados)
+
+    def aplicar(
+        self, device_id: int, state_id: int, state_name: str, home_id: Optional[int] = None
+    ) -> None:
+        """
+        Registra un cambio de estado (o un alta) ya persistido en la BD.
+
+        Args:
+            device_id: ID del dispositivo
+            state_id: ID del nuevo estado
+            state_name: Nombre del nuevo estado
+            home_id: Hogar del dispositivo (obligatorio en un alta; si se
+                omite se conserva el conocido)
+        """
+        with self.__lock:
+            anterior = self.__estados.get(device_id)
+            if home_id is None and anterior is not None:
+                home_id = anterior.home_id
+            self.__estados[device_id] = DeviceStatus(device_id, state_id, state_name, home_id)
+            self.__escrituras[device_id] = time.monotonic()
+
+    def hogar_de(self, device_id: int) -> Optional[int]:
+        """
+        Obtiene el hogar de un dispositivo solo desde memoria.
+
+        A diferencia de obtener(), nunca consulta la BD: si el store no está
+        cargado o el dispositivo no figura, devuelve None.
+
+        Args:
+            device_id: ID del dispositivo
+
+        Returns:
+            ID del hogar o None si no se conoce
+        """
+        estado = self.__estados.get(device_id)
+        return estado.home_id if estado is not None else None
+
+    def eliminar(self, device_id: int) -> None:
+        """
+        Quita un dispositivo eliminado de la BD.
+
+        Args:
+            device_id: ID del dispositivo
+        """
+        with self.__lock:
+            self.__estados.pop(device_id, None)
+            self.__escrituras[device_id] = time.monotonic()
+
+    def reconciliar(self) -> Optional[List[int]]:
+        """
+        Compara el store con la BD y corrige las diferencias.
+
+        Las escrituras aplicadas mientras se leía la BD tienen prioridad
+        sobre la lectura, que puede ser anterior a ellas.
+
+        Returns:
+            IDs de los dispositivos corregidos, o None si falló la lectura
+        """
+        inicio = time.monotonic()
+        estados = self.device_dao.listar_estados()
+        if estados is None:
+            logger.error("Reconciliación del store de estados fallida: error de BD")
+            return None
+
+        en_bd = {estado.device_id: estado for estado in estados}
+        corregidos = []
+        with self.__lock:
+            for device_id in set(en_bd) | set(self.__estados):
+                if self.__escrituras.get(device_id, 0.0) > inicio:
+                    continue
+                if en_bd.get(device_id) != self.__estados.get(device_id):
+                    corregidos.append(device_id)
+                    if device_id in en_bd:
+                        self.__estados[device_id] = en_bd[device_id]
+                    else:
+                        del self.__estados[device_id]
+            self.__escrituras = {
+                device_id: instante
+                for device_id, instante in self.__escrituras.items()
+                if instante > inicio
+            }
+            self.__cargado = True
+
+        if corregidos:
+            logger.warning(f"Store de estados reconciliado: {len(corregidos)} desvíos {sorted(corregidos)}")
+        return sorted(corregidos)
+
+    def iniciar_reconciliacion_periodica(self, intervalo_segundos: Optional[float] = None) -> None:
+        """
+        Reconcilia el store en segundo plano cada cierto intervalo.
+
+        Cada pasada corre en su propio hilo con una conexión del pool que
+        se devuelve al terminar (las conexiones no se comparten entre hilos).
+
+        Args:
+            intervalo_segundos: Intervalo entre pasadas
+                (por defecto env DEVICE_STATE_RECONCILE_SECONDS o 300)
+        """
+        if intervalo_segundos is None:
+            intervalo_segundos = float(os.getenv("DEVICE_STATE_RECONCILE_SECONDS", "300"))
+
+        def ejecutar():
+            try:
+                with DatabaseConnection().unidad_de_trabajo():
+                    self.reconciliar()
+            except Exception as e:
+                logger.error(f"Error en la reconciliación del store de estados: {e}")
+            with self.__lock:
+                if self.__temporizador is not None:
+                    programar()
+
+        def programar():
+            self.__temporizador = threading.Timer(intervalo_segundos, ejecutar)
+            self.__temporizador.daemon = True
+            self.__temporizador.start()
+
+        with self.__lock:
+            self.detener_reconciliacion_periodica()
+            programar()
+
+    def detener_reconciliacion_periodica(self) -> None:
+        """Detiene la reconciliación en segundo plano."""
+        with self.__lock:
+            if self.__temporizador is not None:
+                self.__temporizador.cancel()
+                self.__temporizador = None
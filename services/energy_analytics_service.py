@@ -0,0 +1,190 @@
+"""Servicio de analítica de consumo energético sobre el historial de estados."""
+
+from datetime import datetime
+from itertools import chain
+from typing import Dict, List, Optional, Sequence, Tuple
+from dao.device_power_dao import DevicePowerDAO
+from dao.event_dao import EventDAO
+from dominio.energy import EnergyReport
+from services.device_history_service import DeviceHistoryService
+from utils.arrays import np
+from utils.exceptions import ConfigurationException
+from utils.logger import get_device_logger
+
+# Logger de dispositivos
+logger = get_device_logger()
+
+# Estados que cuentan como encendido para el ciclo de trabajo
+# (Encendido, Modo ahorro, Modo nocturno y Modo automático; ver seeds/02_states.sql)
+ESTADOS_ENCENDIDO = (1, 5, 8, 9)
+
+# Fila del historial: dispositivo, segundos desde el inicio del rango y estado
+TRANSICION = (
+    np.dtype([('device_id', np.int64), ('t', np.float64), ('state_id', np.int64)])
+    if np is not None else None
+)
+
+
+class EnergyAnalyticsService:
+    """
+    Servicio para estimar el consumo energético de los dispositivos.
+
+    Responsabilidades:
+    - Cargar con una consulta el historial de cambios de estado de un
+      dispositivo o de un hogar en arreglos NumPy
+    - Calcular tiempo encendido, ciclo de trabajo y kWh estimados por
+      dispositivo y por tipo, sin recorrer las filas en Python
+    - Partir del estado reconstruido al inicio del rango (instantánea más
+      deltas), no de los eventos desde el origen del historial
+    """
+
+    def __init__(self, estados_encendido: Sequence[int] = ESTADOS_ENCENDIDO):
+        """
+        Inicializa el servicio.
+
+        Args:
+            estados_encendido: IDs de estado que cuentan como encendido
+        """
+        self.event_dao = EventDAO()
+        self.power_dao = DevicePowerDAO()
+        self.history_service = DeviceHistoryService()
+        self.estados_encendido = tuple(estados_encendido)
+
+    def consumo(
+        self,
+        desde: datetime,
+        hasta: datetime,
+        device_id: Optional[int] = None,
+        home_id: Optional[int] = None
+    ) -> Optional[EnergyReport]:
+        """
+        Estima el consumo de un dispositivo, de un hogar o de todos.
+
+        Args:
+            desde: Inicio del intervalo
+            hasta: Fin del intervalo
+            device_id: Limitar a un dispositivo (opcional)
+            home_id: Limitar a los dispositivos de un hogar (opcional)
+
+        Returns:
+            EnergyReport o None si el intervalo es inválido o hubo un error de BD
+
+        Raises:
+            ConfigurationException: Si NumPy no está instalado
+        """
+        if np is None:
+            raise ConfigurationException(
+                "La analítica de consumo requiere NumPy", "pip install numpy"
+            )
+        if hasta <= desde:
+            logger.warning(f"Intervalo de consumo inválido: {desde} - {hasta}")
+            return None
+
+        iniciales = self.history_service.estado_en(desde, home_id)
+        tipos = self.power_dao.obtener_tipos(device_id, home_id)
+        potencias = self.power_dao.obtener_potencias()
+        if iniciales is None or tipos is None or potencias is None:
+            logger.error("Consumo no calculado: no se pudo leer el historial o las potencias")
+            return None
+
+        try:
+            filas = chain(
+                (
+                    (dispositivo, 0.0, estado.state_id)
+                    for dispositivo, estado in iniciales.items()
+                    if device_id is None or dispositivo == device_id
+                ),
+                self.event_dao.iterar_transiciones(desde, hasta, device_id, home_id),
+            )
+            transiciones = np.fromiter(filas, dtype=TRANSICION)
+        except Exception as e:
+            logger.error(f"Error al cargar el historial de estados: {e}")
+            return None
+
+        reporte = self.calcular(transiciones, tipos, potencias, desde, hasta)
+        logger.info(
+            f"Consumo estimado {desde:%Y-%m-%d} - {hasta:%Y-%m-%d}: "
+            f"{len(reporte.device_ids)} dispositivos | {reporte.total_kwh:.2f} kWh"
+        )
+        return reporte
+
+    def calcular(
+        self,
+        transiciones,
+        tipos: Dict[int, int],
+        potencias: List[Tuple[int, int, float]],
+        desde: datetime,
+        hasta: datetime
+    ) -> EnergyReport:
+        """
+        Calcula el consumo a partir de un historial ya cargado.
+
+        Cada fila abre un tramo en su estado que termina en la siguiente
+        fila del mismo dispositivo (o al final del intervalo).
+
+        Args:
+            transiciones: Arreglo estructurado con dtype TRANSICION; las filas
+                de cada dispositivo deben estar en orden cronológico
+            tipos: {device_id: device_type_id}
+            potencias: Tuplas (device_type_id, state_id, watts)
+            desde: Inicio del intervalo
+            hasta: Fin del intervalo
+
+        Returns:
+            EnergyReport
+        """
+        total = (hasta - desde).total_seconds()
+        # Orden estable por dispositivo: conserva el orden cronológico de
+        # las filas de cada uno (más barato que ordenar por dos claves)
+        orden = np.argsort(transiciones['device_id'], kind='stable')
+        dispositivos = transiciones['device_id'][orden]
+        inicio = np.clip(transiciones['t'][orden], 0.0, total)
+        estados = transiciones['state_id'][orden]
+
+        # Fin de cada tramo: el inicio del siguiente, salvo en la última
+        # fila de cada dispositivo, que se extiende hasta el final del rango
+        fin = np.full(len(inicio), total)
+        mismo = dispositivos[1:] == dispositivos[:-1]
+        fin[:-1][mismo] = inicio[1:][mismo]
+        duracion = fin - inicio
+
+        # Índice de cada fila en la lista de dispositivos (ya agrupados)
+        nuevo = np.ones(len(dispositivos), dtype=bool)
+        nuevo[1:] = ~mismo
+        ids = dispositivos[nuevo]
+        indice = np.cumsum(nuevo) - 1
+        tipo_por_dispositivo = np.fromiter(
+            (tipos.get(int(d), 0) for d in ids), dtype=np.int64, count=len(ids)
+        )
+
+        # Matriz de potencia [tipo, estado] (W); los pares sin dato valen 0
+        tabla = np.array(potencias, dtype=np.float64).reshape(-1, 3)
+        tipo_max = int(max(tipo_por_dispositivo.max(initial=0), tabla[:, 0].max(initial=0)))
+        estado_max = int(max(estados.max(initial=0), tabla[:, 1].max(initial=0)))
+        watts = np.zeros((tipo_max + 1, estado_max + 1))
+        watts[tabla[:, 0].astype(np.int64), tabla[:, 1].astype(np.int64)] = tabla[:, 2]
+
+        encendido = np.isin(estados, self.estados_encendido)
+        observado = np.bincount(indice, weights=duracion, minlength=len(ids))
+        segundos_encendido = np.bincount(indice, weights=duracion * encendido, minlength=len(ids))
+        energia = watts[tipo_por_dispositivo[indice], estados] * duracion
+        kwh = np.bincount(indice, weights=energia, minlength=len(ids)) / 3.6e6
+
+        tipos_presentes = np.unique(tipo_por_dispositivo)
+        por_tipo = np.bincount(tipo_por_dispositivo, weights=kwh, minlength=tipo_max + 1)
+
+        return EnergyReport(
+            desde=desde,
+            hasta=hasta,
+            device_ids=ids,
+            device_type_ids=tipo_por_dispositivo,
+            observed_seconds=observado,
+            on_seconds=segundos_encendido,
+            duty_cycles=np.divide(
+                segundos_encendido, observado,
+                out=np.zeros(len(ids)), where=observado > 0,
+            ),
+            kwh=kwh,
+            kwh_by_type={int(t): float(por_tipo[t]) for t in tipos_presentes},
+            transitions=len(transiciones),
+        )
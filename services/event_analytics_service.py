@@ -0,0 +1,104 @@
+"""Servicio de analítica de eventos basado en tablas de agregados."""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+from dao.event_rollup_dao import EventRollupDAO
+from utils.logger import get_database_logger
+
+# Logger de base de datos
+logger = get_database_logger()
+
+
+class EventAnalyticsService:
+    """
+    Servicio para consultas analíticas sobre eventos.
+
+    Responsabilidades:
+    - Mantener incrementalmente los rollups por hora y por día
+    - Responder conteos por dispositivo y por hogar sin recorrer la tabla event
+    """
+
+    GRANULARIDADES = tuple(EventRollupDAO.GRANULARIDADES)
+
+    def __init__(self):
+        """Inicializa el servicio de analítica."""
+        self.rollup_dao = EventRollupDAO()
+
+    def actualizar_rollups(self) -> tuple[bool, str]:
+        """
+        Procesa los eventos nuevos desde el último watermark.
+
+        Returns:
+            Tupla (éxito: bool, mensaje: str)
+        """
+        procesados = self.rollup_dao.actualizar_rollups()
+        if procesados < 0:
+            logger.error("Fallo al actualizar rollups de eventos")
+            return False, "Error al actualizar los agregados de eventos"
+
+        logger.info(f"Rollups de eventos actualizados: {procesados} eventos procesados")
+        return True, f"{procesados} eventos procesados"
+
+    def eventos_por_dispositivo(
+        self,
+        device_id: int,
+        desde: datetime,
+        hasta: datetime,
+        granularidad: str = 'dia',
+        source: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Obtiene la cantidad de eventos de un dispositivo por hora o por día.
+
+        Args:
+            device_id: ID del dispositivo
+            desde: Inicio del rango
+            hasta: Fin del rango
+            granularidad: 'hora' o 'dia'
+            source: Origen del evento (opcional, ej: 'sensor')
+
+        Returns:
+            Lista de diccionarios {bucket, source, total}
+        """
+        if granularidad not in self.GRANULARIDADES:
+            logger.warning(f"Granularidad inválida: {granularidad}")
+            return []
+        try:
+            return self.rollup_dao.obtener_conteos_dispositivo(
+                device_id, desde, hasta, granularidad, source
+            )
+        except Exception as e:
+            logger.error(f"Error al obtener conteos del dispositivo {device_id}: {e}")
+            return []
+
+    def eventos_por_hogar(
+        self,
+        home_id: int,
+        desde: datetime,
+        hasta: datetime,
+        granularidad: str = 'hora',
+        source: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Obtiene la cantidad de eventos de un hogar por hora o por día.
+
+        Args:
+            home_id: ID del hogar
+            desde: Inicio del rango
+            hasta: Fin del rango
+            granularidad: 'hora' o 'dia'
+            source: Origen del evento (opcional, ej: 'sensor')
+
+        Returns:
+            Lista de diccionarios {bucket, source, total}
+        """
+        if granularidad not in self.GRANULARIDADES:
+            logger.warning(f"Granularidad inválida: {granularidad}")
+            return []
+        try:
+            return self.rollup_dao.obtener_conteos_hogar(
+                home_id, desde, hasta, granularidad, source
+            )
+        except Exception as e:
+            logger.error(f"Error al obtener conteos del hogar {home_id}: {e}")
+            return []
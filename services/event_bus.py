@@ -0,0 +1,263 @@
+"""Bus de publicación/suscripción en proceso para eventos del dominio."""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Generic, List, Optional, Type, TypeVar
+from conn.db_connection import DatabaseConnection
+from utils.logger import get_app_logger
+
+# Logger general de la aplicación
+logger = get_app_logger()
+
+M = TypeVar('M')
+
+SINCRONO = "sincrono"
+ASINCRONO = "asincrono"
+
+
+class Suscripcion(Generic[M]):
+    """
+    Suscripción de un manejador a un tipo de mensaje (tópico).
+
+    En modo asíncrono la suscripción tiene su propia cola acotada, que
+    se vacía en el pool de hilos del bus respetando el orden de
+    publicación. Si la cola se llena se descarta el mensaje más antiguo:
+    para cambios de estado el último valor es el que importa.
+    """
+
+    def __init__(
+        self,
+        tipo: Type[M],
+        manejador: Callable[[M], None],
+        modo: str = SINCRONO,
+        capacidad: int = 1000,
+    ):
+        """
+        Inicializa la suscripción.
+
+        Args:
+            tipo: Clase de los mensajes que recibe
+            manejador: Función que procesa cada mensaje
+            modo: SINCRONO (en el hilo que publica) o ASINCRONO (pool de hilos)
+            capacidad: Tamaño máximo de la cola en modo asíncrono
+        """
+        if modo not in (SINCRONO, ASINCRONO):
+            raise ValueError(f"Modo de entrega inválido: {modo}")
+        self.tipo = tipo
+        self.manejador = manejador
+        self.modo = modo
+        self.descartados = 0
+        self.__cola: "queue.Queue[M]" = queue.Queue(maxsize=capacidad)
+        self.__lock = threading.Lock()
+        self.__drenando = False
+
+    def entregar(self, mensaje: M, pool: Optional[ThreadPoolExecutor] = None) -> None:
+        """
+        Entrega un mensaje según el modo de la suscripción.
+
+        Args:
+            mensaje: Mensaje publicado
+            pool: Pool de hilos (requerido en modo asíncrono)
+        """
+        if self.modo == SINCRONO:
+            self.__invocar(mensaje)
+            return
+
+        with self.__lock:
+            try:
+                self.__cola.put_nowait(mensaje)
+            except queue.Full:
+                self.__cola.get_nowait()
+                self.__cola.put_nowait(mensaje)
+                self.descartados += 1
+                logger.warning(
+                    f"Cola llena para {getattr(self.manejador, '__name__', self.manejador)}: "
+                    f"mensaje más antiguo descartado ({self.descartados} en total)"
+                )
+            if self.__drenando:
+                return
+            self.__drenando = True
+        pool.submit(self.__drenar)
+
+    def pendientes(self) -> int:
+        """
+        Cantidad de mensajes aún no procesados.
+
+        Returns:
+            Mensajes en cola más el que se está procesando
+        """
+        with self.__lock:
+            return self.__cola.qsize() + (1 if self.__drenando else 0)
+
+    def __drenar(self) -> None:
+        """
+        Procesa la cola hasta vaciarla (una sola tarea por suscripción).
+
+        La conexión a la BD que usen los manejadores se devuelve al pool
+        al vaciarse la cola, en lugar de quedar atada al hilo del pool.
+        """
+        with DatabaseConnection().unidad_de_trabajo():
+            while True:
+                with self.__lock:
+                    try:
+                        mensaje = self.__cola.get_nowait()
+                    except queue.Empty:
+                        self.__drenando = False
+                        return
+                self.__invocar(mensaje)
+
+    def __invocar(self, mensaje: M) -> None:
+        """Ejecuta el manejador; sus errores no afectan a los demás suscriptores."""
+        try:
+            self.manejador(mensaje)
+        except Exception as e:
+            logger.error(
+                f"Error en suscriptor de {type(mensaje).__name__} "
+                f"({getattr(self.manejador, '__name__', self.manejador)}): {e}"
+            )
+
+
+class EventBus:
+    """
+    Bus de eventos en proceso, tipado por clase de mensaje.
+
+    - Implementa el patrón Singleton: un único bus por proceso
+    - Cada clase de mensaje es un tópico; también se entrega a quienes
+      se suscribieron a una clase base
+    - Entrega síncrona (en el hilo que publica) o asíncrona (pool de hilos
+      con colas acotadas por suscriptor)
+    """
+
+    _instance: Optional["EventBus"] = None
+
+    def __new__(cls):
+        """Implementa Singleton."""
+        if cls._instance is None:
+            cls._instance = super(EventBus, cls).__new__(cls)
+            cls._instance.__inicializar()
+        return cls._instance
+
+    def __inicializar(self) -> None:
+        """Inicializa el estado interno (una sola vez por proceso)."""
+        self.__suscripciones: Dict[type, List[Suscripcion]] = {}
+        self.__lock = threading.Lock()
+        self.__pool: Optional[ThreadPoolExecutor] = None
+
+    def suscribir(
+        self,
+        tipo: Type[M],
+        manejador: Callable[[M], None],
+        modo: str = SINCRONO,
+        capacidad: int = 1000,
+    ) -> Suscripcion[M]:
+        """
+        Suscribe un manejador a un tipo de mensaje.
+
+        Args:
+            tipo: Clase de los mensajes a recibir
+            manejador: Función que procesa cada mensaje
+            modo: SINCRONO o ASINCRONO
+            capacidad: Tamaño máximo de la cola en modo asíncrono
+
+        Returns:
+            La suscripción creada (para desuscribir)
+        """
+        suscripcion = Suscripcion(tipo, manejador, modo, capacidad)
+        with self.__lock:
+            # Copia al escribir: publicar() recorre la lista sin tomar el lock
+            self.__suscripciones[tipo] = self.__suscripciones.get(tipo, []) + [suscripcion]
+        return suscripcion
+
+    def desuscribir(self, suscripcion: Suscripcion) -> bool:
+        """
+        Cancela una suscripción.
+
+        Args:
+            suscripcion: Suscripción devuelta por suscribir()
+
+        Returns:
+            True si la suscripción existía
+        """
+        with self.__lock:
+            actuales = self.__suscripciones.get(suscripcion.tipo, [])
+            if suscripcion not in actuales:
+                return False
+            restantes = [s for s in actuales if s is not suscripcion]
+            if restantes:
+                self.__suscripciones[suscripcion.tipo] = restantes
+            else:
+                del self.__suscripciones[suscripcion.tipo]
+            return True
+
+    def publicar(self, mensaje: object) -> int:
+        """
+        Publica un mensaje a todos los suscriptores de su tipo.
+
+        Args:
+            mensaje: Mensaje a publicar
+
+        Returns:
+            Cantidad de suscripciones a las que se entregó
+        """
+        entregados = 0
+        for tipo in type(mensaje).__mro__:
+            for suscripcion in self.__suscripciones.get(tipo, ()):
+                pool = self.__obtener_pool() if suscripcion.modo == ASINCRONO else None
+                suscripcion.entregar(mensaje, pool)
+                entregados += 1
+        return entregados
+
+    def tiene_suscriptores(self, tipo: type) -> bool:
+        """
+        Indica si alguien escucha un tipo de mensaje (para evitar construirlo).
+
+        Args:
+            tipo: Clase del mensaje
+
+        Returns:
+            True si hay al menos una suscripción al tipo o a una base
+        """
+        return any(t in self.__suscripciones for t in tipo.__mro__)
+
+    def esperar(self, timeout: float = 5.0) -> bool:
+        """
+        Espera a que las entregas asíncronas pendientes terminen.
+
+        Args:
+            timeout: Tiempo máximo de espera en segundos
+
+        Returns:
+            True si no quedan mensajes pendientes
+        """
+        limite = time.monotonic() + timeout
+        while True:
+            pendientes = sum(
+                s.pendientes() for lista in list(self.__suscripciones.values()) for s in lista
+            )
+            if pendientes == 0:
+                return True
+            if time.monotonic() >= limite:
+                return False
+            time.sleep(0.005)
+
+    def cerrar(self) -> None:
+        """Procesa lo pendiente y libera el pool de hilos."""
+        with self.__lock:
+            pool, self.__pool = self.__pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def limpiar(self) -> None:
+        """Elimina todas las suscripciones."""
+        with self.__lock:
+            self.__suscripciones = {}
+
+    def __obtener_pool(self) -> ThreadPoolExecutor:
+        """Crea el pool de hilos la primera vez que se necesita."""
+        if self.__pool is None:
+            with self.__lock:
+                if self.__pool is None:
+                    self.__pool = ThreadPoolExecutor(thread_name_prefix="event-bus")
+        return self.__pool
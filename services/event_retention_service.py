@@ -0,0 +1,193 @@
+"""Servicio de mantenimiento de particiones y retención de eventos."""
+
+import csv
+import gzip
+import os
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+from dao.event_partition_dao import EventPartitionDAO
+from utils.logger import get_database_logger
+
+# Logger de base de datos
+logger = get_database_logger()
+
+# Columnas exportadas al archivo histórico
+COLUMNAS_ARCHIVO = ['id', 'date_time_value', 'description', 'device_id', 'user_email', 'source', 'state_id']
+
+
+def sumar_meses(fecha: date, meses: int) -> date:
+    """
+    Desplaza una fecha al primer día del mes resultante.
+
+    Args:
+        fecha: Fecha de referencia
+        meses: Cantidad de meses a sumar (negativo para restar)
+
+    Returns:
+        Primer día del mes desplazado
+    """
+    indice = fecha.year * 12 + (fecha.month - 1) + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+class EventRetentionService:
+    """
+    Servicio para el mantenimiento de la tabla event particionada por mes.
+
+    Responsabilidades:
+    - Pre-crear particiones para los próximos meses
+    - Exportar particiones vencidas a archivos comprimidos
+    - Eliminar particiones vencidas (DROP PARTITION, sin DELETE masivo)
+    """
+
+    def __init__(
+        self,
+        meses_adelantados: int = 3,
+        meses_retencion: int = 12,
+        directorio_archivo: Optional[Path] = None
+    ):
+        """
+        Inicializa el servicio de retención.
+
+        Args:
+            meses_adelantados: Meses futuros con partición pre-creada
+            meses_retencion: Meses completos que se conservan en la BD
+            directorio_archivo: Carpeta donde se guardan los archivos históricos
+        """
+        self.partition_dao = EventPartitionDAO()
+        self.meses_adelantados = meses_adelantados
+        self.meses_retencion = meses_retencion
+        self.directorio_archivo = Path(
+            directorio_archivo or os.getenv("EVENT_ARCHIVE_DIR", "archive")
+        )
+
+    def crear_particiones_futuras(self, hoy: Optional[date] = None) -> List[str]:
+        """
+        Crea las particiones que falten hasta los meses adelantados.
+
+        Solo se puede separar de 'p_futuro' por encima de la última partición,
+        así que se crean todos los meses siguientes a ella (también los que
+        quedaron sin crear si el mantenimiento no corrió). Sin particiones
+        mensuales (tabla nueva o recién migrada) se empieza en el mes del
+        evento más antiguo: el historial queda repartido por mes en lugar de
+        caer entero en la partición del mes actual.
+
+        Args:
+            hoy: Fecha de referencia (por defecto: hoy)
+
+        Returns:
+            Lista de particiones creadas
+        """
+        hoy = hoy or date.today()
+        existentes = self.partition_dao.obtener_particiones()
+        if existentes:
+            mes = sumar_meses(EventPartitionDAO.mes_de_particion(existentes[-1]), 1)
+        else:
+            mas_antiguo = self.partition_dao.obtener_fecha_minima()
+            mes = sumar_meses(min(mas_antiguo.date(), hoy) if mas_antiguo else hoy, 0)
+        hasta = sumar_meses(hoy, self.meses_adelantados)
+        creadas = []
+
+        while mes <= hasta:
+            nombre = EventPartitionDAO.nombre_particion(mes.year, mes.month)
+            if not self.partition_dao.agregar_particion(nombre, sumar_meses(mes, 1)):
+                logger.error(f"Fallo al crear partición de eventos {nombre}")
+                break
+
+            creadas.append(nombre)
+            logger.info(f"Partición de eventos creada: {nombre}")
+            mes = sumar_meses(mes, 1)
+
+        return creadas
+
+    def obtener_particiones_vencidas(self, hoy: Optional[date] = None) -> List[str]:
+        """
+        Obtiene las particiones cuyo mes quedó fuera del período de retención.
+
+        Args:
+            hoy: Fecha de referencia (por defecto: hoy)
+
+        Returns:
+            Lista de particiones vencidas, de la más antigua a la más reciente
+        """
+        hoy = hoy or date.today()
+        limite = sumar_meses(hoy, -self.meses_retencion)
+        return [
+            nombre for nombre in self.partition_dao.obtener_particiones()
+            if EventPartitionDAO.mes_de_particion(nombre) < limite
+        ]
+
+    def archivar_particion(self, nombre: str) -> Path:
+        """
+        Exporta una partición a un archivo CSV comprimido con gzip.
+
+        El archivo se escribe primero con extensión temporal y se renombra
+        al terminar, de modo que nunca queda un archivo histórico incompleto.
+
+        Args:
+            nombre: Nombre de la partición
+
+        Returns:
+            Ruta del archivo generado
+        """
+        self.directorio_archivo.mkdir(parents=True, exist_ok=True)
+        destino = self.directorio_archivo / f"event_{nombre}.csv.gz"
+        temporal = destino.with_suffix(".tmp")
+
+        filas = 0
+        with gzip.open(temporal, "wt", encoding="utf-8", newline="") as archivo:
+            writer = csv.DictWriter(archivo, fieldnames=COLUMNAS_ARCHIVO)
+            writer.writeheader()
+            for row in self.partition_dao.iterar_filas_particion(nombre):
+                writer.writerow(row)
+                filas += 1
+
+        temporal.replace(destino)
+        logger.info(f"Partición {nombre} archivada: {filas} eventos -> {destino}")
+        return destino
+
+    def purgar_particiones_vencidas(self, hoy: Optional[date] = None) -> List[str]:
+        """
+        Archiva y elimina las particiones vencidas.
+
+        Una partición solo se elimina si su archivo histórico se generó sin errores.
+
+        Args:
+            hoy: Fecha de referencia (por defecto: hoy)
+
+        Returns:
+            Lista de particiones eliminadas
+        """
+        eliminadas = []
+
+        for nombre in self.obtener_particiones_vencidas(hoy):
+            try:
+                self.archivar_particion(nombre)
+            except Exception as e:
+                logger.error(f"Error al archivar partición {nombre}: {e}")
+                break
+
+            if not self.partition_dao.eliminar_particion(nombre):
+                logger.error(f"Fallo al eliminar partición de eventos {nombre}")
+                break
+
+            eliminadas.append(nombre)
+            logger.info(f"Partición de eventos eliminada: {nombre}")
+
+        return eliminadas
+
+    def ejecutar_mantenimiento(self, hoy: Optional[date] = None) -> Dict[str, List[str]]:
+        """
+        Ejecuta el ciclo completo de mantenimiento de particiones.
+
+        Args:
+            hoy: Fecha de referencia (por defecto: hoy)
+
+        Returns:
+            Diccionario con las particiones creadas y eliminadas
+        """
+        return {
+            'creadas': self.crear_particiones_futuras(hoy),
+            'eliminadas': self.purgar_particiones_vencidas(hoy),
+        }
@@ -0,0 +1,249 @@
+"""Cache en memoria de la pertenencia de usuarios a hogares (user_home)."""
+
+import threading
+from typing import Dict, FrozenSet, Optional
+from dao.home_dao import HomeDAO
+from dominio.messages import MembershipChanged
+from services.device_state_store import DeviceStateStore
+from services.event_bus import EventBus, Suscripcion
+from utils.logger import get_auth_logger, log_user_action
+
+# Logger de autenticación
+logger = get_auth_logger()
+
+
+class MembershipCache:
+    """
+    Hogares de cada usuario, para verificar permisos sin consultar la BD.
+
+    - Implementa el patrón Singleton: un único cache por proceso
+    - Se precarga por usuario al iniciar sesión (una consulta); un usuario
+      no precargado se carga en su primera verificación
+    - Verificar si un usuario puede operar un hogar es O(1); para un
+      dispositivo se resuelve su hogar con DeviceStateStore (en memoria)
+    - Los cambios en user_home hechos con asociar/desasociar se publican
+      en el bus (MembershipChanged) y se aplican una sola vez: por la
+      suscripción si el cache está conectado al bus, si no directamente;
+      cambios externos se descartan con invalidar()
+    - Una recarga desde la BD no pisa un cambio aplicado mientras se
+      leía: cada cambio avanza una versión y la recarga se repite
+    - Los usuarios sin sesiones abiertas se desalojan (SessionStore avisa
+      con al_cerrar_ultima; ver AuthService)
+    """
+
+    # Lecturas de la BD que se intentan antes de devolver hogares sin cachearlos
+    INTENTOS_CARGA = 3
+
+    _instance: Optional["MembershipCache"] = None
+
+    def __new__(cls):
+        """Implementa Singleton."""
+        if cls._instance is None:
+            cls._instance = super(MembershipCache, cls).__new__(cls)
+            cls._instance.__inicializar()
+        return cls._instance
+
+    def __inicializar(self) -> None:
+        """Inicializa el estado interno (una sola vez por proceso)."""
+        self.home_dao = HomeDAO()
+        self.state_store = DeviceStateStore()
+        self.event_bus = EventBus()
+        self.__hogares: Dict[str, FrozenSet[int]] = {}
+        # Avanza con cada cambio o invalidación (detecta recargas desactualizadas)
+        self.__version = 0
+        self.__lock = threading.Lock()
+        self.__suscripcion: Optional[Suscripcion] = None
+        self.__bus: Optional[EventBus] = None
+
+    def cargar_usuario(self, email: str) -> bool:
+        """
+        Carga (o recarga) los hogares de un usuario desde la BD.
+
+        Args:
+            email: Email del usuario
+
+        Returns:
+            True si se cargó correctamente
+        """
+        return self.__cargar(email) is not None
+
+    def __cargar(self, email: str) -> Optional[FrozenSet[int]]:
+        """
+        Lee los hogares de un usuario y los cachea si nada cambió durante la lectura.
+
+        Si un cambio se aplica mientras se consulta la BD, la lectura puede
+        ser anterior a él: se descarta y se vuelve a leer. Tras
+        INTENTOS_CARGA lecturas se devuelve la última sin cachearla.
+
+        Args:
+            email: Email del usuario
+
+        Returns:
+            Hogares leídos o None si hubo un error de BD
+        """
+        for _ in range(self.INTENTOS_CARGA):
+            with self.__lock:
+                version = self.__version
+            ids = self.home_dao.obtener_ids_hogares_usuario(email)
+            if ids is None:
+                logger.error(f"No se pudieron cargar los hogares de {email}")
+                return None
+            hogares = frozenset(ids)
+            with self.__lock:
+                if self.__version == version:
+                    self.__hogares[email] = hogares
+                    return hogares
+        logger.warning(f"Hogares de {email} sin cachear: cambiaron durante la carga")
+        return hogares
+
+    def hogares_de(self, email: str) -> FrozenSet[int]:
+        """
+        Obtiene los IDs de los hogares de un usuario.
+
+        Args:
+            email: Email del usuario
+
+        Returns:
+            Conjunto de IDs (vacío si no tiene hogares o hubo un error de BD)
+        """
+        hogares = self.__hogares.get(email)
+        if hogares is None:
+            hogares = self.__cargar(email)
+        return hogares or frozenset()
+
+    def puede_acceder_hogar(self, email: str, home_id: int) -> bool:
+        """
+        Verifica si un usuario pertenece a un hogar.
+
+        Args:
+            email: Email del usuario
+            home_id: ID del hogar
+
+        Returns:
+            True si el usuario está asociado al hogar
+        """
+        return home_id in self.hogares_de(email)
+
+    def puede_acceder_dispositivo(self, email: str, device_id: int) -> bool:
+        """
+        Verifica si un usuario pertenece al hogar de un dispositivo.
+
+        Args:
+            email: Email del usuario
+            device_id: ID del dispositivo
+
+        Returns:
+            True si el dispositivo existe y su hogar es del usuario
+        """
+        home_id = self.state_store.hogar_de(device_id)
+        if home_id is None:
+            estado = self.state_store.obtener(device_id)
+            home_id = estado.home_id if estado is not None else None
+        return home_id is not None and self.puede_acceder_hogar(email, home_id)
+
+    def asociar(self, email: str, home_id: int) -> tuple[bool, str]:
+        """
+        Asocia un usuario a un hogar.
+
+        Args:
+            email: Email del usuario
+            home_id: ID del hogar
+
+        Returns:
+            Tupla (éxito: bool, mensaje: str)
+        """
+        if not self.home_dao.asociar_usuario(email, home_id):
+            return False, "Error al asociar el usuario al hogar"
+        self.__publicar(MembershipChanged(email, home_id, True))
+        log_user_action(email, "HOME_JOIN", f"home_id={home_id}")
+        return True, "Usuario asociado al hogar"
+
+    def desasociar(self, email: str, home_id: int) -> tuple[bool, str]:
+        """
+        Quita a un usuario de un hogar.
+
+        Args:
+            email: Email del usuario
+            home_id: ID del hogar
+
+        Returns:
+            Tupla (éxito: bool, mensaje: str)
+        """
+        if not self.home_dao.desasociar_usuario(email, home_id):
+            return False, "El usuario no pertenece a ese hogar"
+        self.__publicar(MembershipChanged(email, home_id, False))
+        log_user_action(email, "HOME_LEAVE", f"home_id={home_id}")
+        return True, "Usuario quitado del hogar"
+
+    def aplicar(self, cambio: MembershipChanged) -> None:
+        """
+        Aplica un cambio de pertenencia a un usuario ya cargado.
+
+        Los usuarios no cargados se leerán completos en su próxima
+        verificación, por lo que no hace falta registrar nada.
+
+        Args:
+            cambio: Cambio publicado en el bus
+        """
+        with self.__lock:
+            self.__version += 1
+            hogares = self.__hogares.get(cambio.user_email)
+            if hogares is None:
+                return
+            if cambio.member:
+                self.__hogares[cambio.user_email] = hogares | {cambio.home_id}
+            else:
+                self.__hogares[cambio.user_email] = hogares - {cambio.home_id}
+
+    def invalidar(self, email: Optional[str] = None) -> None:
+        """
+        Descarta los hogares cacheados (ej: tras cambios hechos fuera del
+        proceso o al cerrarse la última sesión de un usuario).
+
+        Args:
+            email: Usuario a descartar (None para todos)
+        """
+        with self.__lock:
+            self.__version += 1
+            if email is None:
+                self.__hogares.clear()
+            else:
+                self.__hogares.pop(email, None)
+
+    def __publicar(self, cambio: MembershipChanged) -> None:
+        """
+        Publica un cambio en el bus y lo aplica localmente una sola vez.
+
+        Si el cache está suscrito al mismo bus, la suscripción (síncrona)
+        ya lo aplica al publicarlo.
+
+        Args:
+            cambio: Cambio de pertenencia ya persistido
+        """
+        if self.__suscripcion is None or self.__bus is not self.event_bus:
+            self.aplicar(cambio)
+        self.event_bus.publicar(cambio)
+
+    def conectar(self, bus: Optional[EventBus] = None) -> None:
+        """
+        Suscribe el cache a los cambios de pertenencia publicados por otros.
+
+        Args:
+            bus: Bus de eventos (por defecto el del proceso)
+        """
+        bus = bus or EventBus()
+        self.desconectar(bus)
+        self.__suscripcion = bus.suscribir(MembershipChanged, self.aplicar)
+        self.__bus = bus
+
+    def desconectar(self, bus: Optional[EventBus] = None) -> None:
+        """
+        Cancela la suscripción del cache.
+
+        Args:
+            bus: Bus de eventos (por defecto el del proceso)
+        """
+        if self.__suscripcion is not None:
+            (bus or EventBus()).desuscribir(self.__suscripcion)
+            self.__suscripcion = None
+            self.__bus = None
@@ -0,0 +1,298 @@
+"""Limitación de solicitudes (token bucket) por usuario y por hogar."""
+
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, NamedTuple, Optional, Set, Tuple
+from utils.exceptions import InvalidConfigException, RateLimitExceededException
+from utils.logger import get_auth_logger
+
+# Logger de autenticación
+logger = get_auth_logger()
+
+# Rol usado cuando el del usuario no tiene un nivel configurado
+ROL_POR_DEFECTO = "standard"
+
+
+class RateTier(NamedTuple):
+    """
+    Nivel de limitación de un rol (o de los hogares).
+
+    Atributos:
+        tasa: Solicitudes repuestas por segundo
+        rafaga: Solicitudes máximas acumulables (tamaño del balde)
+    """
+
+    tasa: float
+    rafaga: float
+
+    @classmethod
+    def desde_texto(cls, clave: str, texto: str) -> "RateTier":
+        """
+        Interpreta un nivel con formato 'tasa/ráfaga' (ej: '5/20').
+
+        Args:
+            clave: Variable de entorno de la que proviene (para el error)
+            texto: Valor a interpretar
+
+        Returns:
+            RateTier
+
+        Raises:
+            InvalidConfigException: Si el formato o los valores son inválidos
+        """
+        try:
+            tasa, rafaga = (float(parte) for parte in texto.split("/"))
+        except ValueError:
+            raise InvalidConfigException(clave, "Formato esperado: 'tasa/ráfaga' (ej: 5/20)")
+        if tasa <= 0 or rafaga < 1:
+            raise InvalidConfigException(clave, "La tasa debe ser > 0 y la ráfaga >= 1")
+        return cls(tasa, rafaga)
+
+
+# Niveles por defecto: {rol: 'tasa/ráfaga'} (sobrescribibles con RATE_LIMIT_<ROL>)
+NIVELES_POR_DEFECTO = {
+    "admin": "20/60",
+    "standard": "5/20",
+}
+# Nivel compartido por todos los usuarios de un mismo hogar (RATE_LIMIT_HOGAR)
+NIVEL_HOGAR_POR_DEFECTO = "10/40"
+
+
+class TokenBucket:
+    """
+    Balde de fichas con reposición perezosa.
+
+    No hay temporizadores: las fichas se reponen al consultar el balde,
+    según el tiempo transcurrido desde la consulta anterior. 'lleno' es el
+    instante en que el balde vuelve a tener la ráfaga completa (desde ahí
+    equivale a uno nuevo y puede descartarse).
+    """
+
+    __slots__ = ('fichas', 'ultimo', 'lleno')
+
+    def __init__(self, fichas: float, ahora: float):
+        self.fichas = fichas
+        self.ultimo = ahora
+        self.lleno = ahora
+
+    def reponer(self, nivel: RateTier, ahora: float) -> None:
+        """
+        Repone las fichas acumuladas desde la última consulta.
+
+        Args:
+            nivel: Tasa y ráfaga del balde
+            ahora: Instante actual (reloj monotónico)
+        """
+        if ahora > self.ultimo:
+            self.fichas = min(nivel.rafaga, self.fichas + (ahora - self.ultimo) * nivel.tasa)
+        self.ultimo = ahora
+
+    def espera(self, nivel: RateTier) -> float:
+        """
+        Segundos hasta que haya una ficha disponible (0 si ya la hay).
+
+        Args:
+            nivel: Tasa y ráfaga del balde
+        """
+        return max(0.0, (1.0 - self.fichas) / nivel.tasa)
+
+    def calcular_lleno(self, nivel: RateTier) -> None:
+        """
+        Actualiza el instante en que el balde recupera la ráfaga completa.
+
+        Args:
+            nivel: Tasa y ráfaga del balde
+        """
+        self.lleno = self.ultimo + max(0.0, nivel.rafaga - self.fichas) / nivel.tasa
+
+
+# Usuario que origina las solicitudes: (email, rol). Aislado por hilo y por
+# tarea asíncrona; None para procesos del sistema (motor de reglas, cron)
+_actor_actual: ContextVar[Optional[Tuple[str, str]]] = ContextVar("actor_actual", default=None)
+
+
+def establecer_actor(email: Optional[str], rol: Optional[str] = None) -> None:
+    """
+    Define el usuario al que se cargan las solicitudes del contexto actual.
+
+    Args:
+        email: Email del usuario (None al cerrar sesión)
+        rol: Nombre del rol del usuario
+    """
+    _actor_actual.set((email, rol or ROL_POR_DEFECTO) if email else None)
+
+
+def actor_actual() -> Optional[Tuple[str, str]]:
+    """
+    Obtiene el usuario del contexto actual.
+
+    Returns:
+        Tupla (email, rol) o None si no hay usuario
+    """
+    return _actor_actual.get()
+
+
+class RateLimiter:
+    """
+    Limitador de solicitudes que modifican datos.
+
+    - Implementa el patrón Singleton: un único estado por proceso
+    - Un balde por usuario (nivel según su rol) y otro por hogar (compartido
+      por todos sus usuarios); una solicitud consume una ficha de cada uno
+    - Estado O(1) por clave y reposición perezosa: sin hilos ni timers
+    - Los baldes que recuperaron la ráfaga completa se descartan (un barrido
+      perezoso cada INTERVALO_BARRIDO segundos): la memoria crece con los
+      usuarios y hogares activos, no con todos los vistos
+    - El rechazo es inmediato y no consulta la BD
+    - Las solicitudes sin usuario (motor de reglas, tareas programadas) no
+      se limitan
+    """
+
+    # Segundos mínimos entre barridos de baldes llenos
+    INTERVALO_BARRIDO = 60.0
+
+    _instance: Optional["RateLimiter"] = None
+
+    def __new__(cls):
+        """Implementa Singleton."""
+        if cls._instance is None:
+            cls._instance = super(RateLimiter, cls).__new__(cls)
+            cls._instance.__inicializar()
+        return cls._instance
+
+    def __inicializar(self) -> None:
+        """Inicializa el estado interno (una sola vez por proceso)."""
+        self.niveles: Dict[str, RateTier] = {
+            rol: RateTier.desde_texto(
+                f"RATE_LIMIT_{rol.upper()}", os.getenv(f"RATE_LIMIT_{rol.upper()}", valor)
+            )
+            for rol, valor in NIVELES_POR_DEFECTO.items()
+        }
+        self.nivel_hogar = RateTier.desde_texto(
+            "RATE_LIMIT_HOGAR", os.getenv("RATE_LIMIT_HOGAR", NIVEL_HOGAR_POR_DEFECTO)
+        )
+        self.reloj: Callable[[], float] = time.monotonic
+        self.__baldes: Dict[Tuple[str, object], TokenBucket] = {}
+        # Baldes que ya rechazaron desde su último consumo (se loguea solo el primero)
+        self.__agotados: Set[Tuple[str, object]] = set()
+        self.__ultimo_barrido: Optional[float] = None
+        self.__lock = threading.Lock()
+
+    def nivel_de(self, rol: str) -> RateTier:
+        """
+        Obtiene el nivel de un rol.
+
+        Los roles sin nivel por defecto pueden configurarse con
+        RATE_LIMIT_<ROL>; si no lo tienen usan el de 'standard'.
+
+        Args:
+            rol: Nombre del rol
+
+        Returns:
+            RateTier
+        """
+        nivel = self.niveles.get(rol)
+        if nivel is None:
+            clave = f"RATE_LIMIT_{rol.upper()}"
+            valor = os.getenv(clave)
+            nivel = RateTier.desde_texto(clave, valor) if valor else self.niveles[ROL_POR_DEFECTO]
+            self.niveles[rol] = nivel
+        return nivel
+
+    def consumir(self, email: str, rol: str, home_id: Optional[int] = None) -> None:
+        """
+        Consume una ficha del usuario (y del hogar, si se conoce).
+
+        Las fichas se descuentan solo si todos los baldes tienen una, de modo
+        que una solicitud rechazada no penaliza al otro balde.
+
+        Args:
+            email: Email del usuario
+            rol: Nombre del rol del usuario
+            home_id: ID del hogar afectado (opcional)
+
+        Raises:
+            RateLimitExceededException: Si algún balde está vacío
+        """
+        baldes = [(("usuario", email), self.nivel_de(rol))]
+        if home_id is not None:
+            baldes.append((("hogar", home_id), self.nivel_hogar))
+
+        ahora = self.reloj()
+        with self.__lock:
+            self.__barrer(ahora)
+            espera = 0.0
+            for clave, nivel in baldes:
+                balde = self.__baldes.get(clave)
+                if balde is None:
+                    balde = self.__baldes[clave] = TokenBucket(nivel.rafaga, ahora)
+                else:
+                    balde.reponer(nivel, ahora)
+                espera = max(espera, balde.espera(nivel))
+
+            if espera == 0.0:
+                for clave, nivel in baldes:
+                    balde = self.__baldes[clave]
+                    balde.fichas -= 1.0
+                    balde.calcular_lleno(nivel)
+                    self.__agotados.discard(clave)
+                return
+
+            for clave, nivel in baldes:
+                if self.__baldes[clave].espera(nivel) > 0 and clave not in self.__agotados:
+                    self.__agotados.add(clave)
+                    logger.warning(f"Límite de solicitudes alcanzado: {clave[0]}={clave[1]}")
+        raise RateLimitExceededException(espera)
+
+    def __barrer(self, ahora: float) -> None:
+        """
+        Descarta los baldes que ya recuperaron la ráfaga completa.
+
+        Se ejecuta como mucho una vez cada INTERVALO_BARRIDO segundos, de
+        modo que su costo se reparte entre las solicitudes. Debe llamarse
+        con el lock tomado.
+
+        Args:
+            ahora: Instante actual (reloj monotónico)
+        """
+        ultimo = self.__ultimo_barrido
+        if ultimo is not None and ahora - ultimo < self.INTERVALO_BARRIDO:
+            return
+        self.__ultimo_barrido = ahora
+        llenos = [clave for clave, balde in self.__baldes.items() if balde.lleno <= ahora]
+        for clave in llenos:
+            del self.__baldes[clave]
+            self.__agotados.discard(clave)
+
+    def cantidad_baldes(self) -> int:
+        """
+        Cantidad de baldes en memoria.
+
+        Returns:
+            Número de baldes
+        """
+        return len(self.__baldes)
+
+    def verificar(self, home_id: Optional[int] = None) -> None:
+        """
+        Consume una ficha del usuario del contexto actual.
+
+        Sin usuario en el contexto no se aplica ningún límite.
+
+        Args:
+            home_id: ID del hogar afectado (opcional)
+
+        Raises:
+            RateLimitExceededException: Si se superó el límite
+        """
+        actor = _actor_actual.get()
+        if actor is not None:
+            self.consumir(actor[0], actor[1], home_id)
+
+    def reiniciar(self) -> None:
+        """Vacía el estado de todos los baldes (ej: en tests)."""
+        with self.__lock:
+            self.__baldes.clear()
+            self.__agotados.clear()
@@ -0,0 +1,268 @@
+"""Motor de reglas de automatizaciones indexado por disparador."""
+
+import threading
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+from dao.automation_rule_dao import AutomationRuleDAO
+from dominio.automation_rule import (
+    TRIGGER_DEVICE_STATE,
+    TRIGGER_EVENT_SOURCE,
+    TRIGGER_TIME,
+    AutomationRule,
+)
+from dominio.messages import AutomationChanged, ClockTick, DeviceStateChanged, EventOccurred
+from services.command_coalescer import CommandCoalescer
+from services.event_bus import ASINCRONO, EventBus, Suscripcion
+from utils.logger import get_automation_logger
+
+# Logger de automatizaciones
+logger = get_automation_logger()
+
+Clave = Tuple[Hashable, ...]
+
+
+def claves_de(mensaje: object) -> List[Clave]:
+    """
+    Claves de índice que corresponden a un mensaje del bus.
+
+    Para cada evento se busca la clave exacta y la clave comodín
+    (campo opcional en None) de los disparadores.
+
+    Args:
+        mensaje: DeviceStateChanged, EventOccurred o ClockTick
+
+    Returns:
+        Lista de claves a consultar (vacía si el mensaje no dispara reglas)
+    """
+    if isinstance(mensaje, DeviceStateChanged):
+        return [
+            (TRIGGER_DEVICE_STATE, mensaje.device_id, mensaje.state_id),
+            (TRIGGER_DEVICE_STATE, mensaje.device_id, None),
+        ]
+    if isinstance(mensaje, EventOccurred):
+        return [
+            (TRIGGER_EVENT_SOURCE, mensaje.source, mensaje.device_id),
+            (TRIGGER_EVENT_SOURCE, mensaje.source, None),
+        ]
+    if isinstance(mensaje, ClockTick):
+        return [(TRIGGER_TIME, mensaje.timestamp.hour, mensaje.timestamp.minute)]
+    return []
+
+
+class RuleEngine:
+    """
+    Evalúa automatizaciones en respuesta a eventos.
+
+    Las reglas se indexan por la clave de cada disparador, de modo que un
+    evento solo consulta las reglas que lo escuchan: el costo es
+    proporcional a las reglas coincidentes y no al total de automatizaciones.
+
+    Las acciones con estado destino se aplican a través de DeviceService,
+    que persiste el cambio, actualiza el store en memoria y lo publica en el bus.
+    """
+
+    def __init__(self, ejecutor: Optional[Callable[[AutomationRule, object], None]] = None):
+        """
+        Inicializa el motor.
+
+        Args:
+            ejecutor: Función que ejecuta una regla disparada
+                (por defecto aplica los estados destino de sus acciones)
+        """
+        self.rule_dao = AutomationRuleDAO()
+        self.coalescer = CommandCoalescer()
+        self.ejecutor = ejecutor or self.aplicar_acciones
+        self.__reglas: Dict[int, AutomationRule] = {}
+        self.__indice: Dict[Clave, Dict[int, AutomationRule]] = {}
+        self.__lock = threading.RLock()
+        self.__suscripciones: List[Suscripcion] = []
+
+    def cargar(self) -> bool:
+        """
+        Carga e indexa todas las automatizaciones activas.
+
+        Returns:
+            True si se cargaron correctamente
+        """
+        reglas = self.rule_dao.obtener_reglas()
+        if reglas is None:
+            logger.error("No se pudieron cargar las reglas de automatizaciones")
+            return False
+
+        with self.__lock:
+            self.__reglas.clear()
+            self.__indice.clear()
+            for regla in reglas:
+                self.registrar(regla)
+        logger.info(f"Motor de reglas cargado: {len(reglas)} automatizaciones")
+        return True
+
+    def registrar(self, regla: AutomationRule) -> None:
+        """
+        Indexa (o reemplaza) la regla de una automatización.
+
+        Args:
+            regla: Regla a indexar
+        """
+        with self.__lock:
+            self.quitar(regla.automation_id)
+            self.__reglas[regla.automation_id] = regla
+            for trigger in regla.triggers:
+                self.__indice.setdefault(trigger.clave(), {})[regla.automation_id] = regla
+
+    def quitar(self, automation_id: int) -> bool:
+        """
+        Quita la regla de una automatización del índice.
+
+        Args:
+            automation_id: ID de la automatización
+
+        Returns:
+            True si la regla estaba indexada
+        """
+        with self.__lock:
+            regla = self.__reglas.pop(automation_id, None)
+            if regla is None:
+                return False
+            for trigger in regla.triggers:
+                clave = trigger.clave()
+                coincidentes = self.__indice.get(clave)
+                if coincidentes is not None:
+                    coincidentes.pop(automation_id, None)
+                    if not coincidentes:
+                        del self.__indice[clave]
+            return True
+
+    def recargar(self, automation_id: int) -> bool:
+        """
+        Vuelve a leer la regla de una automatización (tras crearla, editarla,
+        activarla o desactivarla).
+
+        Args:
+            automation_id: ID de la automatización
+
+        Returns:
+            True si la automatización quedó indexada (activa y con disparadores)
+        """
+        reglas = self.rule_dao.obtener_reglas(automation_id)
+        if reglas is None:
+            logger.error(f"No se pudo recargar la regla de la automatización {automation_id}")
+            return False
+        with self.__lock:
+            self.quitar(automation_id)
+            for regla in reglas:
+                self.registrar(regla)
+        return bool(reglas)
+
+    def cantidad_reglas(self) -> int:
+        """
+        Cantidad de automatizaciones indexadas.
+
+        Returns:
+            Número de reglas
+        """
+        return len(self.__reglas)
+
+    def horarios(self) -> List[Tuple[int, int]]:
+        """
+        Horarios (hora, minuto) que tienen al menos una regla.
+
+        Returns:
+            Lista ordenada de tuplas (hora, minuto)
+        """
+        with self.__lock:
+            return sorted(clave[1:] for clave in self.__indice if clave[0] == TRIGGER_TIME)
+
+    def reglas_para(self, mensaje: object) -> List[AutomationRule]:
+        """
+        Reglas cuyos disparadores coinciden con el mensaje.
+
+        Args:
+            mensaje: Evento recibido del bus
+
+        Returns:
+            Reglas coincidentes, sin repetir
+        """
+        coincidentes: Dict[int, AutomationRule] = {}
+        with self.__lock:
+            for clave in claves_de(mensaje):
+                coincidentes.update(self.__indice.get(clave, {}))
+        return list(coincidentes.values())
+
+    def procesar(self, mensaje: object) -> List[int]:
+        """
+        Ejecuta las reglas que dispara un mensaje.
+
+        Args:
+            mensaje: Evento recibido del bus
+
+        Returns:
+            IDs de las automatizaciones ejecutadas
+        """
+        ejecutadas = []
+        for regla in self.reglas_para(mensaje):
+            try:
+                self.ejecutor(regla, mensaje)
+                ejecutadas.append(regla.automation_id)
+            except Exception as e:
+                logger.error(f"Error al ejecutar automatización {regla.automation_id}: {e}")
+        return ejecutadas
+
+    def aplicar_acciones(self, regla: AutomationRule, mensaje: object) -> None:
+        """
+        Ejecutor por defecto: lleva cada dispositivo al estado destino de su acción.
+
+        Los cambios pasan por el CommandCoalescer: varias reglas que actúan
+        sobre el mismo dispositivo en la misma ventana generan una sola
+        escritura, y los dispositivos que ya están en el estado destino se
+        omiten, lo que además corta ciclos entre reglas.
+
+        Args:
+            regla: Regla disparada
+            mensaje: Evento que la disparó
+        """
+        logger.info(
+            f"Automatización disparada: {regla.name} (ID={regla.automation_id}) | "
+            f"evento={type(mensaje).__name__}"
+        )
+        for accion in regla.actions:
+            if accion.state_id is None:
+                continue
+            self.coalescer.solicitar(accion.device_id, accion.state_id, origen="automatización")
+
+    def conectar(self, bus: Optional[EventBus] = None) -> None:
+        """
+        Suscribe el motor a los eventos del bus.
+
+        Los eventos se reciben de forma asíncrona: las acciones de una regla
+        pueden publicar nuevos cambios de estado sin reentrar en el hilo que
+        publicó.
+
+        Args:
+            bus: Bus de eventos (por defecto el del proceso)
+        """
+        bus = bus or EventBus()
+        self.desconectar(bus)
+        self.__suscripciones = [
+            bus.suscribir(DeviceStateChanged, self.procesar, modo=ASINCRONO),
+            bus.suscribir(EventOccurred, self.procesar, modo=ASINCRONO),
+            # El pulso de reloj se evalúa en el hilo del planificador, sin cola:
+            # ningún pulso se descarta por una cola llena
+            bus.suscribir(ClockTick, self.procesar),
+            bus.suscribir(
+                AutomationChanged,
+                lambda mensaje: self.recargar(mensaje.automation_id),
+                modo=ASINCRONO,
+            ),
+        ]
+
+    def desconectar(self, bus: Optional[EventBus] = None) -> None:
+        """
+        Cancela las suscripciones del motor.
+
+        Args:
+            bus: Bus de eventos (por defecto el del proceso)
+        """
+        bus = bus or EventBus()
+        for suscripcion in self.__suscripciones:
+            bus.desuscribir(suscripcion)
+        self.__suscripciones = []
@@ -0,0 +1,361 @@
+"""Planificador de tareas basado en una rueda de temporizadores."""
+
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from conn.db_connection import DatabaseConnection
+from dao.scheduled_job_dao import ScheduledJobDAO
+from utils.cron import CronExpression
+from utils.logger import get_app_logger
+
+# Logger general de la aplicación
+logger = get_app_logger()
+
+
+class _Entrada:
+    """Temporizador dentro de la rueda."""
+
+    __slots__ = ('vencimiento', 'valor', 'cancelada')
+
+    def __init__(self, vencimiento: int, valor: object):
+        self.vencimiento = vencimiento
+        self.valor = valor
+        self.cancelada = False
+
+
+class TimerWheel:
+    """
+    Rueda de temporizadores con hash (hashed timing wheel).
+
+    Cada ranura agrupa los temporizadores cuyo tick de vencimiento cae en
+    ella (módulo la cantidad de ranuras). Agregar y cancelar son O(1) y
+    avanzar un tick solo revisa una ranura, sin importar cuántos
+    temporizadores haya programados en total.
+    """
+
+    def __init__(self, ranuras: int = 3600):
+        """
+        Inicializa la rueda.
+
+        Args:
+            ranuras: Cantidad de ranuras (una vuelta = ranuras ticks)
+        """
+        self.__ranuras: List[List[_Entrada]] = [[] for _ in range(ranuras)]
+        self.__tick = 0
+
+    @property
+    def tick(self) -> int:
+        """Obtiene el tick actual."""
+        return self.__tick
+
+    def agregar(self, vencimiento: int, valor: object) -> _Entrada:
+        """
+        Programa un temporizador.
+
+        Args:
+            vencimiento: Tick absoluto en el que vence (si ya pasó, vence en el próximo)
+            valor: Dato asociado que se devuelve al vencer
+
+        Returns:
+            La entrada creada (para cancelarla)
+        """
+        entrada = _Entrada(max(vencimiento, self.__tick + 1), valor)
+        self.__ranuras[entrada.vencimiento % len(self.__ranuras)].append(entrada)
+        return entrada
+
+    @staticmethod
+    def cancelar(entrada: _Entrada) -> None:
+        """
+        Cancela un temporizador (se descarta al pasar por su ranura).
+
+        Args:
+            entrada: Entrada devuelta por agregar()
+        """
+        entrada.cancelada = True
+
+    def avanzar_hasta(self, tick: int) -> List[object]:
+        """
+        Avanza la rueda y devuelve los temporizadores vencidos.
+
+        Args:
+            tick: Tick absoluto hasta el que avanzar (inclusive)
+
+        Returns:
+            Valores vencidos, en orden de vencimiento
+        """
+        if tick <= self.__tick:
+            return []
+
+        vencidas: List[_Entrada] = []
+        # Tras una vuelta completa todas las ranuras ya fueron revisadas
+        for t in range(self.__tick + 1, min(tick, self.__tick + len(self.__ranuras)) + 1):
+            ranura = self.__ranuras[t % len(self.__ranuras)]
+            pendientes = []
+            for entrada in ranura:
+                if entrada.cancelada:
+                    continue
+                if entrada.vencimiento <= tick:
+                    vencidas.append(entrada)
+                else:
+                    pendientes.append(entrada)
+            ranura[:] = pendientes
+        self.__tick = tick
+
+        vencidas.sort(key=lambda entrada: entrada.vencimiento)
+        return [entrada.valor for entrada in vencidas]
+
+
+class _Trabajo:
+    """Tarea programada con nombre."""
+
+    __slots__ = ('nombre', 'cron', 'accion', 'proxima', 'recuperar', 'max_recuperaciones', 'entrada')
+
+    def __init__(
+        self,
+        nombre: str,
+        cron: Optional[CronExpression],
+        accion: Callable[[datetime], None],
+        proxima: datetime,
+        recuperar: bool,
+        max_recuperaciones: int,
+    ):
+        self.nombre = nombre
+        self.cron = cron
+        self.accion = accion
+        self.proxima = proxima
+        self.recuperar = recuperar
+        self.max_recuperaciones = max_recuperaciones
+        self.entrada: Optional[_Entrada] = None
+
+    def siguiente(self, instante: datetime) -> Optional[datetime]:
+        """Próxima ejecución posterior a instante (None para tareas únicas)."""
+        return self.cron.siguiente(instante) if self.cron else None
+
+
+class Scheduler:
+    """
+    Planificador de tareas recurrentes (cron) y únicas.
+
+    - Un único hilo avanza la rueda de temporizadores; no hay un hilo ni
+      una consulta periódica por tarea
+    - La próxima ejecución de cada tarea se persiste en scheduled_job
+    - Al registrar una tarea con una ejecución persistida ya vencida
+      (la aplicación estuvo detenida), se recuperan las ejecuciones
+      perdidas, hasta max_recuperaciones por tarea
+    """
+
+    # Atraso tolerado para ejecutar una tarea que no recupera ejecuciones perdidas
+    TOLERANCIA = timedelta(minutes=1)
+
+    def __init__(
+        self,
+        resolucion_segundos: float = 1.0,
+        ranuras: int = 3600,
+        reloj: Callable[[], datetime] = datetime.now,
+    ):
+        """
+        Inicializa el planificador.
+
+        Args:
+            resolucion_segundos: Duración de un tick de la rueda
+            ranuras: Ranuras de la rueda
+            reloj: Fuente de la hora actual
+        """
+        self.job_dao = ScheduledJobDAO()
+        self.__resolucion = resolucion_segundos
+        self.__reloj = reloj
+        self.__origen = reloj()
+        self.__rueda = TimerWheel(ranuras)
+        self.__trabajos: Dict[str, _Trabajo] = {}
+        self.__persistidas: Optional[Dict[str, datetime]] = None
+        self.__lock = threading.RLock()
+        self.__hilo: Optional[threading.Thread] = None
+        self.__detener = threading.Event()
+
+    def programar_cron(
+        self,
+        nombre: str,
+        expresion: str,
+        accion: Callable[[datetime], None],
+        recuperar: bool = True,
+        max_recuperaciones: int = 1440,
+    ) -> datetime:
+        """
+        Programa una tarea recurrente.
+
+        Args:
+            nombre: Nombre único de la tarea (clave de persistencia)
+            expresion: Expresión cron de 5 campos (ej: '0 23 * * *')
+            accion: Función que recibe el instante programado de cada ejecución
+            recuperar: Ejecutar las ejecuciones perdidas mientras la app estuvo
+                detenida (solo para tareas idempotentes, como el mantenimiento)
+            max_recuperaciones: Máximo de ejecuciones perdidas a recuperar
+
+        Returns:
+            Próxima ejecución
+
+        Raises:
+            ValueError: Si la expresión cron es inválida
+        """
+        cron = CronExpression(expresion)
+        proxima = self.__proxima_persistida(nombre) or cron.siguiente(self.__reloj())
+        return self.__registrar(
+            _Trabajo(nombre, cron, accion, proxima, recuperar, max_recuperaciones)
+        )
+
+    def programar_una_vez(
+        self, nombre: str, instante: datetime, accion: Callable[[datetime], None]
+    ) -> datetime:
+        """
+        Programa una tarea que se ejecuta una sola vez.
+
+        Si ya existe una ejecución persistida con ese nombre se respeta
+        (se ejecuta al registrarla si venció mientras la app estuvo detenida).
+
+        Args:
+            nombre: Nombre único de la tarea
+            instante: Momento de la ejecución
+            accion: Función que recibe el instante programado
+
+        Returns:
+            Instante de la ejecución
+        """
+        proxima = self.__proxima_persistida(nombre) or instante
+        return self.__registrar(_Trabajo(nombre, None, accion, proxima, True, 1))
+
+    def cancelar(self, nombre: str) -> bool:
+        """
+        Cancela una tarea y elimina su próxima ejecución persistida.
+
+        Args:
+            nombre: Nombre de la tarea
+
+        Returns:
+            True si la tarea estaba programada
+        """
+        with self.__lock:
+            trabajo = self.__trabajos.pop(nombre, None)
+            if trabajo is None:
+                return False
+            TimerWheel.cancelar(trabajo.entrada)
+        self.job_dao.eliminar(nombre)
+        return True
+
+    def proxima_ejecucion(self, nombre: str) -> Optional[datetime]:
+        """
+        Obtiene la próxima ejecución de una tarea.
+
+        Args:
+            nombre: Nombre de la tarea
+
+        Returns:
+            Próxima ejecución o None si la tarea no está programada
+        """
+        trabajo = self.__trabajos.get(nombre)
+        return trabajo.proxima if trabajo else None
+
+    def procesar(self, ahora: Optional[datetime] = None) -> int:
+        """
+        Avanza la rueda hasta ahora y ejecuta las tareas vencidas.
+
+        Args:
+            ahora: Hora actual (por defecto la del reloj)
+
+        Returns:
+            Cantidad de ejecuciones realizadas
+        """
+        ahora = ahora or self.__reloj()
+        with self.__lock:
+            vencidos = self.__rueda.avanzar_hasta(self.__tick_de(ahora, redondeo=math.floor))
+        return sum(self.__ejecutar(trabajo, ahora) for trabajo in vencidos)
+
+    def iniciar(self) -> None:
+        """Inicia el hilo que avanza la rueda (uno solo para todas las tareas)."""
+        if self.__hilo is not None and self.__hilo.is_alive():
+            return
+        self.__detener.clear()
+        self.__hilo = threading.Thread(
+            target=self.__bucle, name="scheduler", daemon=True
+        )
+        self.__hilo.start()
+
+    def detener(self) -> None:
+        """Detiene el hilo del planificador."""
+        self.__detener.set()
+        if self.__hilo is not None:
+            self.__hilo.join(timeout=5)
+            self.__hilo = None
+
+    def __bucle(self) -> None:
+        """Avanza la rueda una vez por tick (devolviendo la conexión al pool en cada uno)."""
+        while not self.__detener.wait(self.__resolucion):
+            try:
+                with DatabaseConnection().unidad_de_trabajo():
+                    self.procesar()
+            except Exception as e:
+                logger.error(f"Error en el planificador: {e}")
+
+    def __proxima_persistida(self, nombre: str) -> Optional[datetime]:
+        """Próxima ejecución persistida de una tarea (una sola consulta para todas)."""
+        if self.__persistidas is None:
+            self.__persistidas = self.job_dao.obtener_proximas() or {}
+        return self.__persistidas.pop(nombre, None)
+
+    def __tick_de(self, instante: datetime, redondeo=math.ceil) -> int:
+        """Tick de la rueda correspondiente a un instante."""
+        return int(redondeo((instante - self.__origen).total_seconds() / self.__resolucion))
+
+    def __registrar(self, trabajo: _Trabajo) -> datetime:
+        """Agrega una tarea a la rueda (reemplazando la anterior con el mismo nombre)."""
+        with self.__lock:
+            anterior = self.__trabajos.get(trabajo.nombre)
+            if anterior is not None:
+                TimerWheel.cancelar(anterior.entrada)
+            self.__trabajos[trabajo.nombre] = trabajo
+            trabajo.entrada = self.__rueda.agregar(self.__tick_de(trabajo.proxima), trabajo)
+        self.job_dao.guardar(trabajo.nombre, trabajo.proxima)
+        logger.info(f"Tarea programada: {trabajo.nombre} | próxima={trabajo.proxima}")
+        return trabajo.proxima
+
+    def __ejecutar(self, trabajo: _Trabajo, ahora: datetime) -> int:
+        """
+        Ejecuta una tarea vencida (y sus ejecuciones perdidas) y la reprograma.
+
+        Returns:
+            Cantidad de ejecuciones realizadas
+        """
+        instantes = []
+        proxima = trabajo.proxima
+        while proxima is not None and proxima <= ahora:
+            instantes.append(proxima)
+            proxima = trabajo.siguiente(proxima)
+
+        if not trabajo.recuperar:
+            instantes = [i for i in instantes if ahora - i <= self.TOLERANCIA]
+        omitidas = len(instantes) - trabajo.max_recuperaciones
+        if omitidas > 0:
+            logger.warning(f"Tarea {trabajo.nombre}: {omitidas} ejecuciones perdidas omitidas")
+            instantes = instantes[omitidas:]
+
+        for instante in instantes:
+            try:
+                trabajo.accion(instante)
+            except Exception as e:
+                logger.error(f"Error al ejecutar la tarea {trabajo.nombre} ({instante}): {e}")
+
+        with self.__lock:
+            if self.__trabajos.get(trabajo.nombre) is not trabajo:
+                # Cancelada o reemplazada durante la ejecución
+                return len(instantes)
+            trabajo.proxima = proxima
+            if proxima is None:
+                del self.__trabajos[trabajo.nombre]
+            else:
+                trabajo.entrada = self.__rueda.agregar(self.__tick_de(proxima), trabajo)
+
+        if proxima is None:
+            self.job_dao.eliminar(trabajo.nombre)
+        else:
+            self.job_dao.guardar(trabajo.nombre, proxima)
+        return len(instantes)
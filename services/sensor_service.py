@@ -0,0 +1,77 @@
+"""Servicio de ingreso de eventos y lecturas de sensores."""
+
+from datetime import datetime
+from typing import Optional
+from dao.event_dao import EventDAO
+from dominio.messages import EventOccurred, SensorReading
+from services.event_bus import EventBus
+from services.telemetry_store import TelemetryStore
+from utils.logger import get_device_logger
+
+# Logger de dispositivos
+logger = get_device_logger()
+
+# Origen de los eventos reportados por sensores
+SOURCE_SENSOR = "sensor"
+
+
+class SensorService:
+    """
+    Punto de entrada de los datos que reportan los sensores.
+
+    Responsabilidades:
+    - Registrar detecciones (humo, movimiento...) como eventos y publicarlas
+      en el bus (motor de reglas, detector de anomalías)
+    - Registrar lecturas numéricas en la telemetría y publicarlas en el bus
+    """
+
+    def __init__(self):
+        """Inicializa el servicio de sensores."""
+        self.event_dao = EventDAO()
+        self.telemetry_store = TelemetryStore()
+        self.event_bus = EventBus()
+
+    def registrar_evento(
+        self, device_id: int, descripcion: str, instante: Optional[datetime] = None
+    ) -> tuple[bool, str]:
+        """
+        Registra un evento de sensor (ej: 'Movimiento detectado').
+
+        Args:
+            device_id: ID del dispositivo
+            descripcion: Descripción del evento
+            instante: Momento del evento (por defecto: ahora)
+
+        Returns:
+            Tupla (éxito: bool, mensaje: str)
+        """
+        instante = instante or datetime.now()
+        if not self.event_dao.registrar_evento(device_id, SOURCE_SENSOR, descripcion, instante):
+            logger.error(f"No se pudo registrar el evento del sensor {device_id}")
+            return False, "Error al registrar el evento"
+
+        self.event_bus.publicar(EventOccurred(device_id, SOURCE_SENSOR, descripcion, instante))
+        return True, "Evento registrado"
+
+    def registrar_lectura(
+        self, device_id: int, metric: str, valor: float, instante: Optional[datetime] = None
+    ) -> tuple[bool, str]:
+        """
+        Registra una lectura numérica de un sensor.
+
+        Args:
+            device_id: ID del dispositivo
+            metric: Nombre de la métrica (ej: 'temperatura')
+            valor: Valor leído
+            instante: Momento de la lectura (por defecto: ahora)
+
+        Returns:
+            Tupla (éxito: bool, mensaje: str)
+        """
+        instante = instante or datetime.now()
+        if not self.telemetry_store.registrar(device_id, metric, valor, instante):
+            return False, "Lectura inválida"
+
+        if self.event_bus.tiene_suscriptores(SensorReading):
+            self.event_bus.publicar(SensorReading(device_id, metric, float(valor), instante))
+        return True, "Lectura registrada"
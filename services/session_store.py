@@ -0,0 +1,198 @@
+"""Store en memoria de sesiones autenticadas (tokens con expiración)."""
+
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set
+from dominio.user import User
+from utils.logger import get_auth_logger
+
+# Logger de autenticación
+logger = get_auth_logger()
+
+
+class _Sesion:
+    """Usuario de un token y su vencimiento (reloj monotónico)."""
+
+    __slots__ = ('usuario', 'vence')
+
+    def __init__(self, usuario: User, vence: float):
+        self.usuario = usuario
+        self.vence = vence
+
+
+class SessionStore:
+    """
+    Sesiones activas indexadas por token.
+
+    - Implementa el patrón Singleton: un único store por proceso
+    - Validar un token es O(1) y nunca consulta la BD
+    - Expiración deslizante: cada uso renueva el TTL de la sesión
+    - Tamaño acotado: al superar el máximo se descarta la sesión usada
+      hace más tiempo
+
+    Como todas las sesiones comparten el mismo TTL, el orden de uso
+    (OrderedDict) coincide con el de vencimiento: las vencidas siempre
+    están al principio y se purgan sin recorrer el resto.
+    """
+
+    _instance: Optional["SessionStore"] = None
+
+    def __new__(cls):
+        """Implementa Singleton."""
+        if cls._instance is None:
+            cls._instance = super(SessionStore, cls).__new__(cls)
+            cls._instance.__inicializar()
+        return cls._instance
+
+    def __inicializar(self) -> None:
+        """Inicializa el estado interno (una sola vez por proceso)."""
+        self.ttl_segundos = float(os.getenv("SESSION_TTL_MINUTES", "30")) * 60
+        self.maximo = int(os.getenv("SESSION_MAX", "10000"))
+        self.reloj: Callable[[], float] = time.monotonic
+        # Se invoca con el email cuando se cierra (o vence) la última sesión de un usuario
+        self.al_cerrar_ultima: Optional[Callable[[str], None]] = None
+        self.__sesiones: "OrderedDict[str, _Sesion]" = OrderedDict()
+        # email -> tokens del usuario (para revocar todas sus sesiones)
+        self.__por_usuario: Dict[str, Set[str]] = {}
+        self.__lock = threading.Lock()
+
+    def crear(self, usuario: User) -> str:
+        """
+        Abre una sesión para un usuario ya autenticado.
+
+        Args:
+            usuario: Usuario autenticado
+
+        Returns:
+            Token de la sesión
+        """
+        token = secrets.token_urlsafe(32)
+        with self.__lock:
+            ahora = self.reloj()
+            self.__purgar(ahora)
+            self.__sesiones[token] = _Sesion(usuario, ahora + self.ttl_segundos)
+            self.__por_usuario.setdefault(usuario.email, set()).add(token)
+            while len(self.__sesiones) > self.maximo:
+                descartado, sesion = self.__sesiones.popitem(last=False)
+                self.__desindexar(descartado, sesion.usuario.email)
+                logger.warning(f"Sesión descartada por límite de sesiones: {sesion.usuario.email}")
+        return token
+
+    def validar(self, token: Optional[str]) -> Optional[User]:
+        """
+        Obtiene el usuario de un token vigente y renueva su vencimiento.
+
+        Args:
+            token: Token de la sesión
+
+        Returns:
+            Usuario de la sesión o None si el token no existe o venció
+        """
+        if not token:
+            return None
+        with self.__lock:
+            sesion = self.__sesiones.get(token)
+            if sesion is None:
+                return None
+            ahora = self.reloj()
+            if sesion.vence <= ahora:
+                del self.__sesiones[token]
+                self.__desindexar(token, sesion.usuario.email)
+                return None
+            sesion.vence = ahora + self.ttl_segundos
+            self.__sesiones.move_to_end(token)
+            return sesion.usuario
+
+    def revocar(self, token: Optional[str]) -> Optional[User]:
+        """
+        Cierra una sesión.
+
+        Args:
+            token: Token de la sesión
+
+        Returns:
+            Usuario de la sesión cerrada o None si no existía
+        """
+        with self.__lock:
+            sesion = self.__sesiones.pop(token, None)
+            if sesion is None:
+                return None
+            self.__desindexar(token, sesion.usuario.email)
+            return sesion.usuario
+
+    def revocar_usuario(self, email: str) -> int:
+        """
+        Cierra todas las sesiones de un usuario (ej: al cambiar su rol).
+
+        Args:
+            email: Email del usuario
+
+        Returns:
+            Cantidad de sesiones cerradas
+        """
+        with self.__lock:
+            tokens = self.__por_usuario.pop(email, set())
+            for token in tokens:
+                self.__sesiones.pop(token, None)
+            if tokens and self.al_cerrar_ultima is not None:
+                self.al_cerrar_ultima(email)
+            return len(tokens)
+
+    def purgar(self) -> int:
+        """
+        Elimina las sesiones vencidas.
+
+        Returns:
+            Cantidad de sesiones eliminadas
+        """
+        with self.__lock:
+            return self.__purgar(self.reloj())
+
+    def activas(self) -> int:
+        """
+        Cantidad de sesiones en el store (incluye vencidas aún no purgadas).
+
+        Returns:
+            Sesiones en memoria
+        """
+        with self.__lock:
+            return len(self.__sesiones)
+
+    def __purgar(self, ahora: float) -> int:
+        """
+        Elimina desde el principio las sesiones vencidas (requiere el lock).
+
+        Args:
+            ahora: Instante actual
+
+        Returns:
+            Cantidad de sesiones eliminadas
+        """
+        eliminadas = 0
+        while self.__sesiones:
+            token, sesion = next(iter(self.__sesiones.items()))
+            if sesion.vence > ahora:
+                break
+            del self.__sesiones[token]
+            self.__desindexar(token, sesion.usuario.email)
+            eliminadas += 1
+        return eliminadas
+
+    def __desindexar(self, token: str, email: str) -> None:
+        """
+        Quita un token del índice por usuario (requiere el lock).
+
+        Args:
+            token: Token eliminado
+            email: Email del usuario de la sesión
+        """
+        tokens = self.__por_usuario.get(email)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self.__por_usuario[email]
+                if self.al_cerrar_ultima is not None:
+                    self.al_cerrar_ultima(email)
@@ -0,0 +1,326 @@
+"""Store de telemetría numérica: buffers en memoria, lotes y niveles reducidos."""
+
+import math
+import os
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional, Tuple
+from dao.telemetry_dao import TelemetryDAO, inicio_bucket, normalizar_ts
+from dominio.telemetry import TelemetryAggregate, TelemetrySeries
+from utils.arrays import a_arreglo
+from utils.logger import get_device_logger
+
+# Logger de dispositivos
+logger = get_device_logger()
+
+# Rango máximo (inclusive) que se responde con la granularidad 'minuto'
+UMBRAL_MINUTO = timedelta(days=7)
+
+Clave = Tuple[int, str]
+# (device_id, metric, ts): una lectura por instante, la última registrada
+ClaveMuestra = Tuple[int, str, datetime]
+# [sample_count, min_value, max_value, sum_value]
+Acumulador = List[float]
+
+
+def acumular(buckets: Dict[datetime, Acumulador], bucket: datetime, valor: float) -> None:
+    """
+    Agrega una lectura al acumulador de su bucket.
+
+    Args:
+        buckets: Acumuladores por inicio de bucket
+        bucket: Inicio del bucket de la lectura
+        valor: Valor leído
+    """
+    acumulador = buckets.get(bucket)
+    if acumulador is None:
+        buckets[bucket] = [1, valor, valor, valor]
+    else:
+        acumulador[0] += 1
+        acumulador[1] = min(acumulador[1], valor)
+        acumulador[2] = max(acumulador[2], valor)
+        acumulador[3] += valor
+
+
+class TelemetryStore:
+    """
+    Subsistema de telemetría numérica de los sensores.
+
+    - Implementa el patrón Singleton: un único store por proceso
+    - Mantiene un buffer circular con las lecturas recientes de cada
+      (dispositivo, métrica), consultable sin ir a la BD
+    - Acumula las lecturas nuevas y las escribe por lotes (volcar); la BD
+      recalcula los agregados min/max/promedio de los buckets afectados
+    - Una lectura repetida (mismo instante, a milisegundos como en la BD)
+      reemplaza a la anterior, en memoria y en la BD
+    - Las consultas por rango incluyen las lecturas pendientes y las que
+      se están escribiendo, hasta que su transacción se confirma
+    - Las consultas por rango devuelven arreglos NumPy (ver utils.arrays)
+    """
+
+    _instance: Optional["TelemetryStore"] = None
+
+    def __new__(cls):
+        """Implementa Singleton."""
+        if cls._instance is None:
+            cls._instance = super(TelemetryStore, cls).__new__(cls)
+            cls._instance.__inicializar()
+        return cls._instance
+
+    def __inicializar(self) -> None:
+        """Inicializa el estado interno (una sola vez por proceso)."""
+        self.telemetry_dao = TelemetryDAO()
+        self.capacidad = int(os.getenv("TELEMETRY_BUFFER_SIZE", "1024"))
+        self.tamano_lote = int(os.getenv("TELEMETRY_BATCH_SIZE", "5000"))
+        self.__recientes: Dict[Clave, Deque[Tuple[datetime, float]]] = {}
+        self.__pendientes: Dict[ClaveMuestra, float] = {}
+        # Lecturas del volcado en curso: siguen visibles hasta el commit
+        self.__en_vuelo: Dict[ClaveMuestra, float] = {}
+        self.__lock = threading.RLock()
+        self.__lock_volcado = threading.Lock()
+
+    def registrar(
+        self, device_id: int, metric: str, valor: float, instante: Optional[datetime] = None
+    ) -> bool:
+        """
+        Registra una lectura numérica.
+
+        La lectura queda en memoria; se escribe en la BD en el próximo
+        volcado (o de inmediato si se completa un lote).
+
+        Args:
+            device_id: ID del dispositivo
+            metric: Nombre de la métrica (ej: 'temperatura')
+            valor: Valor leído
+            instante: Momento de la lectura (por defecto: ahora)
+
+        Returns:
+            True si la lectura es válida y se registró
+        """
+        try:
+            valor = float(valor)
+        except (TypeError, ValueError):
+            logger.warning(f"Lectura no numérica descartada: device={device_id} {metric}={valor!r}")
+            return False
+        if not math.isfinite(valor) or not metric or len(metric) > 32:
+            logger.warning(f"Lectura inválida descartada: device={device_id} {metric}={valor}")
+            return False
+
+        instante = normalizar_ts(instante or datetime.now())
+        with self.__lock:
+            clave = (device_id, metric)
+            buffer = self.__recientes.get(clave)
+            if buffer is None:
+                buffer = self.__recientes[clave] = deque(maxlen=self.capacidad)
+            if buffer and buffer[-1][0] == instante:
+                buffer[-1] = (instante, valor)
+            else:
+                buffer.append((instante, valor))
+            self.__pendientes[(device_id, metric, instante)] = valor
+            lote_completo = len(self.__pendientes) >= self.tamano_lote
+
+        if lote_completo:
+            self.volcar()
+        return True
+
+    def pendientes(self) -> int:
+        """
+        Cantidad de lecturas todavía no escritas en la BD.
+
+        Returns:
+            Lecturas pendientes
+        """
+        with self.__lock:
+            return len(self.__pendientes)
+
+    def volcar(self) -> tuple[bool, str]:
+        """
+        Escribe en la BD las lecturas pendientes (la BD recalcula sus agregados).
+
+        Los volcados se hacen de a uno. Mientras se escriben, las lecturas
+        siguen visibles para las consultas. Si la escritura falla vuelven a
+        quedar pendientes para el próximo volcado (sin pisar una lectura
+        más nueva del mismo instante).
+
+        Returns:
+            Tupla (éxito: bool, mensaje: str)
+        """
+        with self.__lock_volcado:
+            with self.__lock:
+                self.__en_vuelo, self.__pendientes = self.__pendientes, {}
+                en_vuelo = self.__en_vuelo
+            if not en_vuelo:
+                return True, "Sin lecturas pendientes"
+
+            muestras = [
+                (device_id, metric, instante, valor)
+                for (device_id, metric, instante), valor in en_vuelo.items()
+            ]
+            guardado = self.telemetry_dao.guardar(muestras)
+            with self.__lock:
+                if not guardado:
+                    en_vuelo.update(self.__pendientes)
+                    self.__pendientes = en_vuelo
+                self.__en_vuelo = {}
+
+        if guardado:
+            logger.debug(f"Telemetría volcada: {len(muestras)} lecturas")
+            return True, f"{len(muestras)} lecturas guardadas"
+        logger.error(f"No se pudo volcar la telemetría ({len(muestras)} lecturas pendientes)")
+        return False, "Error al guardar la telemetría"
+
+    def recientes(
+        self, device_id: int, metric: str, cantidad: Optional[int] = None
+    ) -> TelemetrySeries:
+        """
+        Obtiene las últimas lecturas en memoria de una métrica.
+
+        Args:
+            device_id: ID del dispositivo
+            metric: Nombre de la métrica
+            cantidad: Máximo de lecturas (por defecto todo el buffer)
+
+        Returns:
+            TelemetrySeries en orden cronológico (vacía si no hay lecturas)
+        """
+        with self.__lock:
+            lecturas = list(self.__recientes.get((device_id, metric), ()))
+        if cantidad is not None:
+            lecturas = lecturas[-cantidad:] if cantidad > 0 else []
+        return TelemetrySeries(
+            device_id,
+            metric,
+            a_arreglo(instante.timestamp() for instante, _ in lecturas),
+            a_arreglo(valor for _, valor in lecturas),
+        )
+
+    def serie(
+        self, device_id: int, metric: str, desde: datetime, hasta: datetime
+    ) -> Optional[TelemetrySeries]:
+        """
+        Obtiene las lecturas crudas de una métrica en un rango.
+
+        Incluye las lecturas todavía no volcadas a la BD y las que se
+        están volcando.
+
+        Args:
+            device_id: ID del dispositivo
+            metric: Nombre de la métrica
+            desde: Inicio del rango (inclusive)
+            hasta: Fin del rango (inclusive)
+
+        Returns:
+            TelemetrySeries o None si hubo un error de BD
+        """
+        # La memoria se lee antes que la BD: una lectura cuyo volcado
+        # termine en el medio aparece en alguna de las dos
+        en_memoria = {
+            instante: valor
+            for instante, valor in self.__en_memoria(device_id, metric).items()
+            if desde <= instante <= hasta
+        }
+        rows = self.telemetry_dao.obtener_muestras(device_id, metric, desde, hasta)
+        if rows is None:
+            return None
+
+        lecturas = [(normalizar_ts(row['ts']), row['value']) for row in rows]
+        if en_memoria:
+            lecturas = sorted({**dict(lecturas), **en_memoria}.items())
+
+        return TelemetrySeries(
+            device_id,
+            metric,
+            a_arreglo(instante.timestamp() for instante, _ in lecturas),
+            a_arreglo(valor for _, valor in lecturas),
+        )
+
+    def serie_reducida(
+        self,
+        device_id: int,
+        metric: str,
+        desde: datetime,
+        hasta: datetime,
+        granularidad: Optional[str] = None
+    ) -> Optional[TelemetryAggregate]:
+        """
+        Obtiene el min/max/promedio por bucket de una métrica en un rango.
+
+        Args:
+            device_id: ID del dispositivo
+            metric: Nombre de la métrica
+            desde: Inicio del rango (inclusive)
+            hasta: Fin del rango (inclusive)
+            granularidad: 'minuto' o 'hora' (por defecto 'minuto' para rangos
+                de hasta 7 días y 'hora' para rangos mayores)
+
+        Returns:
+            TelemetryAggregate o None si hubo un error o la granularidad es inválida
+        """
+        if granularidad is None:
+            granularidad = 'minuto' if hasta - desde <= UMBRAL_MINUTO else 'hora'
+        if granularidad not in TelemetryDAO.GRANULARIDADES:
+            logger.warning(f"Granularidad inválida: {granularidad}")
+            return None
+
+        segundos = TelemetryDAO.GRANULARIDADES[granularidad][1]
+        en_memoria = {
+            instante: valor
+            for instante, valor in self.__en_memoria(device_id, metric).items()
+            if desde <= inicio_bucket(instante, segundos) <= hasta
+        }
+        rows = self.telemetry_dao.obtener_agregados(device_id, metric, desde, hasta, granularidad)
+        if rows is None:
+            return None
+
+        buckets = {
+            row['bucket']: [row['sample_count'], row['min_value'], row['max_value'], row['sum_value']]
+            for row in rows
+        }
+        if en_memoria:
+            # Los buckets con lecturas no confirmadas se recalculan desde las
+            # lecturas crudas: una lectura repetida o ya confirmada cuenta una vez
+            afectados = {inicio_bucket(instante, segundos) for instante in en_memoria}
+            fin = max(afectados) + timedelta(seconds=segundos, milliseconds=-1)
+            crudas = self.telemetry_dao.obtener_muestras(device_id, metric, min(afectados), fin)
+            if crudas is None:
+                return None
+            lecturas = {normalizar_ts(row['ts']): row['value'] for row in crudas}
+            lecturas.update(en_memoria)
+            recalculados: Dict[datetime, Acumulador] = {}
+            for instante, valor in lecturas.items():
+                bucket = inicio_bucket(instante, segundos)
+                if bucket in afectados:
+                    acumular(recalculados, bucket, valor)
+            buckets.update(recalculados)
+        ordenados = sorted(buckets.items())
+
+        return TelemetryAggregate(
+            device_id,
+            metric,
+            granularidad,
+            a_arreglo(bucket.timestamp() for bucket, _ in ordenados),
+            a_arreglo(a[1] for _, a in ordenados),
+            a_arreglo(a[2] for _, a in ordenados),
+            a_arreglo(a[3] / a[0] for _, a in ordenados),
+            a_arreglo(a[0] for _, a in ordenados),
+        )
+
+    def __en_memoria(self, device_id: int, metric: str) -> Dict[datetime, float]:
+        """
+        Lecturas de una métrica que todavía no están confirmadas en la BD.
+
+        Args:
+            device_id: ID del dispositivo
+            metric: Nombre de la métrica
+
+        Returns:
+            {instante: valor}; las pendientes reemplazan a las del volcado en curso
+        """
+        with self.__lock:
+            return {
+                instante: valor
+                for muestras in (self.__en_vuelo, self.__pendientes)
+                for (d, m, instante), valor in muestras.items()
+                if d == device_id and m == metric
+            }
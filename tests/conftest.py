@@ -229,6 +229,7 @@ def mock_auth_service(mock_user_dao, mock_role_dao):
     service = AuthService()
     service.user_dao = mock_user_dao
     service.role_dao = mock_role_dao
+    service.membresias = Mock()
 
     return service
 
@@ -250,6 +251,8 @@ def mock_device_service(
     service.state_dao = mock_state_dao
     service.device_type_dao = mock_device_type_dao
     service.location_dao = mock_location_dao
+    service.state_store = Mock()
+    service.event_bus = Mock()
 
     return service
 
@@ -262,6 +265,9 @@ def mock_automation_service(mock_automation_dao, mock_home_dao):
     service = AutomationService()
     service.automation_dao = mock_automation_dao
     service.home_dao = mock_home_dao
+    service.event_bus = Mock()
+    service.hogares = Mock()
+    service.hogares.hogar_de.return_value = 1
 
     return service
 
@@ -288,6 +294,31 @@ def fecha_hora_test():
     return datetime(2024, 11, 28, 14, 30, 0)
 
 
+class Reloj:
+    """Reloj manual: devuelve 'ahora' hasta que el test lo avance"""
+
+    def __init__(self, ahora=1000.0):
+        self.ahora = ahora
+
+    def __call__(self):
+        return self.ahora
+
+
+@pytest.fixture
+def reloj():
+    """Reloj manual (segundos monótonos; se puede fijar a un datetime)"""
+    return Reloj()
+
+
+@pytest.fixture(autouse=True)
+def sin_actor():
+    """Evita que un login de un test limite las solicitudes de los siguientes"""
+    from services.rate_limiter import establecer_actor
+
+    yield
+    establecer_actor(None)
+
+
 # ============================================
 # HOOKS DE PYTEST
 # ============================================
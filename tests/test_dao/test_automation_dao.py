@@ -4,6 +4,7 @@ Estos tests verifican las operaciones CRUD de automatizaciones.
 """
 
 import pytest
+from unittest.mock import MagicMock, patch
 from dao.automation_dao import AutomationDAO
 from dao.home_dao import HomeDAO
 from dominio.automation import Automation
@@ -72,6 +73,29 @@ class TestAutomationDAO:
         assert isinstance(automatizaciones, list)
         assert len(automatizaciones) == 0
 
+    def test_obtener_por_usuario(self, automation_dao, home_dao):
+        """Test: Obtener automatizaciones agrupadas por hogar para un usuario"""
+        resultado = automation_dao.obtener_por_usuario("admin@smarthome.com")
+        
+        assert isinstance(resultado, dict)
+        
+        hogares = home_dao.obtener_hogares_usuario("admin@smarthome.com")
+        assert set(resultado.keys()) == {hogar.name for hogar in hogares}
+        
+        for nombre_hogar, automatizaciones in resultado.items():
+            for automation in automatizaciones:
+                assert automation.home.name == nombre_hogar
+
+    def test_obtener_por_usuario_solo_activas(self, automation_dao):
+        """Test: Filtrar solo automatizaciones activas del usuario"""
+        resultado = automation_dao.obtener_por_usuario(
+            "admin@smarthome.com", solo_activas=True
+        )
+        
+        for automatizaciones in resultado.values():
+            for automation in automatizaciones:
+                assert automation.active is True
+
     def test_obtener_activas(self, automation_dao):
         """Test: Obtener solo las automatizaciones activas de un hogar"""
         automatizaciones = automation_dao.obtener_activas(1)
@@ -127,6 +151,7 @@ class TestAutomationDAO:
             automation = Automation(0, "Test Automation", "Descripción test", True, home)
             exito = automation_dao.insertar(automation)
             assert exito is True
+            assert automation.id > 0
 
     def test_modificar_automation(self, automation_dao):
         """Test: Modificar una automatización existente"""
@@ -153,6 +178,37 @@ class TestAutomationDAO:
         assert exito is False
 
 
+class TestAutomationDAOModificarParcial:
+    """Tests de UPDATE parcial según los campos modificados (sin BD)"""
+
+    def test_modificar_sin_cambios_no_accede_bd(self, automatizacion_test):
+        """Test: Una automatización sin cambios no genera UPDATE"""
+        dao = AutomationDAO()
+        
+        with patch.object(dao.db, "get_cursor") as mock_get_cursor:
+            resultado = dao.modificar(automatizacion_test)
+        
+        assert resultado is True
+        mock_get_cursor.assert_not_called()
+
+    def test_modificar_solo_columnas_cambiadas(self, automatizacion_test):
+        """Test: El UPDATE incluye solo las columnas modificadas"""
+        dao = AutomationDAO()
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 1
+        automatizacion_test.name = "Modo Ahorro"
+        
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor):
+            with patch.object(dao.db, "commit"):
+                resultado = dao.modificar(automatizacion_test)
+        
+        assert resultado is True
+        query, params = mock_cursor.execute.call_args[0]
+        assert "name = %s" in query
+        assert "description" not in query
+        assert params == ("Modo Ahorro", automatizacion_test.id)
+
+
 # Tests simples adicionales
 def test_automation_dao_instancia():
     """Test: Crear una instancia de AutomationDAO"""
@@ -4,6 +4,7 @@ Estos tests verifican las operaciones CRUD de dispositivos.
 """
 
 import pytest
+from unittest.mock import MagicMock, patch
 from dao.device_dao import DeviceDAO
 from dao.state_dao import StateDAO
 from dao.device_type_dao import DeviceTypeDAO
@@ -111,6 +112,28 @@ class TestDeviceDAO:
         assert isinstance(dispositivos, list)
         assert len(dispositivos) == 0
 
+    def test_obtener_por_usuario(self, device_dao, home_dao):
+        """Test: Obtener dispositivos agrupados por hogar para un usuario"""
+        resultado = device_dao.obtener_por_usuario("admin@smarthome.com")
+        
+        assert isinstance(resultado, dict)
+        
+        # Mismos hogares que la consulta de membresía
+        hogares = home_dao.obtener_hogares_usuario("admin@smarthome.com")
+        assert set(resultado.keys()) == {hogar.name for hogar in hogares}
+        
+        for nombre_hogar, dispositivos in resultado.items():
+            for device in dispositivos:
+                assert device.home.name == nombre_hogar
+                assert device.state is not None
+                assert device.device_type is not None
+                assert device.location is not None
+
+    def test_obtener_por_usuario_inexistente(self, device_dao):
+        """Test: Usuario sin hogares devuelve diccionario vacío"""
+        resultado = device_dao.obtener_por_usuario("noexiste@test.com")
+        assert resultado == {}
+
     def test_buscar_por_nombre(self, device_dao):
         """Test: Buscar dispositivos por nombre"""
         # Buscar dispositivos que contengan "Luz" en el hogar 1
@@ -182,6 +205,44 @@ class TestDeviceDAO:
         assert exito is False
 
 
+class TestDeviceDAOModificarParcial:
+    """Tests de UPDATE parcial según los campos modificados (sin BD)"""
+
+    def test_modificar_sin_cambios_no_accede_bd(self, dispositivo_luz_sala):
+        """Test: Un dispositivo sin cambios no genera UPDATE"""
+        dao = DeviceDAO()
+        
+        with patch.object(dao.db, "get_cursor") as mock_get_cursor:
+            resultado = dao.modificar(dispositivo_luz_sala)
+        
+        assert resultado is True
+        mock_get_cursor.assert_not_called()
+
+    def test_modificar_solo_columnas_cambiadas(self, dispositivo_luz_sala, state_apagado):
+        """Test: El UPDATE incluye solo las columnas modificadas"""
+        dao = DeviceDAO()
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 1
+        dispositivo_luz_sala.state = state_apagado
+        
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor):
+            with patch.object(dao.db, "commit"):
+                resultado = dao.modificar(dispositivo_luz_sala)
+        
+        assert resultado is True
+        query, params = mock_cursor.execute.call_args[0]
+        assert "state_id = %s" in query
+        assert "name = %s" not in query
+        assert "home_id" not in query
+        assert params == (state_apagado.id, dispositivo_luz_sala.id)
+        assert dispositivo_luz_sala.is_dirty() is False
+
+    def test_columnas_modificables_tienen_setter(self):
+        """Test: Cada columna modificable corresponde a un campo con setter"""
+        for campo in DeviceDAO.COLUMNAS_MODIFICABLES:
+            assert getattr(Device, campo).fset is not None
+
+
 # Tests simples adicionales
 def test_device_dao_instancia():
     """Test: Crear una instancia de DeviceDAO"""
@@ -192,3 +253,44 @@ def test_device_dao_instancia():
     assert hasattr(dao, 'insertar')
     assert hasattr(dao, 'modificar')
     assert hasattr(dao, 'eliminar')
+
+
+class TestDeviceDAOResumen:
+    """Tests para las proyecciones de listado"""
+
+    def test_listar_resumen_una_consulta(self):
+        """Test: El resumen se arma con una sola consulta y sin sub-DAOs"""
+        dao = DeviceDAO()
+        dao.device_type_dao = MagicMock()
+        dao.location_dao = MagicMock()
+        dao.home_dao = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [
+            {'id': 1, 'name': "Luz Sala", 'type_name': "Luz", 'state_name': "Encendido",
+             'location_name': "Sala", 'home_name': "Casa Test"}
+        ]
+
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor):
+            resumen = dao.listar_resumen()
+
+        assert resumen[0].name == "Luz Sala"
+        assert resumen[0].location_name == "Sala"
+        mock_cursor.execute.assert_called_once()
+        dao.device_type_dao.obtener_por_ids.assert_not_called()
+
+    def test_listar_resumen_por_usuario_hogar_vacio(self):
+        """Test: Hogares sin dispositivos aparecen con lista vacía"""
+        dao = DeviceDAO()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [
+            {'home_name': "Casa", 'id': 1, 'name': "Luz", 'type_name': "Luz",
+             'state_name': "Encendido", 'location_name': "Sala"},
+            {'home_name': "Oficina", 'id': None, 'name': None, 'type_name': None,
+             'state_name': None, 'location_name': None},
+        ]
+
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor):
+            resultado = dao.listar_resumen_por_usuario("user@test.com")
+
+        assert [d.id for d in resultado["Casa"]] == [1]
+        assert resultado["Oficina"] == []
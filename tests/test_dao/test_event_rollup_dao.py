@@ -0,0 +1,78 @@
+"""
+Tests para EventRollupDAO (Agregados de eventos)
+
+Cubre:
+- Actualización incremental con margen de seguridad bajo el watermark
+- Recuento idempotente de los buckets afectados
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from dao.event_rollup_dao import EventRollupDAO
+
+
+class TestEventRollupDAOActualizar:
+    """Tests para la actualización de los rollups"""
+
+    def test_sin_eventos_nuevos(self):
+        """Test: Sin eventos nuevos ni recientes no se escribe nada"""
+        # Arrange
+        dao = EventRollupDAO()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = {'max_id': None, 'fecha_minima': None, 'nuevos': 0}
+
+        with patch.object(dao, "obtener_watermark", return_value=10), \
+             patch.object(dao.db, "get_cursor", return_value=mock_cursor), \
+             patch.object(dao.db, "commit") as commit:
+            # Act
+            resultado = dao.actualizar_rollups()
+
+            # Assert
+            assert resultado == 0
+            mock_cursor.execute.assert_called_once()
+            commit.assert_not_called()
+
+    def test_relee_el_margen_bajo_el_watermark(self):
+        """Test: Los eventos recientes con id menor al watermark también se leen"""
+        # Arrange
+        dao = EventRollupDAO()
+        dao.margen_segundos = 300
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = {
+            'max_id': 12, 'fecha_minima': datetime(2026, 3, 5, 14, 37, 12), 'nuevos': 2
+        }
+
+        with patch.object(dao, "obtener_watermark", return_value=10), \
+             patch.object(dao.db, "get_cursor", return_value=mock_cursor), \
+             patch.object(dao.db, "commit"):
+            # Act
+            resultado = dao.actualizar_rollups()
+
+            # Assert
+            assert resultado == 2
+            consulta, params = mock_cursor.execute.call_args_list[0][0]
+            assert "OR date_time_value >= NOW() - INTERVAL %s SECOND" in consulta
+            assert params == (10, 10, 300)
+
+    def test_recuento_reemplaza_conteos(self):
+        """Test: Los buckets afectados se recuentan desde su inicio y no se suman"""
+        # Arrange
+        dao = EventRollupDAO()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = {
+            'max_id': 12, 'fecha_minima': datetime(2026, 3, 5, 14, 37, 12), 'nuevos': 2
+        }
+
+        with patch.object(dao, "obtener_watermark", return_value=10), \
+             patch.object(dao.db, "get_cursor", return_value=mock_cursor), \
+             patch.object(dao.db, "commit"):
+            # Act
+            dao.actualizar_rollups()
+
+            # Assert
+            hora, dia, watermark = mock_cursor.execute.call_args_list[1:]
+            assert "event_count = VALUES(event_count)" in hora[0][0]
+            assert "event_count +" not in hora[0][0]
+            assert hora[0][1] == (datetime(2026, 3, 5, 14, 0),)
+            assert dia[0][1] == (datetime(2026, 3, 5, 0, 0),)
+            assert watermark[0][1] == (EventRollupDAO.WATERMARK, 12)
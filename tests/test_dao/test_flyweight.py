@@ -0,0 +1,112 @@
+"""
+Tests para el registro flyweight de entidades de catálogo
+
+Cubre:
+- Instancia canónica compartida por id
+- Reemplazo cuando cambian los valores
+- Instancias canónicas de solo lectura
+- StateDAO / RoleDAO devolviendo instancias compartidas entre sesiones
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from dao import flyweight
+from dao.flyweight import descartar, internar
+from dao.role_dao import RoleDAO
+from dao.state_dao import StateDAO
+from dominio.device_type import DeviceType
+from dominio.state import State
+
+
+@pytest.fixture(autouse=True)
+def registro_limpio():
+    """Vacía el registro antes y después de cada test"""
+    flyweight.limpiar()
+    yield
+    flyweight.limpiar()
+
+
+class TestInternar:
+    """Tests para el registro de instancias canónicas"""
+
+    def test_misma_instancia_para_mismos_valores(self):
+        """Test: Entidades iguales comparten la instancia canónica"""
+        primero = internar(State(1, "Encendido"))
+        segundo = internar(State(1, "Encendido"))
+
+        assert primero is segundo
+        assert flyweight.cantidad() == 1
+
+    def test_valores_nuevos_reemplazan_canonica(self):
+        """Test: Si la fila cambió, la nueva entidad pasa a ser la canónica"""
+        viejo = internar(State(1, "Encendido"))
+        nuevo = internar(State(1, "Prendido"))
+
+        assert nuevo is not viejo
+        assert internar(State(1, "Prendido")) is nuevo
+
+    def test_tipos_distintos_no_colisionan(self):
+        """Test: El mismo id en distintas clases son entradas distintas"""
+        internar(State(1, "Encendido"))
+        internar(DeviceType(1, "Luz", "LED"))
+
+        assert flyweight.cantidad() == 2
+
+    def test_descartar(self):
+        """Test: Descartar obliga a registrar una nueva instancia"""
+        viejo = internar(State(1, "Encendido"))
+        descartar(State, 1)
+
+        assert internar(State(1, "Encendido")) is not viejo
+
+    def test_canonica_es_solo_lectura(self):
+        """Test: La instancia compartida no se puede modificar"""
+        estado = internar(State(1, "Encendido"))
+        tipo = internar(DeviceType(1, "Luz", "LED"))
+
+        with pytest.raises(AttributeError):
+            estado.name = "Apagado"
+        with pytest.raises(AttributeError):
+            tipo.characteristics = "Halógena"
+        assert estado.name == "Encendido"
+        assert isinstance(estado, State)
+        assert estado == State(1, "Encendido")
+
+    def test_reinternar_canonica(self):
+        """Test: Internar de nuevo una canónica la conserva (misma clave)"""
+        estado = internar(State(1, "Encendido"))
+
+        assert internar(estado) is estado
+        assert flyweight.cantidad() == 1
+
+
+class TestFlyweightConDAO:
+    """Tests de integración del registro con los DAOs"""
+
+    def test_state_dao_comparte_instancia_entre_llamadas(self):
+        """Test: Sin sesión, dos lecturas del mismo estado dan la misma instancia"""
+        dao = StateDAO()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = {'id': 1, 'name': 'Encendido'}
+
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor):
+            primero = dao.obtener_por_id(1)
+            segundo = dao.obtener_por_id(1)
+
+        assert primero is segundo
+
+    def test_role_dao_eliminar_descarta(self):
+        """Test: Eliminar un rol lo quita del registro"""
+        dao = RoleDAO()
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 1
+        mock_cursor.fetchone.return_value = {'id': 2, 'name': 'Estándar'}
+
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor):
+            with patch.object(dao.db, "commit"):
+                dao.obtener_por_id(2)
+                dao.eliminar(2)
+
+        assert flyweight.cantidad() == 0
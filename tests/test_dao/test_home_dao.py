@@ -60,6 +60,18 @@ class TestHomeDAO:
         assert isinstance(hogares, list)
         assert len(hogares) == 0
 
+    def test_obtener_ids_hogares_usuario(self, home_dao):
+        """Test: Los IDs coinciden con los hogares del usuario"""
+        hogares = home_dao.obtener_hogares_usuario("admin@smarthome.com")
+        ids = home_dao.obtener_ids_hogares_usuario("admin@smarthome.com")
+        
+        assert sorted(ids) == sorted(h.id for h in hogares)
+
+    def test_desasociar_usuario_inexistente(self, home_dao):
+        """Test: Desasociar un usuario que no pertenece al hogar"""
+        exito = home_dao.desasociar_usuario("noexiste@test.com", 1)
+        assert exito is False
+
     def test_insertar_home(self, home_dao):
         """Test: Insertar un nuevo hogar"""
         home = Home(0, "Hogar Test Temporal")
@@ -0,0 +1,151 @@
+"""
+Tests para el mapa de identidad compartido por los DAOs
+
+Cubre:
+- Registro y reutilización de entidades
+- Alcance de sesión (anidado y sin sesión)
+- Integración con StateDAO (una sola consulta por id)
+"""
+
+from unittest.mock import MagicMock, patch
+
+from dao.identity_map import (
+    IdentityMap,
+    buscar,
+    hidratar,
+    mapa_actual,
+    olvidar,
+    registrar,
+    sesion_identidad,
+)
+from dao.state_dao import StateDAO
+from dominio.state import State
+
+
+class TestIdentityMap:
+    """Tests para el registro de entidades"""
+
+    def test_obtener_o_registrar_reutiliza_instancia(self):
+        """Test: La fábrica solo se invoca la primera vez"""
+        mapa = IdentityMap()
+        fabrica = MagicMock(side_effect=lambda: State(1, "Encendido"))
+
+        primero = mapa.obtener_o_registrar(State, 1, fabrica)
+        segundo = mapa.obtener_o_registrar(State, 1, fabrica)
+
+        assert primero is segundo
+        fabrica.assert_called_once()
+
+    def test_claves_distinguen_tipo(self):
+        """Test: Mismo id con distinto tipo son entidades distintas"""
+        mapa = IdentityMap()
+        mapa.obtener_o_registrar(State, 1, lambda: State(1, "Encendido"))
+
+        assert mapa.obtener(State, 1) is not None
+        assert mapa.obtener(object, 1) is None
+
+    def test_olvidar_y_limpiar(self):
+        """Test: Eliminar entidades del mapa"""
+        mapa = IdentityMap()
+        mapa.obtener_o_registrar(State, 1, lambda: State(1, "Encendido"))
+        mapa.obtener_o_registrar(State, 2, lambda: State(2, "Apagado"))
+
+        mapa.olvidar(State, 1)
+        assert len(mapa) == 1
+
+        mapa.limpiar()
+        assert len(mapa) == 0
+
+
+class TestSesionIdentidad:
+    """Tests para el alcance de sesión"""
+
+    def test_sin_sesion_no_registra(self):
+        """Test: Sin sesión activa cada hidratación crea una instancia nueva"""
+        primero = hidratar(State, 1, lambda: State(1, "Encendido"))
+        segundo = hidratar(State, 1, lambda: State(1, "Encendido"))
+
+        assert primero is not segundo
+        assert buscar(State, 1) is None
+        assert mapa_actual() is None
+
+    def test_sesion_comparte_instancias(self):
+        """Test: Dentro de la sesión se reutiliza la misma instancia"""
+        with sesion_identidad():
+            primero = hidratar(State, 1, lambda: State(1, "Encendido"))
+            segundo = hidratar(State, 1, lambda: State(1, "Apagado"))
+
+            assert primero is segundo
+            assert buscar(State, 1) is primero
+
+        assert mapa_actual() is None
+
+    def test_sesiones_anidadas_comparten_mapa(self):
+        """Test: Un alcance anidado reutiliza el mapa exterior"""
+        with sesion_identidad() as exterior:
+            hidratar(State, 1, lambda: State(1, "Encendido"))
+            with sesion_identidad() as interior:
+                assert interior is exterior
+            # Salir del alcance interior no vacía el mapa
+            assert buscar(State, 1) is not None
+
+    def test_registrar_en_sesion(self):
+        """Test: Registrar reemplaza la instancia canónica de la sesión"""
+        with sesion_identidad():
+            hidratar(State, 1, lambda: State(1, "Encendido"))
+            guardado = State(1, "Prendido")
+            registrar(State, 1, guardado)
+
+            assert buscar(State, 1) is guardado
+            assert hidratar(State, 1, lambda: State(1, "Encendido")) is guardado
+
+    def test_registrar_sin_sesion(self):
+        """Test: Sin sesión activa registrar no tiene efecto"""
+        registrar(State, 1, State(1, "Encendido"))
+
+        assert buscar(State, 1) is None
+
+    def test_olvidar_en_sesion(self):
+        """Test: Olvidar fuerza una nueva hidratación"""
+        with sesion_identidad():
+            primero = hidratar(State, 1, lambda: State(1, "Encendido"))
+            olvidar(State, 1)
+            segundo = hidratar(State, 1, lambda: State(1, "Apagado"))
+
+            assert primero is not segundo
+            assert segundo.name == "Apagado"
+
+
+class TestIdentityMapConDAO:
+    """Tests de integración del mapa con un DAO"""
+
+    def test_state_dao_consulta_una_vez_por_sesion(self):
+        """Test: Lecturas repetidas del mismo id no vuelven a la BD"""
+        dao = StateDAO()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = {'id': 1, 'name': 'Encendido'}
+
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor):
+            with sesion_identidad():
+                primero = dao.obtener_por_id(1)
+                segundo = dao.obtener_por_id(1)
+
+        assert primero is segundo
+        mock_cursor.execute.assert_called_once()
+
+    def test_state_dao_modificar_conserva_instancia(self, state_encendido):
+        """Test: Tras modificar, la instancia guardada pasa a ser la de la sesión"""
+        dao = StateDAO()
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 1
+        mock_cursor.fetchone.return_value = {'id': 1, 'name': 'Encendido'}
+
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor):
+            with patch.object(dao.db, "commit"):
+                with sesion_identidad():
+                    dao.obtener_por_id(1)
+                    dao.modificar(state_encendido)
+                    leido = dao.obtener_por_id(1)
+
+        assert leido is state_encendido
+        assert mock_cursor.execute.call_count == 2
@@ -0,0 +1,167 @@
+"""
+Tests para las referencias perezosas de relaciones
+
+Cubre:
+- Carga en lote de referencias pendientes
+- Acceso al id sin cargar la entidad
+- Referencias colgantes
+- DeviceDAO / EventDAO sin consultas extra para campos escalares
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from dao.device_dao import DeviceDAO
+from dao.event_dao import EventDAO
+from dao.lazy import CargadorLote, esta_cargado, resolver
+from dominio.device_type import DeviceType
+from dominio.home import Home
+
+
+def _cargar_hogares(ids):
+    return {id: Home(id, f"Hogar {id}") for id in ids if id != 99}
+
+
+class TestCargadorLote:
+    """Tests para la carga en lote"""
+
+    def test_resuelve_todos_los_pendientes_en_una_carga(self):
+        """Test: El primer acceso carga todas las referencias pendientes"""
+        cargar = MagicMock(side_effect=_cargar_hogares)
+        cargador = CargadorLote(cargar)
+        refs = [cargador.referencia(id) for id in (1, 2, 3, 2)]
+
+        assert refs[0].name == "Hogar 1"
+        assert refs[2].name == "Hogar 3"
+
+        cargar.assert_called_once()
+        assert sorted(cargar.call_args[0][0]) == [1, 2, 3]
+
+    def test_id_no_dispara_carga(self):
+        """Test: El identificador está disponible sin cargar"""
+        cargar = MagicMock(side_effect=_cargar_hogares)
+        ref = CargadorLote(cargar).referencia(5)
+
+        assert ref.id == 5
+        assert not esta_cargado(ref)
+        cargar.assert_not_called()
+
+    def test_atributo_id_personalizado(self):
+        """Test: Referencias identificadas por email"""
+        cargar = MagicMock(return_value={})
+        ref = CargadorLote(cargar).referencia("admin@test.com", 'email')
+
+        assert ref.email == "admin@test.com"
+        cargar.assert_not_called()
+
+    def test_referencia_colgante(self):
+        """Test: Entidad inexistente se resuelve a None"""
+        ref = CargadorLote(_cargar_hogares).referencia(99)
+
+        assert not ref
+        assert ref == None  # noqa: E711
+        assert resolver(ref) is None
+        assert getattr(ref, 'name', None) is None
+        with pytest.raises(AttributeError):
+            ref.name
+
+    def test_resolver_devuelve_entidad_real(self):
+        """Test: resolver() desenvuelve la referencia"""
+        ref = CargadorLote(_cargar_hogares).referencia(1)
+
+        home = resolver(ref)
+
+        assert isinstance(home, Home)
+        assert esta_cargado(ref)
+        assert ref == home
+
+
+class TestDeviceDAOLazy:
+    """Tests de relaciones perezosas en DeviceDAO"""
+
+    @staticmethod
+    def _filas():
+        return [
+            {'id': i, 'name': f"Luz {i}", 'state_id': 1, 'state_name': "Encendido",
+             'device_type_id': 1, 'location_id': i, 'home_id': 1}
+            for i in range(1, 4)
+        ]
+
+    def test_campos_escalares_sin_consultas_extra(self):
+        """Test: name y state no cargan las relaciones"""
+        dao = DeviceDAO()
+        dao.device_type_dao = MagicMock()
+        dao.location_dao = MagicMock()
+        dao.home_dao = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = self._filas()
+
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor):
+            dispositivos = dao.obtener_todos()
+
+        assert [d.name for d in dispositivos] == ["Luz 1", "Luz 2", "Luz 3"]
+        assert all(d.state.name == "Encendido" for d in dispositivos)
+        mock_cursor.execute.assert_called_once()
+        dao.device_type_dao.obtener_por_ids.assert_not_called()
+        dao.location_dao.obtener_por_ids.assert_not_called()
+        dao.home_dao.obtener_por_ids.assert_not_called()
+
+    def test_relacion_se_carga_en_lote(self):
+        """Test: El primer acceso a un tipo carga los de todo el listado"""
+        dao = DeviceDAO()
+        dao.device_type_dao = MagicMock()
+        dao.device_type_dao.obtener_por_ids.return_value = {1: DeviceType(1, "Luz", "")}
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = self._filas()
+
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor):
+            dispositivos = dao.obtener_todos()
+
+        assert [d.device_type.name for d in dispositivos] == ["Luz"] * 3
+        dao.device_type_dao.obtener_por_ids.assert_called_once_with([1])
+
+
+class TestEventDAOLazy:
+    """Tests de relaciones perezosas en EventDAO"""
+
+    def test_eventos_no_cargan_dispositivo_ni_usuario(self):
+        """Test: Listar eventos no consulta dispositivos ni usuarios"""
+        dao = EventDAO()
+        dao.device_dao = MagicMock()
+        dao.user_dao = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [
+            {'id': i, 'date_time_value': datetime(2024, 11, 28), 'description': "Encendido",
+             'device_id': i, 'user_email': "admin@test.com", 'source': "manual"}
+            for i in range(1, 4)
+        ]
+
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor):
+            eventos = dao.obtener_recientes()
+
+        assert [e.device.id for e in eventos] == [1, 2, 3]
+        assert all(e.user.email == "admin@test.com" for e in eventos)
+        dao.device_dao.obtener_por_ids.assert_not_called()
+        dao.user_dao.obtener_por_emails.assert_not_called()
+
+    def test_dispositivo_borrado_se_resuelve_a_none(self):
+        """Test: El dispositivo de un evento que ya no existe se comporta como None"""
+        dao = EventDAO()
+        dao.device_dao = MagicMock()
+        dao.device_dao.obtener_por_ids.return_value = {}
+        dao.user_dao = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [
+            {'id': 1, 'date_time_value': datetime(2024, 11, 28), 'description': "Encendido",
+             'device_id': 7, 'user_email': None, 'source': "manual"}
+        ]
+
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor):
+            evento = dao.obtener_recientes()[0]
+
+        assert not evento.device
+        assert resolver(evento.device) is None
+        assert getattr(evento.device, 'name', "sin dispositivo") == "sin dispositivo"
+        assert evento.device.id == 7
@@ -0,0 +1,68 @@
+"""
+Tests para TelemetryDAO (Lecturas de telemetría)
+
+Cubre:
+- Recalculo de los agregados con una sentencia por granularidad
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from dao.telemetry_dao import TelemetryDAO
+
+
+class TestTelemetryDAOGuardar:
+    """Tests para el guardado de lecturas"""
+
+    def test_recalcula_buckets_en_una_sentencia_por_nivel(self):
+        """Test: Todos los buckets afectados de un nivel se recalculan juntos"""
+        # Arrange
+        dao = TelemetryDAO()
+        mock_cursor = MagicMock()
+        muestras = [
+            (1, 'temp', datetime(2026, 3, 5, 14, 37, 12), 21.0),
+            (1, 'temp', datetime(2026, 3, 5, 14, 38, 1), 21.5),
+            (2, 'hum', datetime(2026, 3, 5, 15, 2, 0), 40.0),
+        ]
+
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor), \
+             patch.object(dao.db, "commit") as commit:
+            # Act
+            resultado = dao.guardar(muestras)
+
+            # Assert
+            assert resultado is True
+            mock_cursor.executemany.assert_called_once()
+            assert mock_cursor.execute.call_count == 2
+            commit.assert_called_once()
+
+            minuto, hora = mock_cursor.execute.call_args_list
+            consulta, params = minuto[0]
+            assert "INSERT INTO telemetry_rollup_minute" in consulta
+            assert consulta.count("UNION ALL") == 2
+            assert params[:4] == (
+                1, 'temp', datetime(2026, 3, 5, 14, 37), datetime(2026, 3, 5, 14, 38)
+            )
+
+            consulta, params = hora[0]
+            assert "INSERT INTO telemetry_rollup_hour" in consulta
+            assert consulta.count("UNION ALL") == 1
+            assert params == (
+                1, 'temp', datetime(2026, 3, 5, 14), datetime(2026, 3, 5, 15),
+                2, 'hum', datetime(2026, 3, 5, 15), datetime(2026, 3, 5, 16),
+            )
+
+    def test_sin_muestras_no_recalcula(self):
+        """Test: Un lote vacío no escribe lecturas ni agregados"""
+        # Arrange
+        dao = TelemetryDAO()
+        mock_cursor = MagicMock()
+
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor), \
+             patch.object(dao.db, "commit"):
+            # Act
+            resultado = dao.guardar([])
+
+            # Assert
+            assert resultado is True
+            mock_cursor.executemany.assert_not_called()
+            mock_cursor.execute.assert_not_called()
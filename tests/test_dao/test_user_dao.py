@@ -9,10 +9,15 @@ Cubre:
 - Obtener todos
 - Cambiar rol
 - Validar credenciales
+- Hash de contraseñas en el pool de trabajadores
 """
 
+import asyncio
 from unittest.mock import MagicMock, patch
+
+import pytest
 from dao.user_dao import UserDAO
+from utils.passwords import PasswordHasher, es_hash, hash_ficticio, hashear, verificar
 
 
 class TestUserDAOInsertar:
@@ -34,6 +39,40 @@ class TestUserDAOInsertar:
                 mock_cursor.execute.assert_called_once()
                 mock_cursor.close.assert_called_once()
 
+    def test_insertar_guarda_hash(self, usuario_admin):
+        """Test: La contraseña se guarda hasheada, nunca en texto plano"""
+        # Arrange
+        dao = UserDAO()
+        mock_cursor = MagicMock()
+
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor):
+            with patch.object(dao.db, "commit"):
+                # Act
+                dao.insertar(usuario_admin)
+
+                # Assert
+                guardada = mock_cursor.execute.call_args[0][1][1]
+                assert es_hash(guardada)
+                assert verificar("admin123", guardada)
+
+    def test_insertar_hashea_entrada_con_formato_de_hash(self, usuario_admin):
+        """Test: Una contraseña ingresada con forma de hash también se hashea"""
+        # Arrange
+        dao = UserDAO()
+        mock_cursor = MagicMock()
+        falso = "scrypt$1$1$1$x$x"
+        usuario_admin.change_password(falso)
+
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor):
+            with patch.object(dao.db, "commit"):
+                # Act
+                dao.insertar(usuario_admin)
+
+                # Assert
+                guardada = mock_cursor.execute.call_args[0][1][1]
+                assert guardada != falso
+                assert verificar(falso, guardada)
+
 
 class TestUserDAOModificar:
     """Tests para modificación de usuarios"""
@@ -53,6 +92,25 @@ class TestUserDAOModificar:
                 # Assert
                 assert resultado is True
                 mock_cursor.execute.assert_called_once()
+                assert "password" not in mock_cursor.execute.call_args[0][0]
+
+    def test_modificar_con_cambio_de_password(self, usuario_admin):
+        """Test: Una contraseña cambiada se guarda hasheada una sola vez"""
+        # Arrange
+        dao = UserDAO()
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 1
+        usuario_admin.change_password("nueva123")
+
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor):
+            with patch.object(dao.db, "commit"):
+                # Act
+                dao.modificar(usuario_admin)
+
+                # Assert
+                guardada = mock_cursor.execute.call_args[0][1][0]
+                assert verificar("nueva123", guardada)
+                assert not usuario_admin.is_dirty()
 
     def test_modificar_usuario_no_encontrado(self, usuario_admin):
         """Test: Modificar usuario que no existe"""
@@ -87,7 +145,8 @@ class TestUserDAOEliminar:
 
                 # Assert
                 assert resultado is True
-                mock_cursor.execute.assert_called_once()
+                assert mock_cursor.execute.call_count == 2
+                assert mock_cursor.execute.call_args_list[0][0][0].startswith("UPDATE event")
 
     def test_eliminar_usuario_no_encontrado(self):
         """Test: Eliminar usuario que no existe"""
@@ -246,7 +305,8 @@ class TestUserDAOValidarCredenciales:
         # Arrange
         dao = UserDAO()
 
-        with patch.object(dao, "obtener_por_email", return_value=usuario_admin):
+        with patch.object(dao, "obtener_por_email", return_value=usuario_admin), \
+             patch.object(dao, "guardar_hash", return_value=True):
             # Act
             resultado = dao.validar_credenciales("admin@test.com", "admin123")
 
@@ -254,6 +314,55 @@ class TestUserDAOValidarCredenciales:
             assert resultado is not None
             assert resultado.email == "admin@test.com"
 
+    def test_login_correcto_migra_password_heredada(self, usuario_admin):
+        """Test: Un login correcto con contraseña en texto plano la reemplaza por su hash"""
+        # Arrange
+        dao = UserDAO()
+
+        with patch.object(dao, "obtener_por_email", return_value=usuario_admin), \
+             patch.object(dao, "guardar_hash", return_value=True) as guardar:
+            # Act
+            dao.validar_credenciales("admin@test.com", "admin123")
+            dao.validar_credenciales("admin@test.com", "wrongpass")
+
+            # Assert
+            guardar.assert_called_once()
+            email, guardada = guardar.call_args[0]
+            assert email == "admin@test.com"
+            assert verificar("admin123", guardada)
+            # El usuario devuelto (el que cachea SessionStore) ya no guarda texto plano
+            assert usuario_admin.password == guardada
+            assert not usuario_admin.is_dirty()
+
+    def test_validar_credenciales_futuro(self, usuario_admin):
+        """Test: La validación puede esperarse desde asyncio sin bloquear"""
+        # Arrange
+        dao = UserDAO()
+        usuario_admin.change_password(hashear("admin123", n=2 ** 10))
+
+        async def validar():
+            return await asyncio.gather(
+                asyncio.wrap_future(dao.validar_credenciales_futuro("admin@test.com", "admin123")),
+                asyncio.wrap_future(dao.validar_credenciales_futuro("admin@test.com", "wrongpass")),
+            )
+
+        with patch.object(dao, "obtener_por_email", return_value=usuario_admin), \
+             patch.object(dao, "guardar_hash") as guardar:
+            # Act
+            correcto, incorrecto = asyncio.run(validar())
+
+            # Assert
+            assert correcto is usuario_admin
+            assert incorrecto is None
+            guardar.assert_not_called()
+
+    def test_guardar_hash_rechaza_texto_plano(self):
+        """Test: guardar_hash sólo acepta valores ya hasheados"""
+        dao = UserDAO()
+
+        with pytest.raises(ValueError):
+            dao.guardar_hash("admin@test.com", "admin123")
+
     def test_validar_credenciales_incorrectas(self, usuario_admin):
         """Test: Credenciales inválidas"""
         # Arrange
@@ -271,9 +380,65 @@ class TestUserDAOValidarCredenciales:
         # Arrange
         dao = UserDAO()
 
-        with patch.object(dao, "obtener_por_email", return_value=None):
+        with patch.object(dao, "obtener_por_email", return_value=None), \
+             patch.object(dao.hasher, "verificar", wraps=dao.hasher.verificar) as verificar_hash:
             # Act
             resultado = dao.validar_credenciales("noexiste@test.com", "pass")
 
             # Assert
             assert resultado is None
+            # Se paga el mismo costo de scrypt que con un usuario registrado
+            verificar_hash.assert_called_once_with("pass", hash_ficticio())
+
+    def test_usuario_no_existe_no_valida_con_el_hash_ficticio(self):
+        """Test: Acertar la contraseña del hash ficticio no autentica a nadie"""
+        # Arrange
+        dao = UserDAO()
+
+        with patch.object(dao, "obtener_por_email", return_value=None), \
+             patch.object(dao.hasher, "verificar") as verificar_hash:
+            verificar_hash.return_value.add_done_callback.side_effect = (
+                lambda callback: callback(MagicMock(result=lambda: True))
+            )
+
+            # Act / Assert
+            assert dao.validar_credenciales("noexiste@test.com", "pass") is None
+
+    def test_validar_credenciales_con_hash(self, usuario_admin):
+        """Test: Credenciales válidas contra una contraseña hasheada"""
+        # Arrange
+        dao = UserDAO()
+        usuario_admin.change_password(hashear("admin123", n=2 ** 10))
+
+        with patch.object(dao, "obtener_por_email", return_value=usuario_admin):
+            # Act & Assert
+            assert dao.validar_credenciales("admin@test.com", "admin123") is usuario_admin
+            assert dao.validar_credenciales("admin@test.com", "wrongpass") is None
+
+
+class TestPasswordHasher:
+    """Tests para el hash de contraseñas"""
+
+    def test_hash_con_sal(self):
+        """Test: La misma contraseña genera hashes distintos"""
+        assert hashear("secreta", n=2 ** 10) != hashear("secreta", n=2 ** 10)
+
+    def test_costo_viaja_con_el_hash(self):
+        """Test: Un hash con otro costo se sigue verificando"""
+        almacenado = hashear("secreta", n=2 ** 11)
+
+        assert almacenado.split("$")[1] == str(2 ** 11)
+        assert verificar("secreta", almacenado)
+
+    def test_hash_corrupto(self):
+        """Test: Un hash mal formado no valida"""
+        assert not verificar("secreta", "scrypt$x$8$1$AAAA$AAAA")
+
+    def test_pool_y_async(self):
+        """Test: El pool resuelve hashes en paralelo y desde asyncio"""
+        hasher = PasswordHasher()
+        futuros = [hasher.hashear(f"clave{i}", n=2 ** 10) for i in range(8)]
+        hashes = [f.result() for f in futuros]
+
+        assert all(hasher.verificar(f"clave{i}", h).result() for i, h in enumerate(hashes))
+        assert asyncio.run(hasher.verificar_async("clave0", hashes[0])) is True
@@ -209,4 +209,20 @@ def test_toggle_automation_state():
     
     # Desactivar nuevamente
     automation.deactivate()
-    assert not automation.active
\ No newline at end of file
+    assert not automation.active
+
+def test_automation_registra_campos_modificados():
+    """Test: Cambios de nombre, descripción y activación quedan registrados"""
+    home = Home(1, "Casa")
+    automation = Automation(9, "Modo Noche", "Apaga luces", True, home)
+    assert automation.is_dirty() is False
+    
+    automation.activate()  # Ya estaba activa: no es un cambio
+    assert automation.is_dirty() is False
+    
+    automation.description = "Apaga todas las luces"
+    automation.deactivate()
+    assert automation.get_dirty_fields() == {'description', 'active'}
+    
+    automation.mark_clean()
+    assert automation.get_dirty_fields() == set()
@@ -6,6 +6,8 @@ Estos tests verifican el funcionamiento de los dispositivos inteligentes.
 import sys
 import os
 
+import pytest
+
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "models"))
 
 from dominio.device import Device
@@ -236,4 +238,42 @@ def test_cambiar_estado_device_setter():
     
     # Verificar nuevo estado
     assert device.state.id == 2
-    assert device.state.name == "Apagado"
\ No newline at end of file
+    assert device.state.name == "Apagado"
+
+def test_device_recien_creado_sin_cambios():
+    """Test: Un dispositivo recién cargado no tiene campos modificados"""
+    home = Home(1, "Casa")
+    device = Device(7, "Luz", State(1, "Encendido"), DeviceType(1, "Luz", "LED"),
+                    Location(1, "Sala", home), home)
+    
+    assert device.is_dirty() is False
+    assert device.get_dirty_fields() == set()
+
+
+def test_device_registra_campos_modificados():
+    """Test: Solo se registran los campos que realmente cambian"""
+    home = Home(1, "Casa")
+    device = Device(8, "Luz", State(1, "Encendido"), DeviceType(1, "Luz", "LED"),
+                    Location(1, "Sala", home), home)
+    
+    device.name = "Luz"  # Mismo valor: no es un cambio
+    device.state = State(1, "Encendido")  # Mismo estado
+    assert device.is_dirty() is False
+    
+    device.name = "Luz Sala"
+    device.state = State(2, "Apagado")
+    assert device.get_dirty_fields() == {'name', 'state'}
+    
+    device.mark_clean()
+    assert device.is_dirty() is False
+
+
+def test_device_usa_slots():
+    """Test: El dispositivo no tiene __dict__ por instancia"""
+    home = Home(1, "Casa")
+    device = Device(9, "Luz", State(1, "Encendido"), DeviceType(1, "Luz", "LED"),
+                    Location(1, "Sala", home), home)
+    
+    assert not hasattr(device, '__dict__')
+    with pytest.raises(AttributeError):
+        device.atributo_inexistente = True
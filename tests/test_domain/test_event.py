@@ -7,6 +7,8 @@ import sys
 import os
 from datetime import datetime
 
+import pytest
+
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "models"))
 
 from dominio.event import Event
@@ -236,4 +238,12 @@ def test_diferentes_sources():
     assert event1.source == "user_action"
     assert event2.source == "automation"
     assert event3.source == "device_trigger"
-    assert event4.source == "system_error"
\ No newline at end of file
+    assert event4.source == "system_error"
+
+def test_event_usa_slots():
+    """Test: El evento no tiene __dict__ por instancia"""
+    event = Event(5, "Test", "user_action", date_time_value=datetime.now())
+
+    assert not hasattr(event, '__dict__')
+    with pytest.raises(AttributeError):
+        event.atributo_inexistente = True
@@ -9,6 +9,10 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "models"))
 
 from dominio.home import Home
+from dominio.device import Device
+from dominio.state import State
+from dominio.device_type import DeviceType
+from dominio.location import Location
 
 
 class TestHome:
@@ -90,4 +94,81 @@ def test_multiples_homes():
 def test_home_con_caracteres_especiales():
     """Test: Hogar con caracteres especiales"""
     home = Home(3, "Casa de María & José")
-    assert home.name == "Casa de María & José"
\ No newline at end of file
+    assert home.name == "Casa de María & José"
+
+
+def _crear_dispositivo(home, id, state_id=1, type_id=1, location_id=1):
+    return Device(id, f"Dispositivo {id}", State(state_id, "Estado"),
+                  DeviceType(type_id, "Tipo", ""), Location(location_id, "Sala", home), home)
+
+
+class TestHomeDispositivos:
+    """Tests para el índice de dispositivos del hogar"""
+
+    def test_agregar_y_obtener_por_id(self):
+        """Test: Agregar dispositivos y buscarlos por id"""
+        home = Home(1, "Casa")
+        luz = _crear_dispositivo(home, 10)
+
+        home.add_device(luz)
+        home.add_device(luz)  # Repetido: no se duplica
+
+        assert home.get_devices() == [luz]
+        assert home.get_device(10) is luz
+        assert home.has_device(10)
+        assert home.get_device(99) is None
+
+    def test_orden_de_agregado(self):
+        """Test: get_devices respeta el orden de agregado"""
+        home = Home(1, "Casa")
+        dispositivos = [_crear_dispositivo(home, id) for id in (3, 1, 2)]
+        for device in dispositivos:
+            home.add_device(device)
+
+        assert [d.id for d in home.get_devices()] == [3, 1, 2]
+
+    def test_quitar_dispositivo(self):
+        """Test: Quitar un dispositivo lo elimina de todos los índices"""
+        home = Home(1, "Casa")
+        luz = _crear_dispositivo(home, 10, type_id=5)
+        home.add_device(luz)
+
+        home.remove_device(luz)
+
+        assert home.get_devices() == []
+        assert home.get_devices_by_type(5) == []
+        assert not home.has_device(10)
+
+    def test_indices_secundarios(self):
+        """Test: Búsquedas por tipo, ubicación y estado"""
+        home = Home(1, "Casa")
+        luz = _crear_dispositivo(home, 1, state_id=1, type_id=1, location_id=1)
+        sensor = _crear_dispositivo(home, 2, state_id=2, type_id=2, location_id=1)
+        home.add_device(luz)
+        home.add_device(sensor)
+
+        assert home.get_devices_by_type(2) == [sensor]
+        assert home.get_devices_by_location(1) == [luz, sensor]
+        assert home.get_devices_by_state(1) == [luz]
+
+    def test_cambio_de_estado_reindexa(self):
+        """Test: Cambiar el estado del dispositivo actualiza el índice"""
+        home = Home(1, "Casa")
+        luz = _crear_dispositivo(home, 1, state_id=1)
+        home.add_device(luz)
+
+        luz.state = State(2, "Apagado")
+
+        assert home.get_devices_by_state(1) == []
+        assert home.get_devices_by_state(2) == [luz]
+
+    def test_dispositivo_quitado_no_reindexa(self):
+        """Test: Un dispositivo quitado ya no afecta los índices"""
+        home = Home(1, "Casa")
+        luz = _crear_dispositivo(home, 1, state_id=1)
+        home.add_device(luz)
+        home.remove_device(luz)
+
+        luz.state = State(2, "Apagado")
+
+        assert home.get_devices_by_state(2) == []
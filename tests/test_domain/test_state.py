@@ -76,4 +76,10 @@ def test_cambiar_nombre_state():
     """Test: Cambiar nombre de un estado"""
     state = State(2, "Original")
     state.name = "Modificado"
-    assert state.name == "Modificado"
\ No newline at end of file
+    assert state.name == "Modificado"
+
+def test_state_igualdad_por_valor():
+    """Test: Dos estados con el mismo id y nombre son iguales"""
+    assert State(1, "Encendido") == State(1, "Encendido")
+    assert State(1, "Encendido") != State(1, "Apagado")
+    assert len({State(1, "Encendido"), State(1, "Encendido")}) == 1
@@ -98,6 +98,16 @@ class TestUser:
         # Password incorrecta
         assert not user.validate_credentials("usuario@test.com", "password_incorrecta")
 
+    def test_validar_credenciales_con_hash(self):
+        """Test: Validar credenciales contra una contraseña hasheada"""
+        from utils.passwords import hashear
+
+        role = Role(2, "Usuario")
+        user = User("usuario@test.com", hashear("mi_password", n=2 ** 10), "Usuario", role)
+
+        assert user.validate_credentials("usuario@test.com", "mi_password")
+        assert not user.validate_credentials("usuario@test.com", "otra")
+
     def test_types_user(self):
         """Test: Verificar tipos de datos correctos"""
         role = Role(1, "Administrador")
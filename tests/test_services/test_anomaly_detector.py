@@ -0,0 +1,180 @@
+"""
+Tests para AnomalyDetector y SensorService (Anomalías en sensores)
+
+Cubre:
+- Media y varianza EWMA
+- Lecturas fuera de rango (z-score) y período de calentamiento
+- Ráfagas de eventos por ventana
+- Enfriamiento entre alertas, registro y publicación
+- Ingreso de eventos y lecturas por SensorService
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from dominio.messages import AnomalyDetected, EventOccurred, SensorReading
+from services.anomaly_detector import (
+    ANOMALIA_TASA,
+    ANOMALIA_VALOR,
+    SOURCE_ALERTA,
+    AnomalyDetector,
+    EstadisticaEwma,
+)
+from services.sensor_service import SensorService
+
+INICIO = datetime(2024, 11, 28, 22, 0, 0)
+
+
+@pytest.fixture
+def detector():
+    """AnomalyDetector con DAO mockeado y bus propio"""
+    detector = AnomalyDetector(muestras_minimas=10, ventana_segundos=60)
+    detector.event_dao = Mock()
+    return detector
+
+
+def lectura(segundos, valor, device_id=1):
+    """Lectura de temperatura"""
+    return SensorReading(device_id, "temperatura", valor, INICIO + timedelta(seconds=segundos))
+
+
+def evento(segundos, device_id=5, source="sensor"):
+    """Evento de movimiento"""
+    return EventOccurred(device_id, source, "Movimiento detectado", INICIO + timedelta(seconds=segundos))
+
+
+class TestEstadisticaEwma:
+    """Tests para la media y varianza móviles"""
+
+    def test_converge_a_la_media(self):
+        """Test: Valores alternados convergen a su media y varianza"""
+        estadistica = EstadisticaEwma()
+        for i in range(2000):
+            estadistica.actualizar(10.0 if i % 2 else 20.0, 0.05)
+
+        assert estadistica.media == pytest.approx(15.0, abs=0.3)
+        assert estadistica.desvio() == pytest.approx(5.0, abs=0.3)
+
+
+class TestLecturas:
+    """Tests para anomalías de valor"""
+
+    def test_valor_atipico(self, detector):
+        """Test: Un salto de temperatura se detecta tras el calentamiento"""
+        for i in range(50):
+            assert detector.procesar_lectura(lectura(i, 21.0 + (i % 3) * 0.1)) is None
+
+        anomalia = detector.procesar_lectura(lectura(50, 60.0))
+
+        assert anomalia.kind == ANOMALIA_VALOR
+        assert anomalia.metric == "temperatura"
+        assert anomalia.score > 4
+        detector.event_dao.registrar_evento.assert_called_once()
+        assert detector.event_dao.registrar_evento.call_args[0][1] == SOURCE_ALERTA
+
+    def test_sin_alertas_durante_calentamiento(self, detector):
+        """Test: Las primeras lecturas solo alimentan la estadística"""
+        detector.procesar_lectura(lectura(0, 20.0))
+
+        assert detector.procesar_lectura(lectura(1, 500.0)) is None
+
+    def test_enfriamiento(self, detector):
+        """Test: Valores anómalos seguidos generan una sola alerta"""
+        for i in range(50):
+            detector.procesar_lectura(lectura(i, 21.0 + (i % 3) * 0.1))
+
+        alertas = [detector.procesar_lectura(lectura(50 + i, 80.0)) for i in range(3)]
+
+        assert sum(a is not None for a in alertas) == 1
+
+    def test_dispositivos_independientes(self, detector):
+        """Test: Cada (dispositivo, métrica) tiene su propia estadística"""
+        for i in range(50):
+            detector.procesar_lectura(lectura(i, 21.0 + (i % 3) * 0.1, device_id=1))
+            detector.procesar_lectura(lectura(i, 60.0 + (i % 3) * 0.1, device_id=2))
+
+        assert detector.procesar_lectura(lectura(60, 60.0, device_id=2)) is None
+
+
+class TestTasa:
+    """Tests para ráfagas de eventos"""
+
+    def test_rafaga(self, detector):
+        """Test: Muchos eventos en una ventana frente a uno por minuto"""
+        for minuto in range(20):
+            assert detector.procesar_evento(evento(minuto * 60)) is None
+
+        alertas = [detector.procesar_evento(evento(20 * 60 + i)) for i in range(30)]
+        anomalias = [a for a in alertas if a is not None]
+
+        assert len(anomalias) == 1
+        assert anomalias[0].kind == ANOMALIA_TASA
+        assert anomalias[0].value >= detector.eventos_minimos
+
+    def test_ignora_eventos_que_no_son_de_sensor(self, detector):
+        """Test: Solo se cuentan los eventos con source='sensor'"""
+        assert detector.procesar_evento(evento(0, source="manual")) is None
+
+
+class TestBus:
+    """Tests de integración con el bus de eventos"""
+
+    def test_conectar_y_publicar_anomalia(self, detector):
+        """Test: Las lecturas llegan por el bus y las anomalías se publican"""
+        bus = Mock()
+        detector.conectar(bus)
+
+        assert bus.suscribir.call_count == 2
+        for i in range(50):
+            detector.procesar_lectura(lectura(i, 21.0 + (i % 3) * 0.1))
+        detector.procesar_lectura(lectura(50, 90.0))
+
+        publicado = bus.publicar.call_args[0][0]
+        assert isinstance(publicado, AnomalyDetected)
+        detector.desconectar(bus)
+        assert bus.desuscribir.call_count == 2
+
+
+class TestSensorService:
+    """Tests para el ingreso de datos de sensores"""
+
+    @pytest.fixture
+    def servicio(self):
+        """SensorService con dependencias mockeadas"""
+        servicio = SensorService()
+        servicio.event_dao = Mock()
+        servicio.telemetry_store = Mock()
+        servicio.event_bus = Mock()
+        return servicio
+
+    def test_evento_se_registra_y_publica(self, servicio):
+        """Test: El evento se guarda y luego se publica"""
+        servicio.event_dao.registrar_evento.return_value = True
+
+        exito, _ = servicio.registrar_evento(5, "Movimiento detectado", INICIO)
+
+        assert exito is True
+        servicio.event_dao.registrar_evento.assert_called_once_with(5, "sensor", "Movimiento detectado", INICIO)
+        servicio.event_bus.publicar.assert_called_once_with(
+            EventOccurred(5, "sensor", "Movimiento detectado", INICIO)
+        )
+
+    def test_evento_no_guardado_no_se_publica(self, servicio):
+        """Test: Si falla la BD no se publica"""
+        servicio.event_dao.registrar_evento.return_value = False
+
+        exito, _ = servicio.registrar_evento(5, "Movimiento detectado", INICIO)
+
+        assert exito is False
+        servicio.event_bus.publicar.assert_not_called()
+
+    def test_lectura_invalida(self, servicio):
+        """Test: Una lectura rechazada por la telemetría no se publica"""
+        servicio.telemetry_store.registrar.return_value = False
+
+        exito, _ = servicio.registrar_lectura(1, "temperatura", "x", INICIO)
+
+        assert exito is False
+        servicio.event_bus.publicar.assert_not_called()
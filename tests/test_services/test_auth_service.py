@@ -6,9 +6,13 @@ Cubre:
 - Inicio de sesión
 - Cierre de sesión
 - Cambio de roles
+- Permisos sobre hogares desde MembershipCache
 - Validaciones
 """
 
+import asyncio
+from concurrent.futures import Future
+
 
 class TestAuthServiceRegistro:
     """Tests para registro de usuarios"""
@@ -202,6 +206,23 @@ class TestAuthServiceLogin:
             for word in ["contraseña", "password", "obligatorio"]
         )
 
+    def test_login_async(self, mock_auth_service, mock_user_dao, usuario_standard):
+        """Test: El login para asyncio espera el Future de validación"""
+        # Arrange
+        futuro = Future()
+        futuro.set_result(usuario_standard)
+        mock_user_dao.validar_credenciales_futuro.return_value = futuro
+
+        # Act
+        exito, _ = asyncio.run(
+            mock_auth_service.iniciar_sesion_async("user@test.com", "user123")
+        )
+
+        # Assert
+        assert exito is True
+        assert mock_auth_service.usuario_actual == usuario_standard
+        mock_user_dao.validar_credenciales.assert_not_called()
+
 
 class TestAuthServiceSesion:
     """Tests para gestión de sesión"""
@@ -302,6 +323,29 @@ class TestAuthServiceSesion:
         # Assert
         assert datos == {}
 
+    def test_hogares_permitidos_desde_cache(self, mock_auth_service, usuario_standard):
+        """Test: Los hogares del usuario actual salen del cache de membresías"""
+        # Arrange
+        mock_auth_service.usuario_actual = usuario_standard
+        mock_auth_service.membresias.hogares_de.return_value = frozenset({1, 2})
+
+        # Act
+        hogares = mock_auth_service.hogares_permitidos()
+
+        # Assert
+        assert hogares == {1, 2}
+        mock_auth_service.membresias.hogares_de.assert_called_once_with("user@test.com")
+
+    def test_hogares_permitidos_sin_sesion(self, mock_auth_service):
+        """Test: Sin sesión activa no hay hogares permitidos"""
+        # Arrange
+        mock_auth_service.usuario_actual = None
+
+        # Act / Assert
+        assert mock_auth_service.hogares_permitidos() == frozenset()
+        assert not mock_auth_service.puede_acceder_hogar(1)
+        mock_auth_service.membresias.hogares_de.assert_not_called()
+
 
 class TestAuthServiceCambioRol:
     """Tests para cambio de rol de usuarios"""
@@ -0,0 +1,61 @@
+"""
+Tests para AutomationHomeIndex (Hogar de cada automatización)
+
+Cubre:
+- Carga única desde la BD
+- Actualización por los AutomationChanged del bus
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from dominio.messages import AutomationChanged
+from services.automation_home_index import AutomationHomeIndex
+from services.event_bus import EventBus
+
+
+@pytest.fixture
+def indice():
+    """AutomationHomeIndex nuevo con el DAO mockeado"""
+    AutomationHomeIndex._instance = None
+    indice = AutomationHomeIndex()
+    indice.automation_dao = Mock()
+    indice.automation_dao.listar_hogares.return_value = {1: 10, 2: 20}
+    yield indice
+    AutomationHomeIndex._instance = None
+
+
+class TestAutomationHomeIndex:
+    """Tests para el índice de hogares"""
+
+    def test_carga_una_vez(self, indice):
+        """Test: La primera búsqueda carga el índice y las siguientes no consultan la BD"""
+        assert indice.hogar_de(1) == 10
+        assert indice.hogar_de(2) == 20
+        assert indice.hogar_de(3) is None
+
+        indice.automation_dao.listar_hogares.assert_called_once()
+
+    def test_error_bd(self, indice):
+        """Test: Si falla la carga el hogar no se conoce"""
+        indice.automation_dao.listar_hogares.return_value = None
+
+        assert indice.cargar() is False
+        assert indice.hogar_de(1) is None
+
+    def test_cambios_por_bus(self, indice):
+        """Test: Altas y bajas publicadas en el bus actualizan el índice"""
+        EventBus._instance = None
+        bus = EventBus()
+        indice.cargar()
+        indice.conectar(bus)
+
+        bus.publicar(AutomationChanged(3, 30))
+        bus.publicar(AutomationChanged(1))
+
+        assert indice.hogar_de(3) == 30
+        assert indice.hogar_de(1) is None
+        indice.desconectar(bus)
+        bus.cerrar()
+        EventBus._instance = None
@@ -8,9 +8,12 @@ Cubre:
 - Eliminación de automatizaciones
 - Activación/Desactivación
 - Obtención por hogar
+- Resúmenes (proyecciones) para listados
 """
 
 from dominio.automation import Automation
+from dominio.messages import AutomationChanged
+from dominio.summary import AutomationSummary
 
 
 class TestAutomationServiceCrear:
@@ -22,7 +25,12 @@ class TestAutomationServiceCrear:
         """Test: Crear automatización con datos válidos"""
         # Arrange
         mock_home_dao.obtener_por_id.return_value = home_test
-        mock_automation_dao.insertar.return_value = True
+
+        def insertar(automatizacion):
+            automatizacion._assign_id(42)
+            return True
+
+        mock_automation_dao.insertar.side_effect = insertar
 
         # Act
         exito, mensaje = mock_automation_service.crear_automatizacion(
@@ -36,6 +44,7 @@ class TestAutomationServiceCrear:
         assert exito is True
         assert "exitosamente" in mensaje.lower()
         mock_automation_dao.insertar.assert_called_once()
+        mock_automation_service.event_bus.publicar.assert_called_once_with(AutomationChanged(42, 1))
 
     def test_crear_automatizacion_nombre_vacio(
         self, mock_automation_service, mock_home_dao
@@ -101,6 +110,7 @@ class TestAutomationServiceCrear:
         # Assert
         assert exito is False
         assert "error" in mensaje.lower()
+        mock_automation_service.event_bus.publicar.assert_not_called()
 
     def test_crear_automatizacion_inactiva_por_defecto(
         self, mock_automation_service, mock_automation_dao, mock_home_dao, home_test
@@ -216,8 +226,9 @@ class TestAutomationServiceListar:
     ):
         """Test: Obtener automatizaciones organizadas por hogar"""
         # Arrange
-        mock_home_dao.obtener_hogares_usuario.return_value = [home_test]
-        mock_automation_dao.obtener_por_hogar.return_value = [automatizacion_test]
+        mock_automation_dao.obtener_por_usuario.return_value = {
+            "Casa Test": [automatizacion_test]
+        }
 
         # Act
         resultado = mock_automation_service.obtener_automatizaciones_usuario(
@@ -227,6 +238,72 @@ class TestAutomationServiceListar:
         # Assert
         assert "Casa Test" in resultado
         assert len(resultado["Casa Test"]) == 1
+        mock_automation_dao.obtener_por_usuario.assert_called_once_with(
+            "user@test.com", False
+        )
+        mock_automation_dao.obtener_por_hogar.assert_not_called()
+        mock_home_dao.obtener_hogares_usuario.assert_not_called()
+
+    def test_obtener_automatizaciones_usuario_solo_activas(
+        self,
+        mock_automation_service,
+        mock_automation_dao,
+        automatizacion_test,
+    ):
+        """Test: Filtrar solo automatizaciones activas del usuario"""
+        # Arrange
+        mock_automation_dao.obtener_por_usuario.return_value = {
+            "Casa Test": [automatizacion_test]
+        }
+
+        # Act
+        resultado = mock_automation_service.obtener_automatizaciones_usuario(
+            "user@test.com", solo_activas=True
+        )
+
+        # Assert
+        assert resultado["Casa Test"][0].active is True
+        mock_automation_dao.obtener_por_usuario.assert_called_once_with(
+            "user@test.com", True
+        )
+
+
+class TestAutomationServiceResumenListado:
+    """Tests para los resúmenes de automatizaciones usados en tablas"""
+
+    def test_listar_resumen_automatizaciones(
+        self, mock_automation_service, mock_automation_dao
+    ):
+        """Test: Listado resumido sin hidratar entidades"""
+        # Arrange
+        mock_automation_dao.listar_resumen.return_value = [
+            AutomationSummary(1, "Modo Nocturno", "Apaga luces", True, "Casa Test")
+        ]
+
+        # Act
+        resumen = mock_automation_service.listar_resumen_automatizaciones()
+
+        # Assert
+        assert resumen[0].home_name == "Casa Test"
+        mock_automation_dao.obtener_todos.assert_not_called()
+
+    def test_resumen_automatizaciones_usuario_activas(
+        self, mock_automation_service, mock_automation_dao
+    ):
+        """Test: Resumen por hogar filtrando activas"""
+        # Arrange
+        mock_automation_dao.listar_resumen_por_usuario.return_value = {"Casa Test": []}
+
+        # Act
+        resultado = mock_automation_service.resumen_automatizaciones_usuario(
+            "user@test.com", solo_activas=True
+        )
+
+        # Assert
+        assert resultado == {"Casa Test": []}
+        mock_automation_dao.listar_resumen_por_usuario.assert_called_once_with(
+            "user@test.com", True
+        )
 
 
 class TestAutomationServiceActualizar:
@@ -406,6 +483,7 @@ class TestAutomationServiceEstado:
         # Assert
         assert exito is True
         assert "activada" in mensaje.lower()
+        mock_automation_service.event_bus.publicar.assert_called_once_with(AutomationChanged(1, 1))
 
     def test_activar_automatizacion_ya_activa(
         self, mock_automation_service, mock_automation_dao, automatizacion_test
@@ -420,6 +498,7 @@ class TestAutomationServiceEstado:
 
         # Assert
         assert exito is False
+        mock_automation_service.event_bus.publicar.assert_not_called()
         # Puede decir "ya está activa" o "estado"
         assert any(word in mensaje.lower() for word in ["ya", "activa", "estado"])
 
@@ -0,0 +1,185 @@
+"""
+Tests para AutomationSimulator (Simulación sobre el historial de eventos)
+
+Cubre:
+- Acciones disparadas por eventos y por horario
+- Estado en memoria (sin acciones repetidas) y cascadas entre reglas
+- Cambios de estado y bajas del historial
+- Corte de ciclos
+- Carga de reglas inactivas y ausencia de escrituras en la BD
+"""
+
+from datetime import datetime, time, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from dominio.automation_rule import (
+    TRIGGER_DEVICE_STATE,
+    TRIGGER_EVENT_SOURCE,
+    TRIGGER_TIME,
+    AutomationAction,
+    AutomationRule,
+    Trigger,
+)
+from dominio.summary import DeviceStatus
+from services.automation_simulator import AutomationSimulator, pulsos_entre
+
+DESDE = datetime(2024, 11, 28, 0, 0)
+HASTA = datetime(2024, 11, 29, 23, 59)
+
+ALARMA_HUMO = AutomationRule(
+    7, "Alarma Humo", 1,
+    (Trigger(1, 7, TRIGGER_EVENT_SOURCE, device_id=8, source="sensor"),),
+    (AutomationAction(6, "Apagar", 2),),
+)
+MODO_NOCHE = AutomationRule(
+    1, "Modo Noche", 1,
+    (Trigger(2, 1, TRIGGER_TIME, time_of_day=time(23, 0)),),
+    (AutomationAction(1, "Apagar", 2), AutomationAction(2, "Ajustar", None)),
+)
+
+
+def fila(instante, device_id, source="sensor"):
+    """Fila cruda de la tabla event"""
+    return {'date_time_value': instante, 'device_id': device_id, 'source': source, 'description': ''}
+
+
+@pytest.fixture
+def simulador():
+    """AutomationSimulator con DAOs mockeados"""
+    simulador = AutomationSimulator()
+    simulador.rule_dao = Mock()
+    simulador.event_dao = Mock()
+    simulador.history_service = Mock()
+    return simulador
+
+
+class TestPulsos:
+    """Tests para la generación de pulsos horarios"""
+
+    def test_solo_minutos_con_reglas(self):
+        """Test: Se generan solo los horarios programados dentro del rango"""
+        pulsos = list(pulsos_entre(DESDE, HASTA, [(7, 0), (23, 0)]))
+
+        assert pulsos == [
+            datetime(2024, 11, 28, 7, 0),
+            datetime(2024, 11, 28, 23, 0),
+            datetime(2024, 11, 29, 7, 0),
+            datetime(2024, 11, 29, 23, 0),
+        ]
+
+
+class TestSimulacion:
+    """Tests para la reproducción de eventos"""
+
+    def test_evento_dispara_accion_una_vez(self, simulador):
+        """Test: La segunda detección no repite la acción (el estado ya cambió)"""
+        filas = [
+            fila(DESDE + timedelta(hours=1), 8),
+            fila(DESDE + timedelta(hours=2), 8),
+            fila(DESDE + timedelta(hours=3), 5),
+        ]
+
+        reporte = simulador.simular_eventos(filas, [ALARMA_HUMO], {6: 1}, DESDE, HASTA)
+
+        assert reporte.eventos == 3
+        assert len(reporte.acciones) == 1
+        accion = reporte.acciones[0]
+        assert (accion.automation_id, accion.device_id, accion.previous_state_id, accion.state_id) == (7, 6, 1, 2)
+        assert accion.timestamp == DESDE + timedelta(hours=1)
+        assert reporte.estados_finales[6] == 2
+
+    def test_reglas_horarias(self, simulador):
+        """Test: Los disparadores horarios se evalúan aunque no haya eventos"""
+        reporte = simulador.simular_eventos([], [MODO_NOCHE], {1: 1}, DESDE, HASTA)
+
+        assert reporte.pulsos == 2
+        assert [a.timestamp for a in reporte.acciones] == [datetime(2024, 11, 28, 23, 0)]
+        assert reporte.por_automatizacion == {1: 1}
+
+    def test_cascada_entre_reglas(self, simulador):
+        """Test: Un cambio simulado dispara las reglas de estado"""
+        encadenada = AutomationRule(
+            3, "Ahorro", 1,
+            (Trigger(3, 3, TRIGGER_DEVICE_STATE, device_id=6, state_id=2),),
+            (AutomationAction(15, "Apagar", 2),),
+        )
+
+        reporte = simulador.simular_eventos(
+            [fila(DESDE, 8)], [ALARMA_HUMO, encadenada], {6: 1, 15: 1}, DESDE, HASTA
+        )
+
+        assert [a.automation_id for a in reporte.acciones] == [7, 3]
+        assert reporte.acciones[1].trigger == "DeviceStateChanged"
+
+    def test_ciclo_se_corta(self, simulador):
+        """Test: Dos reglas que se disparan mutuamente no iteran sin fin"""
+        encender = AutomationRule(
+            1, "Encender", 1,
+            (Trigger(1, 1, TRIGGER_DEVICE_STATE, device_id=1, state_id=2),),
+            (AutomationAction(1, "Encender", 1),),
+        )
+        apagar = AutomationRule(
+            2, "Apagar", 1,
+            (Trigger(2, 2, TRIGGER_DEVICE_STATE, device_id=1, state_id=1),
+             Trigger(3, 2, TRIGGER_EVENT_SOURCE, source="manual")),
+            (AutomationAction(1, "Apagar", 2),),
+        )
+        simulador.max_cascada = 5
+
+        reporte = simulador.simular_eventos(
+            [fila(DESDE, 1, source="manual")], [encender, apagar], {1: 1}, DESDE, HASTA
+        )
+
+        assert len(reporte.acciones) == 5
+        assert reporte.cascadas_cortadas == 1
+
+    def test_cambio_de_estado_del_historial(self, simulador):
+        """Test: Un cambio de estado registrado actualiza la copia y dispara reglas de estado"""
+        encadenada = AutomationRule(
+            3, "Ahorro", 1,
+            (Trigger(3, 3, TRIGGER_DEVICE_STATE, device_id=6, state_id=2),),
+            (AutomationAction(15, "Apagar", 2),),
+        )
+        filas = [dict(fila(DESDE, 6, source="manual"), state_id=2, home_id=1)]
+
+        reporte = simulador.simular_eventos(filas, [ALARMA_HUMO, encadenada], {6: 1, 15: 1}, DESDE, HASTA)
+
+        assert [a.automation_id for a in reporte.acciones] == [3]
+        assert reporte.estados_finales == {6: 2, 15: 2}
+
+    def test_baja_quita_el_dispositivo(self, simulador):
+        """Test: Tras la baja de un dispositivo no se simulan acciones sobre él"""
+        filas = [
+            dict(fila(DESDE, 6, source="sistema"), state_id=0),
+            fila(DESDE + timedelta(hours=1), 8),
+        ]
+
+        reporte = simulador.simular_eventos(filas, [ALARMA_HUMO], {6: 1}, DESDE, HASTA)
+
+        assert reporte.acciones == []
+        assert reporte.estados_finales == {}
+
+    def test_simular_carga_reglas_inactivas_sin_escribir(self, simulador):
+        """Test: Se simulan automatizaciones desactivadas y no se escribe en la BD"""
+        simulador.rule_dao.obtener_reglas.return_value = [ALARMA_HUMO]
+        simulador.history_service.estado_en.return_value = {6: DeviceStatus(6, 1, "Encendido")}
+        simulador.event_dao.iterar_por_fecha.return_value = iter([fila(DESDE, 8)])
+
+        reporte = simulador.simular(DESDE, HASTA, automation_ids=[7], home_id=1)
+
+        simulador.rule_dao.obtener_reglas.assert_called_once_with(7, solo_activas=False)
+        simulador.history_service.estado_en.assert_called_once_with(DESDE, 1)
+        simulador.event_dao.iterar_por_fecha.assert_called_once_with(DESDE, HASTA, 1)
+        assert len(reporte.acciones) == 1
+        assert simulador.event_dao.method_calls == [
+            ("iterar_por_fecha", (DESDE, HASTA, 1), {})
+        ]
+
+    def test_simular_error_bd(self, simulador):
+        """Test: Si no se pueden leer las reglas la simulación se cancela"""
+        simulador.rule_dao.obtener_reglas.return_value = None
+        simulador.history_service.estado_en.return_value = {}
+
+        assert simulador.simular(DESDE, HASTA) is None
@@ -0,0 +1,126 @@
+"""
+Tests para CommandCoalescer (Coalescencia de cambios de estado)
+
+Cubre:
+- Ráfagas que se reducen al último estado pedido
+- Ráfagas que terminan en el estado actual (sin escritura)
+- Ventanas independientes por dispositivo y cierre en un único hilo
+- Métricas de coalescencia y errores
+"""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from dominio.summary import DeviceStatus
+from services.command_coalescer import CommandCoalescer
+
+
+@pytest.fixture
+def coalescer():
+    """CommandCoalescer nuevo con ventana larga (se cierra con vaciar)"""
+    CommandCoalescer._instance = None
+    coalescer = CommandCoalescer()
+    coalescer.device_service = Mock()
+    coalescer.device_service.cambiar_estado_dispositivo.return_value = (True, "ok")
+    coalescer.state_store = Mock()
+    coalescer.state_store.obtener.return_value = DeviceStatus(1, 2, "Apagado")
+    coalescer.ventana_segundos = 60
+    yield coalescer
+    coalescer.vaciar()
+    coalescer.detener()
+    CommandCoalescer._instance = None
+
+
+class TestCoalescencia:
+    """Tests para la reducción de ráfagas"""
+
+    def test_rafaga_aplica_ultimo_estado(self, coalescer):
+        """Test: Varios cambios en la ventana generan una sola escritura"""
+        for estado in (1, 3, 1, 5):
+            assert coalescer.solicitar(1, estado) is True
+
+        assert coalescer.pendientes() == 1
+        assert coalescer.vaciar() == 1
+
+        coalescer.device_service.cambiar_estado_dispositivo.assert_called_once_with(1, 5, "manual")
+        metricas = coalescer.metricas()
+        assert (metricas.solicitudes, metricas.escrituras, metricas.combinadas) == (4, 1, 3)
+        assert metricas.tasa_coalescencia == pytest.approx(0.75)
+
+    def test_rafaga_que_vuelve_al_estado_actual(self, coalescer):
+        """Test: Encender y apagar dentro de la ventana no escribe nada"""
+        coalescer.solicitar(1, 1)
+        coalescer.solicitar(1, 2)
+        coalescer.vaciar()
+
+        coalescer.device_service.cambiar_estado_dispositivo.assert_not_called()
+        assert coalescer.metricas().sin_cambio == 1
+
+    def test_estado_actual_no_abre_ventana(self, coalescer):
+        """Test: Pedir el estado que ya tiene el dispositivo se descarta"""
+        assert coalescer.solicitar(1, 2) is False
+        assert coalescer.pendientes() == 0
+
+    def test_dispositivos_independientes(self, coalescer):
+        """Test: Cada dispositivo tiene su propia ventana"""
+        coalescer.solicitar(1, 1, origen="automatización")
+        coalescer.solicitar(2, 1)
+
+        assert coalescer.vaciar() == 2
+        assert coalescer.device_service.cambiar_estado_dispositivo.call_count == 2
+
+
+class TestVentana:
+    """Tests para el cierre de la ventana"""
+
+    def test_cierre_por_temporizador(self, coalescer):
+        """Test: Al vencer la ventana se aplica el cambio sin intervención"""
+        coalescer.ventana_segundos = 0.02
+        coalescer.solicitar(1, 1)
+        coalescer.solicitar(1, 3)
+
+        limite = time.monotonic() + 2
+        while coalescer.pendientes() and time.monotonic() < limite:
+            time.sleep(0.01)
+        while not coalescer.device_service.cambiar_estado_dispositivo.called and time.monotonic() < limite:
+            time.sleep(0.01)
+
+        coalescer.device_service.cambiar_estado_dispositivo.assert_called_once_with(1, 3, "manual")
+
+    def test_un_solo_hilo_para_todas_las_ventanas(self, coalescer):
+        """Test: Las ventanas de muchos dispositivos las cierra un mismo hilo"""
+        coalescer.ventana_segundos = 0.02
+        hilos = set()
+        coalescer.device_service.cambiar_estado_dispositivo.side_effect = (
+            lambda *_: hilos.add(threading.get_ident()) or (True, "ok")
+        )
+        antes = threading.active_count()
+
+        for device_id in range(1, 51):
+            coalescer.solicitar(device_id, 1)
+
+        assert threading.active_count() <= antes + 1
+        limite = time.monotonic() + 2
+        while coalescer.metricas().escrituras < 50 and time.monotonic() < limite:
+            time.sleep(0.01)
+        assert coalescer.metricas().escrituras == 50
+        assert len(hilos) == 1
+
+    def test_ventana_cero_aplica_inmediato(self, coalescer):
+        """Test: Sin ventana el cambio se aplica en la misma llamada"""
+        coalescer.ventana_segundos = 0
+        coalescer.solicitar(1, 1)
+
+        coalescer.device_service.cambiar_estado_dispositivo.assert_called_once_with(1, 1, "manual")
+
+    def test_error_se_cuenta(self, coalescer):
+        """Test: Un cambio rechazado por DeviceService cuenta como error"""
+        coalescer.device_service.cambiar_estado_dispositivo.return_value = (False, "Estado no encontrado")
+        coalescer.solicitar(1, 99)
+        coalescer.vaciar()
+
+        metricas = coalescer.metricas()
+        assert (metricas.escrituras, metricas.errores) == (0, 1)
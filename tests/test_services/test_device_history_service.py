@@ -0,0 +1,193 @@
+"""
+Tests para DeviceHistoryService (Estado de dispositivos en el tiempo)
+
+Cubre:
+- Formato compacto de las instantáneas
+- Reconstrucción desde la instantánea más cercana más los deltas
+- Filtro por hogar y ausencia de instantánea previa
+- Altas y bajas de dispositivos posteriores a la instantánea
+- Cambios registrados en el mismo instante que la instantánea
+- Registro de cambios de estado, altas y bajas publicados en el bus
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from dao.device_state_snapshot_dao import Snapshot, desempaquetar, empaquetar
+from dao.event_dao import EventDAO
+from dominio.messages import DeviceCreated, DeviceDeleted, DeviceStateChanged
+from dominio.state import State
+from services.device_history_service import ESTADO_ELIMINADO, INICIO_HISTORIAL, DeviceHistoryService
+from services.event_bus import EventBus
+
+SNAPSHOT = datetime(2024, 11, 28, 22, 0)
+CONSULTA = datetime(2024, 11, 28, 22, 45)
+
+
+def delta(minutos, device_id, state_id, home_id=1):
+    """Fila de cambio de estado posterior a la instantánea"""
+    return {
+        'date_time_value': SNAPSHOT + timedelta(minutes=minutos),
+        'device_id': device_id,
+        'state_id': state_id,
+        'home_id': home_id,
+    }
+
+
+@pytest.fixture
+def servicio():
+    """DeviceHistoryService con DAOs mockeados"""
+    servicio = DeviceHistoryService(dias_retencion=30)
+    servicio.snapshot_dao = Mock()
+    servicio.event_dao = Mock()
+    servicio.state_dao = Mock()
+    servicio.state_dao.obtener_todos.return_value = [State(1, "Encendido"), State(2, "Apagado")]
+    servicio.snapshot_dao.obtener_anterior.return_value = Snapshot(
+        SNAPSHOT, [(1, 1, 1), (2, 1, 1), (3, 2, 2)]
+    )
+    return servicio
+
+
+class TestFormatoSnapshot:
+    """Tests para el empaquetado binario de estados"""
+
+    def test_ida_y_vuelta(self):
+        """Test: Se recuperan las mismas tuplas, 12 bytes por dispositivo"""
+        estados = [(1, 1, 1), (2, 1, 2), (70000, 3, 4)]
+
+        datos = empaquetar(estados)
+
+        assert len(datos) == 36
+        assert desempaquetar(datos) == estados
+
+
+class TestEstadoEn:
+    """Tests para la reconstrucción del estado en un instante"""
+
+    def test_aplica_deltas_sobre_snapshot(self, servicio):
+        """Test: El último delta de cada dispositivo gana"""
+        servicio.event_dao.iterar_cambios_estado.return_value = iter([
+            delta(5, 1, 2), delta(30, 1, 1), delta(40, 2, 2),
+        ])
+
+        estados = servicio.estado_en(CONSULTA)
+
+        servicio.snapshot_dao.obtener_anterior.assert_called_once_with(CONSULTA)
+        servicio.event_dao.iterar_cambios_estado.assert_called_once_with(
+            SNAPSHOT, CONSULTA, incluir_desde=True
+        )
+        assert {d: e.state_id for d, e in estados.items()} == {1: 1, 2: 2, 3: 2}
+        assert estados[2].state_name == "Apagado"
+
+    def test_filtro_por_hogar(self, servicio):
+        """Test: Solo se devuelven los dispositivos del hogar pedido"""
+        servicio.event_dao.iterar_cambios_estado.return_value = iter([delta(10, 4, 1, home_id=2)])
+
+        estados = servicio.estado_en(CONSULTA, home_id=2)
+
+        assert sorted(estados) == [3, 4]
+
+    def test_sin_snapshot_usa_solo_eventos(self, servicio):
+        """Test: Sin instantánea previa se reconstruye desde el inicio del historial"""
+        servicio.snapshot_dao.obtener_anterior.return_value = None
+        servicio.event_dao.iterar_cambios_estado.return_value = iter([delta(10, 1, 2)])
+
+        estados = servicio.estado_en(CONSULTA)
+
+        assert servicio.event_dao.iterar_cambios_estado.call_args[0][0] == INICIO_HISTORIAL
+        assert servicio.event_dao.iterar_cambios_estado.call_args[1] == {'incluir_desde': False}
+        assert list(estados) == [1]
+
+    def test_cambio_en_el_instante_del_snapshot(self, servicio):
+        """Test: Un cambio con el mismo instante que la instantánea se aplica"""
+        servicio.event_dao.iterar_cambios_estado.return_value = iter([delta(0, 1, 2)])
+
+        estados = servicio.estado_en(CONSULTA)
+
+        assert estados[1].state_id == 2
+
+    def test_consulta_incluye_el_instante_del_snapshot(self):
+        """Test: Desde una instantánea, la consulta de deltas incluye su instante"""
+        dao = EventDAO()
+        cursor = MagicMock()
+        cursor.fetchmany.return_value = []
+
+        with patch.object(dao.db, "get_cursor", return_value=cursor):
+            list(dao.iterar_cambios_estado(SNAPSHOT, CONSULTA, incluir_desde=True))
+            list(dao.iterar_cambios_estado(SNAPSHOT, CONSULTA))
+
+        incluye, excluye = (llamada[0][0] for llamada in cursor.execute.call_args_list)
+        assert "e.date_time_value >= %s" in incluye
+        assert "e.date_time_value > %s" in excluye
+
+    def test_alta_y_baja_posteriores_al_snapshot(self, servicio):
+        """Test: Aparecen los dispositivos creados y desaparecen los eliminados"""
+        servicio.event_dao.iterar_cambios_estado.return_value = iter([
+            delta(5, 4, 1), delta(10, 2, ESTADO_ELIMINADO, home_id=None),
+        ])
+
+        estados = servicio.estado_en(CONSULTA)
+
+        assert sorted(estados) == [1, 3, 4]
+
+    def test_error_devuelve_none(self, servicio):
+        """Test: Un error al leer los deltas devuelve None"""
+        servicio.event_dao.iterar_cambios_estado.side_effect = RuntimeError("boom")
+
+        assert servicio.estado_en(CONSULTA) is None
+
+
+class TestSnapshotYRegistro:
+    """Tests para la toma de instantáneas y el registro de deltas"""
+
+    def test_tomar_snapshot_depura_vencidas(self, servicio):
+        """Test: Tras guardar se eliminan las instantáneas fuera de la retención"""
+        servicio.snapshot_dao.tomar.return_value = 3
+        servicio.snapshot_dao.eliminar_anteriores.return_value = 0
+
+        exito, _ = servicio.tomar_snapshot(SNAPSHOT)
+
+        assert exito is True
+        servicio.snapshot_dao.eliminar_anteriores.assert_called_once_with(SNAPSHOT - timedelta(days=30))
+
+    def test_tomar_snapshot_error(self, servicio):
+        """Test: Si falla el guardado no se depura"""
+        servicio.snapshot_dao.tomar.return_value = -1
+
+        exito, _ = servicio.tomar_snapshot(SNAPSHOT)
+
+        assert exito is False
+        servicio.snapshot_dao.eliminar_anteriores.assert_not_called()
+
+    def test_cambio_publicado_se_registra(self, servicio):
+        """Test: Cada DeviceStateChanged del bus se guarda como delta"""
+        EventBus._instance = None
+        bus = EventBus()
+        servicio.conectar(bus)
+
+        bus.publicar(DeviceStateChanged(1, 1, 2, "Apagado", 1, CONSULTA, "automatización"))
+        servicio.desconectar(bus)
+        bus.publicar(DeviceStateChanged(1, 1, 1, "Encendido", 2, CONSULTA))
+
+        servicio.event_dao.registrar_cambio_estado.assert_called_once_with(
+            1, 2, "Estado cambiado a 'Apagado'", "automatización", CONSULTA
+        )
+        bus.cerrar()
+        EventBus._instance = None
+
+    def test_alta_y_baja_publicadas_se_registran(self, servicio):
+        """Test: El alta guarda el estado inicial y la baja ESTADO_ELIMINADO"""
+        EventBus._instance = None
+        bus = EventBus()
+        servicio.conectar(bus)
+
+        bus.publicar(DeviceCreated(7, 1, 2, SNAPSHOT))
+        bus.publicar(DeviceDeleted(7, 1, CONSULTA))
+
+        llamadas = servicio.event_dao.registrar_cambio_estado.call_args_list
+        assert [llamada[0][:2] for llamada in llamadas] == [(7, 2), (7, ESTADO_ELIMINADO)]
+        servicio.desconectar(bus)
+        bus.cerrar()
+        EventBus._instance = None
@@ -7,10 +7,17 @@ Cubre:
 - Actualización de dispositivos
 - Eliminación de dispositivos
 - Búsqueda de dispositivos
-- Cambio de estado
+- Cambio de estado (directo y a través del CommandCoalescer)
 - Obtención de opciones de configuración
+- Resúmenes (proyecciones) para listados
 """
 
+from unittest.mock import patch
+
+from dominio.messages import DeviceCreated, DeviceDeleted, DeviceStateChanged
+from dominio.summary import DeviceStatus, DeviceSummary
+from services.command_coalescer import CommandCoalescer
+
 
 class TestDeviceServiceCrear:
     """Tests para creación de dispositivos"""
@@ -45,6 +52,12 @@ class TestDeviceServiceCrear:
         assert exito is True
         assert "exitosamente" in mensaje.lower()
         mock_device_dao.insertar.assert_called_once()
+        alta = mock_device_service.event_bus.publicar.call_args[0][0]
+        assert isinstance(alta, DeviceCreated)
+        assert (alta.home_id, alta.state_id) == (1, 1)
+        mock_device_service.state_store.aplicar.assert_called_once_with(
+            alta.device_id, state_encendido.id, state_encendido.name, 1
+        )
 
     def test_crear_dispositivo_nombre_vacio(self, mock_device_service):
         """Test: Validación de nombre vacío"""
@@ -241,6 +254,49 @@ class TestDeviceServiceListar:
         assert dispositivo is None
 
 
+class TestDeviceServiceResumen:
+    """Tests para los resúmenes de dispositivos usados en tablas"""
+
+    def test_listar_resumen_dispositivos(self, mock_device_service, mock_device_dao):
+        """Test: Listado resumido sin hidratar entidades"""
+        # Arrange
+        mock_device_dao.listar_resumen.return_value = [
+            DeviceSummary(1, "Luz Sala", "Luz", "Encendido", "Sala", "Casa Test")
+        ]
+
+        # Act
+        resumen = mock_device_service.listar_resumen_dispositivos()
+
+        # Assert
+        assert resumen[0].type_name == "Luz"
+        assert resumen[0].home_name == "Casa Test"
+        mock_device_dao.listar_resumen.assert_called_once_with(None)
+        mock_device_dao.obtener_todos.assert_not_called()
+
+    def test_resumen_dispositivos_usuario(self, mock_device_service, mock_device_dao):
+        """Test: Resumen por hogar para un usuario"""
+        # Arrange
+        mock_device_dao.listar_resumen_por_usuario.return_value = {"Casa Test": []}
+
+        # Act
+        resultado = mock_device_service.resumen_dispositivos_usuario("user@test.com")
+
+        # Assert
+        assert resultado == {"Casa Test": []}
+        mock_device_dao.listar_resumen_por_usuario.assert_called_once_with("user@test.com")
+
+    def test_listar_resumen_error(self, mock_device_service, mock_device_dao):
+        """Test: Error del DAO devuelve lista vacía"""
+        # Arrange
+        mock_device_dao.listar_resumen.side_effect = Exception("fallo")
+
+        # Act
+        resumen = mock_device_service.listar_resumen_dispositivos()
+
+        # Assert
+        assert resumen == []
+
+
 class TestDeviceServiceActualizar:
     """Tests para actualización de dispositivos"""
 
@@ -410,6 +466,9 @@ class TestDeviceServiceEliminar:
         assert "eliminado" in mensaje.lower()
         assert "Luz Sala" in mensaje
         mock_device_dao.eliminar.assert_called_once_with(1)
+        baja = mock_device_service.event_bus.publicar.call_args[0][0]
+        assert isinstance(baja, DeviceDeleted)
+        assert baja.device_id == 1
 
     def test_eliminar_dispositivo_no_encontrado(
         self, mock_device_service, mock_device_dao
@@ -510,6 +569,49 @@ class TestDeviceServiceEstado:
         # Assert
         assert exito is True
         assert "Apagado" in mensaje
+        mock_device_service.state_store.aplicar.assert_called_once_with(
+            1, state_apagado.id, state_apagado.name
+        )
+        mensaje_bus = mock_device_service.event_bus.publicar.call_args[0][0]
+        assert isinstance(mensaje_bus, DeviceStateChanged)
+        assert mensaje_bus.device_id == dispositivo_luz_sala.id
+        assert mensaje_bus.state_id == state_apagado.id
+        assert mensaje_bus.previous_state_id == dispositivo_luz_sala.state.id
+
+    def test_cambiar_estado_fallo_bd_no_actualiza_store(
+        self,
+        mock_device_service,
+        mock_device_dao,
+        mock_state_dao,
+        dispositivo_luz_sala,
+        state_apagado,
+    ):
+        """Test: Si la BD falla, el store en memoria no cambia"""
+        # Arrange
+        mock_device_dao.obtener_por_id.return_value = dispositivo_luz_sala
+        mock_state_dao.obtener_por_id.return_value = state_apagado
+        mock_device_dao.cambiar_estado.return_value = False
+
+        # Act
+        exito, _ = mock_device_service.cambiar_estado_dispositivo(1, 2)
+
+        # Assert
+        assert exito is False
+        mock_device_service.state_store.aplicar.assert_not_called()
+        mock_device_service.event_bus.publicar.assert_not_called()
+
+    def test_obtener_estado_desde_store(self, mock_device_service, mock_device_dao):
+        """Test: El estado actual se lee del store, sin consultar la BD"""
+        # Arrange
+        estado = DeviceStatus(1, 2, "Apagado")
+        mock_device_service.state_store.obtener.return_value = estado
+
+        # Act
+        resultado = mock_device_service.obtener_estado_dispositivo(1)
+
+        # Assert
+        assert resultado == estado
+        mock_device_dao.obtener_por_id.assert_not_called()
 
     def test_cambiar_estado_dispositivo_no_encontrado(
         self, mock_device_service, mock_device_dao
@@ -540,6 +642,57 @@ class TestDeviceServiceEstado:
         assert exito is False
         assert "no encontrado" in mensaje.lower()
 
+    def test_solicitar_cambio_estado_por_coalescer(
+        self, mock_device_service, mock_device_dao, mock_state_dao, state_apagado
+    ):
+        """Test: Un cambio pedido por el usuario se encola en el coalescedor"""
+        # Arrange
+        mock_device_service.state_store.obtener.return_value = DeviceStatus(1, 1, "Encendido", 1)
+        mock_state_dao.obtener_por_id.return_value = state_apagado
+
+        with patch.object(CommandCoalescer, "solicitar", return_value=True) as solicitar:
+            # Act
+            exito, mensaje = mock_device_service.solicitar_cambio_estado(1, state_apagado.id)
+
+        # Assert
+        assert exito is True
+        assert "solicitado" in mensaje
+        solicitar.assert_called_once_with(1, state_apagado.id, origen="manual")
+        mock_device_dao.cambiar_estado.assert_not_called()
+        mock_device_service.event_bus.publicar.assert_not_called()
+
+    def test_solicitar_cambio_estado_sin_cambio(
+        self, mock_device_service, mock_state_dao, state_apagado
+    ):
+        """Test: Pedir el estado actual no genera escrituras"""
+        # Arrange
+        mock_device_service.state_store.obtener.return_value = DeviceStatus(1, 2, "Apagado", 1)
+        mock_state_dao.obtener_por_id.return_value = state_apagado
+
+        with patch.object(CommandCoalescer, "solicitar", return_value=False):
+            # Act
+            exito, mensaje = mock_device_service.solicitar_cambio_estado(1, state_apagado.id)
+
+        # Assert
+        assert exito is True
+        assert "ya está" in mensaje
+
+    def test_solicitar_cambio_estado_dispositivo_inexistente(
+        self, mock_device_service, mock_state_dao
+    ):
+        """Test: Un dispositivo que no existe se rechaza sin encolar nada"""
+        # Arrange
+        mock_device_service.state_store.obtener.return_value = None
+
+        with patch.object(CommandCoalescer, "solicitar") as solicitar:
+            # Act
+            exito, mensaje = mock_device_service.solicitar_cambio_estado(999, 2)
+
+        # Assert
+        assert exito is False
+        assert "no encontrado" in mensaje.lower()
+        solicitar.assert_not_called()
+
 
 class TestDeviceServiceOpciones:
     """Tests para obtención de opciones de configuración"""
@@ -584,8 +737,9 @@ class TestDeviceServiceOpciones:
     ):
         """Test: Obtener dispositivos organizados por hogar para un usuario"""
         # Arrange
-        mock_home_dao.obtener_hogares_usuario.return_value = [home_test]
-        mock_device_dao.obtener_por_hogar.return_value = [dispositivo_luz_sala]
+        mock_device_dao.obtener_por_usuario.return_value = {
+            "Casa Test": [dispositivo_luz_sala]
+        }
 
         # Act
         resultado = mock_device_service.obtener_dispositivos_usuario("user@test.com")
@@ -594,3 +748,6 @@ class TestDeviceServiceOpciones:
         assert "Casa Test" in resultado
         assert len(resultado["Casa Test"]) == 1
         assert resultado["Casa Test"][0].name == "Luz Sala"
+        mock_device_dao.obtener_por_usuario.assert_called_once_with("user@test.com")
+        mock_device_dao.obtener_por_hogar.assert_not_called()
+        mock_home_dao.obtener_hogares_usuario.assert_not_called()
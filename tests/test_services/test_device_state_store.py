@@ -0,0 +1,179 @@
+"""
+Tests para DeviceStateStore (Estado de dispositivos en memoria)
+
+Cubre:
+- Carga inicial con una sola consulta
+- Lecturas desde memoria y consulta puntual ante un id desconocido
+- Escrituras (aplicar/eliminar)
+- Reconciliación contra la BD (y en segundo plano con conexión del pool)
+"""
+
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from dominio.summary import DeviceStatus
+from services.device_state_store import DeviceStateStore
+
+
+@pytest.fixture
+def mock_dao_estados():
+    """Mock del DeviceDAO con dos dispositivos"""
+    dao = Mock()
+    dao.listar_estados.return_value = [
+        DeviceStatus(1, 1, "Encendido"),
+        DeviceStatus(2, 2, "Apagado"),
+    ]
+    return dao
+
+
+@pytest.fixture
+def store(mock_dao_estados):
+    """Instancia nueva del store (se descarta el singleton entre tests)"""
+    DeviceStateStore._instance = None
+    store = DeviceStateStore()
+    store.device_dao = mock_dao_estados
+    yield store
+    store.detener_reconciliacion_periodica()
+    DeviceStateStore._instance = None
+
+
+class TestDeviceStateStoreLectura:
+    """Tests para carga y lectura del store"""
+
+    def test_es_singleton(self, store):
+        """Test: Todas las instancias comparten el mismo estado"""
+        assert DeviceStateStore() is store
+
+    def test_obtener_carga_una_sola_vez(self, store, mock_dao_estados):
+        """Test: La primera lectura carga todo y las siguientes no van a la BD"""
+        assert store.obtener(1).state_name == "Encendido"
+        assert store.obtener(2).state_name == "Apagado"
+        assert store.esta_cargado() is True
+        mock_dao_estados.listar_estados.assert_called_once_with()
+
+    def test_obtener_id_desconocido_consulta_solo_esa_fila(self, store, mock_dao_estados):
+        """Test: Un dispositivo creado después de la carga se busca puntualmente"""
+        store.cargar()
+        mock_dao_estados.listar_estados.return_value = [DeviceStatus(3, 1, "Encendido")]
+
+        assert store.obtener(3) == DeviceStatus(3, 1, "Encendido")
+        mock_dao_estados.listar_estados.assert_called_with(3)
+        assert 3 in store.obtener_todos()
+
+    def test_obtener_inexistente(self, store, mock_dao_estados):
+        """Test: Un id que no existe en la BD devuelve None"""
+        store.cargar()
+        mock_dao_estados.listar_estados.return_value = []
+
+        assert store.obtener(999) is None
+
+    def test_cargar_error_bd(self, store, mock_dao_estados):
+        """Test: Un error de BD no marca el store como cargado"""
+        mock_dao_estados.listar_estados.return_value = None
+
+        assert store.cargar() is False
+        assert store.esta_cargado() is False
+
+
+class TestDeviceStateStoreEscritura:
+    """Tests para las escrituras en el store"""
+
+    def test_aplicar_actualiza_en_memoria(self, store, mock_dao_estados):
+        """Test: Aplicar un cambio se refleja sin volver a la BD"""
+        store.cargar()
+        store.aplicar(1, 2, "Apagado")
+
+        assert store.obtener(1) == DeviceStatus(1, 2, "Apagado")
+        mock_dao_estados.listar_estados.assert_called_once()
+
+    def test_aplicar_conserva_hogar(self, store, mock_dao_estados):
+        """Test: Un cambio de estado conserva el hogar y hogar_de no va a la BD"""
+        mock_dao_estados.listar_estados.return_value = [DeviceStatus(1, 1, "Encendido", 4)]
+        assert store.hogar_de(1) is None
+
+        store.cargar()
+        store.aplicar(1, 2, "Apagado")
+
+        assert store.hogar_de(1) == 4
+        assert store.hogar_de(99) is None
+        mock_dao_estados.listar_estados.assert_called_once_with()
+
+    def test_alta_registra_hogar(self, store, mock_dao_estados):
+        """Test: Un dispositivo creado después de cargar queda con su hogar"""
+        store.cargar()
+        store.aplicar(30, 1, "Encendido", 4)
+
+        assert store.hogar_de(30) == 4
+        mock_dao_estados.listar_estados.assert_called_once_with()
+
+    def test_eliminar(self, store):
+        """Test: Un dispositivo eliminado sale del store"""
+        store.cargar()
+        store.eliminar(2)
+
+        assert 2 not in store.obtener_todos()
+
+
+class TestDeviceStateStoreReconciliacion:
+    """Tests para la reconciliación contra la BD"""
+
+    def test_corrige_desvios(self, store, mock_dao_estados):
+        """Test: Cambios hechos fuera del proceso se corrigen"""
+        store.cargar()
+        mock_dao_estados.listar_estados.return_value = [
+            DeviceStatus(1, 2, "Apagado"),
+            DeviceStatus(3, 1, "Encendido"),
+        ]
+
+        corregidos = store.reconciliar()
+
+        assert corregidos == [1, 2, 3]
+        assert store.obtener_todos() == {
+            1: DeviceStatus(1, 2, "Apagado"),
+            3: DeviceStatus(3, 1, "Encendido"),
+        }
+
+    def test_sin_desvios(self, store):
+        """Test: Si coincide con la BD no hay correcciones"""
+        store.cargar()
+
+        assert store.reconciliar() == []
+
+    def test_respeta_escrituras_durante_la_lectura(self, store, mock_dao_estados):
+        """Test: Una escritura posterior al inicio de la lectura no se pisa"""
+        store.cargar()
+        lectura_vieja = [DeviceStatus(1, 1, "Encendido"), DeviceStatus(2, 2, "Apagado")]
+
+        def leer_y_escribir():
+            # Simula un cambio de estado que ocurre mientras se lee la BD
+            store.aplicar(1, 2, "Apagado")
+            return lectura_vieja
+
+        mock_dao_estados.listar_estados.side_effect = leer_y_escribir
+
+        assert store.reconciliar() == []
+        assert store.obtener(1) == DeviceStatus(1, 2, "Apagado")
+
+    def test_error_bd_no_modifica(self, store, mock_dao_estados):
+        """Test: Si falla la lectura el store queda intacto"""
+        store.cargar()
+        mock_dao_estados.listar_estados.return_value = None
+
+        assert store.reconciliar() is None
+        assert len(store.obtener_todos()) == 2
+
+    def test_periodica_devuelve_la_conexion(self, store, mock_dao_estados):
+        """Test: Cada pasada en segundo plano usa y devuelve una conexión del pool"""
+        devuelta = threading.Event()
+
+        with patch("services.device_state_store.DatabaseConnection") as mock_db:
+            unidad = mock_db.return_value.unidad_de_trabajo.return_value
+            unidad.__exit__.side_effect = lambda *_: devuelta.set()
+            store.iniciar_reconciliacion_periodica(0.01)
+            assert devuelta.wait(2)
+            store.detener_reconciliacion_periodica()
+
+        assert unidad.__enter__.called
+        mock_dao_estados.listar_estados.assert_called()
@@ -0,0 +1,117 @@
+"""
+Tests para EnergyAnalyticsService (Consumo energético estimado)
+
+Cubre:
+- Tramos entre cambios de estado, tiempo encendido y ciclo de trabajo
+- kWh por dispositivo y por tipo según la potencia de cada estado
+- Estado inicial reconstruido al comienzo del rango
+- Errores de BD e intervalo inválido
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from dominio.summary import DeviceStatus
+from services.energy_analytics_service import TRANSICION, EnergyAnalyticsService
+
+DESDE = datetime(2024, 11, 1)
+HASTA = DESDE + timedelta(days=1)
+HORA = 3600.0
+
+# Luz (tipo 1): 10 W encendida, 1 W en espera; Aire (tipo 11): 1000 W encendido
+POTENCIAS = [(1, 1, 10.0), (1, 3, 1.0), (11, 1, 1000.0)]
+
+
+@pytest.fixture
+def servicio():
+    """EnergyAnalyticsService con DAOs mockeados"""
+    servicio = EnergyAnalyticsService()
+    servicio.event_dao = Mock()
+    servicio.power_dao = Mock()
+    servicio.history_service = Mock()
+    servicio.power_dao.obtener_tipos.return_value = {1: 1, 2: 11}
+    servicio.power_dao.obtener_potencias.return_value = POTENCIAS
+    return servicio
+
+
+def historial(*filas):
+    """Arreglo de transiciones (device_id, segundos, state_id)"""
+    return np.array(list(filas), dtype=TRANSICION)
+
+
+class TestCalcular:
+    """Tests para el cálculo vectorizado"""
+
+    def test_tramos_y_consumo(self, servicio):
+        """Test: Cada estado dura hasta el siguiente cambio del mismo dispositivo"""
+        transiciones = historial(
+            (2, 0.0, 2), (1, 0.0, 1), (1, 6 * HORA, 3), (2, 12 * HORA, 1), (1, 18 * HORA, 2),
+        )
+
+        reporte = servicio.calcular(transiciones, {1: 1, 2: 11}, POTENCIAS, DESDE, HASTA)
+
+        assert list(reporte.device_ids) == [1, 2]
+        assert list(reporte.on_seconds) == [6 * HORA, 12 * HORA]
+        assert list(reporte.duty_cycles) == [0.25, 0.5]
+        # Luz: 6 h a 10 W + 12 h a 1 W; Aire: 12 h a 1000 W
+        assert reporte.kwh == pytest.approx([0.072, 12.0])
+        assert reporte.kwh_by_type == pytest.approx({1: 0.072, 11: 12.0})
+        assert reporte.total_kwh == pytest.approx(12.072)
+
+    def test_dispositivo_creado_dentro_del_rango(self, servicio):
+        """Test: El ciclo de trabajo se calcula sobre el tiempo observado"""
+        reporte = servicio.calcular(historial((1, 12 * HORA, 1)), {1: 1}, POTENCIAS, DESDE, HASTA)
+
+        assert list(reporte.observed_seconds) == [12 * HORA]
+        assert list(reporte.duty_cycles) == [1.0]
+
+    def test_tipo_o_estado_sin_potencia(self, servicio):
+        """Test: Dispositivos borrados o estados sin potencia no consumen"""
+        reporte = servicio.calcular(
+            historial((9, 0.0, 1), (1, 0.0, 7)), {1: 1}, POTENCIAS, DESDE, HASTA
+        )
+
+        assert list(reporte.device_type_ids) == [1, 0]
+        assert list(reporte.kwh) == [0.0, 0.0]
+
+    def test_historial_vacio(self, servicio):
+        """Test: Sin transiciones el reporte está vacío"""
+        reporte = servicio.calcular(historial(), {}, POTENCIAS, DESDE, HASTA)
+
+        assert len(reporte.device_ids) == 0
+        assert reporte.total_kwh == 0.0
+
+
+class TestConsumo:
+    """Tests para la carga del historial"""
+
+    def test_estado_inicial_mas_transiciones(self, servicio):
+        """Test: El estado al inicio del rango abre el primer tramo"""
+        servicio.history_service.estado_en.return_value = {
+            1: DeviceStatus(1, 1, "Encendido"), 2: DeviceStatus(2, 2, "Apagado"),
+        }
+        servicio.event_dao.iterar_transiciones.return_value = iter([(1, 12 * HORA, 2)])
+
+        reporte = servicio.consumo(DESDE, HASTA, device_id=1)
+
+        servicio.history_service.estado_en.assert_called_once_with(DESDE, None)
+        servicio.event_dao.iterar_transiciones.assert_called_once_with(DESDE, HASTA, 1, None)
+        assert list(reporte.device_ids) == [1]
+        assert reporte.kwh == pytest.approx([0.12])
+        assert reporte.transitions == 2
+
+    def test_error_bd(self, servicio):
+        """Test: Si no se pueden leer las potencias no se calcula"""
+        servicio.history_service.estado_en.return_value = {}
+        servicio.power_dao.obtener_potencias.return_value = None
+
+        assert servicio.consumo(DESDE, HASTA) is None
+
+    def test_intervalo_invalido(self, servicio):
+        """Test: 'hasta' debe ser posterior a 'desde'"""
+        assert servicio.consumo(HASTA, DESDE) is None
+        servicio.history_service.estado_en.assert_not_called()
@@ -0,0 +1,89 @@
+"""
+Tests para EventAnalyticsService (Analítica de eventos)
+
+Cubre:
+- Actualización incremental de rollups
+- Conteos por dispositivo y por hogar
+- Validación de granularidad
+"""
+
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from services.event_analytics_service import EventAnalyticsService
+
+
+@pytest.fixture
+def mock_rollup_dao():
+    """Mock del EventRollupDAO"""
+    return Mock()
+
+
+@pytest.fixture
+def analytics_service(mock_rollup_dao):
+    """EventAnalyticsService con DAO mockeado"""
+    service = EventAnalyticsService()
+    service.rollup_dao = mock_rollup_dao
+    return service
+
+
+class TestEventAnalyticsServiceRollups:
+    """Tests para la actualización de rollups"""
+
+    def test_actualizar_rollups_exitoso(self, analytics_service, mock_rollup_dao):
+        """Test: Procesar eventos nuevos desde el watermark"""
+        mock_rollup_dao.actualizar_rollups.return_value = 15
+
+        exito, mensaje = analytics_service.actualizar_rollups()
+
+        assert exito is True
+        assert "15" in mensaje
+
+    def test_actualizar_rollups_error(self, analytics_service, mock_rollup_dao):
+        """Test: Error de BD al actualizar rollups"""
+        mock_rollup_dao.actualizar_rollups.return_value = -1
+
+        exito, mensaje = analytics_service.actualizar_rollups()
+
+        assert exito is False
+        assert "error" in mensaje.lower()
+
+
+class TestEventAnalyticsServiceConsultas:
+    """Tests para las consultas de conteos"""
+
+    def test_eventos_por_dispositivo(self, analytics_service, mock_rollup_dao):
+        """Test: Conteos diarios de un dispositivo"""
+        desde, hasta = datetime(2024, 1, 1), datetime(2024, 12, 31)
+        mock_rollup_dao.obtener_conteos_dispositivo.return_value = [
+            {'bucket': datetime(2024, 11, 28), 'source': 'manual', 'total': 3}
+        ]
+
+        conteos = analytics_service.eventos_por_dispositivo(1, desde, hasta)
+
+        assert conteos[0]['total'] == 3
+        mock_rollup_dao.obtener_conteos_dispositivo.assert_called_once_with(
+            1, desde, hasta, 'dia', None
+        )
+
+    def test_eventos_por_hogar_sensor(self, analytics_service, mock_rollup_dao):
+        """Test: Disparos de sensores por hogar y hora"""
+        desde, hasta = datetime(2024, 11, 28), datetime(2024, 11, 29)
+        mock_rollup_dao.obtener_conteos_hogar.return_value = []
+
+        analytics_service.eventos_por_hogar(1, desde, hasta, 'hora', 'sensor')
+
+        mock_rollup_dao.obtener_conteos_hogar.assert_called_once_with(
+            1, desde, hasta, 'hora', 'sensor'
+        )
+
+    def test_granularidad_invalida(self, analytics_service, mock_rollup_dao):
+        """Test: Granularidad no soportada no consulta la BD"""
+        conteos = analytics_service.eventos_por_hogar(
+            1, datetime(2024, 1, 1), datetime(2024, 2, 1), 'semana'
+        )
+
+        assert conteos == []
+        mock_rollup_dao.obtener_conteos_hogar.assert_not_called()
@@ -0,0 +1,128 @@
+"""
+Tests para EventBus (Bus de publicación/suscripción)
+
+Cubre:
+- Entrega síncrona por tópico (clase de mensaje)
+- Entrega asíncrona en orden y con cola acotada
+- Aislamiento de errores entre suscriptores
+- Desuscripción
+"""
+
+import threading
+from datetime import datetime
+
+import pytest
+
+from dominio.messages import DeviceStateChanged
+from services.event_bus import ASINCRONO, EventBus
+
+
+def cambio(device_id: int, state_id: int = 1) -> DeviceStateChanged:
+    """Construye un mensaje de cambio de estado"""
+    return DeviceStateChanged(device_id, 1, state_id, "Encendido", None, datetime(2024, 1, 1))
+
+
+@pytest.fixture
+def bus():
+    """Bus nuevo (se descarta el singleton entre tests)"""
+    EventBus._instance = None
+    bus = EventBus()
+    yield bus
+    bus.cerrar()
+    EventBus._instance = None
+
+
+class TestEventBusSincrono:
+    """Tests para la entrega síncrona"""
+
+    def test_entrega_por_tipo(self, bus):
+        """Test: Solo reciben los suscriptores del tipo publicado"""
+        recibidos, otros = [], []
+        bus.suscribir(DeviceStateChanged, recibidos.append)
+        bus.suscribir(str, otros.append)
+
+        entregados = bus.publicar(cambio(1))
+
+        assert entregados == 1
+        assert recibidos == [cambio(1)]
+        assert otros == []
+
+    def test_suscripcion_a_clase_base(self, bus):
+        """Test: Suscribirse a una clase base recibe los subtipos"""
+        recibidos = []
+        bus.suscribir(tuple, recibidos.append)
+
+        bus.publicar(cambio(1))
+
+        assert len(recibidos) == 1
+
+    def test_error_en_suscriptor_no_afecta_a_otros(self, bus):
+        """Test: Un manejador que falla no corta la entrega"""
+        recibidos = []
+
+        def fallar(mensaje):
+            raise RuntimeError("boom")
+
+        bus.suscribir(DeviceStateChanged, fallar)
+        bus.suscribir(DeviceStateChanged, recibidos.append)
+
+        bus.publicar(cambio(1))
+
+        assert recibidos == [cambio(1)]
+
+    def test_desuscribir(self, bus):
+        """Test: Tras desuscribir no se reciben mensajes"""
+        recibidos = []
+        suscripcion = bus.suscribir(DeviceStateChanged, recibidos.append)
+
+        assert bus.desuscribir(suscripcion) is True
+        assert bus.desuscribir(suscripcion) is False
+        assert bus.publicar(cambio(1)) == 0
+        assert bus.tiene_suscriptores(DeviceStateChanged) is False
+
+    def test_modo_invalido(self, bus):
+        """Test: Un modo de entrega desconocido se rechaza"""
+        with pytest.raises(ValueError):
+            bus.suscribir(DeviceStateChanged, print, modo="otro")
+
+
+class TestEventBusAsincrono:
+    """Tests para la entrega en el pool de hilos"""
+
+    def test_entrega_en_orden_en_otro_hilo(self, bus):
+        """Test: Los mensajes llegan en orden y fuera del hilo que publica"""
+        recibidos, hilos = [], set()
+
+        def manejar(mensaje):
+            hilos.add(threading.get_ident())
+            recibidos.append(mensaje.device_id)
+
+        bus.suscribir(DeviceStateChanged, manejar, modo=ASINCRONO)
+        for device_id in range(50):
+            bus.publicar(cambio(device_id))
+
+        assert bus.esperar() is True
+        assert recibidos == list(range(50))
+        assert threading.get_ident() not in hilos
+
+    def test_cola_llena_descarta_el_mas_antiguo(self, bus):
+        """Test: Con la cola llena se conserva el mensaje más reciente"""
+        liberar = threading.Event()
+        recibidos = []
+
+        def manejar(mensaje):
+            liberar.wait(timeout=5)
+            recibidos.append(mensaje.device_id)
+
+        suscripcion = bus.suscribir(DeviceStateChanged, manejar, modo=ASINCRONO, capacidad=2)
+        bus.publicar(cambio(0))
+        # Esperar a que el primer mensaje salga de la cola y quede bloqueado
+        while suscripcion.pendientes() != 1:
+            pass
+        for device_id in range(1, 5):
+            bus.publicar(cambio(device_id))
+        liberar.set()
+
+        assert bus.esperar() is True
+        assert recibidos == [0, 3, 4]
+        assert suscripcion.descartados == 2
@@ -0,0 +1,149 @@
+"""
+Tests para EventRetentionService (Particiones y retención de eventos)
+
+Cubre:
+- Cálculo de meses
+- Pre-creación de particiones futuras
+- Detección de particiones vencidas
+- Archivado y eliminación de particiones
+"""
+
+import csv
+import gzip
+from datetime import date, datetime
+from unittest.mock import Mock
+
+import pytest
+
+from services.event_retention_service import EventRetentionService, sumar_meses
+
+
+@pytest.fixture
+def mock_partition_dao():
+    """Mock del EventPartitionDAO"""
+    dao = Mock()
+    dao.agregar_particion.return_value = True
+    dao.obtener_fecha_minima.return_value = None
+    dao.eliminar_particion.return_value = True
+    dao.iterar_filas_particion.return_value = iter([])
+    return dao
+
+
+@pytest.fixture
+def retention_service(mock_partition_dao, tmp_path):
+    """EventRetentionService con DAO mockeado y carpeta temporal"""
+    service = EventRetentionService(
+        meses_adelantados=2, meses_retencion=3, directorio_archivo=tmp_path
+    )
+    service.partition_dao = mock_partition_dao
+    return service
+
+
+class TestSumarMeses:
+    """Tests para el cálculo de meses"""
+
+    def test_sumar_meses_cruza_anio(self):
+        """Test: Sumar meses pasando al año siguiente"""
+        assert sumar_meses(date(2024, 11, 15), 3) == date(2025, 2, 1)
+
+    def test_restar_meses_cruza_anio(self):
+        """Test: Restar meses volviendo al año anterior"""
+        assert sumar_meses(date(2024, 2, 29), -3) == date(2023, 11, 1)
+
+
+class TestEventRetentionServiceCrear:
+    """Tests para pre-creación de particiones"""
+
+    def test_crear_particiones_sin_existentes(self, retention_service, mock_partition_dao):
+        """Test: Crear mes actual y meses adelantados"""
+        mock_partition_dao.obtener_particiones.return_value = []
+
+        creadas = retention_service.crear_particiones_futuras(date(2024, 11, 28))
+
+        assert creadas == ["p202411", "p202412", "p202501"]
+        mock_partition_dao.agregar_particion.assert_any_call("p202501", date(2025, 2, 1))
+
+    def test_crear_particiones_omite_existentes(self, retention_service, mock_partition_dao):
+        """Test: No recrear particiones que ya existen"""
+        mock_partition_dao.obtener_particiones.return_value = ["p202411", "p202412"]
+
+        creadas = retention_service.crear_particiones_futuras(date(2024, 11, 28))
+
+        assert creadas == ["p202501"]
+        assert mock_partition_dao.agregar_particion.call_count == 1
+
+    def test_crear_particiones_desde_el_evento_mas_antiguo(self, retention_service, mock_partition_dao):
+        """Test: Sin particiones, el historial se reparte por mes desde el evento más antiguo"""
+        mock_partition_dao.obtener_particiones.return_value = []
+        mock_partition_dao.obtener_fecha_minima.return_value = datetime(2024, 8, 15, 10, 30)
+
+        creadas = retention_service.crear_particiones_futuras(date(2024, 11, 28))
+
+        assert creadas == ["p202408", "p202409", "p202410", "p202411", "p202412", "p202501"]
+
+    def test_crear_particiones_completa_meses_faltantes(self, retention_service, mock_partition_dao):
+        """Test: Si el mantenimiento no corrió, se crean los meses intermedios"""
+        mock_partition_dao.obtener_particiones.return_value = ["p202408"]
+
+        creadas = retention_service.crear_particiones_futuras(date(2024, 11, 28))
+
+        assert creadas[:3] == ["p202409", "p202410", "p202411"]
+        mock_partition_dao.obtener_fecha_minima.assert_not_called()
+
+    def test_crear_particiones_se_detiene_ante_error(self, retention_service, mock_partition_dao):
+        """Test: Un fallo detiene la creación para no dejar huecos"""
+        mock_partition_dao.obtener_particiones.return_value = []
+        mock_partition_dao.agregar_particion.return_value = False
+
+        creadas = retention_service.crear_particiones_futuras(date(2024, 11, 28))
+
+        assert creadas == []
+        assert mock_partition_dao.agregar_particion.call_count == 1
+
+
+class TestEventRetentionServicePurgar:
+    """Tests para archivado y eliminación de particiones vencidas"""
+
+    def test_obtener_particiones_vencidas(self, retention_service, mock_partition_dao):
+        """Test: Solo vencen los meses anteriores al período de retención"""
+        mock_partition_dao.obtener_particiones.return_value = [
+            "p202407", "p202408", "p202409", "p202410", "p202411"
+        ]
+
+        vencidas = retention_service.obtener_particiones_vencidas(date(2024, 11, 28))
+
+        assert vencidas == ["p202407"]
+
+    def test_purgar_archiva_y_elimina(self, retention_service, mock_partition_dao, tmp_path):
+        """Test: La partición se exporta a gzip antes de eliminarse"""
+        mock_partition_dao.obtener_particiones.return_value = ["p202401", "p202411"]
+        mock_partition_dao.iterar_filas_particion.return_value = iter([
+            {
+                'id': 1,
+                'date_time_value': datetime(2024, 1, 5, 10, 0),
+                'description': 'Luz encendida',
+                'device_id': 1,
+                'user_email': None,
+                'source': 'manual',
+            }
+        ])
+
+        eliminadas = retention_service.purgar_particiones_vencidas(date(2024, 11, 28))
+
+        assert eliminadas == ["p202401"]
+        mock_partition_dao.eliminar_particion.assert_called_once_with("p202401")
+
+        with gzip.open(tmp_path / "event_p202401.csv.gz", "rt", encoding="utf-8") as f:
+            filas = list(csv.DictReader(f))
+        assert len(filas) == 1
+        assert filas[0]['description'] == 'Luz encendida'
+
+    def test_purgar_no_elimina_si_falla_archivo(self, retention_service, mock_partition_dao):
+        """Test: Sin archivo histórico no se elimina la partición"""
+        mock_partition_dao.obtener_particiones.return_value = ["p202401"]
+        mock_partition_dao.iterar_filas_particion.side_effect = Exception("Conexión perdida")
+
+        eliminadas = retention_service.purgar_particiones_vencidas(date(2024, 11, 28))
+
+        assert eliminadas == []
+        mock_partition_dao.eliminar_particion.assert_not_called()
@@ -0,0 +1,191 @@
+"""
+Tests para MembershipCache (Pertenencia de usuarios a hogares)
+
+Cubre:
+- Precarga y carga en la primera verificación
+- Verificación de hogares y dispositivos sin consultas a la BD
+- Asociar/desasociar (write-through y publicación en el bus)
+- Recargas concurrentes con cambios
+- Invalidación y desalojo al cerrar la última sesión
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from dominio.messages import MembershipChanged
+from dominio.summary import DeviceStatus
+from services.event_bus import EventBus
+from services.membership_cache import MembershipCache
+from services.session_store import SessionStore
+
+EMAIL = "user@test.com"
+
+
+@pytest.fixture
+def cache():
+    """MembershipCache nuevo con dependencias mockeadas"""
+    MembershipCache._instance = None
+    cache = MembershipCache()
+    cache.home_dao = Mock()
+    cache.home_dao.obtener_ids_hogares_usuario.return_value = [1, 2]
+    cache.state_store = Mock()
+    cache.event_bus = Mock()
+    yield cache
+    MembershipCache._instance = None
+
+
+class TestVerificacion:
+    """Tests para las verificaciones de permisos"""
+
+    def test_precarga_evita_consultas(self, cache):
+        """Test: Tras la precarga las verificaciones no consultan la BD"""
+        assert cache.cargar_usuario(EMAIL) is True
+        for _ in range(100):
+            assert cache.puede_acceder_hogar(EMAIL, 1)
+            assert not cache.puede_acceder_hogar(EMAIL, 3)
+
+        cache.home_dao.obtener_ids_hogares_usuario.assert_called_once_with(EMAIL)
+
+    def test_carga_en_primera_verificacion(self, cache):
+        """Test: Un usuario no precargado se carga una sola vez"""
+        assert cache.puede_acceder_hogar(EMAIL, 2)
+        assert cache.hogares_de(EMAIL) == {1, 2}
+
+        cache.home_dao.obtener_ids_hogares_usuario.assert_called_once()
+
+    def test_error_bd_deniega_y_no_cachea(self, cache):
+        """Test: Si falla la BD se deniega y se reintenta en la próxima verificación"""
+        cache.home_dao.obtener_ids_hogares_usuario.return_value = None
+
+        assert not cache.puede_acceder_hogar(EMAIL, 1)
+        assert not cache.puede_acceder_hogar(EMAIL, 1)
+        assert cache.home_dao.obtener_ids_hogares_usuario.call_count == 2
+
+    def test_dispositivo_por_hogar_en_memoria(self, cache):
+        """Test: El hogar del dispositivo sale del store de estados"""
+        cache.state_store.hogar_de.side_effect = {10: 1, 20: 3}.get
+
+        assert cache.puede_acceder_dispositivo(EMAIL, 10)
+        assert not cache.puede_acceder_dispositivo(EMAIL, 20)
+        cache.state_store.obtener.assert_not_called()
+
+    def test_dispositivo_fuera_del_store(self, cache):
+        """Test: Un dispositivo desconocido se busca en el store y si no existe se deniega"""
+        cache.state_store.hogar_de.return_value = None
+        cache.state_store.obtener.side_effect = {30: DeviceStatus(30, 1, "Encendido", 2)}.get
+
+        assert cache.puede_acceder_dispositivo(EMAIL, 30)
+        assert not cache.puede_acceder_dispositivo(EMAIL, 99)
+
+
+class TestCambios:
+    """Tests para cambios en user_home"""
+
+    def test_asociar_actualiza_y_publica(self, cache):
+        """Test: Asociar agrega el hogar al cache y avisa por el bus"""
+        cache.cargar_usuario(EMAIL)
+        cache.home_dao.asociar_usuario.return_value = True
+
+        exito, _ = cache.asociar(EMAIL, 5)
+
+        assert exito is True
+        assert cache.puede_acceder_hogar(EMAIL, 5)
+        cache.event_bus.publicar.assert_called_once_with(MembershipChanged(EMAIL, 5, True))
+        cache.home_dao.obtener_ids_hogares_usuario.assert_called_once()
+
+    def test_desasociar(self, cache):
+        """Test: Desasociar quita el permiso de inmediato"""
+        cache.cargar_usuario(EMAIL)
+        cache.home_dao.desasociar_usuario.return_value = True
+
+        cache.desasociar(EMAIL, 1)
+
+        assert not cache.puede_acceder_hogar(EMAIL, 1)
+        assert cache.puede_acceder_hogar(EMAIL, 2)
+
+    def test_fallo_bd_no_modifica(self, cache):
+        """Test: Si no se pudo escribir en la BD el cache no cambia"""
+        cache.cargar_usuario(EMAIL)
+        cache.home_dao.asociar_usuario.return_value = False
+
+        exito, _ = cache.asociar(EMAIL, 5)
+
+        assert exito is False
+        assert not cache.puede_acceder_hogar(EMAIL, 5)
+        cache.event_bus.publicar.assert_not_called()
+
+    def test_cambio_de_otro_proceso_por_bus(self, cache):
+        """Test: Un MembershipChanged publicado por otro se aplica al cache"""
+        cache.cargar_usuario(EMAIL)
+        bus = Mock()
+        cache.conectar(bus)
+        manejador = bus.suscribir.call_args[0][1]
+
+        manejador(MembershipChanged(EMAIL, 7, True))
+
+        assert cache.puede_acceder_hogar(EMAIL, 7)
+        cache.desconectar(bus)
+        bus.desuscribir.assert_called_once()
+
+    def test_conectado_aplica_una_vez(self, cache):
+        """Test: Conectado al bus, un cambio propio se aplica solo por la suscripción"""
+        EventBus._instance = None
+        bus = cache.event_bus = EventBus()
+        cache.cargar_usuario(EMAIL)
+        cache.conectar(bus)
+        cache.home_dao.asociar_usuario.return_value = True
+
+        with patch.object(cache, "aplicar", wraps=cache.aplicar) as aplicar:
+            # Se reconecta para que la suscripción use el método espiado
+            cache.conectar(bus)
+            cache.asociar(EMAIL, 5)
+
+        assert aplicar.call_count == 1
+        assert cache.puede_acceder_hogar(EMAIL, 5)
+        cache.desconectar(bus)
+        bus.cerrar()
+        EventBus._instance = None
+
+    def test_recarga_no_pisa_cambio_concurrente(self, cache):
+        """Test: Un cambio aplicado durante la lectura descarta la lectura anterior"""
+        lecturas = iter([[1, 2], [1, 2, 5]])
+
+        def leer(email):
+            ids = next(lecturas)
+            if ids == [1, 2]:
+                # Otro hilo asocia el hogar 5 mientras se consulta la BD
+                cache.aplicar(MembershipChanged(EMAIL, 5, True))
+            return ids
+
+        cache.home_dao.obtener_ids_hogares_usuario.side_effect = leer
+
+        assert cache.cargar_usuario(EMAIL) is True
+        assert cache.hogares_de(EMAIL) == {1, 2, 5}
+        assert cache.home_dao.obtener_ids_hogares_usuario.call_count == 2
+
+    def test_desalojo_al_cerrar_ultima_sesion(self, cache, usuario_standard):
+        """Test: Al cerrarse la última sesión del usuario sus hogares salen del cache"""
+        SessionStore._instance = None
+        sesiones = SessionStore()
+        sesiones.al_cerrar_ultima = cache.invalidar
+        cache.cargar_usuario(usuario_standard.email)
+        primera = sesiones.crear(usuario_standard)
+        segunda = sesiones.crear(usuario_standard)
+
+        sesiones.revocar(primera)
+        cache.hogares_de(usuario_standard.email)
+        sesiones.revocar(segunda)
+        cache.hogares_de(usuario_standard.email)
+
+        assert cache.home_dao.obtener_ids_hogares_usuario.call_count == 2
+        SessionStore._instance = None
+
+    def test_invalidar(self, cache):
+        """Test: Invalidar fuerza a recargar desde la BD"""
+        cache.cargar_usuario(EMAIL)
+        cache.home_dao.obtener_ids_hogares_usuario.return_value = [3]
+
+        cache.invalidar(EMAIL)
+
+        assert cache.hogares_de(EMAIL) == {3}
@@ -0,0 +1,219 @@
+"""
+Tests para RateLimiter (Limitación de solicitudes)
+
+Cubre:
+- Ráfaga inicial y reposición perezosa del balde
+- Niveles por rol y configuración inválida
+- Balde compartido por hogar
+- Descarte de baldes llenos
+- Rechazo sin acceso a la BD en DeviceService y AutomationService
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from services.automation_service import AutomationService
+from services.device_service import DeviceService
+from services.rate_limiter import RateLimiter, RateTier, establecer_actor
+from utils.exceptions import InvalidConfigException, RateLimitExceededException
+
+
+@pytest.fixture
+def limitador(reloj):
+    """RateLimiter nuevo con niveles fijos y reloj manual"""
+    RateLimiter._instance = None
+    limitador = RateLimiter()
+    limitador.niveles = {"admin": RateTier(10, 5), "standard": RateTier(1, 3)}
+    limitador.nivel_hogar = RateTier(2, 4)
+    limitador.reloj = reloj
+    yield limitador
+    RateLimiter._instance = None
+
+
+def agotar(limitador, email, rol="standard", home_id=None):
+    """Consume fichas hasta el primer rechazo y devuelve las aceptadas"""
+    aceptadas = 0
+    while True:
+        try:
+            limitador.consumir(email, rol, home_id)
+        except RateLimitExceededException as e:
+            return aceptadas, e
+        aceptadas += 1
+
+
+class TestTokenBucket:
+    """Tests para la ráfaga y la reposición"""
+
+    def test_rafaga_y_rechazo(self, limitador):
+        """Test: Se aceptan 'rafaga' solicitudes seguidas y luego se rechaza"""
+        aceptadas, error = agotar(limitador, "user@test.com")
+
+        assert aceptadas == 3
+        assert error.retry_after == pytest.approx(1.0)
+
+    def test_reposicion_perezosa(self, limitador, reloj):
+        """Test: Las fichas se reponen según el tiempo transcurrido"""
+        agotar(limitador, "user@test.com")
+
+        reloj.ahora += 2.5
+        aceptadas, _ = agotar(limitador, "user@test.com")
+
+        assert aceptadas == 2
+
+    def test_reposicion_no_supera_la_rafaga(self, limitador, reloj):
+        """Test: Un usuario inactivo no acumula más que la ráfaga"""
+        agotar(limitador, "user@test.com")
+
+        reloj.ahora += 3600
+        aceptadas, _ = agotar(limitador, "user@test.com")
+
+        assert aceptadas == 3
+
+    def test_usuarios_independientes(self, limitador):
+        """Test: Agotar un usuario no afecta a otro"""
+        agotar(limitador, "user@test.com")
+
+        limitador.consumir("otro@test.com", "standard")
+
+
+class TestNiveles:
+    """Tests para los niveles por rol"""
+
+    def test_nivel_por_rol(self, limitador):
+        """Test: Cada rol usa su propia ráfaga"""
+        assert agotar(limitador, "admin@test.com", rol="admin")[0] == 5
+
+    def test_rol_desconocido_usa_standard(self, limitador, monkeypatch):
+        """Test: Un rol sin nivel configurado usa el de 'standard'"""
+        monkeypatch.delenv("RATE_LIMIT_INVITADO", raising=False)
+
+        assert limitador.nivel_de("invitado") == RateTier(1, 3)
+
+    def test_rol_configurado_por_entorno(self, limitador, monkeypatch):
+        """Test: RATE_LIMIT_<ROL> define el nivel de un rol nuevo"""
+        monkeypatch.setenv("RATE_LIMIT_TECNICO", "2/8")
+
+        assert limitador.nivel_de("tecnico") == RateTier(2, 8)
+
+    @pytest.mark.parametrize("texto", ["5", "a/b", "0/10", "5/0"])
+    def test_configuracion_invalida(self, texto):
+        """Test: Formatos o valores inválidos se rechazan"""
+        with pytest.raises(InvalidConfigException):
+            RateTier.desde_texto("RATE_LIMIT_STANDARD", texto)
+
+
+class TestHogar:
+    """Tests para el balde compartido por hogar"""
+
+    def test_hogar_compartido(self, limitador):
+        """Test: Los usuarios de un hogar comparten su balde"""
+        assert agotar(limitador, "a@test.com", rol="admin", home_id=1)[0] == 4
+
+        with pytest.raises(RateLimitExceededException):
+            limitador.consumir("b@test.com", "admin", home_id=1)
+        limitador.consumir("b@test.com", "admin", home_id=2)
+
+    def test_rechazo_no_consume_otros_baldes(self, limitador, reloj):
+        """Test: Si el hogar rechaza, la ficha del usuario no se descuenta"""
+        agotar(limitador, "a@test.com", rol="admin", home_id=1)
+        for _ in range(10):
+            with pytest.raises(RateLimitExceededException):
+                limitador.consumir("b@test.com", "standard", home_id=1)
+
+        assert agotar(limitador, "b@test.com")[0] == 3
+
+
+class TestBarrido:
+    """Tests para el descarte de baldes llenos"""
+
+    def test_descarta_baldes_llenos(self, limitador, reloj):
+        """Test: Los baldes que recuperaron la ráfaga se descartan en el barrido"""
+        for i in range(50):
+            limitador.consumir(f"user{i}@test.com", "standard", home_id=i)
+        assert limitador.cantidad_baldes() == 100
+
+        reloj.ahora += RateLimiter.INTERVALO_BARRIDO
+        limitador.consumir("otro@test.com", "standard")
+
+        assert limitador.cantidad_baldes() == 1
+
+    def test_conserva_baldes_sin_reponer(self, limitador, reloj):
+        """Test: Un balde que aún no se repuso sigue limitando tras el barrido"""
+        limitador.INTERVALO_BARRIDO = 1.0
+        agotar(limitador, "user@test.com")
+
+        reloj.ahora += 1.0
+        aceptadas, _ = agotar(limitador, "user@test.com")
+
+        assert aceptadas == 1
+        assert limitador.cantidad_baldes() == 1
+
+
+class TestServicios:
+    """Tests de integración con los servicios"""
+
+    def test_sin_actor_no_limita(self, limitador):
+        """Test: Procesos del sistema (sin usuario) no se limitan"""
+        for _ in range(100):
+            limitador.verificar(home_id=1)
+
+    def test_dispositivo_rechazado_sin_bd(self, limitador):
+        """Test: Al superar el límite DeviceService no consulta la BD"""
+        servicio = DeviceService()
+        servicio.device_dao = Mock()
+        servicio.state_store = Mock()
+        servicio.state_store.hogar_de.return_value = 7
+        servicio.rate_limiter = limitador
+        establecer_actor("user@test.com", "standard")
+        agotar(limitador, "user@test.com")
+
+        exito, mensaje = servicio.cambiar_estado_dispositivo(1, 2)
+
+        assert exito is False
+        assert "Demasiadas solicitudes" in mensaje
+        servicio.device_dao.obtener_por_id.assert_not_called()
+
+    def test_automatizacion_rechazada_sin_bd(self, limitador):
+        """Test: Al superar el límite AutomationService no consulta la BD"""
+        servicio = AutomationService()
+        servicio.automation_dao = Mock()
+        servicio.hogares = Mock()
+        servicio.hogares.hogar_de.return_value = 7
+        servicio.rate_limiter = limitador
+        establecer_actor("user@test.com", "standard")
+        agotar(limitador, "user@test.com")
+
+        exito, _ = servicio.activar_automatizacion(1)
+
+        assert exito is False
+        servicio.automation_dao.obtener_por_id.assert_not_called()
+
+    def test_automatizacion_limitada_por_hogar(self, limitador):
+        """Test: Las escrituras de automatizaciones consumen el balde de su hogar"""
+        servicio = AutomationService()
+        servicio.automation_dao = Mock()
+        servicio.automation_dao.obtener_por_id.return_value = None
+        servicio.hogares = Mock()
+        servicio.hogares.hogar_de.return_value = 7
+        servicio.rate_limiter = limitador
+        agotar(limitador, "otro@test.com", rol="admin", home_id=7)
+        establecer_actor("user@test.com", "standard")
+
+        exito, mensaje = servicio.eliminar_automatizacion(1)
+
+        assert exito is False
+        assert "Demasiadas solicitudes" in mensaje
+        servicio.hogares.hogar_de.assert_called_once_with(1)
+        servicio.automation_dao.obtener_por_id.assert_not_called()
+
+    def test_id_invalido_no_crea_baldes(self, limitador):
+        """Test: Un home_id inválido se rechaza antes de consumir fichas"""
+        servicio = DeviceService()
+        servicio.rate_limiter = limitador
+        establecer_actor("user@test.com", "standard")
+
+        exito, _ = servicio.crear_dispositivo("Lámpara", -5, 1, 1, 1)
+
+        assert exito is False
+        assert limitador.cantidad_baldes() == 0
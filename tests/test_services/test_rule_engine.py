@@ -0,0 +1,171 @@
+"""
+Tests para RuleEngine (Motor de reglas de automatizaciones)
+
+Cubre:
+- Índice por disparador (exacto y comodín)
+- Evaluación solo de las reglas coincidentes
+- Ejecutor por defecto (estados destino y corte de ciclos)
+- Recarga de reglas y construcción desde la BD
+"""
+
+from datetime import datetime, time, timedelta
+from unittest.mock import MagicMock, Mock, call, patch
+
+import pytest
+
+from dao.automation_rule_dao import AutomationRuleDAO
+from dominio.automation_rule import (
+    TRIGGER_DEVICE_STATE,
+    TRIGGER_EVENT_SOURCE,
+    TRIGGER_TIME,
+    AutomationAction,
+    AutomationRule,
+    Trigger,
+)
+from dominio.messages import ClockTick, DeviceStateChanged, EventOccurred
+from services.rule_engine import RuleEngine
+
+AHORA = datetime(2024, 11, 28, 23, 0)
+
+
+def regla(automation_id, *triggers, acciones=()):
+    """Construye una regla de prueba"""
+    return AutomationRule(automation_id, f"Regla {automation_id}", 1, tuple(triggers), tuple(acciones))
+
+
+def cambio_estado(device_id, state_id):
+    """Construye un mensaje de cambio de estado"""
+    return DeviceStateChanged(device_id, 1, state_id, "Encendido", None, AHORA)
+
+
+@pytest.fixture
+def motor():
+    """RuleEngine con ejecutor y dependencias mockeadas"""
+    motor = RuleEngine(ejecutor=Mock())
+    motor.rule_dao = Mock()
+    motor.coalescer = Mock()
+    return motor
+
+
+class TestRuleEngineIndice:
+    """Tests para el índice de reglas"""
+
+    def test_estado_exacto_y_comodin(self, motor):
+        """Test: Un cambio de estado dispara las reglas del estado y las de cualquier estado"""
+        motor.registrar(regla(1, Trigger(1, 1, TRIGGER_DEVICE_STATE, device_id=5, state_id=2)))
+        motor.registrar(regla(2, Trigger(2, 2, TRIGGER_DEVICE_STATE, device_id=5)))
+        motor.registrar(regla(3, Trigger(3, 3, TRIGGER_DEVICE_STATE, device_id=6, state_id=2)))
+
+        ids = {r.automation_id for r in motor.reglas_para(cambio_estado(5, 2))}
+
+        assert ids == {1, 2}
+        assert [r.automation_id for r in motor.reglas_para(cambio_estado(5, 1))] == [2]
+
+    def test_origen_de_evento(self, motor):
+        """Test: Disparadores por origen con y sin dispositivo"""
+        motor.registrar(regla(1, Trigger(1, 1, TRIGGER_EVENT_SOURCE, device_id=8, source="sensor")))
+        motor.registrar(regla(2, Trigger(2, 2, TRIGGER_EVENT_SOURCE, source="sensor")))
+
+        evento = EventOccurred(8, "sensor", "Humo detectado", AHORA)
+        otro = EventOccurred(5, "manual", "Encendido", AHORA)
+
+        assert {r.automation_id for r in motor.reglas_para(evento)} == {1, 2}
+        assert motor.reglas_para(otro) == []
+
+    def test_horario(self, motor):
+        """Test: Los disparadores horarios coinciden por hora y minuto"""
+        motor.registrar(regla(1, Trigger(1, 1, TRIGGER_TIME, time_of_day=time(23, 0))))
+
+        assert len(motor.reglas_para(ClockTick(AHORA))) == 1
+        assert motor.reglas_para(ClockTick(AHORA + timedelta(minutes=1))) == []
+
+    def test_regla_con_varios_disparadores_no_se_repite(self, motor):
+        """Test: Una regla que coincide por dos claves se evalúa una vez"""
+        motor.registrar(regla(
+            1,
+            Trigger(1, 1, TRIGGER_DEVICE_STATE, device_id=5, state_id=2),
+            Trigger(2, 1, TRIGGER_DEVICE_STATE, device_id=5),
+        ))
+
+        assert len(motor.reglas_para(cambio_estado(5, 2))) == 1
+
+    def test_quitar_limpia_el_indice(self, motor):
+        """Test: Una regla quitada deja de dispararse"""
+        motor.registrar(regla(1, Trigger(1, 1, TRIGGER_DEVICE_STATE, device_id=5)))
+
+        assert motor.quitar(1) is True
+        assert motor.quitar(1) is False
+        assert motor.reglas_para(cambio_estado(5, 2)) == []
+        assert motor.cantidad_reglas() == 0
+
+    def test_recargar_desactivada(self, motor):
+        """Test: Al recargar una automatización desactivada sale del índice"""
+        motor.registrar(regla(1, Trigger(1, 1, TRIGGER_DEVICE_STATE, device_id=5)))
+        motor.rule_dao.obtener_reglas.return_value = []
+
+        assert motor.recargar(1) is False
+        assert motor.cantidad_reglas() == 0
+
+
+class TestRuleEngineEjecucion:
+    """Tests para la ejecución de reglas"""
+
+    def test_procesar_ejecuta_solo_coincidentes(self, motor):
+        """Test: Solo se ejecutan las reglas del evento"""
+        motor.registrar(regla(1, Trigger(1, 1, TRIGGER_DEVICE_STATE, device_id=5)))
+        motor.registrar(regla(2, Trigger(2, 2, TRIGGER_DEVICE_STATE, device_id=6)))
+
+        assert motor.procesar(cambio_estado(5, 2)) == [1]
+        motor.ejecutor.assert_called_once()
+
+    def test_error_en_regla_no_corta_las_demas(self, motor):
+        """Test: Una regla que falla no impide ejecutar las otras"""
+        motor.registrar(regla(1, Trigger(1, 1, TRIGGER_DEVICE_STATE, device_id=5)))
+        motor.registrar(regla(2, Trigger(2, 2, TRIGGER_DEVICE_STATE, device_id=5)))
+        motor.ejecutor.side_effect = [RuntimeError("boom"), None]
+
+        assert motor.procesar(cambio_estado(5, 2)) == [2]
+
+    def test_aplicar_acciones_usa_coalescer(self, motor):
+        """Test: Las acciones con estado destino se envían al coalescedor"""
+        r = regla(1, acciones=[
+            AutomationAction(1, "Apagar", 2),
+            AutomationAction(2, "Apagar", 2),
+            AutomationAction(3, "Ajustar a 22°C", None),
+        ])
+
+        motor.aplicar_acciones(r, ClockTick(AHORA))
+
+        assert motor.coalescer.solicitar.call_args_list == [
+            call(1, 2, origen="automatización"),
+            call(2, 2, origen="automatización"),
+        ]
+
+
+class TestAutomationRuleDAO:
+    """Tests para la construcción de reglas desde la BD"""
+
+    def test_agrupa_disparadores_y_acciones(self):
+        """Test: Dos consultas construyen las reglas con sus acciones"""
+        dao = AutomationRuleDAO()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.side_effect = [
+            [
+                {'id': 1, 'automation_id': 1, 'trigger_type': TRIGGER_TIME, 'device_id': None,
+                 'state_id': None, 'source': None, 'time_of_day': timedelta(hours=23),
+                 'name': 'Modo Noche', 'home_id': 1},
+                {'id': 2, 'automation_id': 1, 'trigger_type': TRIGGER_EVENT_SOURCE,
+                 'device_id': 5, 'state_id': None, 'source': 'sensor', 'time_of_day': None,
+                 'name': 'Modo Noche', 'home_id': 1},
+            ],
+            [{'automation_id': 1, 'device_id': 1, 'action': 'Apagar', 'state_id': 2}],
+        ]
+
+        with patch.object(dao.db, "get_cursor", return_value=mock_cursor):
+            reglas = dao.obtener_reglas()
+
+        assert mock_cursor.execute.call_count == 2
+        assert len(reglas) == 1
+        assert [t.id for t in reglas[0].triggers] == [1, 2]
+        assert reglas[0].triggers[0].time_of_day == time(23, 0)
+        assert reglas[0].actions == (AutomationAction(1, 'Apagar', 2),)
@@ -0,0 +1,198 @@
+"""
+Tests para Scheduler (Planificador sobre rueda de temporizadores)
+
+Cubre:
+- Expresiones cron
+- Rueda de temporizadores (vencimiento, vueltas y cancelación)
+- Tareas recurrentes y únicas
+- Persistencia de la próxima ejecución y recuperación tras reinicio
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from services.scheduler import Scheduler, TimerWheel
+from utils.cron import CronExpression
+
+INICIO = datetime(2024, 11, 28, 22, 58, 30)
+
+
+@pytest.fixture
+def reloj(reloj):
+    """Reloj manual (tests/conftest.py) detenido en INICIO"""
+    reloj.ahora = INICIO
+    return reloj
+
+
+@pytest.fixture
+def mock_job_dao():
+    """Mock del ScheduledJobDAO sin ejecuciones persistidas"""
+    dao = Mock()
+    dao.obtener_proximas.return_value = {}
+    return dao
+
+
+@pytest.fixture
+def planificador(reloj, mock_job_dao):
+    """Scheduler con reloj controlable y DAO mockeado"""
+    scheduler = Scheduler(reloj=reloj)
+    scheduler.job_dao = mock_job_dao
+    return scheduler
+
+
+class TestCronExpression:
+    """Tests para el cálculo de la próxima ejecución"""
+
+    def test_diaria(self):
+        """Test: '0 23 * * *' ejecuta a las 23:00"""
+        cron = CronExpression("0 23 * * *")
+
+        assert cron.siguiente(INICIO) == datetime(2024, 11, 28, 23, 0)
+        assert cron.siguiente(datetime(2024, 11, 28, 23, 0)) == datetime(2024, 11, 29, 23, 0)
+
+    def test_pasos_listas_y_rangos(self):
+        """Test: Pasos, listas y rangos combinados"""
+        cron = CronExpression("*/15 8-9,18 * * *")
+
+        assert cron.siguiente(datetime(2024, 11, 28, 9, 50)) == datetime(2024, 11, 28, 18, 0)
+        assert cron.siguiente(datetime(2024, 11, 28, 8, 0)) == datetime(2024, 11, 28, 8, 15)
+
+    def test_dia_de_la_semana(self):
+        """Test: 1-5 son días hábiles (28/11/2024 es jueves)"""
+        cron = CronExpression("0 9 * * 1-5")
+
+        assert cron.siguiente(datetime(2024, 11, 29, 10, 0)) == datetime(2024, 12, 2, 9, 0)
+
+    def test_cambio_de_anio(self):
+        """Test: Avanza de mes y de año"""
+        cron = CronExpression("0 0 1 1 *")
+
+        assert cron.siguiente(INICIO) == datetime(2025, 1, 1, 0, 0)
+
+    @pytest.mark.parametrize("expresion", ["* * *", "60 * * * *", "5-1 * * * *", "a * * * *"])
+    def test_expresion_invalida(self, expresion):
+        """Test: Las expresiones inválidas se rechazan"""
+        with pytest.raises(ValueError):
+            CronExpression(expresion)
+
+
+class TestTimerWheel:
+    """Tests para la rueda de temporizadores"""
+
+    def test_vence_en_su_tick_aunque_de_vueltas(self):
+        """Test: Un temporizador más lejano que una vuelta vence en su tick"""
+        rueda = TimerWheel(ranuras=8)
+        rueda.agregar(3, "a")
+        rueda.agregar(11, "b")  # misma ranura que 'a', una vuelta después
+
+        assert rueda.avanzar_hasta(3) == ["a"]
+        assert rueda.avanzar_hasta(10) == []
+        assert rueda.avanzar_hasta(11) == ["b"]
+
+    def test_salto_grande_devuelve_en_orden(self):
+        """Test: Avanzar varias vueltas de una vez devuelve todo en orden"""
+        rueda = TimerWheel(ranuras=4)
+        for tick in (9, 2, 6):
+            rueda.agregar(tick, tick)
+
+        assert rueda.avanzar_hasta(100) == [2, 6, 9]
+
+    def test_cancelar(self):
+        """Test: Un temporizador cancelado no vence"""
+        rueda = TimerWheel(ranuras=8)
+        entrada = rueda.agregar(2, "a")
+        TimerWheel.cancelar(entrada)
+
+        assert rueda.avanzar_hasta(2) == []
+
+
+class TestScheduler:
+    """Tests para la programación y ejecución de tareas"""
+
+    def test_tarea_cron_se_ejecuta_y_reprograma(self, planificador, reloj, mock_job_dao):
+        """Test: Se ejecuta en su minuto y persiste la próxima ejecución"""
+        accion = Mock()
+        proxima = planificador.programar_cron("noche", "0 23 * * *", accion)
+        assert proxima == datetime(2024, 11, 28, 23, 0)
+
+        assert planificador.procesar(datetime(2024, 11, 28, 22, 59, 59)) == 0
+        assert planificador.procesar(datetime(2024, 11, 28, 23, 0, 0)) == 1
+
+        accion.assert_called_once_with(datetime(2024, 11, 28, 23, 0))
+        assert planificador.proxima_ejecucion("noche") == datetime(2024, 11, 29, 23, 0)
+        mock_job_dao.guardar.assert_called_with("noche", datetime(2024, 11, 29, 23, 0))
+
+    def test_tarea_unica(self, planificador, mock_job_dao):
+        """Test: Una tarea única se ejecuta una vez y se elimina"""
+        accion = Mock()
+        planificador.programar_una_vez("recordatorio", INICIO + timedelta(seconds=10), accion)
+
+        planificador.procesar(INICIO + timedelta(seconds=10))
+        planificador.procesar(INICIO + timedelta(days=1))
+
+        accion.assert_called_once()
+        assert planificador.proxima_ejecucion("recordatorio") is None
+        mock_job_dao.eliminar.assert_called_once_with("recordatorio")
+
+    def test_cancelar(self, planificador):
+        """Test: Una tarea cancelada no se ejecuta"""
+        accion = Mock()
+        planificador.programar_cron("noche", "0 23 * * *", accion)
+
+        assert planificador.cancelar("noche") is True
+        planificador.procesar(datetime(2024, 11, 29, 0, 0))
+
+        accion.assert_not_called()
+
+    def test_error_en_tarea_no_la_desprograma(self, planificador):
+        """Test: Si la acción falla la tarea sigue programada"""
+        planificador.programar_cron("falla", "* * * * *", Mock(side_effect=RuntimeError("boom")))
+
+        assert planificador.procesar(INICIO + timedelta(minutes=1)) == 1
+        assert planificador.proxima_ejecucion("falla") is not None
+
+
+class TestSchedulerRecuperacion:
+    """Tests para la recuperación de ejecuciones perdidas"""
+
+    def test_recupera_ejecuciones_perdidas(self, planificador, mock_job_dao):
+        """Test: Tras un reinicio se ejecutan los minutos perdidos"""
+        mock_job_dao.obtener_proximas.return_value = {"reloj": INICIO - timedelta(minutes=3, seconds=30)}
+        accion = Mock()
+        planificador.programar_cron("reloj", "* * * * *", accion)
+
+        planificador.procesar(INICIO + timedelta(seconds=1))
+
+        assert accion.call_count == 4
+        assert planificador.proxima_ejecucion("reloj") == datetime(2024, 11, 28, 22, 59)
+
+    def test_limite_de_recuperaciones(self, planificador, mock_job_dao):
+        """Test: Solo se recuperan las últimas max_recuperaciones ejecuciones"""
+        mock_job_dao.obtener_proximas.return_value = {"reloj": INICIO - timedelta(hours=2)}
+        accion = Mock()
+        planificador.programar_cron("reloj", "* * * * *", accion, max_recuperaciones=5)
+
+        planificador.procesar(INICIO + timedelta(seconds=1))
+
+        assert accion.call_count == 5
+        assert accion.call_args[0][0] == datetime(2024, 11, 28, 22, 58)
+
+    def test_sin_recuperacion_omite_atrasadas(self, planificador, mock_job_dao):
+        """Test: Con recuperar=False las ejecuciones vencidas se saltan"""
+        mock_job_dao.obtener_proximas.return_value = {"noche": datetime(2024, 11, 27, 23, 0)}
+        accion = Mock()
+        planificador.programar_cron("noche", "0 23 * * *", accion, recuperar=False)
+
+        planificador.procesar(INICIO + timedelta(seconds=1))
+
+        accion.assert_not_called()
+        assert planificador.proxima_ejecucion("noche") == datetime(2024, 11, 28, 23, 0)
+
+    def test_una_sola_consulta_de_persistidas(self, planificador, mock_job_dao):
+        """Test: Las ejecuciones persistidas se leen una vez para todas las tareas"""
+        planificador.programar_cron("a", "0 23 * * *", Mock())
+        planificador.programar_cron("b", "0 7 * * *", Mock())
+
+        mock_job_dao.obtener_proximas.assert_called_once()
@@ -0,0 +1,195 @@
+"""
+Tests para SessionStore (Sesiones en memoria)
+
+Cubre:
+- Emisión y validación de tokens
+- Vencimiento deslizante y purga de sesiones vencidas
+- Límite de sesiones y revocación
+- Sesiones por token en AuthService
+"""
+
+import pytest
+
+from services.rate_limiter import actor_actual
+from services.session_store import SessionStore
+
+
+@pytest.fixture
+def store(reloj):
+    """SessionStore nuevo con TTL de 60 s y reloj manual"""
+    SessionStore._instance = None
+    store = SessionStore()
+    store.ttl_segundos = 60
+    store.maximo = 3
+    store.reloj = reloj
+    yield store
+    SessionStore._instance = None
+
+
+class TestTokens:
+    """Tests para emisión y validación"""
+
+    def test_crear_y_validar(self, store, usuario_standard):
+        """Test: Un token recién emitido identifica al usuario"""
+        token = store.crear(usuario_standard)
+
+        assert store.validar(token) is usuario_standard
+
+    def test_tokens_distintos(self, store, usuario_standard):
+        """Test: Cada sesión tiene su propio token"""
+        assert store.crear(usuario_standard) != store.crear(usuario_standard)
+
+    def test_token_desconocido(self, store):
+        """Test: Un token inexistente o vacío no es válido"""
+        assert store.validar("inexistente") is None
+        assert store.validar(None) is None
+
+
+class TestVencimiento:
+    """Tests para el vencimiento deslizante"""
+
+    def test_sesion_vencida(self, store, reloj, usuario_standard):
+        """Test: Pasado el TTL sin uso el token deja de ser válido"""
+        token = store.crear(usuario_standard)
+
+        reloj.ahora += 61
+
+        assert store.validar(token) is None
+        assert store.activas() == 0
+
+    def test_uso_renueva_vencimiento(self, store, reloj, usuario_standard):
+        """Test: Cada validación extiende la sesión otro TTL"""
+        token = store.crear(usuario_standard)
+        for _ in range(5):
+            reloj.ahora += 50
+            assert store.validar(token) is usuario_standard
+
+    def test_purga_solo_vencidas(self, store, reloj, usuario_standard, usuario_admin):
+        """Test: La purga elimina las vencidas y conserva las vigentes"""
+        vieja = store.crear(usuario_standard)
+        reloj.ahora += 40
+        nueva = store.crear(usuario_admin)
+        reloj.ahora += 30
+
+        assert store.purgar() == 1
+        assert store.validar(vieja) is None
+        assert store.validar(nueva) is usuario_admin
+
+    def test_aviso_al_vencer_la_ultima_sesion(self, store, reloj, usuario_standard):
+        """Test: Se avisa cuando un usuario se queda sin sesiones (no antes)"""
+        cerradas = []
+        store.al_cerrar_ultima = cerradas.append
+        store.crear(usuario_standard)
+        reloj.ahora += 30
+        store.crear(usuario_standard)
+        reloj.ahora += 40
+
+        store.purgar()
+        assert cerradas == []
+        reloj.ahora += 60
+        store.purgar()
+        assert cerradas == [usuario_standard.email]
+
+
+class TestLimiteYRevocacion:
+    """Tests para el límite de sesiones y la revocación"""
+
+    def test_limite_descarta_la_menos_usada(self, store, usuario_standard):
+        """Test: Al superar el máximo se descarta la sesión usada hace más tiempo"""
+        tokens = [store.crear(usuario_standard) for _ in range(3)]
+        store.validar(tokens[0])
+
+        store.crear(usuario_standard)
+
+        assert store.activas() == 3
+        assert store.validar(tokens[1]) is None
+        assert store.validar(tokens[0]) is usuario_standard
+
+    def test_revocar(self, store, usuario_standard):
+        """Test: Una sesión revocada deja de ser válida"""
+        token = store.crear(usuario_standard)
+
+        assert store.revocar(token) is usuario_standard
+        assert store.validar(token) is None
+        assert store.revocar(token) is None
+
+    def test_revocar_usuario(self, store, usuario_standard, usuario_admin):
+        """Test: Se cierran todas las sesiones de un usuario y solo esas"""
+        store.crear(usuario_standard)
+        store.crear(usuario_standard)
+        admin = store.crear(usuario_admin)
+
+        assert store.revocar_usuario(usuario_standard.email) == 2
+        assert store.activas() == 1
+        assert store.validar(admin) is usuario_admin
+
+
+class TestAuthServiceSesiones:
+    """Tests de las sesiones por token en AuthService"""
+
+    def test_login_emite_token(self, store, mock_auth_service, mock_user_dao, usuario_standard):
+        """Test: El login abre una sesión validable sin la BD"""
+        mock_auth_service.session_store = store
+        mock_user_dao.validar_credenciales.return_value = usuario_standard
+
+        mock_auth_service.iniciar_sesion("user@test.com", "user123")
+        token = mock_auth_service.obtener_token()
+        mock_user_dao.reset_mock()
+
+        assert mock_auth_service.validar_sesion(token) is usuario_standard
+        assert actor_actual() == ("user@test.com", "standard")
+        assert not mock_user_dao.method_calls
+
+    def test_varias_sesiones_independientes(self, store, mock_auth_service, usuario_standard, usuario_admin):
+        """Test: Cerrar una sesión por token no afecta a las demás"""
+        mock_auth_service.session_store = store
+        token_a = store.crear(usuario_standard)
+        token_b = store.crear(usuario_admin)
+
+        mock_auth_service.cerrar_sesion(token_a)
+
+        assert mock_auth_service.validar_sesion(token_a) is None
+        assert mock_auth_service.validar_sesion(token_b) is usuario_admin
+
+    def test_cambio_de_rol_revoca_sesiones(
+        self, store, mock_auth_service, mock_user_dao, mock_role_dao, usuario_standard, role_admin
+    ):
+        """Test: Cambiar el rol obliga a iniciar sesión otra vez"""
+        mock_auth_service.session_store = store
+        token = store.crear(usuario_standard)
+        mock_user_dao.obtener_por_email.return_value = usuario_standard
+        mock_role_dao.obtener_por_id.return_value = role_admin
+        mock_user_dao.cambiar_rol.return_value = True
+
+        mock_auth_service.cambiar_rol_usuario("user@test.com", 1)
+
+        assert mock_auth_service.validar_sesion(token) is None
+
+    def test_token_invalido_quita_el_actor(self, store, mock_auth_service, usuario_standard):
+        """Test: Validar un token vencido deja el contexto sin usuario"""
+        mock_auth_service.session_store = store
+        token = store.crear(usuario_standard)
+        mock_auth_service.validar_sesion(token)
+        store.revocar(token)
+
+        assert mock_auth_service.validar_sesion(token) is None
+        assert actor_actual() is None
+
+    def test_cambio_del_propio_rol(
+        self, store, mock_auth_service, mock_user_dao, mock_role_dao, usuario_standard, role_admin
+    ):
+        """Test: Quien cambia su propio rol sigue en sesión con el rol nuevo"""
+        mock_auth_service.session_store = store
+        mock_user_dao.validar_credenciales.return_value = usuario_standard
+        mock_auth_service.iniciar_sesion("user@test.com", "user123")
+        token_anterior = mock_auth_service.obtener_token()
+        mock_user_dao.obtener_por_email.return_value = usuario_standard
+        mock_role_dao.obtener_por_id.return_value = role_admin
+        mock_user_dao.cambiar_rol.return_value = True
+
+        mock_auth_service.cambiar_rol_usuario("user@test.com", 1)
+
+        assert mock_auth_service.validar_sesion(token_anterior) is None
+        assert mock_auth_service.obtener_usuario_actual().role is role_admin
+        assert mock_auth_service.validar_sesion(mock_auth_service.obtener_token()) is not None
+        assert actor_actual() == ("user@test.com", role_admin.name)
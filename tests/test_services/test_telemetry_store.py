@@ -0,0 +1,231 @@
+"""
+Tests para TelemetryStore (Telemetría numérica)
+
+Cubre:
+- Validación de lecturas y buffer circular de lecturas recientes
+- Lecturas repetidas y normalización a milisegundos
+- Volcado por lotes y reintento tras un error de BD
+- Consultas por rango combinando BD, lecturas pendientes y en vuelo
+"""
+
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from services.telemetry_store import TelemetryStore, inicio_bucket
+from utils import arrays
+
+INICIO = datetime(2024, 11, 28, 22, 0, 0)
+
+
+@pytest.fixture
+def store():
+    """TelemetryStore nuevo con DAO mockeado"""
+    TelemetryStore._instance = None
+    store = TelemetryStore()
+    store.telemetry_dao = Mock()
+    store.telemetry_dao.guardar.return_value = True
+    store.capacidad = 3
+    yield store
+    TelemetryStore._instance = None
+
+
+class TestRegistro:
+    """Tests para el registro de lecturas"""
+
+    @pytest.mark.parametrize("valor", ["abc", None, float("nan"), float("inf")])
+    def test_lectura_invalida(self, store, valor):
+        """Test: Valores no numéricos o no finitos se descartan"""
+        assert store.registrar(1, "temperatura", valor, INICIO) is False
+        assert store.pendientes() == 0
+
+    def test_buffer_circular(self, store):
+        """Test: Solo se conservan las últimas 'capacidad' lecturas"""
+        for i in range(5):
+            store.registrar(1, "temperatura", 20 + i, INICIO + timedelta(seconds=i))
+
+        serie = store.recientes(1, "temperatura")
+
+        assert list(serie.values) == [22.0, 23.0, 24.0]
+        assert list(serie.timestamps)[0] == (INICIO + timedelta(seconds=2)).timestamp()
+        assert list(store.recientes(1, "temperatura", cantidad=1).values) == [24.0]
+        assert len(store.recientes(2, "humedad").values) == 0
+
+    def test_lote_completo_se_vuelca(self, store):
+        """Test: Al completar un lote se escribe sin esperar al volcado periódico"""
+        store.tamano_lote = 2
+        store.registrar(1, "energia", 1.5, INICIO)
+        store.registrar(1, "energia", 2.5, INICIO + timedelta(seconds=1))
+
+        store.telemetry_dao.guardar.assert_called_once()
+        assert store.pendientes() == 0
+
+
+class TestVolcado:
+    """Tests para la escritura por lotes"""
+
+    def test_volcado_por_lote(self, store):
+        """Test: Las lecturas pendientes se escriben juntas"""
+        store.registrar(1, "temperatura", 20, INICIO + timedelta(seconds=10))
+        store.registrar(1, "temperatura", 24, INICIO + timedelta(seconds=50))
+        store.registrar(1, "temperatura", 18, INICIO + timedelta(minutes=5))
+
+        exito, _ = store.volcar()
+
+        (muestras,) = store.telemetry_dao.guardar.call_args[0]
+        assert exito is True
+        assert [m[3] for m in muestras] == [20.0, 24.0, 18.0]
+        assert store.pendientes() == 0
+
+    def test_lectura_repetida_reemplaza(self, store):
+        """Test: Dos lecturas del mismo milisegundo se guardan como una (la última)"""
+        store.registrar(1, "temperatura", 20, INICIO.replace(microsecond=1500))
+        store.registrar(1, "temperatura", 21, INICIO.replace(microsecond=1900))
+
+        store.volcar()
+
+        (muestras,) = store.telemetry_dao.guardar.call_args[0]
+        assert muestras == [(1, "temperatura", INICIO.replace(microsecond=1000), 21.0)]
+        assert list(store.recientes(1, "temperatura").values) == [21.0]
+
+    def test_error_conserva_pendientes(self, store):
+        """Test: Si falla la escritura las lecturas se reintentan en el próximo volcado"""
+        store.registrar(1, "temperatura", 20, INICIO)
+        store.telemetry_dao.guardar.return_value = False
+
+        exito, _ = store.volcar()
+        store.registrar(1, "temperatura", 30, INICIO + timedelta(seconds=1))
+        store.telemetry_dao.guardar.return_value = True
+        store.volcar()
+
+        (muestras,) = store.telemetry_dao.guardar.call_args[0]
+        assert exito is False
+        assert [m[3] for m in muestras] == [20.0, 30.0]
+
+    def test_sin_pendientes_no_escribe(self, store):
+        """Test: Un volcado sin lecturas no accede a la BD"""
+        store.volcar()
+
+        store.telemetry_dao.guardar.assert_not_called()
+
+
+class TestConsultas:
+    """Tests para las consultas por rango"""
+
+    def test_serie_incluye_pendientes(self, store):
+        """Test: La serie combina la BD con las lecturas no volcadas"""
+        store.telemetry_dao.obtener_muestras.return_value = [
+            {'ts': INICIO, 'value': 20.0},
+        ]
+        store.registrar(1, "temperatura", 21, INICIO + timedelta(minutes=1))
+        store.registrar(1, "temperatura", 99, INICIO + timedelta(days=1))
+
+        serie = store.serie(1, "temperatura", INICIO, INICIO + timedelta(hours=1))
+
+        assert list(serie.values) == [20.0, 21.0]
+
+    def test_serie_normaliza_claves_de_la_bd(self, store):
+        """Test: Una lectura pendiente y la misma leída de la BD cuentan una vez"""
+        instante = INICIO.replace(microsecond=123456)
+        store.telemetry_dao.obtener_muestras.return_value = [
+            {'ts': INICIO.replace(microsecond=123000), 'value': 20.0},
+        ]
+        store.registrar(1, "temperatura", 22, instante)
+
+        serie = store.serie(1, "temperatura", INICIO, INICIO + timedelta(hours=1))
+
+        assert list(serie.values) == [22.0]
+
+    def test_serie_incluye_lecturas_en_vuelo(self, store):
+        """Test: Mientras se escribe un lote sus lecturas siguen visibles"""
+        store.telemetry_dao.obtener_muestras.return_value = []
+        escribiendo, continuar = threading.Event(), threading.Event()
+
+        def guardar(muestras):
+            escribiendo.set()
+            continuar.wait(5)
+            return True
+
+        store.telemetry_dao.guardar.side_effect = guardar
+        store.registrar(1, "temperatura", 20, INICIO)
+        volcado = threading.Thread(target=store.volcar)
+        volcado.start()
+        escribiendo.wait(5)
+
+        serie = store.serie(1, "temperatura", INICIO, INICIO + timedelta(hours=1))
+        continuar.set()
+        volcado.join(5)
+
+        assert list(serie.values) == [20.0]
+        assert store.pendientes() == 0
+
+    def test_serie_reducida_elige_granularidad(self, store):
+        """Test: Rangos de más de 7 días se responden por hora"""
+        store.telemetry_dao.obtener_agregados.return_value = [
+            {'bucket': INICIO, 'sample_count': 4, 'min_value': 1.0, 'max_value': 7.0, 'sum_value': 16.0},
+        ]
+
+        corta = store.serie_reducida(1, "energia", INICIO, INICIO + timedelta(days=1))
+        larga = store.serie_reducida(1, "energia", INICIO, INICIO + timedelta(days=30))
+
+        assert corta.granularity == "minuto"
+        assert larga.granularity == "hora"
+        assert list(larga.averages) == [4.0]
+        assert list(larga.counts) == [4.0]
+
+    def test_serie_reducida_combina_pendientes(self, store):
+        """Test: Los buckets con lecturas no volcadas se recalculan con las de la BD"""
+        store.telemetry_dao.obtener_agregados.return_value = [
+            {'bucket': INICIO, 'sample_count': 1, 'min_value': 10.0, 'max_value': 10.0, 'sum_value': 10.0},
+        ]
+        store.telemetry_dao.obtener_muestras.return_value = [{'ts': INICIO, 'value': 10.0}]
+        store.registrar(1, "energia", 30, INICIO + timedelta(minutes=10))
+
+        reducida = store.serie_reducida(1, "energia", INICIO, INICIO + timedelta(hours=2), "hora")
+
+        assert list(reducida.minimums) == [10.0]
+        assert list(reducida.maximums) == [30.0]
+        assert list(reducida.averages) == [20.0]
+        store.telemetry_dao.obtener_muestras.assert_called_once_with(
+            1, "energia", INICIO, INICIO + timedelta(hours=1, milliseconds=-1)
+        )
+
+    def test_serie_reducida_no_duplica_lecturas_ya_guardadas(self, store):
+        """Test: Una lectura repetida de una ya guardada no suma al conteo"""
+        store.telemetry_dao.obtener_agregados.return_value = [
+            {'bucket': INICIO, 'sample_count': 1, 'min_value': 10.0, 'max_value': 10.0, 'sum_value': 10.0},
+        ]
+        store.telemetry_dao.obtener_muestras.return_value = [{'ts': INICIO, 'value': 10.0}]
+        store.registrar(1, "energia", 12, INICIO)
+
+        reducida = store.serie_reducida(1, "energia", INICIO, INICIO + timedelta(hours=2), "hora")
+
+        assert list(reducida.counts) == [1.0]
+        assert list(reducida.averages) == [12.0]
+
+    def test_error_de_bd(self, store):
+        """Test: Un error de BD devuelve None"""
+        store.telemetry_dao.obtener_muestras.return_value = None
+
+        assert store.serie(1, "temperatura", INICIO, INICIO) is None
+        assert store.serie_reducida(1, "temperatura", INICIO, INICIO, "semana") is None
+
+    def test_inicio_bucket(self):
+        """Test: Las lecturas se truncan al minuto y a la hora"""
+        instante = datetime(2024, 11, 28, 22, 37, 45, 123)
+
+        assert inicio_bucket(instante, 60) == datetime(2024, 11, 28, 22, 37)
+        assert inicio_bucket(instante, 3600) == datetime(2024, 11, 28, 22, 0)
+
+    def test_arreglos_numpy(self, store):
+        """Test: Con NumPy instalado las series son ndarray de float64"""
+        np = pytest.importorskip("numpy")
+        store.registrar(1, "temperatura", 20, INICIO)
+
+        serie = store.recientes(1, "temperatura")
+
+        assert arrays.NUMPY_DISPONIBLE
+        assert isinstance(serie.values, np.ndarray)
+        assert serie.values.dtype == np.float64
@@ -117,7 +117,7 @@ class ConsoleUI:
             print("✗ No hay sesión activa")
             return
 
-        dispositivos_por_hogar = self.device_service.obtener_dispositivos_usuario(
+        dispositivos_por_hogar = self.device_service.resumen_dispositivos_usuario(
             usuario.email
         )
 
@@ -131,9 +131,9 @@ class ConsoleUI:
             if dispositivos:
                 for disp in dispositivos:
                     print(
-                        f"  • {disp.name} ({disp.device_type.name}) - {disp.state.name}"
+                        f"  • {disp.name} ({disp.type_name}) - {disp.state_name}"
                     )
-                    print(f"    📍 Ubicación: {disp.location.name}")
+                    print(f"    📍 Ubicación: {disp.location_name}")
             else:
                 print("  No hay dispositivos en este hogar")
 
@@ -151,9 +151,13 @@ class ConsoleUI:
             # Obtener opciones de configuración
             opciones = self.device_service.obtener_opciones_configuracion()
 
+            # Solo se ofrecen los hogares del usuario (permisos en memoria)
+            permitidos = self.auth_service.hogares_permitidos()
+            hogares = [h for h in opciones["hogares"] if h.id in permitidos]
+
             # Validar que hay opciones disponibles
-            if not opciones["hogares"]:
-                print("✗ No hay hogares disponibles")
+            if not hogares:
+                print("✗ No tienes hogares asociados")
                 return
 
             if not opciones["tipos"]:
@@ -162,9 +166,12 @@ class ConsoleUI:
 
             # Mostrar hogares
             print("\n🏠 Hogares disponibles:")
-            for h in opciones["hogares"]:
+            for h in hogares:
                 print(f"  {h.id}. {h.name}")
             home_id = int(input("Seleccione ID del hogar: "))
+            if home_id not in permitidos:
+                print("✗ No tienes acceso a ese hogar")
+                return
 
             # Mostrar tipos
             print("\n📱 Tipos de dispositivo:")
@@ -218,7 +225,7 @@ class ConsoleUI:
             print("✗ No hay sesión activa")
             return
 
-        automatizaciones_por_hogar = self.automation_service.obtener_automatizaciones_usuario(
+        automatizaciones_por_hogar = self.automation_service.resumen_automatizaciones_usuario(
             usuario.email
         )
 
@@ -253,10 +260,10 @@ class ConsoleUI:
                 print("✗ No hay sesión activa")
                 return
 
-            # Obtener hogares usando device_service (que ya tiene el método)
-            from dao.home_dao import HomeDAO
-            home_dao = HomeDAO()
-            hogares = home_dao.obtener_hogares_usuario(usuario.email)
+            # Hogares del usuario desde memoria (MembershipCache), sin JOIN con user_home
+            permitidos = self.auth_service.hogares_permitidos()
+            opciones = self.device_service.obtener_opciones_configuracion()
+            hogares = [h for h in opciones["hogares"] if h.id in permitidos]
 
             if not hogares:
                 print("✗ No tienes hogares asociados")
@@ -267,6 +274,9 @@ class ConsoleUI:
             for h in hogares:
                 print(f"  {h.id}. {h.name}")
             home_id = int(input("Seleccione ID del hogar: "))
+            if home_id not in permitidos:
+                print("✗ No tienes acceso a ese hogar")
+                return
 
             # Preguntar si debe estar activa
             activar_input = input("¿Activar automatización ahora? (s/n): ").strip().lower()
@@ -291,8 +301,10 @@ class ConsoleUI:
             automation_id = int(input("ID de la automatización: "))
             automatizacion = self.automation_service.obtener_automatizacion(automation_id)
 
-            if not automatizacion:
-                print("✗ Automatización no encontrada")
+            if not automatizacion or not self.auth_service.puede_acceder_hogar(
+                automatizacion.home.id
+            ):
+                print("✗ Automatización no encontrada en tus hogares")
                 return
 
             # Mostrar información actual
@@ -332,8 +344,10 @@ class ConsoleUI:
             automation_id = int(input("ID de la automatización a actualizar: "))
             automatizacion = self.automation_service.obtener_automatizacion(automation_id)
 
-            if not automatizacion:
-                print("✗ Automatización no encontrada")
+            if not automatizacion or not self.auth_service.puede_acceder_hogar(
+                automatizacion.home.id
+            ):
+                print("✗ Automatización no encontrada en tus hogares")
                 return
 
             print(f"\n🤖 Automatización actual: {automatizacion.name}")
@@ -371,8 +385,10 @@ class ConsoleUI:
             automation_id = int(input("ID de la automatización a eliminar: "))
             automatizacion = self.automation_service.obtener_automatizacion(automation_id)
 
-            if not automatizacion:
-                print("✗ Automatización no encontrada")
+            if not automatizacion or not self.auth_service.puede_acceder_hogar(
+                automatizacion.home.id
+            ):
+                print("✗ Automatización no encontrada en tus hogares")
                 return
 
             # Mostrar información de la automatización
@@ -397,7 +413,7 @@ class ConsoleUI:
     def flujo_ver_dispositivos(self):
         """Muestra todos los dispositivos del sistema."""
         print("\n--- LISTA DE DISPOSITIVOS ---")
-        dispositivos = self.device_service.listar_dispositivos()
+        dispositivos = self.device_service.listar_resumen_dispositivos()
 
         if not dispositivos:
             print("No hay dispositivos registrados")
@@ -407,10 +423,10 @@ class ConsoleUI:
             print(f"\n{'=' * 40}")
             print(f"ID: {disp.id}")
             print(f"📱 Nombre: {disp.name}")
-            print(f"🔧 Tipo: {disp.device_type.name}")
-            print(f"⚡ Estado: {disp.state.name}")
-            print(f"📍 Ubicación: {disp.location.name}")
-            print(f"🏠 Hogar: {disp.home.name}")
+            print(f"🔧 Tipo: {disp.type_name}")
+            print(f"⚡ Estado: {disp.state_name}")
+            print(f"📍 Ubicación: {disp.location_name}")
+            print(f"🏠 Hogar: {disp.home_name}")
 
     def flujo_actualizar_dispositivo(self):
         """Maneja el flujo de actualización de dispositivo."""
@@ -418,6 +434,10 @@ class ConsoleUI:
 
         try:
             device_id = int(input("ID del dispositivo a actualizar: "))
+            if not self.auth_service.puede_acceder_dispositivo(device_id):
+                print("✗ Dispositivo no encontrado en tus hogares")
+                return
+
             dispositivo = self.device_service.obtener_dispositivo(device_id)
 
             if not dispositivo:
@@ -446,10 +466,16 @@ class ConsoleUI:
                 print("✗ No se realizaron cambios")
                 return
 
-            exito, mensaje = self.device_service.actualizar_dispositivo(
-                device_id, nuevo_nombre if nuevo_nombre else None, nuevo_estado_id
-            )
-            print(f"\n{'✓' if exito else '✗'} {mensaje}")
+            # El nombre se guarda de inmediato; el estado pasa por el
+            # coalescedor (una escritura por ráfaga de cambios)
+            if nuevo_nombre:
+                exito, mensaje = self.device_service.actualizar_dispositivo(device_id, nuevo_nombre)
+                print(f"\n{'✓' if exito else '✗'} {mensaje}")
+            if nuevo_estado_id:
+                exito, mensaje = self.device_service.solicitar_cambio_estado(
+                    device_id, nuevo_estado_id
+                )
+                print(f"\n{'✓' if exito else '✗'} {mensaje}")
 
         except ValueError:
             print("✗ Error: Debe ingresar un número válido")
@@ -462,6 +488,10 @@ class ConsoleUI:
 
         try:
             device_id = int(input("ID del dispositivo a eliminar: "))
+            if not self.auth_service.puede_acceder_dispositivo(device_id):
+                print("✗ Dispositivo no encontrado en tus hogares")
+                return
+
             dispositivo = self.device_service.obtener_dispositivo(device_id)
 
             if not dispositivo:
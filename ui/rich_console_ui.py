@@ -8,6 +8,7 @@ para una experiencia visual profesional y atractiva.
 from services.auth_service import AuthService
 from services.device_service import DeviceService
 from services.automation_service import AutomationService
+from services.sensor_service import SensorService
 from ui.rich_utils import (
     console,
     COLORS,
@@ -47,6 +48,7 @@ class RichConsoleUI:
         self.auth_service = AuthService()
         self.device_service = DeviceService()
         self.automation_service = AutomationService()
+        self.sensor_service = SensorService()
 
     # ============================================
     # MENÚS PRINCIPALES
@@ -90,7 +92,8 @@ class RichConsoleUI:
             ("1", "Gestionar Dispositivos (CRUD)", ICONS["device"]),
             ("2", "Gestionar Automatizaciones (CRUD)", ICONS["automation"]),
             ("3", "Cambiar rol de usuario", ICONS["admin"]),
-            ("4", "Cerrar sesión", ICONS["exit"]),
+            ("4", "Registrar dato de sensor", ICONS["add"]),
+            ("5", "Cerrar sesión", ICONS["exit"]),
         ]
 
         menu = create_menu_panel("MENÚ DE ADMINISTRADOR", options, ICONS["admin"])
@@ -226,7 +229,7 @@ class RichConsoleUI:
             pause()
             return
 
-        dispositivos_por_hogar = self.device_service.obtener_dispositivos_usuario(
+        dispositivos_por_hogar = self.device_service.resumen_dispositivos_usuario(
             usuario.email
         )
 
@@ -255,9 +258,9 @@ class RichConsoleUI:
                         [
                             str(disp.id),
                             disp.name,
-                            disp.device_type.name,
-                            get_state_icon(disp.state.name),
-                            disp.location.name,
+                            disp.type_name,
+                            get_state_icon(disp.state_name),
+                            disp.location_name,
                         ]
                     )
 
@@ -275,7 +278,7 @@ class RichConsoleUI:
         print_header("Lista de Dispositivos", "Todos los dispositivos del sistema")
 
         show_loading("Cargando dispositivos...", 0.5)
-        dispositivos = self.device_service.listar_dispositivos()
+        dispositivos = self.device_service.listar_resumen_dispositivos()
 
         if not dispositivos:
             console.print()
@@ -298,10 +301,10 @@ class RichConsoleUI:
                 [
                     str(disp.id),
                     disp.name,
-                    disp.device_type.name,
-                    get_state_icon(disp.state.name),
-                    disp.location.name,
-                    disp.home.name,
+                    disp.type_name,
+                    get_state_icon(disp.state_name),
+                    disp.location_name,
+                    disp.home_name,
                 ]
             )
 
@@ -331,10 +334,14 @@ class RichConsoleUI:
             show_loading("Cargando opciones...", 0.5)
             opciones = self.device_service.obtener_opciones_configuracion()
 
+            # Solo se ofrecen los hogares del usuario (permisos en memoria)
+            permitidos = self.auth_service.hogares_permitidos()
+            hogares = [h for h in opciones["hogares"] if h.id in permitidos]
+
             # Validar que hay opciones disponibles
-            if not opciones["hogares"]:
+            if not hogares:
                 console.print()
-                print_error("No hay hogares disponibles")
+                print_error("No tienes hogares asociados")
                 pause()
                 return
 
@@ -347,10 +354,15 @@ class RichConsoleUI:
             # Mostrar hogares en tabla
             console.print()
             console.print(f"\n{ICONS['home']} [bold cyan]Hogares disponibles:[/bold cyan]")
-            for h in opciones["hogares"]:
+            for h in hogares:
                 console.print(f"  [cyan]{h.id}[/cyan]. {h.name}")
 
             home_id = int(ask_input("\n  Seleccione ID del hogar"))
+            if home_id not in permitidos:
+                console.print()
+                print_error("No tienes acceso a ese hogar")
+                pause()
+                return
 
             # Mostrar tipos en tabla
             console.print()
@@ -409,6 +421,11 @@ class RichConsoleUI:
         try:
             console.print()
             device_id = int(ask_input(f"{ICONS['device']} ID del dispositivo a actualizar"))
+            if not self.auth_service.puede_acceder_dispositivo(device_id):
+                console.print()
+                print_error("Dispositivo no encontrado en tus hogares")
+                pause()
+                return
 
             show_loading("Buscando dispositivo...", 0.5)
             dispositivo = self.device_service.obtener_dispositivo(device_id)
@@ -464,15 +481,24 @@ class RichConsoleUI:
             console.print()
             show_loading("Actualizando dispositivo...", 0.8)
 
-            exito, mensaje = self.device_service.actualizar_dispositivo(
-                device_id, nuevo_nombre if nuevo_nombre else None, nuevo_estado_id
-            )
+            # El nombre se guarda de inmediato; el estado pasa por el
+            # coalescedor (una escritura por ráfaga de cambios)
+            resultados = []
+            if nuevo_nombre:
+                resultados.append(
+                    self.device_service.actualizar_dispositivo(device_id, nuevo_nombre)
+                )
+            if nuevo_estado_id:
+                resultados.append(
+                    self.device_service.solicitar_cambio_estado(device_id, nuevo_estado_id)
+                )
 
             console.print()
-            if exito:
-                print_success(mensaje)
-            else:
-                print_error(mensaje)
+            for exito, mensaje in resultados:
+                if exito:
+                    print_success(mensaje)
+                else:
+                    print_error(mensaje)
 
         except ValueError:
             console.print()
@@ -491,6 +517,11 @@ class RichConsoleUI:
         try:
             console.print()
             device_id = int(ask_input(f"{ICONS['device']} ID del dispositivo a eliminar"))
+            if not self.auth_service.puede_acceder_dispositivo(device_id):
+                console.print()
+                print_error("Dispositivo no encontrado en tus hogares")
+                pause()
+                return
 
             show_loading("Buscando dispositivo...", 0.5)
             dispositivo = self.device_service.obtener_dispositivo(device_id)
@@ -554,7 +585,7 @@ class RichConsoleUI:
             return
 
         show_loading("Cargando automatizaciones...", 0.5)
-        automatizaciones_por_hogar = self.automation_service.obtener_automatizaciones_usuario(
+        automatizaciones_por_hogar = self.automation_service.resumen_automatizaciones_usuario(
             usuario.email
         )
 
@@ -612,7 +643,7 @@ class RichConsoleUI:
         )
 
         show_loading("Cargando automatizaciones...", 0.5)
-        automatizaciones = self.automation_service.listar_automatizaciones()
+        automatizaciones = self.automation_service.listar_resumen_automatizaciones()
 
         if not automatizaciones:
             console.print()
@@ -644,7 +675,7 @@ class RichConsoleUI:
                     if len(auto.description) > 50
                     else auto.description,
                     estado,
-                    auto.home.name,
+                    auto.home_name,
                 ]
             )
 
@@ -674,20 +705,27 @@ class RichConsoleUI:
             # Obtener hogares
             show_loading("Cargando hogares...", 0.5)
             opciones = self.device_service.obtener_opciones_configuracion()
+            permitidos = self.auth_service.hogares_permitidos()
+            hogares = [h for h in opciones["hogares"] if h.id in permitidos]
 
-            if not opciones["hogares"]:
+            if not hogares:
                 console.print()
-                print_error("No hay hogares disponibles")
+                print_error("No tienes hogares asociados")
                 pause()
                 return
 
             # Mostrar hogares
             console.print()
             console.print(f"\n{ICONS['home']} [bold cyan]Hogares disponibles:[/bold cyan]")
-            for h in opciones["hogares"]:
+            for h in hogares:
                 console.print(f"  [cyan]{h.id}[/cyan]. {h.name}")
 
             home_id = int(ask_input("\n  Seleccione ID del hogar"))
+            if home_id not in permitidos:
+                console.print()
+                print_error("No tienes acceso a ese hogar")
+                pause()
+                return
 
             # Crear automatización
             console.print()
@@ -726,9 +764,11 @@ class RichConsoleUI:
             show_loading("Buscando automatización...", 0.5)
             automatizacion = self.automation_service.obtener_automatizacion(auto_id)
 
-            if not automatizacion:
+            if not automatizacion or not self.auth_service.puede_acceder_hogar(
+                automatizacion.home.id
+            ):
                 console.print()
-                print_error("Automatización no encontrada")
+                print_error("Automatización no encontrada en tus hogares")
                 pause()
                 return
 
@@ -799,9 +839,11 @@ class RichConsoleUI:
             show_loading("Buscando automatización...", 0.5)
             automatizacion = self.automation_service.obtener_automatizacion(auto_id)
 
-            if not automatizacion:
+            if not automatizacion or not self.auth_service.puede_acceder_hogar(
+                automatizacion.home.id
+            ):
                 console.print()
-                print_error("Automatización no encontrada")
+                print_error("Automatización no encontrada en tus hogares")
                 pause()
                 return
 
@@ -871,9 +913,11 @@ class RichConsoleUI:
             show_loading("Buscando automatización...", 0.5)
             automatizacion = self.automation_service.obtener_automatizacion(auto_id)
 
-            if not automatizacion:
+            if not automatizacion or not self.auth_service.puede_acceder_hogar(
+                automatizacion.home.id
+            ):
                 console.print()
-                print_error("Automatización no encontrada")
+                print_error("Automatización no encontrada en tus hogares")
                 pause()
                 return
 
@@ -963,3 +1007,59 @@ class RichConsoleUI:
             print_error(f"Error: {e}")
 
         pause()
+
+    def flujo_registrar_dato_sensor(self):
+        """
+        Maneja el ingreso manual de un evento o una lectura de sensor.
+
+        Los datos entran por SensorService, igual que los de un sensor real:
+        el motor de reglas y el detector de anomalías los reciben por el bus
+        y las lecturas se guardan en la telemetría en el próximo volcado.
+        """
+        clear_screen()
+        print_header("Registrar Dato de Sensor", "Evento o lectura numérica")
+
+        try:
+            console.print()
+            device_id = int(ask_input(f"{ICONS['device']} ID del dispositivo"))
+            if self.device_service.obtener_estado_dispositivo(device_id) is None:
+                console.print()
+                print_error(f"No existe el dispositivo {device_id}")
+                pause()
+                return
+
+            console.print()
+            console.print("  [cyan]1[/cyan]. Evento (ej: Movimiento detectado)")
+            console.print("  [cyan]2[/cyan]. Lectura numérica (ej: temperatura)")
+            tipo = ask_input("Seleccione el tipo de dato").strip()
+
+            if tipo == "1":
+                descripcion = ask_input("Descripción del evento").strip()
+                if not descripcion:
+                    print_error("La descripción es obligatoria")
+                    pause()
+                    return
+                exito, mensaje = self.sensor_service.registrar_evento(device_id, descripcion)
+            elif tipo == "2":
+                metrica = ask_input("Métrica").strip()
+                valor = ask_input("Valor")
+                exito, mensaje = self.sensor_service.registrar_lectura(device_id, metrica, valor)
+            else:
+                print_error("Opción inválida")
+                pause()
+                return
+
+            console.print()
+            if exito:
+                print_success(mensaje)
+            else:
+                print_error(mensaje)
+
+        except ValueError:
+            console.print()
+            print_error("Error: Debe ingresar un número válido")
+        except Exception as e:
+            console.print()
+            print_error(f"Error: {e}")
+
+        pause()
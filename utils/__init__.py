@@ -44,6 +44,7 @@ from .exceptions import (
     InvalidCredentialsException,
     UnauthorizedException,
     SessionExpiredException,
+    RateLimitExceededException,
     DeviceException,
     DeviceNotFoundException,
     DeviceStateException,
@@ -99,6 +100,7 @@ __all__ = [
     'InvalidCredentialsException',
     'UnauthorizedException',
     'SessionExpiredException',
+    'RateLimitExceededException',
     'DeviceException',
     'DeviceNotFoundException',
     'DeviceStateException',
@@ -0,0 +1,32 @@
+"""
+Arreglos numéricos con NumPy opcional.
+
+Si NumPy está instalado las series se devuelven como numpy.ndarray
+(float64); si no, como array.array('d'), que también es un buffer
+compacto de dobles y se convierte sin copia con numpy.frombuffer.
+"""
+
+from array import array
+from typing import Iterable
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+NUMPY_DISPONIBLE = np is not None
+
+
+def a_arreglo(valores: Iterable[float]):
+    """
+    Convierte una secuencia de números en un arreglo de float64.
+
+    Args:
+        valores: Números a convertir
+
+    Returns:
+        numpy.ndarray si NumPy está disponible, si no array.array('d')
+    """
+    if np is not None:
+        return np.fromiter(valores, dtype=np.float64)
+    return array('d', valores)
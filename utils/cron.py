@@ -0,0 +1,121 @@
+"""Expresiones cron (5 campos) para programar tareas recurrentes."""
+
+from datetime import datetime, timedelta
+from typing import FrozenSet, List, Tuple
+
+# (nombre, mínimo, máximo) de cada campo, en el orden de la expresión
+_CAMPOS: List[Tuple[str, int, int]] = [
+    ("minuto", 0, 59),
+    ("hora", 0, 23),
+    ("día del mes", 1, 31),
+    ("mes", 1, 12),
+    ("día de la semana", 0, 7),
+]
+
+# Límite de búsqueda de la próxima ejecución (p. ej. "0 0 29 2 *" ocurre cada 4 años)
+_MAX_ANIOS = 5
+
+
+def _parsear_campo(texto: str, minimo: int, maximo: int, nombre: str) -> FrozenSet[int]:
+    """
+    Convierte un campo cron (*, n, a-b, lista, /paso) en el conjunto de valores.
+
+    Raises:
+        ValueError: Si el campo es inválido
+    """
+    valores = set()
+    for parte in texto.split(","):
+        rango, _, paso = parte.partition("/")
+        paso = int(paso) if paso else 1
+        if rango == "*":
+            inicio, fin = minimo, maximo
+        elif "-" in rango:
+            inicio, fin = (int(v) for v in rango.split("-", 1))
+        else:
+            inicio = int(rango)
+            fin = maximo if paso > 1 else inicio
+        if paso < 1 or inicio < minimo or fin > maximo or inicio > fin:
+            raise ValueError(f"Campo cron inválido ({nombre}): {texto}")
+        valores.update(range(inicio, fin + 1, paso))
+    return frozenset(valores)
+
+
+class CronExpression:
+    """
+    Expresión cron estándar de 5 campos: minuto hora día-del-mes mes día-de-la-semana.
+
+    Soporta *, valores, rangos (a-b), listas (a,b) y pasos (*/n, a-b/n).
+    El día de la semana va de 0 (domingo) a 6; 7 también es domingo.
+    Como en cron, si se restringen día del mes y día de la semana basta
+    con que se cumpla uno de los dos.
+    """
+
+    def __init__(self, expresion: str):
+        """
+        Parsea la expresión.
+
+        Args:
+            expresion: Expresión cron (ej: '0 23 * * *')
+
+        Raises:
+            ValueError: Si la expresión es inválida
+        """
+        partes = expresion.split()
+        if len(partes) != len(_CAMPOS):
+            raise ValueError(f"La expresión cron debe tener 5 campos: '{expresion}'")
+        try:
+            conjuntos = [
+                _parsear_campo(parte, minimo, maximo, nombre)
+                for parte, (nombre, minimo, maximo) in zip(partes, _CAMPOS)
+            ]
+        except ValueError as e:
+            raise ValueError(f"Expresión cron inválida '{expresion}': {e}") from e
+
+        self.expresion = expresion
+        self.__minutos, self.__horas, self.__dias, self.__meses, dias_semana = conjuntos
+        self.__dias_semana = frozenset(d % 7 for d in dias_semana)
+        self.__dia_libre = partes[2] == "*"
+        self.__semana_libre = partes[4] == "*"
+
+    def __dia_valido(self, instante: datetime) -> bool:
+        """Indica si la fecha cumple los campos de día del mes y de la semana."""
+        en_mes = instante.day in self.__dias
+        # isoweekday(): lunes=1 ... domingo=7 -> cron: domingo=0
+        en_semana = instante.isoweekday() % 7 in self.__dias_semana
+        if self.__dia_libre or self.__semana_libre:
+            return en_mes and en_semana
+        return en_mes or en_semana
+
+    def siguiente(self, desde: datetime) -> datetime:
+        """
+        Calcula la próxima ejecución estrictamente posterior a una fecha.
+
+        Args:
+            desde: Fecha de referencia
+
+        Returns:
+            Próximo instante (con segundos en 0) que cumple la expresión
+
+        Raises:
+            ValueError: Si no hay ejecuciones en los próximos años
+        """
+        instante = desde.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limite = desde + timedelta(days=366 * _MAX_ANIOS)
+        while instante <= limite:
+            if instante.month not in self.__meses:
+                anio, mes = divmod(instante.month, 12)
+                instante = instante.replace(
+                    year=instante.year + anio, month=mes + 1, day=1, hour=0, minute=0
+                )
+            elif not self.__dia_valido(instante):
+                instante = instante.replace(hour=0, minute=0) + timedelta(days=1)
+            elif instante.hour not in self.__horas:
+                instante = instante.replace(minute=0) + timedelta(hours=1)
+            elif instante.minute not in self.__minutos:
+                instante += timedelta(minutes=1)
+            else:
+                return instante
+        raise ValueError(f"La expresión cron '{self.expresion}' no tiene próximas ejecuciones")
+
+    def __repr__(self) -> str:
+        return f"CronExpression('{self.expresion}')"
@@ -179,6 +179,17 @@ class SessionExpiredException(AuthenticationException):
         super().__init__("La sesión ha expirado. Por favor, inicia sesión nuevamente")
 
 
+class RateLimitExceededException(AuthenticationException):
+    """Excepción cuando un usuario u hogar supera su límite de solicitudes."""
+    
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(
+            "Demasiadas solicitudes. Espera un momento e intenta nuevamente",
+            f"Reintentar en {retry_after:.1f}s"
+        )
+
+
 # ============================================
 # EXCEPCIONES DE DISPOSITIVOS
 # ============================================
@@ -0,0 +1,204 @@
+"""
+Hash de contraseñas con scrypt y un pool de trabajadores dedicado.
+
+Un hash lento (decenas de ms) bloquearía a quien inicia sesión; por eso
+el cálculo se hace en un ThreadPoolExecutor propio (hashlib.scrypt libera
+el GIL, de modo que los hilos corren en paralelo). El tamaño del pool
+acota cuántos núcleos puede ocupar una ráfaga de inicios de sesión.
+
+Formato almacenado: scrypt$<n>$<r>$<p>$<sal base64>$<hash base64>.
+Los parámetros viajan con cada hash: subir el costo no invalida las
+contraseñas ya guardadas.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+PREFIJO = "scrypt"
+
+# Costo por defecto: n=2^14, r=8 (16 MB y ~50 ms por hash en un núcleo actual)
+N_POR_DEFECTO = 2 ** 14
+R_POR_DEFECTO = 8
+P_POR_DEFECTO = 1
+LARGO_SAL = 16
+LARGO_HASH = 32
+
+
+def _b64(datos: bytes) -> str:
+    """Codifica bytes en base64 (texto ASCII)."""
+    return base64.b64encode(datos).decode("ascii")
+
+
+def _derivar(password: str, sal: bytes, n: int, r: int, p: int) -> bytes:
+    """Aplica scrypt con memoria máxima suficiente para los parámetros."""
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=sal, n=n, r=r, p=p,
+        maxmem=256 * n * r * p, dklen=LARGO_HASH,
+    )
+
+
+def es_hash(valor: Optional[str]) -> bool:
+    """
+    Verifica si un valor almacenado ya es un hash de este módulo.
+
+    Args:
+        valor: Contraseña almacenada
+
+    Returns:
+        True si tiene el formato scrypt$...
+    """
+    return bool(valor) and valor.startswith(PREFIJO + "$") and valor.count("$") == 5
+
+
+def hashear(password: str, n: Optional[int] = None) -> str:
+    """
+    Calcula el hash de una contraseña (bloqueante).
+
+    Args:
+        password: Contraseña en texto plano
+        n: Factor de costo (potencia de 2; por defecto PASSWORD_SCRYPT_N)
+
+    Returns:
+        Hash en formato scrypt$n$r$p$sal$hash
+    """
+    n = n or int(os.getenv("PASSWORD_SCRYPT_N", str(N_POR_DEFECTO)))
+    sal = secrets.token_bytes(LARGO_SAL)
+    clave = _derivar(password, sal, n, R_POR_DEFECTO, P_POR_DEFECTO)
+    return f"{PREFIJO}${n}${R_POR_DEFECTO}${P_POR_DEFECTO}${_b64(sal)}${_b64(clave)}"
+
+
+_hash_ficticio: Optional[str] = None
+
+
+def hash_ficticio() -> str:
+    """
+    Hash de una contraseña aleatoria, calculado una vez por proceso.
+
+    Cuando el usuario no existe se verifica contra él: la respuesta tarda
+    lo mismo que con un usuario registrado y no revela qué emails existen.
+
+    Returns:
+        Hash en formato scrypt$n$r$p$sal$hash
+    """
+    global _hash_ficticio
+    if _hash_ficticio is None:
+        _hash_ficticio = hashear(secrets.token_urlsafe(LARGO_SAL))
+    return _hash_ficticio
+
+
+def verificar(password: str, almacenado: Optional[str]) -> bool:
+    """
+    Compara una contraseña con la almacenada en tiempo constante (bloqueante).
+
+    Las contraseñas guardadas en texto plano antes de la migración se
+    siguen aceptando (ver scripts/migrar_passwords.py).
+
+    Args:
+        password: Contraseña ingresada
+        almacenado: Hash (o texto plano heredado) guardado en la BD
+
+    Returns:
+        True si la contraseña es correcta
+    """
+    if not almacenado or password is None:
+        return False
+    if not es_hash(almacenado):
+        return hmac.compare_digest(password.encode("utf-8"), almacenado.encode("utf-8"))
+
+    try:
+        _, n, r, p, sal, clave = almacenado.split("$")
+        calculada = _derivar(password, base64.b64decode(sal), int(n), int(r), int(p))
+        return hmac.compare_digest(calculada, base64.b64decode(clave))
+    except ValueError:
+        return False
+
+
+class PasswordHasher:
+    """
+    Pool dedicado para hashear y verificar contraseñas sin bloquear al llamador.
+
+    - Implementa el patrón Singleton: un único pool por proceso
+    - hashear/verificar devuelven un Future (concurrent.futures)
+    - hashear_async/verificar_async pueden esperarse desde asyncio
+    - Tamaño del pool: PASSWORD_HASH_WORKERS (por defecto, hasta 4 núcleos)
+    """
+
+    _instance: Optional["PasswordHasher"] = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        """Implementa Singleton."""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(PasswordHasher, cls).__new__(cls)
+                cls._instance.__inicializar()
+        return cls._instance
+
+    def __inicializar(self) -> None:
+        """Crea el pool de trabajadores (una sola vez por proceso)."""
+        trabajadores = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.__pool = ThreadPoolExecutor(max_workers=trabajadores, thread_name_prefix="password")
+
+    def hashear(self, password: str, n: Optional[int] = None) -> "Future[str]":
+        """
+        Calcula el hash de una contraseña en el pool.
+
+        Args:
+            password: Contraseña en texto plano
+            n: Factor de costo (opcional)
+
+        Returns:
+            Future con el hash
+        """
+        return self.__pool.submit(hashear, password, n)
+
+    def verificar(self, password: str, almacenado: Optional[str]) -> "Future[bool]":
+        """
+        Verifica una contraseña en el pool.
+
+        Args:
+            password: Contraseña ingresada
+            almacenado: Hash guardado en la BD
+
+        Returns:
+            Future con el resultado
+        """
+        return self.__pool.submit(verificar, password, almacenado)
+
+    async def hashear_async(self, password: str, n: Optional[int] = None) -> str:
+        """
+        Versión para asyncio de hashear().
+
+        Args:
+            password: Contraseña en texto plano
+            n: Factor de costo (opcional)
+
+        Returns:
+            Hash de la contraseña
+        """
+        return await asyncio.wrap_future(self.hashear(password, n))
+
+    async def verificar_async(self, password: str, almacenado: Optional[str]) -> bool:
+        """
+        Versión para asyncio de verificar().
+
+        Args:
+            password: Contraseña ingresada
+            almacenado: Hash guardado en la BD
+
+        Returns:
+            True si la contraseña es correcta
+        """
+        return await asyncio.wrap_future(self.verificar(password, almacenado))
+
+    def cerrar(self) -> None:
+        """Espera los cálculos en curso y detiene el pool."""
+        self.__pool.shutdown(wait=True)
+        PasswordHasher._instance = None